@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Relatórios e exportação sobre sinais, resultados e trades
+
+Uso:
+    python scripts/analytics.py list
+    python scripts/analytics.py report confidence --band 0.05
+    python scripts/analytics.py report strategies --since 2025-01-01 --format jsonl
+    python scripts/analytics.py report trades --trades data/backtest_results.csv
+    python scripts/analytics.py export game_results --output data/exports/game_results.parquet
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.analytics import main
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+    sys.exit(main())
@@ -51,6 +51,8 @@ def _load_bet_analysis_platform():
 
 BetAnalysisPlatform = _load_bet_analysis_platform()
 
+from database import log_file_lock
+
 
 def run_collection(duration_seconds: int = 60, interval_seconds: int = 5):
     os.makedirs('logs', exist_ok=True)
@@ -94,7 +96,8 @@ def run_collection(duration_seconds: int = 60, interval_seconds: int = 5):
         except Exception:
             pass
 
-        with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        # Mesmo lock da compactação de logs da retenção (database.retention)
+        with log_file_lock(csv_path), open(csv_path, 'a', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow([
                 datetime.now().isoformat(),
@@ -0,0 +1,540 @@
+"""
+Analytics sobre Sinais, Resultados e Trades
+===========================================
+
+Relatórios prontos em SQL executados por um motor embutido, com os
+resultados lidos em lotes (fetchmany) e escritos à medida que chegam:
+nenhuma tabela inteira é montada no Python.
+
+Motores:
+- DuckDB (se instalado): colunar. Lê o SQLite (extensão sqlite), os
+  arquivos da retenção (data/archive/<tabela>/date=*/part-*.parquet ou
+  .csv.gz) e trades em CSV/Parquet direto do disco; exporta Parquet com
+  COPY.
+- sqlite3 (fallback): consulta o banco direto; arquivos da retenção e
+  trades entram em tabelas temporárias, carregadas em lotes.
+
+Tabelas lógicas: signals e game_results (banco + arquivos frios) e trades
+(Backtester.save_trades_to_csv).
+
+Uso:
+    python scripts/analytics.py list
+    python scripts/analytics.py report confidence --band 0.05
+    python scripts/analytics.py report hourly --game Double --format jsonl
+    python scripts/analytics.py report trades --trades data/backtest_results.csv
+    python scripts/analytics.py export signals --output data/exports/signals.parquet
+"""
+
+import argparse
+import csv
+import glob
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'data/db/analysis.db'
+DEFAULT_ARCHIVE_DIR = 'data/archive'
+DEFAULT_BATCH_SIZE = 1000
+
+# Coluna de tempo de cada tabela lógica (filtro --since e relatórios por hora)
+TIME_COLUMNS = {'signals': 'timestamp', 'game_results': 'timestamp', 'trades': 'signal_time'}
+# Tabelas lógicas com coluna game (filtro --game)
+GAME_TABLES = ('signals', 'game_results')
+
+# Trechos de SQL que mudam entre os motores
+DIALECTS = {
+    'duckdb': {
+        'floor': 'floor({})',
+        'hour': 'hour(CAST({} AS TIMESTAMP))',
+        'time': 'CAST({} AS TIMESTAMP)',
+        'json': "CAST(json_extract(CAST({} AS VARCHAR), '$.{}') AS VARCHAR)",
+    },
+    'sqlite': {
+        'floor': 'CAST({} AS INTEGER)',
+        'hour': "CAST(strftime('%H', {}) AS INTEGER)",
+        'time': 'datetime({})',
+        'json': "json_extract({}, '$.{}')",
+    },
+}
+
+# Desfecho dos sinais: pendentes contam em signals, mas não no win_rate
+_SIGNAL_OUTCOME = """COUNT(*) AS signals,
+       SUM(CASE WHEN status = 'win' THEN 1 ELSE 0 END) AS wins,
+       SUM(CASE WHEN status = 'loss' THEN 1 ELSE 0 END) AS losses,
+       ROUND(AVG(CASE WHEN status = 'win' THEN 1.0 WHEN status = 'loss' THEN 0.0 END), 4) AS win_rate"""
+
+
+@dataclass(frozen=True)
+class Report:
+    """Relatório pronto: SQL com {source}, {where} e trechos do dialeto"""
+    name: str
+    table: str
+    description: str
+    sql: str
+
+
+REPORTS: Dict[str, Report] = {report.name: report for report in (
+    Report('confidence', 'signals', 'Taxa de acerto por faixa de confiança', f"""
+SELECT {{band}} AS band_start,
+       {_SIGNAL_OUTCOME},
+       ROUND(AVG(confidence), 4) AS avg_confidence
+FROM {{source}} {{where}}
+GROUP BY 1 ORDER BY 1"""),
+    Report('hourly', 'signals', 'Taxa de acerto por hora do dia', f"""
+SELECT {{hour}} AS hour,
+       {_SIGNAL_OUTCOME}
+FROM {{source}} {{where}}
+GROUP BY 1 ORDER BY 1"""),
+    Report('strategies', 'signals', 'Taxa de acerto por combinação de estratégias aprovadas', f"""
+SELECT COALESCE({{strategies}}, '(sem registro)') AS strategies,
+       MIN(strategies_passed) AS strategies_passed,
+       {_SIGNAL_OUTCOME}
+FROM {{source}} {{where}}
+GROUP BY 1 ORDER BY signals DESC, 1"""),
+    Report('results', 'game_results', 'Rodadas por jogo e hora (preço médio e Crash < 2x)', """
+SELECT game, {hour} AS hour,
+       COUNT(*) AS rounds,
+       ROUND(AVG(price), 4) AS avg_price,
+       ROUND(AVG(CASE WHEN price IS NULL THEN NULL WHEN price < 2 THEN 1.0 ELSE 0.0 END), 4) AS below_2x
+FROM {source} {where}
+GROUP BY 1, 2 ORDER BY 1, 2"""),
+    Report('trades', 'trades', 'Trades do backtest por faixa de confiança', """
+SELECT {band} AS band_start,
+       COUNT(*) AS trades,
+       SUM(CASE WHEN result = 'WIN' THEN 1 ELSE 0 END) AS wins,
+       ROUND(AVG(CASE WHEN result = 'WIN' THEN 1.0 WHEN result = 'LOSS' THEN 0.0 END), 4) AS win_rate,
+       ROUND(SUM(profit_loss), 2) AS profit_loss
+FROM {source} {where}
+GROUP BY 1 ORDER BY 1"""),
+)}
+
+
+def _quote(value: str) -> str:
+    """Literal SQL entre aspas simples (caminhos de arquivo)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sqlite_value(value):
+    """Valores de Parquet/CSV em tipos que o sqlite3 aceita sem adaptadores"""
+    if isinstance(value, datetime):
+        return value.isoformat(' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def _open_text(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def iter_file_batches(path: str, batch_size: int = DEFAULT_BATCH_SIZE
+                      ) -> Tuple[List[str], Iterator[List[tuple]]]:
+    """Colunas e lotes de linhas de um CSV (.csv/.csv.gz) ou Parquet"""
+    if path.endswith('.parquet'):
+        if not HAS_PYARROW:
+            raise ImportError(f"pyarrow necessário para ler {path} sem DuckDB")
+        parquet = pq.ParquetFile(path)
+
+        def parquet_batches():
+            for batch in parquet.iter_batches(batch_size=batch_size):
+                columns = [column.to_pylist() for column in batch.columns]
+                yield list(zip(*columns))
+        return list(parquet.schema_arrow.names), parquet_batches()
+
+    handle = _open_text(path, 'r')
+    reader = csv.reader(handle)
+    columns = next(reader, [])
+
+    def csv_batches():
+        try:
+            batch = []
+            for row in reader:
+                # Vazio no CSV = NULL (como o pandas grava None/NaN)
+                batch.append(tuple(value if value != '' else None for value in row))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            handle.close()
+    return columns, csv_batches()
+
+
+def write_rows(columns: Sequence[str], rows: Iterable[tuple], output, fmt: str = 'csv',
+               batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Escreve linhas à medida que chegam
+
+    Args:
+        output: caminho ou arquivo texto aberto (csv/jsonl)
+        fmt: 'csv', 'jsonl' ou 'parquet' (parquet exige pyarrow e caminho)
+
+    Returns:
+        Linhas escritas
+    """
+    if fmt == 'parquet':
+        return _write_parquet(columns, rows, output, batch_size)
+
+    close = isinstance(output, str)
+    if close:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        output = _open_text(output, 'w')
+    count = 0
+    try:
+        if fmt == 'jsonl':
+            for row in rows:
+                output.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n')
+                count += 1
+        else:
+            writer = csv.writer(output)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    finally:
+        if close:
+            output.close()
+    return count
+
+
+def _write_parquet(columns: Sequence[str], rows: Iterable[tuple], path: str, batch_size: int) -> int:
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow ou duckdb necessário para exportar Parquet")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    writer, count, batch = None, 0, []
+
+    def flush():
+        nonlocal writer
+        table = pa.Table.from_pylist([dict(zip(columns, row)) for row in batch])
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+        writer.write_table(table.cast(writer.schema))
+
+    try:
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) >= batch_size:
+                flush()
+                batch = []
+        if batch or writer is None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def _file_format(path: str) -> str:
+    if path.endswith('.parquet'):
+        return 'parquet'
+    if path.endswith('.jsonl') or path.endswith('.jsonl.gz'):
+        return 'jsonl'
+    return 'csv'
+
+
+class AnalyticsEngine:
+    """
+    Consultas sobre o banco, os arquivos frios da retenção e os trades
+
+    Args:
+        db_path: Banco SQLite (init_db)
+        archive_dir: Diretório dos arquivos da retenção (RetentionPolicy.archive_dir)
+        trades_path: CSV/Parquet de trades (Backtester.save_trades_to_csv)
+        engine: 'duckdb', 'sqlite' ou 'auto' (DuckDB se instalado)
+        batch_size: Linhas por fetchmany
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR,
+                 trades_path: Optional[str] = None, engine: str = 'auto',
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        if engine == 'auto':
+            engine = 'duckdb' if HAS_DUCKDB else 'sqlite'
+        if engine not in DIALECTS:
+            raise ValueError(f"Motor desconhecido: {engine}")
+        if engine == 'duckdb' and not HAS_DUCKDB:
+            raise ImportError("duckdb não instalado (pip install duckdb)")
+        self.engine = engine
+        self.db_path = db_path
+        self.archive_dir = archive_dir
+        self.trades_path = trades_path
+        self.batch_size = batch_size
+        self.dialect = DIALECTS[engine]
+        self._relations: Dict[str, str] = {}
+        self._db_attached = False
+        if engine == 'duckdb':
+            self.conn = duckdb.connect()
+            self._attach_duckdb()
+        else:
+            if db_path and os.path.exists(db_path):
+                self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+                self._db_attached = True
+            else:
+                self.conn = sqlite3.connect(':memory:')
+
+    def __enter__(self) -> 'AnalyticsEngine':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Fontes
+    # ------------------------------------------------------------------
+
+    def _attach_duckdb(self):
+        if not (self.db_path and os.path.exists(self.db_path)):
+            return
+        try:
+            self.conn.execute(f"ATTACH {_quote(self.db_path)} AS db (TYPE sqlite, READ_ONLY)")
+            self._db_attached = True
+        except Exception as e:
+            # Extensão sqlite indisponível (ex.: sem rede para instalar): só arquivos
+            logger.warning("[ANALYTICS] Banco não anexado ao DuckDB (%s); usando só os arquivos", e)
+
+    def _archive_files(self, table: str) -> Dict[str, List[str]]:
+        if not self.archive_dir:
+            return {}
+        files = {}
+        for extension in ('parquet', 'csv.gz'):
+            pattern = os.path.join(self.archive_dir, table, 'date=*', f'*.{extension}')
+            found = sorted(glob.glob(pattern))
+            if found:
+                files[extension] = found
+        return files
+
+    def _live_table_exists(self, table: str) -> bool:
+        if not self._db_attached:
+            return False
+        if self.engine == 'duckdb':
+            return bool(self.conn.execute(
+                "SELECT COUNT(*) FROM duckdb_tables() WHERE database_name = 'db' AND table_name = ?",
+                [table]).fetchone()[0])
+        return bool(self.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0])
+
+    def sources(self, table: str) -> Dict:
+        """Origem dos dados de uma tabela lógica (banco, arquivos)"""
+        if table == 'trades':
+            return {'files': [self.trades_path] if self.trades_path else []}
+        files = self._archive_files(table)
+        return {'database': self._live_table_exists(table),
+                'archives': sum(len(paths) for paths in files.values())}
+
+    def relation(self, table: str) -> str:
+        """Nome da view (temporária) que une banco e arquivos da tabela lógica"""
+        if table not in TIME_COLUMNS:
+            raise ValueError(f"Tabela desconhecida: {table} (use {', '.join(TIME_COLUMNS)})")
+        if table not in self._relations:
+            build = self._duckdb_relation if self.engine == 'duckdb' else self._sqlite_relation
+            self._relations[table] = build(table)
+        return self._relations[table]
+
+    def _duckdb_relation(self, table: str) -> str:
+        parts = []
+        if table == 'trades':
+            if not self.trades_path:
+                raise FileNotFoundError("Informe o arquivo de trades (trades_path / --trades)")
+            reader = 'read_parquet' if self.trades_path.endswith('.parquet') else 'read_csv_auto'
+            parts.append(f"SELECT * FROM {reader}({_quote(self.trades_path)})")
+        else:
+            if self._live_table_exists(table):
+                parts.append(f"SELECT * FROM db.{table}")
+            for extension, reader in (('parquet', 'read_parquet'), ('csv.gz', 'read_csv_auto')):
+                if extension in self._archive_files(table):
+                    pattern = os.path.join(self.archive_dir, table, 'date=*', f'*.{extension}')
+                    parts.append(f"SELECT * FROM {reader}({_quote(pattern)}, "
+                                 f"union_by_name = true, hive_partitioning = false)")
+        if not parts:
+            raise FileNotFoundError(f"Nenhuma fonte para {table} (banco: {self.db_path}, arquivos: {self.archive_dir})")
+        name = f"all_{table}"
+        self.conn.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS " + " UNION ALL BY NAME ".join(parts))
+        return name
+
+    def _sqlite_relation(self, table: str) -> str:
+        if table == 'trades':
+            if not self.trades_path:
+                raise FileNotFoundError("Informe o arquivo de trades (trades_path / --trades)")
+            self._load_files('temp.trades_file', [self.trades_path])
+            return 'temp.trades_file'
+
+        columns = None
+        parts = []
+        if self._live_table_exists(table):
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA main.table_info({table})")]
+            parts.append(f"SELECT {', '.join(columns)} FROM main.{table}")
+        paths = [path for found in self._archive_files(table).values() for path in found]
+        if paths:
+            archived = self._load_files(f"temp.archive_{table}", paths)
+            columns = columns or archived
+            parts.append("SELECT " + ', '.join(c if c in archived else f"NULL AS {c}" for c in columns)
+                         + f" FROM temp.archive_{table}")
+        if not parts:
+            raise FileNotFoundError(f"Nenhuma fonte para {table} (banco: {self.db_path}, arquivos: {self.archive_dir})")
+        name = f"all_{table}"
+        self.conn.execute(f"CREATE TEMP VIEW {name} AS " + " UNION ALL ".join(parts))
+        return name
+
+    def _load_files(self, target: str, paths: Sequence[str]) -> List[str]:
+        """Carrega CSV/Parquet numa tabela temporária, lote a lote (modo sqlite3)"""
+        columns: List[str] = []
+        loaded = 0
+        for path in paths:
+            file_columns, batches = iter_file_batches(path, self.batch_size)
+            if not columns:
+                columns = list(file_columns)
+                # Afinidade NUMERIC: números lidos do CSV como texto voltam a ser números
+                self.conn.execute(f"CREATE TABLE {target} ({', '.join(c + ' NUMERIC' for c in columns)})")
+            positions = [file_columns.index(c) if c in file_columns else None for c in columns]
+            insert = f"INSERT INTO {target} VALUES ({', '.join('?' * len(columns))})"
+            for batch in batches:
+                self.conn.executemany(insert, (
+                    tuple(_sqlite_value(row[p]) if p is not None else None for p in positions)
+                    for row in batch))
+                loaded += len(batch)
+        logger.debug("[ANALYTICS] %s linhas de %s arquivo(s) em %s", loaded, len(paths), target)
+        return columns
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, params: Sequence = ()) -> Tuple[List[str], Iterator[tuple]]:
+        """Executa SQL e devolve (colunas, iterador de linhas lidas em lotes)"""
+        cursor = self.conn.execute(sql, list(params))
+        columns = [d[0] for d in cursor.description]
+
+        def rows():
+            while True:
+                batch = cursor.fetchmany(self.batch_size)
+                if not batch:
+                    return
+                yield from batch
+        return columns, rows()
+
+    def render(self, name: str, band: float = 0.05, game: Optional[str] = None,
+               since: Optional[datetime] = None) -> Tuple[str, List]:
+        """SQL e parâmetros de um relatório pronto"""
+        report = REPORTS.get(name)
+        if report is None:
+            raise ValueError(f"Relatório desconhecido: {name} (use {', '.join(REPORTS)})")
+        band = float(band)
+        if not 0 < band <= 1:
+            raise ValueError("band deve estar em (0, 1]")
+        time_column = TIME_COLUMNS[report.table]
+
+        clauses, params = [], []
+        if game and report.table in GAME_TABLES:
+            clauses.append("game = ?")
+            params.append(game)
+        if since is not None:
+            clauses.append(f"{self.dialect['time'].format(time_column)} >= ?")
+            params.append(since if self.engine == 'duckdb' else since.isoformat(' ', 'seconds'))
+
+        floor = self.dialect['floor'].format(f"confidence / {band!r} + 1e-9")
+        sql = report.sql.format(
+            source=self.relation(report.table),
+            where=f"WHERE {' AND '.join(clauses)}" if clauses else '',
+            band=f"ROUND({floor} * {band!r}, 4)",
+            hour=self.dialect['hour'].format(time_column),
+            strategies=self.dialect['json'].format('metadata_json', 'strategies'),
+        )
+        return sql, params
+
+    def report(self, name: str, **options) -> Tuple[List[str], Iterator[tuple]]:
+        """Roda um relatório de REPORTS (band, game, since)"""
+        return self.query(*self.render(name, **options))
+
+    def export(self, table: str, output: str) -> int:
+        """
+        Exporta uma tabela lógica (banco + arquivos) para Parquet, CSV(.gz) ou JSONL
+
+        Returns:
+            Linhas exportadas
+        """
+        fmt = _file_format(output)
+        relation = self.relation(table)
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        if self.engine == 'duckdb' and fmt != 'jsonl':
+            options = "FORMAT parquet, COMPRESSION zstd" if fmt == 'parquet' else "FORMAT csv, HEADER true"
+            self.conn.execute(f"COPY (SELECT * FROM {relation}) TO {_quote(output)} ({options})")
+            return self.conn.execute(f"SELECT COUNT(*) FROM {relation}").fetchone()[0]
+        columns, rows = self.query(f"SELECT * FROM {relation}")
+        return write_rows(columns, rows, output, fmt, self.batch_size)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """CLI: list | report <nome> | export <tabela> --output <arquivo>"""
+    parser = argparse.ArgumentParser(description='Relatórios sobre sinais, resultados e trades')
+    parser.add_argument('--db', default=os.getenv('ANALYTICS_DB_PATH', DEFAULT_DB_PATH),
+                        help='Banco SQLite (padrão: data/db/analysis.db)')
+    parser.add_argument('--archive-dir', default=os.getenv('RETENTION_ARCHIVE_DIR', DEFAULT_ARCHIVE_DIR),
+                        help='Arquivos frios da retenção')
+    parser.add_argument('--trades', default=None, help='CSV/Parquet de trades do backtest')
+    parser.add_argument('--engine', choices=('auto', 'duckdb', 'sqlite'), default='auto')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='Lista os relatórios prontos')
+
+    report = commands.add_parser('report', help='Roda um relatório pronto')
+    report.add_argument('name', choices=sorted(REPORTS))
+    report.add_argument('--band', type=float, default=0.05, help='Largura da faixa de confiança')
+    report.add_argument('--game', default=None, help='Filtra pelo jogo (Double, Crash)')
+    report.add_argument('--since', type=datetime.fromisoformat, default=None,
+                        help='Só registros a partir de (YYYY-MM-DD[ HH:MM])')
+    report.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    report.add_argument('--output', default=None, help='Arquivo de saída (padrão: stdout)')
+
+    export = commands.add_parser('export', help='Exporta uma tabela (banco + arquivos)')
+    export.add_argument('table', choices=sorted(TIME_COLUMNS))
+    export.add_argument('--output', required=True, help='.parquet, .csv, .csv.gz ou .jsonl')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for report_def in REPORTS.values():
+            print(f"{report_def.name:<12} {report_def.table:<13} {report_def.description}")
+        return 0
+
+    with AnalyticsEngine(args.db, args.archive_dir, args.trades, args.engine) as engine:
+        if args.command == 'report':
+            columns, rows = engine.report(args.name, band=args.band, game=args.game, since=args.since)
+            count = write_rows(columns, rows, args.output or sys.stdout, args.format)
+        else:
+            count = engine.export(args.table, args.output)
+            print(f"{count} linhas -> {args.output}")
+    logger.info("[ANALYTICS] %s: %s linhas (%s)", args.command, count, engine.engine)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
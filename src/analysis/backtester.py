@@ -159,6 +159,19 @@ class Backtester:
         logger.info(f"[OK] {len(all_data)} registros carregados")
         return len(all_data)
     
+    @staticmethod
+    def record_time(record: Dict) -> datetime:
+        """Horário da rodada (created_at/timestamp); agora se ausente ou inválido"""
+        value = record.get('created_at') or record.get('timestamp')
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, str) and value:
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+            except ValueError:
+                pass
+        return datetime.now()
+    
     def simulate_signals(self) -> List[BacktestTrade]:
         """
         Simula detecção de sinais nos dados históricos
@@ -200,7 +213,7 @@ class Backtester:
                 
                 trade = BacktestTrade(
                     trade_id=trade_id,
-                    signal_time=datetime.now(),
+                    signal_time=self.record_time(window[-1]),
                     signal_type='Vermelho',
                     confidence=confidence,
                     entry_price=self.stake
@@ -214,7 +227,7 @@ class Backtester:
                 
                 trade = BacktestTrade(
                     trade_id=trade_id,
-                    signal_time=datetime.now(),
+                    signal_time=self.record_time(window[-1]),
                     signal_type='Preto',
                     confidence=confidence,
                     entry_price=self.stake
@@ -0,0 +1,286 @@
+"""
+Simulador Monte Carlo de Banca (Kelly + Drawdown)
+=================================================
+
+Simula muitas trajetórias de banca em paralelo, como arrays NumPy, com as
+mesmas regras usadas ao vivo pelo main.py:
+
+- Tamanho da aposta: KellyCriterion.calculate_bet_size (fração de Kelly,
+  limites 0.5%-5%, aposta mínima) com o win rate estimado das últimas 50
+  apostas, limitado a 30%-70% (_calculate_recent_win_rate; o main.py usa a
+  probabilidade calibrada de cada sinal, que o SignalModel não tem), ou a
+  tabela do OptimalSequencer (SequencerSizer).
+- Pausa: DrawdownManager (drawdown desde o pico >= limite → pausa; retomada
+  manual opcional após N ciclos, zerando o pico).
+- Ruína: banca abaixo da aposta mínima.
+
+Substitui horas de validação em tempo real (validation_50_cycles.py) por
+segundos de cálculo: 100k trajetórias x 1000 ciclos.
+
+Uso:
+    simulator = BankrollSimulator(
+        SignalModel(win_probability=0.52, signal_rate=0.3),
+        RiskConfig(initial_bankroll=1000, max_drawdown_percent=5.0),
+    )
+    result = simulator.run(n_paths=100_000, n_cycles=1000, seed=42)
+    print(result.summary())
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignalModel:
+    """
+    Modelo de sinais e resultados
+
+    Args:
+        win_probability: Probabilidade real de acerto de cada aposta
+        win_probability_std: Incerteza da vantagem: cada trajetória sorteia
+                             sua probabilidade ~ N(win_probability, std)
+        signal_rate: Probabilidade de haver sinal em um ciclo
+        payout_odds: Multiplicador pago no acerto (Blaze double = 2.0)
+        confidence: Confiança informada ao OptimalSequencer
+        cycles_per_hour: Ciclos por hora (avança a hora do dia)
+        start_hour: Hora do dia no primeiro ciclo
+    """
+    win_probability: float = 0.50
+    win_probability_std: float = 0.0
+    signal_rate: float = 1.0
+    payout_odds: float = 2.0
+    confidence: float = 0.70
+    cycles_per_hour: int = 60
+    start_hour: int = 0
+
+
+@dataclass
+class RiskConfig:
+    """Configuração de Kelly e do DrawdownManager (padrões = main.py)"""
+    initial_bankroll: float = 1000.0
+    kelly_fraction: float = 0.25
+    odds: float = 1.9                    # odds usadas no cálculo de Kelly
+    min_bet: float = 1.0
+    max_drawdown_percent: float = 5.0
+    win_rate_window: int = 50
+    win_rate_bounds: Tuple[float, float] = (0.3, 0.7)
+    resume_after: Optional[int] = None   # ciclos em pausa até retomar (None = não retoma)
+
+    @classmethod
+    def from_components(cls, kelly, drawdown, **kwargs) -> 'RiskConfig':
+        """Configuração a partir de instâncias de KellyCriterion e DrawdownManager"""
+        return cls(initial_bankroll=kelly.initial_bankroll,
+                   kelly_fraction=kelly.kelly_fraction,
+                   max_drawdown_percent=drawdown.max_drawdown_percent,
+                   **kwargs)
+
+
+class KellySizer:
+    """KellyCriterion.calculate_bet_size vetorizado"""
+
+    def __init__(self, config: RiskConfig):
+        self.config = config
+
+    def __call__(self, bankroll: np.ndarray, win_rate: np.ndarray, cycle: int) -> np.ndarray:
+        b = self.config.odds - 1
+        raw = (b * win_rate - (1 - win_rate)) / b
+        fraction = np.clip(raw * self.config.kelly_fraction, 0.005, 0.05)
+        return np.maximum(bankroll * fraction, self.config.min_bet)
+
+
+class SequencerSizer:
+    """
+    Fração da banca pela tabela DP do OptimalSequencer
+
+    Índices como em OptimalSequencer.get_optimal_bet: confiança do modelo,
+    banca em % da inicial e hora do dia do ciclo.
+    """
+
+    def __init__(self, sequencer, config: RiskConfig, model: SignalModel):
+        from learning.optimal_sequencer import _confidence_index
+
+        self.bets = sequencer.dp_table.bets                # (confiança, banca, hora)
+        self.conf_idx = _confidence_index(model.confidence)
+        self.config = config
+        self.model = model
+
+    def __call__(self, bankroll: np.ndarray, win_rate: np.ndarray, cycle: int) -> np.ndarray:
+        hour = (self.model.start_hour + cycle // self.model.cycles_per_hour) % 24
+        bankroll_pct = bankroll / self.config.initial_bankroll * 100
+        br_idx = np.clip((bankroll_pct // 10).astype(np.int64) - 1, 0, 9)
+        fraction = self.bets[self.conf_idx, br_idx, hour]
+        return np.maximum(bankroll * fraction, self.config.min_bet)
+
+
+@dataclass
+class SimulationResult:
+    """Estado final de cada trajetória (arrays com n_paths posições)"""
+    initial_bankroll: float
+    n_cycles: int
+    terminal_bankroll: np.ndarray
+    max_drawdown_pct: np.ndarray       # maior queda desde o pico, em % do pico
+    first_pause_cycle: np.ndarray      # -1 = nunca pausou
+    pause_count: np.ndarray
+    ruin_cycle: np.ndarray             # -1 = não quebrou
+    bets: np.ndarray
+    wins: np.ndarray
+    sample_paths: Optional[np.ndarray] = None   # (amostras, ciclos + 1)
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.terminal_bankroll)
+
+    @property
+    def ruined(self) -> np.ndarray:
+        return self.ruin_cycle >= 0
+
+    @property
+    def paused(self) -> np.ndarray:
+        return self.first_pause_cycle >= 0
+
+    def summary(self, quantiles=(0.05, 0.25, 0.50, 0.75, 0.95)) -> Dict:
+        """Probabilidades de ruína/pausa e quantis de drawdown, tempo até pausa e banca final"""
+        def q(values):
+            if len(values) == 0:
+                return {}
+            return {f"p{int(p * 100)}": float(v) for p, v in zip(quantiles, np.quantile(values, quantiles))}
+
+        pause_times = self.first_pause_cycle[self.paused]
+        total_bets = self.bets.sum()
+        return {
+            'paths': self.n_paths,
+            'cycles': self.n_cycles,
+            'ruin_probability': float(self.ruined.mean()),
+            'pause_probability': float(self.paused.mean()),
+            'avg_pauses': float(self.pause_count.mean()),
+            'time_to_pause': {'mean': float(pause_times.mean()) if len(pause_times) else None,
+                              **q(pause_times)},
+            'max_drawdown_pct': {'mean': float(self.max_drawdown_pct.mean()),
+                                 **q(self.max_drawdown_pct)},
+            'terminal_bankroll': {'mean': float(self.terminal_bankroll.mean()),
+                                  **q(self.terminal_bankroll)},
+            'profit_probability': float((self.terminal_bankroll > self.initial_bankroll).mean()),
+            'win_rate': float(self.wins.sum() / total_bets) if total_bets else 0.0,
+            'avg_bets': float(self.bets.mean()),
+        }
+
+
+class BankrollSimulator:
+    """
+    Simulação vetorizada: cada ciclo atualiza todas as trajetórias de uma vez
+
+    Args:
+        model: Modelo de sinais/resultados
+        config: Kelly/drawdown
+        sizer: Função (banca, win_rate_estimado, ciclo) -> aposta;
+               padrão KellySizer(config)
+    """
+
+    def __init__(self, model: Optional[SignalModel] = None,
+                 config: Optional[RiskConfig] = None, sizer=None):
+        self.model = model or SignalModel()
+        self.config = config or RiskConfig()
+        self.sizer = sizer or KellySizer(self.config)
+
+    def run(self, n_paths: int = 100_000, n_cycles: int = 1000, seed: Optional[int] = None,
+            keep_paths: int = 0) -> SimulationResult:
+        """
+        Simula n_paths trajetórias por n_cycles ciclos
+
+        Args:
+            keep_paths: Quantas trajetórias guardar inteiras (para gráficos)
+        """
+        rng = np.random.default_rng(seed)
+        model, config = self.model, self.config
+        window = config.win_rate_window
+        low, high = config.win_rate_bounds
+
+        bankroll = np.full(n_paths, config.initial_bankroll)
+        peak = bankroll.copy()
+        max_dd = np.zeros(n_paths)
+        paused = np.zeros(n_paths, dtype=bool)
+        paused_for = np.zeros(n_paths, dtype=np.int64)
+        first_pause = np.full(n_paths, -1, dtype=np.int64)
+        pause_count = np.zeros(n_paths, dtype=np.int64)
+        ruin_cycle = np.full(n_paths, -1, dtype=np.int64)
+        bets = np.zeros(n_paths, dtype=np.int64)
+        wins = np.zeros(n_paths, dtype=np.int64)
+
+        # Últimos `window` resultados de cada trajetória (buffer circular)
+        recent = np.zeros((n_paths, window), dtype=np.int8)
+        recent_wins = np.zeros(n_paths, dtype=np.int64)
+
+        if model.win_probability_std > 0:
+            p_win = np.clip(rng.normal(model.win_probability, model.win_probability_std, n_paths), 0, 1)
+        else:
+            p_win = np.full(n_paths, model.win_probability)
+
+        samples = None
+        if keep_paths:
+            samples = np.empty((min(keep_paths, n_paths), n_cycles + 1))
+            samples[:, 0] = bankroll[:len(samples)]
+
+        for cycle in range(n_cycles):
+            # Pausas com retomada manual após `resume_after` ciclos (pico zerado)
+            if config.resume_after is not None:
+                paused_for[paused] += 1
+                resume = paused & (paused_for >= config.resume_after)
+                paused[resume] = False
+                peak[resume] = bankroll[resume]
+
+            active = (ruin_cycle < 0) & ~paused
+            active &= rng.random(n_paths) < model.signal_rate
+            idx = np.flatnonzero(active)
+            if len(idx):
+                # Win rate estimado das últimas apostas (0.5 sem histórico)
+                seen = np.minimum(bets[idx], window)
+                estimate = np.where(seen > 0, recent_wins[idx] / np.maximum(seen, 1), 0.5)
+                estimate = np.clip(estimate, low, high)
+
+                stake = np.minimum(self.sizer(bankroll[idx], estimate, cycle), bankroll[idx])
+                won = rng.random(len(idx)) < p_win[idx]
+                bankroll[idx] += np.where(won, stake * (model.payout_odds - 1), -stake)
+
+                # Buffer circular: sai o resultado mais antigo, entra o atual
+                slot = bets[idx] % window
+                recent_wins[idx] += won.astype(np.int64) - recent[idx, slot]
+                recent[idx, slot] = won
+                bets[idx] += 1
+                wins[idx] += won
+
+                # DrawdownManager: pico, drawdown e pausa
+                peak[idx] = np.maximum(peak[idx], bankroll[idx])
+                dd_pct = (peak[idx] - bankroll[idx]) / peak[idx] * 100
+                max_dd[idx] = np.maximum(max_dd[idx], dd_pct)
+                pause = idx[dd_pct >= config.max_drawdown_percent]
+                paused[pause] = True
+                paused_for[pause] = 0
+                pause_count[pause] += 1
+                first_pause[pause[first_pause[pause] < 0]] = cycle
+
+                broke = idx[bankroll[idx] < config.min_bet]
+                ruin_cycle[broke] = cycle
+
+            if samples is not None:
+                samples[:, cycle + 1] = bankroll[:len(samples)]
+
+        result = SimulationResult(
+            initial_bankroll=config.initial_bankroll,
+            n_cycles=n_cycles,
+            terminal_bankroll=bankroll,
+            max_drawdown_pct=max_dd,
+            first_pause_cycle=first_pause,
+            pause_count=pause_count,
+            ruin_cycle=ruin_cycle,
+            bets=bets,
+            wins=wins,
+            sample_paths=samples,
+        )
+        logger.info("[BANKROLL-MC] %s trajetórias x %s ciclos: ruína %.2f%%, pausa %.2f%%",
+                    n_paths, n_cycles, result.ruined.mean() * 100, result.paused.mean() * 100)
+        return result
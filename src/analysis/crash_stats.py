@@ -0,0 +1,281 @@
+"""
+Estatísticas do Crash em Streaming
+==================================
+
+Estado atualizado em O(1) a cada rodada, do qual o StatisticalAnalyzer
+monta o dict de analyze_crash_patterns() sem reprocessar o histórico:
+
+- Janela das últimas `window` rodadas: somas (média/desvio), mín/máx
+  (filas monotônicas) e contadores de crashes baixos (< 2x) e altos (> 5x)
+- Sequência atual de crashes baixos
+- EWMA de média/variância: anomalia = rodada que se afasta mais de
+  `z_threshold` desvios da EWMA anterior a ela
+- Inclinação por mínimos quadrados das últimas `trend_points` rodadas
+  (somas deslizantes; mesmo resultado de linregress sobre df.tail(5))
+
+Uso:
+    stream = CrashStatsStream(window=100)
+    stream.update_frame(df_crash)      # só as rodadas ainda não vistas
+    analysis = stream.summary()
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Colunas usadas para reconhecer rodadas já processadas (ordem de preferência)
+ROUND_KEY_COLUMNS = ('game_id', 'timestamp', 'created_at')
+# Colunas de horário que definem a ordem cronológica das rodadas
+ROUND_TIME_COLUMNS = ('timestamp', 'created_at')
+
+
+def trailing_true_count(flags) -> int:
+    """Quantos valores verdadeiros seguidos há no fim de flags (sequência atual)"""
+    flags = np.asarray(flags, dtype=bool)
+    misses = np.flatnonzero(~flags)
+    return int(len(flags) - 1 - misses[-1]) if len(misses) else len(flags)
+
+
+def linear_trend(values: Sequence[float]) -> Dict:
+    """Inclinação e correlação de y contra x = 0..n-1 (forma fechada de linregress)"""
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    x = np.arange(n)
+    return _trend_from_sums(n, float(y.sum()), float(x @ y), float(y @ y))
+
+
+def _trend_from_sums(n: int, sy: float, sxy: float, syy: float) -> Dict:
+    sx = n * (n - 1) / 2
+    sxx = (n - 1) * n * (2 * n - 1) / 6
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    slope = cov / var_x if var_x > 0 else 0.0
+    r_value = cov / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else 0.0
+    return {
+        'recent_slope': float(slope),
+        'recent_correlation': float(max(-1.0, min(1.0, r_value))),
+        'trend_direction': 'alta' if slope > 0 else 'baixa' if slope < 0 else 'estável',
+    }
+
+
+class CrashStatsStream:
+    """
+    Acumuladores das rodadas do Crash
+
+    Args:
+        window: Rodadas consideradas nas estatísticas e contadores
+        low_threshold / high_threshold: Limites de crash baixo (<) e alto (>)
+        ewma_alpha: Peso da última rodada na EWMA de média/variância
+        z_threshold: Desvios da EWMA para marcar anomalia
+        anomaly_lookback: Últimas rodadas reportadas em anomalies()
+        trend_points: Rodadas da regressão de tendência
+        min_periods: Rodadas antes de relatar anomalias
+    """
+
+    def __init__(self, window: int = 100, low_threshold: float = 2.0,
+                 high_threshold: float = 5.0, ewma_alpha: float = 0.1,
+                 z_threshold: float = 2.0, anomaly_lookback: int = 10,
+                 trend_points: int = 5, min_periods: int = 10):
+        self.window = window
+        self.low_threshold = low_threshold
+        self.high_threshold = high_threshold
+        self.ewma_alpha = ewma_alpha
+        self.z_threshold = z_threshold
+        self.anomaly_lookback = anomaly_lookback
+        self.trend_points = trend_points
+        self.min_periods = min_periods
+        self.reset()
+
+    def reset(self):
+        self.count = 0                      # rodadas já vistas (total)
+        self.last_key: Optional[str] = None
+        self.values = deque(maxlen=self.window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._min = deque()                 # (índice, valor) crescente
+        self._max = deque()                 # (índice, valor) decrescente
+        self.low_count = 0
+        self.high_count = 0
+        self.low_streak = 0
+        self.ewma_mean = 0.0
+        self.ewma_var = 0.0
+        self._anomalies = deque(maxlen=self.anomaly_lookback)
+        self._trend = deque(maxlen=self.trend_points)
+        self._trend_sy = 0.0
+        self._trend_sxy = 0.0
+        self._trend_syy = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float):
+        """Processa uma rodada em O(1)"""
+        value = float(value)
+        index = self.count
+        self.count += 1
+
+        # Janela: sai a rodada mais antiga
+        if len(self.values) == self.window:
+            evicted = self.values[0]
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+            self.low_count -= evicted < self.low_threshold
+            self.high_count -= evicted > self.high_threshold
+        self.values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        if self.count % self.window == 0:
+            # Recalcula as somas para limitar o erro de ponto flutuante
+            self._sum = float(sum(self.values))
+            self._sum_sq = float(sum(v * v for v in self.values))
+
+        window_start = index - self.window + 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        for queue in (self._min, self._max):
+            queue.append((index, value))
+            if queue[0][0] < window_start:
+                queue.popleft()
+
+        is_low = value < self.low_threshold
+        self.low_count += is_low
+        self.high_count += value > self.high_threshold
+        self.low_streak = self.low_streak + 1 if is_low else 0
+
+        # Anomalia contra a EWMA anterior à rodada; depois atualiza a EWMA
+        ewma_std = math.sqrt(self.ewma_var)
+        self._anomalies.append(self.count > self.min_periods and ewma_std > 0
+                               and abs(value - self.ewma_mean) > self.z_threshold * ewma_std)
+        if self.count == 1:
+            self.ewma_mean = value
+        else:
+            diff = value - self.ewma_mean
+            increment = self.ewma_alpha * diff
+            self.ewma_mean += increment
+            self.ewma_var = (1 - self.ewma_alpha) * (self.ewma_var + diff * increment)
+
+        self._push_trend(value)
+
+    def _push_trend(self, value: float):
+        """Somas da regressão com x = 0..n-1 sobre as últimas trend_points rodadas"""
+        if len(self._trend) == self.trend_points:
+            oldest = self._trend[0]
+            # Os pontos restantes recuam uma posição em x
+            self._trend_sxy -= self._trend_sy - oldest
+            self._trend_sy -= oldest
+            self._trend_syy -= oldest * oldest
+            position = self.trend_points - 1
+        else:
+            position = len(self._trend)
+        self._trend_sxy += position * value
+        self._trend.append(value)
+        self._trend_sy += value
+        self._trend_syy += value * value
+
+        if self.count % self.trend_points == 0:
+            y = np.fromiter(self._trend, dtype=float)
+            self._trend_sy = float(y.sum())
+            self._trend_sxy = float(np.arange(len(y)) @ y)
+            self._trend_syy = float(y @ y)
+
+    def update_frame(self, df, key: Optional[str] = None) -> int:
+        """
+        Processa as rodadas de df posteriores à última já vista
+
+        df com a coluna crash_point, em qualquer ordem quando há coluna de
+        horário (timestamp ou created_at): a API devolve a mais recente
+        primeiro, então as linhas são ordenadas antes de entrar no estado.
+        Sem coluna de horário, df deve estar em ordem cronológica. A última
+        rodada vista é reconhecida pela coluna `key` (padrão: game_id,
+        timestamp ou created_at); se ela não estiver em df, todas as linhas
+        são novas. Sem coluna de identificação, o estado é refeito a partir de df.
+
+        Returns:
+            Quantas rodadas foram processadas
+        """
+        time_column = next((c for c in ROUND_TIME_COLUMNS if c in df.columns), None)
+        if time_column is not None and not df[time_column].is_monotonic_increasing:
+            df = df.sort_values(time_column, kind='stable')
+        values = df['crash_point'].to_numpy(dtype=float)
+        key = key or next((c for c in ROUND_KEY_COLUMNS if c in df.columns), None)
+
+        start = 0
+        if key is None:
+            self.reset()
+        elif len(values):
+            keys = df[key].astype(str).to_numpy()
+            if self.last_key is not None:
+                seen = np.flatnonzero(keys == self.last_key)
+                if len(seen):
+                    start = int(seen[-1]) + 1
+            self.last_key = keys[-1]
+
+        for value in values[start:]:
+            self.push(value)
+        logger.debug("[CRASH-STREAM] %s rodadas novas (%s no total)", len(values) - start, self.count)
+        return len(values) - start
+
+    def basic_stats(self) -> Dict:
+        """
+        Média, mediana, desvio, mín e máx das últimas `window` rodadas
+
+        Não é o histórico inteiro: rodadas que saíram da janela não contam
+        (o total já visto fica em `count`).
+        """
+        n = len(self.values)
+        if not n:
+            return {}
+        variance = (self._sum_sq - self._sum * self._sum / n) / (n - 1) if n > 1 else float('nan')
+        return {
+            'mean': self._sum / n,
+            'median': float(np.median(np.fromiter(self.values, dtype=float))),
+            'std': math.sqrt(max(variance, 0.0)) if n > 1 else float('nan'),
+            'min': self._min[0][1],
+            'max': self._max[0][1],
+        }
+
+    def sequences(self) -> Dict:
+        """Contadores de crashes baixos/altos na janela e a sequência atual"""
+        n = len(self.values)
+        return {
+            'low_crash_count': self.low_count,
+            'low_crash_percentage': self.low_count / n if n else 0.0,
+            'current_low_streak': self.low_streak,
+            'high_crash_count': self.high_count,
+            'high_crash_percentage': self.high_count / n if n else 0.0,
+        }
+
+    def trends(self) -> Dict:
+        if len(self._trend) < self.trend_points:
+            return {}
+        return _trend_from_sums(len(self._trend), self._trend_sy, self._trend_sxy, self._trend_syy)
+
+    def anomalies(self) -> Dict:
+        if len(self.values) < self.min_periods:
+            return {}
+        recent = list(self.values)[-len(self._anomalies):]
+        positions = [i for i, flag in enumerate(self._anomalies) if flag]
+        return {
+            'count': len(positions),
+            'positions': positions,
+            'values': [recent[i] for i in positions],
+            'ewma_mean': self.ewma_mean,
+            'ewma_std': math.sqrt(self.ewma_var),
+        }
+
+    def summary(self) -> Dict:
+        """Mesmo formato de StatisticalAnalyzer.analyze_crash_patterns()"""
+        return {
+            'basic_stats': self.basic_stats(),
+            'sequences': self.sequences(),
+            'trends': self.trends(),
+            'anomalies': self.anomalies(),
+        }
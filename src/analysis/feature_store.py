@@ -0,0 +1,361 @@
+"""
+Feature Store por Rodada
+========================
+
+Calcula cada feature UMA vez por rodada nova, com estado incremental, e
+guarda as linhas por (jogo, índice da rodada). Estratégias e módulos de
+aprendizado leem a última linha (latest) em vez de recalcular a partir
+das listas brutas de cores.
+
+- Cada Feature declara as colunas que produz e as colunas de que depende;
+  o store resolve as dependências e roda só o necessário.
+- As estratégias declaram as colunas que consomem em FEATURES
+  (StrategyPipeline.required_features()).
+- As linhas podem ser gravadas em JSONL ao lado do histórico (flush) e
+  relidas para backtests e treino (read / to_window_features).
+
+Uso:
+    store = FeatureStore('double', pipeline.required_features())
+    store.extend(double_records)           # só rodadas ainda não vistas
+    signal_data['features'] = store.latest()
+    store.flush('data/features/double.jsonl')
+"""
+
+import json
+import logging
+import math
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from core.rolls import color_to_code
+from .backtester import Backtester
+from .crash_stats import CrashStatsStream
+from .monte_carlo_strategy import RunsAccumulator, Strategy6_RunTestValidation
+from .strategy_pipeline import Strategy2_TechnicalValidation, WindowFeatures
+
+logger = logging.getLogger(__name__)
+
+# Campos que identificam uma rodada (ordem de preferência)
+ROUND_KEY_FIELDS = ('game_id', 'id', 'created_at', 'timestamp')
+
+# Features registradas por jogo (ordem de registro)
+FEATURES: Dict[str, List[Type['Feature']]] = {'double': [], 'crash': []}
+
+
+def round_key(record: Dict) -> Optional[str]:
+    for name in ROUND_KEY_FIELDS:
+        if record.get(name) not in (None, ''):
+            return str(record[name])
+    return None
+
+
+def register_feature(*games: str):
+    """Registra uma Feature para os jogos indicados"""
+    def decorator(cls):
+        for game in games:
+            FEATURES.setdefault(game, []).append(cls)
+        return cls
+    return decorator
+
+
+class Feature:
+    """
+    Feature incremental
+
+    update() recebe a rodada e a linha parcial (com as dependências já
+    calculadas) e devolve um valor para cada coluna em `columns`.
+    """
+    columns: Tuple[str, ...] = ()
+    depends_on: Tuple[str, ...] = ()
+
+    def update(self, record: Dict, row: Dict) -> Tuple:
+        raise NotImplementedError
+
+
+@register_feature('double')
+class ColorFeature(Feature):
+    columns = ('color', 'roll')
+
+    def update(self, record, row):
+        roll = record.get('roll')
+        return color_to_code(record.get('color', '')), float(roll) if isinstance(roll, (int, float)) else math.nan
+
+
+@register_feature('double')
+class ColorCountFeature(Feature):
+    """Vermelhos/pretos nas últimas 10 rodadas (Strategy1)"""
+    columns = ('red_count_10', 'black_count_10')
+    depends_on = ('color',)
+
+    def __init__(self, window: int = 10):
+        self.recent: Deque[int] = deque(maxlen=window)
+        self.red = 0
+        self.black = 0
+
+    def update(self, record, row):
+        if len(self.recent) == self.recent.maxlen:
+            oldest = self.recent[0]
+            self.red -= oldest == 1
+            self.black -= oldest == -1
+        code = row['color']
+        self.recent.append(code)
+        self.red += code == 1
+        self.black += code == -1
+        return self.red, self.black
+
+
+@register_feature('double')
+class StreakFeature(Feature):
+    """Sequência atual e maior sequência de cores iguais nas últimas 20 (Strategy4)"""
+    columns = ('streak', 'max_streak_20')
+    depends_on = ('color',)
+
+    def __init__(self, window: int = 20):
+        self.recent: Deque[int] = deque(maxlen=window)
+        self.streak = 0
+
+    def update(self, record, row):
+        code = row['color']
+        self.streak = self.streak + 1 if self.recent and self.recent[-1] == code else 1
+        self.recent.append(code)
+
+        # Janela fixa de 20: varredura O(20) por rodada
+        best = current = 1
+        for previous, following in zip(self.recent, list(self.recent)[1:]):
+            current = current + 1 if following == previous else 1
+            best = max(best, current)
+        return self.streak, best
+
+
+@register_feature('double')
+class RunsFeature(Feature):
+    """Contagens do Run Test nas últimas 10 rodadas (Strategy6)"""
+    columns = ('runs_10', 'red_10', 'black_10', 'clusters_10', 'max_cluster_10')
+    depends_on = ('color',)
+
+    def __init__(self, window: int = 10):
+        self.accumulator = RunsAccumulator(window=window)
+
+    def update(self, record, row):
+        self.accumulator.push('R' if row['color'] == 1 else 'B')
+        info = self.accumulator.cluster_info()
+        return (self.accumulator.runs, self.accumulator.n_red, self.accumulator.n_black,
+                self.accumulator.clusters, info['max_cluster_length'])
+
+
+@register_feature('double')
+class TechnicalFeature(Feature):
+    """RSI(14) e Bollinger(20) sobre os números sorteados (mesmas fórmulas da Strategy2)"""
+    columns = ('rsi_14', 'bb_mid_20', 'bb_std_20')
+    depends_on = ('roll',)
+
+    def __init__(self, rsi_period: int = 14, bb_period: int = 20):
+        self.rsi_period = rsi_period
+        self.deltas: Deque[float] = deque(maxlen=rsi_period)
+        self.values: Deque[float] = deque(maxlen=bb_period)
+        self.seen = 0
+
+    def update(self, record, row):
+        roll = row['roll']
+        if math.isnan(roll):
+            return math.nan, math.nan, math.nan
+        if self.values:
+            self.deltas.append(roll - self.values[-1])
+        self.values.append(roll)
+        self.seen += 1
+
+        rsi = 50.0
+        if self.seen >= self.rsi_period:
+            deltas = np.fromiter(self.deltas, dtype=float)
+            avg_gain = np.clip(deltas, 0, None).mean()
+            avg_loss = np.clip(-deltas, 0, None).mean()
+            if avg_loss == 0:
+                rsi = 100.0 if avg_gain > 0 else 50.0
+            else:
+                rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        if len(self.values) < self.values.maxlen:
+            return rsi, math.nan, math.nan
+        values = np.fromiter(self.values, dtype=float)
+        return rsi, float(values.mean()), float(values.std())
+
+
+@register_feature('crash')
+class CrashFeature(Feature):
+    """Crash point, sequência de crashes baixos e EWMA (CrashStatsStream)"""
+    columns = ('crash_point', 'low_streak', 'ewma_mean', 'ewma_std')
+
+    def __init__(self):
+        self.stream = CrashStatsStream()
+
+    def update(self, record, row):
+        value = float(record.get('crash_point', math.nan))
+        self.stream.push(value)
+        return value, self.stream.low_streak, self.stream.ewma_mean, math.sqrt(self.stream.ewma_var)
+
+
+@register_feature('double', 'crash')
+class TimeFeature(Feature):
+    """Hora e dia da semana da rodada (contexto do MetaLearner)"""
+    columns = ('hour', 'weekday')
+
+    def update(self, record, row):
+        moment = Backtester.record_time(record)
+        return moment.hour, moment.weekday()
+
+
+def _resolve(game: str, columns: Optional[Iterable[str]]) -> List[Feature]:
+    """Instancia as Features que produzem `columns` (e dependências) em ordem"""
+    available = FEATURES.get(game)
+    if not available:
+        raise ValueError(f"Jogo sem features registradas: {game}")
+    provider = {column: cls for cls in available for column in cls.columns}
+
+    wanted = list(provider) if columns is None else list(columns)
+    unknown = [c for c in wanted if c not in provider]
+    if unknown:
+        raise ValueError(f"Features desconhecidas para {game}: {unknown}")
+
+    ordered: List[Type[Feature]] = []
+
+    def visit(cls, path=()):
+        if cls in ordered:
+            return
+        if cls in path:
+            raise ValueError(f"Dependência circular em {cls.__name__}")
+        for dependency in cls.depends_on:
+            visit(provider[dependency], path + (cls,))
+        ordered.append(cls)
+
+    for column in wanted:
+        visit(provider[column])
+    return [cls() for cls in ordered]
+
+
+class FeatureStore:
+    """
+    Features por rodada de um jogo
+
+    Args:
+        game: 'double' ou 'crash'
+        columns: Colunas necessárias (None = todas do jogo)
+        max_rows: Linhas mantidas em memória (as antigas saem; o índice
+                  da rodada continua crescendo)
+    """
+
+    def __init__(self, game: str = 'double', columns: Optional[Iterable[str]] = None,
+                 max_rows: Optional[int] = 10_000):
+        self.game = game
+        self.features = _resolve(game, columns)
+        self.columns = tuple(c for feature in self.features for c in feature.columns)
+        self.rows: Deque[Dict] = deque(maxlen=max_rows)
+        self.next_index = 0                 # índice da próxima rodada
+        self.last_key: Optional[str] = None
+        self._flushed = 0                   # próxima rodada a gravar em flush()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, record: Dict) -> Dict:
+        """Calcula as features de uma rodada nova"""
+        row = {'game': self.game, 'roll_index': self.next_index}
+        for feature in self.features:
+            row.update(zip(feature.columns, feature.update(record, row)))
+        self.rows.append(row)
+        self.next_index += 1
+        return row
+
+    def extend(self, records: Sequence[Dict]) -> int:
+        """
+        Processa as rodadas posteriores à última já vista
+
+        records em ordem cronológica. A última rodada vista é reconhecida por
+        game_id/id/created_at/timestamp; se ela não estiver em records (ou não
+        houver identificação), todas são tratadas como novas.
+
+        Returns:
+            Quantas rodadas foram adicionadas
+        """
+        records = list(records)
+        start = 0
+        if self.last_key is not None:
+            keys = [round_key(r) for r in records]
+            seen = [i for i, key in enumerate(keys) if key == self.last_key]
+            if seen:
+                start = seen[-1] + 1
+        for record in records[start:]:
+            self.append(record)
+        if records:
+            self.last_key = round_key(records[-1])
+        logger.debug("[FEATURES] %s: %s rodadas novas (%s no total)",
+                     self.game, len(records) - start, self.next_index)
+        return len(records) - start
+
+    def latest(self) -> Dict:
+        """Features da última rodada ({} se vazio)"""
+        return dict(self.rows[-1]) if self.rows else {}
+
+    def row(self, roll_index: int) -> Dict:
+        position = roll_index - (self.next_index - len(self.rows))
+        if not 0 <= position < len(self.rows):
+            raise KeyError(f"Rodada {roll_index} fora da memória do store")
+        return dict(self.rows[position])
+
+    def column(self, name: str) -> np.ndarray:
+        return np.array([row[name] for row in self.rows])
+
+    def frame(self) -> pd.DataFrame:
+        """Linhas em memória indexadas por (game, roll_index)"""
+        return pd.DataFrame(list(self.rows)).set_index(['game', 'roll_index'])
+
+    def flush(self, path) -> int:
+        """Acrescenta em JSONL as linhas ainda não gravadas; retorna quantas"""
+        first = self.next_index - len(self.rows)
+        pending = [row for row in self.rows if row['roll_index'] >= max(self._flushed, first)]
+        if pending:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as handle:
+                for row in pending:
+                    handle.write(json.dumps(row, default=float) + '\n')
+        self._flushed = self.next_index
+        return len(pending)
+
+    @staticmethod
+    def read(path) -> pd.DataFrame:
+        """Features gravadas por flush(), indexadas por (game, roll_index)"""
+        return pd.read_json(path, lines=True).set_index(['game', 'roll_index'])
+
+    def to_window_features(self, window_size: int = 20) -> WindowFeatures:
+        """
+        WindowFeatures das janelas de `window_size` rodadas terminadas em
+        cada linha (a partir da window_size-ésima linha em memória), no
+        formato de StrategyPipeline.window_features() sem preços
+        (engrenagem 2 em fallback)
+        """
+        if window_size < 20:
+            raise ValueError("window_size deve ser >= 20 (max_streak_20 usa as últimas 20)")
+        rows = list(self.rows)[window_size - 1:]
+        n = len(rows)
+        technical_confidence, rsi = Strategy2_TechnicalValidation.technical_features(None, n)
+        # Cores da janela inteira (engrenagens 5 e 6) a partir da coluna 'color'
+        codes = np.array([row['color'] for row in self.rows], dtype=np.int8)
+        windows = (np.lib.stride_tricks.sliding_window_view(codes, window_size) if n
+                   else np.empty((0, window_size), dtype=np.int8))
+        is_red = windows == 1
+        return WindowFeatures(
+            total_records=window_size,
+            vermelho_count=np.array([row['red_count_10'] for row in rows], dtype=np.int64),
+            preto_count=np.array([row['black_count_10'] for row in rows], dtype=np.int64),
+            technical_confidence=technical_confidence,
+            rsi=rsi,
+            max_streak=np.array([row['max_streak_20'] for row in rows], dtype=np.int64),
+            red_total=is_red.sum(axis=1),
+            black_total=(windows == -1).sum(axis=1),
+            runs_10=Strategy6_RunTestValidation.runs_batch(is_red[:, -10:]),
+            has_prices=False,
+        )
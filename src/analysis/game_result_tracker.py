@@ -82,7 +82,7 @@ class GameResultTracker:
         Returns:
             Número de resultados processados
         """
-        count = 0
+        game_results = []
         
         for item in raw_data:
             try:
@@ -94,7 +94,7 @@ class GameResultTracker:
                 else:  # Crash
                     result = item.get('result', 'Preto')  # Default
                 
-                game_result = {
+                game_results.append({
                     'id': result_id,
                     'game': game,
                     'timestamp': item.get('timestamp', datetime.now()),
@@ -105,15 +105,20 @@ class GameResultTracker:
                     'signal_matched': False,
                     'raw_data': item,
                     'analyzed': False
-                }
-                
-                if self.record_game_result(game_result):
-                    count += 1
+                })
                     
             except Exception as e:
                 logger.warning(f"[AVISO] Erro processando item: {str(e)}")
                 continue
         
+        # Backfill em uma transação (COPY/execute_values no Postgres)
+        try:
+            count = self.repo.save_many(game_results)
+            self.recent_results.update((r['id'], r) for r in game_results)
+        except Exception as e:
+            logger.warning(f"[AVISO] Lote recusado ({e}); gravando um a um")
+            count = sum(self.record_game_result(r) for r in game_results)
+        
         logger.info(f"[OK] Processados {count} resultados de {game}")
         return count
     
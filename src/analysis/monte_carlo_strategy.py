@@ -8,10 +8,14 @@ Implementa Técnicas de Redução de Variância (Variance Reduction Techniques):
 4. Modo Híbrido - Seleção automática baseada nos dados
 """
 
+import math
 import numpy as np
-from typing import Dict, Tuple, List
+from collections import deque
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, Tuple, List, Optional
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 try:
     from scipy.stats import qmc
@@ -26,6 +30,18 @@ class StrategyResult(Enum):
     PASS = "pass"
 
 
+# Códigos de resultado de analyze_batch() (índice nesta tupla)
+VALIDATION_RESULTS = tuple(StrategyResult)
+
+# Nomes de cor aceitos (mesmos de strategy_pipeline.RED_NAMES/BLACK_NAMES)
+RED_RUN_NAMES = ('vermelho', 'red', 'r')
+BLACK_RUN_NAMES = ('preto', 'black', 'b')
+
+# Simulações com semente fixa já calculadas (seed, probabilidade, jogos, simulações, método, nível)
+SIMULATION_CACHE_SIZE = 4096
+_SIMULATION_CACHE: Dict[tuple, 'MonteCarloResult'] = {}
+
+
 @dataclass
 class MonteCarloResult:
     mean_expected: float
@@ -44,15 +60,21 @@ class MonteCarloResult:
 
 
 class Strategy5_MonteCarloValidation:
-    def __init__(self, n_simulations: int = 2500, confidence_level: float = 0.95, trv_method: str = "hybrid"):
+    def __init__(self, n_simulations: int = 2500, confidence_level: float = 0.95, trv_method: str = "hybrid",
+                 seed: Optional[int] = None):
         """
         OTIMIZADO: 1000-3000 simulações (ao invés de 10000)
         Com TRV, alcança mesma precisão com ~70% menos simulações
+
+        seed fixa o gerador de cada simulação: as mesmas entradas dão o mesmo
+        resultado, e as simulações ficam em cache por probabilidade
+        (SIMULATION_CACHE_SIZE). None = sorteio novo a cada chamada.
         """
         self.name = "Monte Carlo Validation (TRV Enhanced)"
         self.n_simulations = min(3000, max(1000, n_simulations))  # Limitar 1000-3000
         self.confidence_level = confidence_level
         self.trv_method = trv_method
+        self.seed = seed
         if trv_method == "qmc" and not HAS_SCIPY:
             self.trv_method = "antithetic"
     
@@ -85,17 +107,71 @@ class Strategy5_MonteCarloValidation:
             'monte_carlo': {
                 'simulations': n_sims,
                 'method': mc_result.method_used,
-                'variance_reduction': f"{mc_result.variance_reduction:.1f}%",
-                'expected_mean': f"{mc_result.mean_expected:.2f}",
-                'expected_std': f"{mc_result.std_expected:.2f}",
-                'confidence_interval_95': f"{mc_result.lower_ci_95:.1f}-{mc_result.upper_ci_95:.1f}",
-                'z_score': f"{mc_result.z_score:.2f}",
+                'variance_reduction': mc_result.variance_reduction,
+                'expected_mean': mc_result.mean_expected,
+                'expected_std': mc_result.std_expected,
+                'confidence_interval_95': (mc_result.lower_ci_95, mc_result.upper_ci_95),
+                'z_score': mc_result.z_score,
                 'is_significant': mc_result.is_significant_95,
                 'interpretation': mc_result.interpretation
             }
         })
         
         return result, confidence, details
+
+    def analyze_batch(self, probability: np.ndarray, observed: np.ndarray, total_records: int,
+                      total_games: int = 10, **_) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        analyze() em lote: probabilidade histórica da cor esperada e
+        desequilíbrio observado por janela
+
+        Cada par (probabilidade, observado) distinto é avaliado uma vez.
+
+        Returns:
+            (índices em VALIDATION_RESULTS, confianças, {})
+        """
+        n = len(probability)
+        if total_records < 10:
+            return np.full(n, VALIDATION_RESULTS.index(StrategyResult.WEAK), dtype=np.int8), np.full(n, 0.68), {}
+
+        method = self._select_trv_method(total_records, total_games)
+        n_sims = self._get_optimal_simulations(total_records, method)
+        pairs, inverse = np.unique(np.column_stack([probability, observed]), axis=0, return_inverse=True)
+        codes = np.empty(len(pairs), dtype=np.int8)
+        confidences = np.empty(len(pairs))
+        for i, (p, obs) in enumerate(pairs):
+            mc_result = self._run_simulation(float(p), total_games, n_sims, method)
+            result, confidences[i], _ = self._evaluate_significance_adaptive(
+                int(obs), mc_result, float(p), '', total_records)
+            codes[i] = VALIDATION_RESULTS.index(result)
+        inverse = inverse.reshape(-1)
+        return codes[inverse], confidences[inverse], {}
+
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        """Detalhes legíveis (percentuais e casas decimais) a partir dos brutos de analyze()"""
+        described = dict(details)
+        if 'probability_historical' in described:
+            described['probability_historical'] = f"{described['probability_historical']:.1%}"
+        if 'variance_reduction' in described:
+            described['variance_reduction'] = f"{described['variance_reduction']:.1f}%"
+        for key in ('expected_mean', 'expected_std'):
+            if key in described:
+                described[key] = round(described[key], 2)
+        if 'z_score' in described:
+            described['z_score'] = round(described['z_score'], 3)
+        if 'monte_carlo' in described:
+            mc = dict(described['monte_carlo'])
+            lower, upper = mc['confidence_interval_95']
+            mc.update({
+                'variance_reduction': f"{mc['variance_reduction']:.1f}%",
+                'expected_mean': f"{mc['expected_mean']:.2f}",
+                'expected_std': f"{mc['expected_std']:.2f}",
+                'confidence_interval_95': f"{lower:.1f}-{upper:.1f}",
+                'z_score': f"{mc['z_score']:.2f}",
+            })
+            described['monte_carlo'] = mc
+        return described
     
     def _select_trv_method(self, data_count: int, n_games: int) -> str:
         if self.trv_method != "hybrid":
@@ -134,47 +210,51 @@ class Strategy5_MonteCarloValidation:
     def _run_simulation(self, probability: float, n_games: int, n_sims: int, method: str) -> MonteCarloResult:
         if probability is None or np.isnan(probability):
             probability = 0.5
-        probability = max(0.0, min(1.0, probability))
-        
+        probability = max(0.0, min(1.0, float(probability)))
+
+        if self.seed is None:
+            return self._simulate(probability, n_games, n_sims, method, np.random.default_rng())
+
+        # Gerador com semente fixa: o resultado só depende destes parâmetros
+        key = (self.seed, probability, n_games, n_sims, method, self.confidence_level)
+        cached = _SIMULATION_CACHE.get(key)
+        if cached is None:
+            cached = self._simulate(probability, n_games, n_sims, method, np.random.default_rng(self.seed))
+            if len(_SIMULATION_CACHE) >= SIMULATION_CACHE_SIZE:
+                _SIMULATION_CACHE.clear()
+            _SIMULATION_CACHE[key] = cached
+        # Cópia: _evaluate_significance_adaptive preenche z_score e interpretação
+        return replace(cached)
+
+    def _simulate(self, probability: float, n_games: int, n_sims: int, method: str,
+                  rng: np.random.Generator) -> MonteCarloResult:
         if method == "antithetic":
-            return self._run_antithetic_variables(probability, n_games, n_sims)
+            return self._run_antithetic_variables(probability, n_games, n_sims, rng)
         elif method == "control":
-            return self._run_control_variates(probability, n_games, n_sims)
+            return self._run_control_variates(probability, n_games, n_sims, rng)
         elif method == "qmc" and HAS_SCIPY:
-            return self._run_quasi_monte_carlo(probability, n_games, n_sims)
+            return self._run_quasi_monte_carlo(probability, n_games, n_sims, rng)
         else:
-            return self._run_standard_monte_carlo(probability, n_games, n_sims)
+            return self._run_standard_monte_carlo(probability, n_games, n_sims, rng)
     
-    def _run_standard_monte_carlo(self, probability: float, n_games: int, n_sims: int) -> MonteCarloResult:
-        simulation_results = []
-        for _ in range(n_sims):
-            count = np.random.binomial(n_games, probability)
-            simulation_results.append(count)
-        simulation_results = np.array(simulation_results)
+    def _run_standard_monte_carlo(self, probability: float, n_games: int, n_sims: int,
+                                  rng: np.random.Generator) -> MonteCarloResult:
+        simulation_results = rng.binomial(n_games, probability, size=n_sims)
         return self._build_result(simulation_results, method="Standard Monte Carlo", variance_reduction=0.0)
     
-    def _run_antithetic_variables(self, probability: float, n_games: int, n_sims: int) -> MonteCarloResult:
-        simulation_results = []
-        for _ in range(n_sims // 2):
-            u1 = np.random.rand(n_games)
-            count1 = np.sum(u1 < probability)
-            u2 = 1 - u1
-            count2 = np.sum(u2 < probability)
-            pair_mean = (count1 + count2) / 2.0
-            simulation_results.append(pair_mean)
-        simulation_results = np.array(simulation_results)
+    def _run_antithetic_variables(self, probability: float, n_games: int, n_sims: int,
+                                  rng: np.random.Generator) -> MonteCarloResult:
+        u1 = rng.random((n_sims // 2, n_games))
+        count1 = np.sum(u1 < probability, axis=1)
+        count2 = np.sum((1 - u1) < probability, axis=1)
+        simulation_results = (count1 + count2) / 2.0
         return self._build_result(simulation_results, method="Antithetic Variables", variance_reduction=45.0)
     
-    def _run_control_variates(self, probability: float, n_games: int, n_sims: int) -> MonteCarloResult:
-        simulation_results = []
-        control_values = []
+    def _run_control_variates(self, probability: float, n_games: int, n_sims: int,
+                              rng: np.random.Generator) -> MonteCarloResult:
         expected_mean = n_games * probability
-        for _ in range(n_sims):
-            count = np.random.binomial(n_games, probability)
-            simulation_results.append(count)
-            control_values.append(count - expected_mean)
-        simulation_results = np.array(simulation_results)
-        control_values = np.array(control_values)
+        simulation_results = rng.binomial(n_games, probability, size=n_sims)
+        control_values = simulation_results - expected_mean
         cov_matrix = np.cov(simulation_results, control_values)
         cov = cov_matrix[0, 1]
         var_c = np.var(control_values)
@@ -183,17 +263,15 @@ class Strategy5_MonteCarloValidation:
         adjusted_results = simulation_results - b_star * (mean_control - 0)
         return self._build_result(adjusted_results, method="Control Variates", variance_reduction=55.0)
     
-    def _run_quasi_monte_carlo(self, probability: float, n_games: int, n_sims: int) -> MonteCarloResult:
+    def _run_quasi_monte_carlo(self, probability: float, n_games: int, n_sims: int,
+                               rng: np.random.Generator) -> MonteCarloResult:
         if not HAS_SCIPY:
-            return self._run_antithetic_variables(probability, n_games, n_sims)
-        sampler = qmc.Sobol(d=1, scramble=True)
-        sobol_samples = sampler.random(n=n_sims)
-        simulation_results = []
-        for sobol_u in sobol_samples:
-            u_games = sampler.random(n=n_games).flatten()
-            count = np.sum(u_games < probability)
-            simulation_results.append(count)
-        simulation_results = np.array(simulation_results)
+            return self._run_antithetic_variables(probability, n_games, n_sims, rng)
+        sampler = qmc.Sobol(d=1, scramble=True, seed=rng)
+        # Uma sequência para todas as simulações (potência de 2, sem aviso de balanço)
+        total = n_sims * n_games
+        u_games = sampler.random_base2(m=max(0, (total - 1).bit_length()))[:total].reshape(n_sims, n_games)
+        simulation_results = np.sum(u_games < probability, axis=1)
         return self._build_result(simulation_results, method="Quasi-Monte Carlo (Sobol)", variance_reduction=70.0)
     
     def _build_result(self, simulation_results: np.ndarray, method: str, variance_reduction: float) -> MonteCarloResult:
@@ -212,10 +290,10 @@ class Strategy5_MonteCarloValidation:
     
     def _calculate_probability(self, colors: List[str], target_color: str) -> float:
         target_color_lower = target_color.lower()
-        if target_color_lower in ['vermelho', 'red']:
-            count = sum(1 for c in colors if c.lower() in ['vermelho', 'red'])
-        elif target_color_lower in ['preto', 'black']:
-            count = sum(1 for c in colors if c.lower() in ['preto', 'black'])
+        if target_color_lower in RED_RUN_NAMES:
+            count = sum(1 for c in colors if str(c).lower() in RED_RUN_NAMES)
+        elif target_color_lower in BLACK_RUN_NAMES:
+            count = sum(1 for c in colors if str(c).lower() in BLACK_RUN_NAMES)
         else:
             count = 0
         return count / len(colors) if colors else 0.5
@@ -269,17 +347,208 @@ class Strategy5_MonteCarloValidation:
         
         mc_result.interpretation = interpretation
         details = {
-            'observed': observed, 'expected_mean': round(mc_result.mean_expected, 2),
-            'expected_std': round(mc_result.std_expected, 2), 'z_score': round(z_score, 3),
+            'observed': observed, 'expected_mean': mc_result.mean_expected,
+            'expected_std': mc_result.std_expected, 'z_score': z_score,
             'z_threshold_95': threshold_95, 'is_significant': is_significant_95,
-            'interpretation': interpretation, 'probability_historical': f"{probability:.1%}",
+            'interpretation': interpretation, 'probability_historical': probability,
             'adaptive_mode': 'fallback_pesado' if data_count < 20 else 'fallback_moderado' if data_count < 50 else 'normal',
-            'trv_method': mc_result.method_used, 'variance_reduction': f"{mc_result.variance_reduction:.1f}%"
+            'trv_method': mc_result.method_used, 'variance_reduction': mc_result.variance_reduction
         }
         return result, confidence, details
 
 
+# Run Test exato: tabela de valores críticos para n1, n2 <= EXACT_RUNS_MAX_N
+EXACT_RUNS_MAX_N = 20
+
+
+def normalize_run_color(color) -> str:
+    """'R' para vermelho, 'B' para qualquer outra cor"""
+    return 'R' if str(color).lower() in RED_RUN_NAMES else 'B'
+
+
+def _runs_counts(n1: int, n2: int) -> List[int]:
+    """
+    Nº de arranjos com exatamente r runs (r = 0..n1+n2), Wald–Wolfowitz
+
+    R = 2k:   2·C(n1-1, k-1)·C(n2-1, k-1)
+    R = 2k+1: C(n1-1, k)·C(n2-1, k-1) + C(n1-1, k-1)·C(n2-1, k)
+    """
+    n = n1 + n2
+    counts = [0] * (n + 1)
+    if n1 == 0 or n2 == 0:
+        if n:
+            counts[1] = 1
+        return counts
+    for r in range(2, n + 1):
+        k = r // 2
+        if r % 2 == 0:
+            counts[r] = 2 * math.comb(n1 - 1, k - 1) * math.comb(n2 - 1, k - 1)
+        else:
+            counts[r] = (math.comb(n1 - 1, k) * math.comb(n2 - 1, k - 1)
+                         + math.comb(n1 - 1, k - 1) * math.comb(n2 - 1, k))
+    return counts
+
+
+@lru_cache(maxsize=None)
+def runs_distribution(n1: int, n2: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distribuição exata do nº de runs: (P(R <= r), P(R >= r)) para r = 0..n1+n2"""
+    counts = _runs_counts(n1, n2)
+    total = math.comb(n1 + n2, n1)
+    below = np.cumsum(counts) / total
+    above = np.cumsum(counts[::-1])[::-1] / total
+    return below, above
+
+
+@lru_cache(maxsize=None)
+def runs_critical_table(alpha: float = 0.05) -> np.ndarray:
+    """
+    Valores críticos exatos (bilaterais) para n1, n2 = 0..EXACT_RUNS_MAX_N
+
+    table[n1, n2] = (inferior, superior): runs <= inferior indica clusters,
+    runs >= superior indica alternância; cada cauda com P <= alpha/2.
+    Sem região crítica: inferior = 0, superior = n1 + n2 + 1.
+    """
+    size = EXACT_RUNS_MAX_N + 1
+    table = np.zeros((size, size, 2), dtype=np.int64)
+    for n1 in range(size):
+        for n2 in range(size):
+            below, above = runs_distribution(n1, n2)
+            low = np.flatnonzero(below <= alpha / 2)
+            high = np.flatnonzero(above <= alpha / 2)
+            table[n1, n2] = (low[-1] if len(low) else 0,
+                             high[0] if len(high) else n1 + n2 + 1)
+    return table
+
+
+@dataclass
+class RunsTestResult:
+    """Resultado numérico do Run Test (formatação fica para quem exibe)"""
+    runs: int
+    n1: int
+    n2: int
+    expected_runs: float
+    std_runs: float
+    z_score: float
+    p_value: float
+    method: str                     # 'exact' (tabela) ou 'normal' (aproximação)
+    lower_critical: float
+    upper_critical: float
+    has_clusters: bool
+    too_alternating: bool
+
+    @property
+    def is_random(self) -> bool:
+        return not (self.has_clusters or self.too_alternating)
+
+
+def runs_test(runs: int, n1: int, n2: int, alpha: float = 0.05) -> RunsTestResult:
+    """
+    Run Test de Wald–Wolfowitz a partir das contagens
+
+    n1, n2 <= EXACT_RUNS_MAX_N: região crítica e p-valor exatos (a aproximação
+    normal erra nessas amostras curtas); acima disso, aproximação normal.
+    """
+    n = n1 + n2
+    expected = 2 * n1 * n2 / n + 1 if n > 0 else 0.0
+    variance = (2 * n1 * n2 * (2 * n1 * n2 - n1 - n2)) / (n ** 2 * (n - 1)) if n > 1 else 0.0
+    std = math.sqrt(variance)
+    z_score = (runs - expected) / std if std > 0 else 0.0
+
+    if max(n1, n2) <= EXACT_RUNS_MAX_N:
+        below, above = runs_distribution(n1, n2)
+        lower, upper = runs_critical_table(alpha)[n1, n2]
+        p_value = min(1.0, 2 * min(below[runs], above[runs])) if n else 1.0
+        return RunsTestResult(runs, n1, n2, expected, std, z_score, float(p_value), 'exact',
+                              int(lower), int(upper), runs <= lower, runs >= upper)
+
+    z_critical = NormalDist().inv_cdf(1 - alpha / 2)
+    p_value = 2 * (1 - NormalDist().cdf(abs(z_score)))
+    return RunsTestResult(runs, n1, n2, expected, std, z_score, p_value, 'normal',
+                          expected - z_critical * std, expected + z_critical * std,
+                          z_score < -z_critical, z_score > z_critical)
+
+
+class RunsAccumulator:
+    """
+    Contagens do Run Test mantidas incrementalmente
+
+    Cada push atualiza n1 (vermelhos), n2 (pretos), os runs e o nº de
+    clusters (runs >= cluster_length) em O(1). Com window, a cor mais
+    antiga sai a cada push (janela deslizante).
+    """
+
+    def __init__(self, window: Optional[int] = None, cluster_length: int = 3):
+        self.window = window
+        self.cluster_length = cluster_length
+        self.n_red = 0
+        self.n_black = 0
+        self.clusters = 0
+        self._runs = deque()            # [cor, tamanho], do mais antigo ao atual
+
+    @classmethod
+    def from_sequence(cls, sequence, **kwargs) -> 'RunsAccumulator':
+        accumulator = cls(**kwargs)
+        accumulator.extend(sequence)
+        return accumulator
+
+    def __len__(self) -> int:
+        return self.n_red + self.n_black
+
+    @property
+    def runs(self) -> int:
+        return len(self._runs)
+
+    def extend(self, colors):
+        for color in colors:
+            self.push(color)
+
+    def push(self, color):
+        code = normalize_run_color(color)
+        if self.window is not None and len(self) >= self.window:
+            self._pop_oldest()
+
+        if self._runs and self._runs[-1][0] == code:
+            self._runs[-1][1] += 1
+        else:
+            self._runs.append([code, 1])
+        if self._runs[-1][1] == self.cluster_length:
+            self.clusters += 1
+
+        if code == 'R':
+            self.n_red += 1
+        else:
+            self.n_black += 1
+
+    def _pop_oldest(self):
+        oldest = self._runs[0]
+        if oldest[1] == self.cluster_length:
+            self.clusters -= 1
+        oldest[1] -= 1
+        if oldest[1] == 0:
+            self._runs.popleft()
+
+        if oldest[0] == 'R':
+            self.n_red -= 1
+        else:
+            self.n_black -= 1
+
+    def test(self, alpha: float = 0.05) -> RunsTestResult:
+        return runs_test(self.runs, self.n_red, self.n_black, alpha)
+
+    def cluster_info(self) -> Dict:
+        # O contador já diz quantos clusters há; sem clusters não precisa varrer os runs
+        clusters = [] if not self.clusters else [
+            {'color': color, 'length': length}
+            for color, length in self._runs if length >= self.cluster_length]
+        return {'clusters_detected': self.clusters, 'clusters': clusters,
+                'max_cluster_length': max((c['length'] for c in clusters), default=0),
+                'interpretation': f"Detectados {self.clusters} clusters"}
+
+
 class Strategy6_RunTestValidation:
+    # Contagens das últimas 10 cores no FeatureStore (= color_sequence do main)
+    FEATURES = ('runs_10', 'red_10', 'black_10', 'clusters_10', 'max_cluster_10')
+
     def __init__(self, significance_level: float = 0.05):
         self.name = "Run Test Validation"
         self.significance_level = significance_level
@@ -287,86 +556,128 @@ class Strategy6_RunTestValidation:
     def analyze(self, data: Dict) -> Tuple[StrategyResult, float, Dict]:
         colors = data.get('historical_colors', [])
         recent_sequence = data.get('color_sequence', [])
+        features = data.get('features') or {}
+        # As contagens valem para as últimas 10 cores: sequência de 10 ou só features
+        if all(name in features for name in self.FEATURES) and \
+                (len(recent_sequence) == 10 or not (recent_sequence or colors)):
+            return self._analyze_features(features)
         if not recent_sequence:
             recent_sequence = colors[-20:] if len(colors) >= 20 else colors
-        if len(recent_sequence) < 3:
-            return StrategyResult.WEAK, 0.65, {'reason': 'Sequência muito curta', 'required': 3, 'received': len(recent_sequence)}
-        runs_result = self._analyze_runs(recent_sequence)
-        result, confidence, details = self._evaluate_randomness_adaptive(runs_result, len(recent_sequence))
+        # Acumulador local (a instância é compartilhada entre threads): janela
+        # de 10-20 cores, contada em uma passada. Quem recebe uma cor por rodada
+        # mantém o próprio acumulador e usa analyze_stream (ex.: FeatureStore)
+        return self.analyze_stream(RunsAccumulator.from_sequence(recent_sequence))
+
+    def _analyze_features(self, features: Dict) -> Tuple[StrategyResult, float, Dict]:
+        """Run Test a partir das contagens já calculadas pelo FeatureStore"""
+        length = features['red_10'] + features['black_10']
+        if length < 3:
+            return StrategyResult.WEAK, 0.65, {'reason': 'Sequência muito curta', 'required': 3, 'received': length}
+        cluster_info = {'clusters_detected': features['clusters_10'],
+                        'max_cluster_length': features['max_cluster_10'],
+                        'interpretation': f"Detectados {features['clusters_10']} clusters"}
+        runs_result = self._runs_details(runs_test(features['runs_10'], features['red_10'], features['black_10'],
+                                                   self.significance_level), length, cluster_info)
+        result, confidence, details = self._evaluate_randomness_adaptive(runs_result, length)
+        details.update(runs_result)
+        return result, confidence, details
+
+    def analyze_batch(self, runs: np.ndarray, n_red: np.ndarray, length: int,
+                      **_) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        analyze() em lote: runs e vermelhos nas últimas `length` cores de
+        cada janela (as demais cores contam como 'B')
+
+        Returns:
+            (índices em VALIDATION_RESULTS, confianças, {})
+        """
+        n = len(runs)
+        if length < 3:
+            return np.full(n, VALIDATION_RESULTS.index(StrategyResult.WEAK), dtype=np.int8), np.full(n, 0.65), {}
+
+        pairs, inverse = np.unique(np.column_stack([runs, n_red]), axis=0, return_inverse=True)
+        codes = np.empty(len(pairs), dtype=np.int8)
+        confidences = np.empty(len(pairs))
+        for i, (pair_runs, red) in enumerate(pairs.tolist()):
+            test = runs_test(pair_runs, red, length - red, self.significance_level)
+            result, confidences[i], _ = self._evaluate_randomness_adaptive(
+                self._runs_details(test, length, {}), length)
+            codes[i] = VALIDATION_RESULTS.index(result)
+        inverse = inverse.reshape(-1)
+        return codes[inverse], confidences[inverse], {}
+
+    @staticmethod
+    def runs_batch(is_red: np.ndarray) -> np.ndarray:
+        """Nº de runs (vermelho x demais) em cada linha de uma matriz booleana"""
+        if not is_red.shape[1]:
+            return np.zeros(len(is_red), dtype=np.int64)
+        return 1 + (is_red[:, 1:] != is_red[:, :-1]).sum(axis=1)
+
+    def analyze_stream(self, accumulator: RunsAccumulator) -> Tuple[StrategyResult, float, Dict]:
+        """Avalia um RunsAccumulator mantido pelo chamador (uma cor por rodada)"""
+        if len(accumulator) < 3:
+            return StrategyResult.WEAK, 0.65, {'reason': 'Sequência muito curta', 'required': 3, 'received': len(accumulator)}
+        runs_result = self._analyze_runs(accumulator)
+        result, confidence, details = self._evaluate_randomness_adaptive(runs_result, len(accumulator))
         details.update(runs_result)
         return result, confidence, details
     
-    def _analyze_runs(self, sequence: List[str]) -> Dict:
-        if not sequence:
+    def _analyze_runs(self, sequence) -> Dict:
+        accumulator = sequence if isinstance(sequence, RunsAccumulator) else RunsAccumulator.from_sequence(sequence)
+        if not len(accumulator):
             return {'runs': 0, 'n1': 0, 'n2': 0}
-        normalized = [self._normalize_color(c) for c in sequence]
-        runs = 1
-        for i in range(1, len(normalized)):
-            if normalized[i] != normalized[i-1]:
-                runs += 1
-        n1 = sum(1 for c in normalized if c == 'R')
-        n2 = len(normalized) - n1
-        n = len(normalized)
-        expected_runs = (2 * n1 * n2) / (n1 + n2) + 1 if (n1 + n2) > 0 else 0
-        variance = (2 * n1 * n2 * (2 * n1 * n2 - n1 - n2)) / ((n1 + n2) ** 2 * (n1 + n2 - 1)) if (n1 + n2) > 1 else 0
-        std_runs = np.sqrt(variance)
-        z_score = (runs - expected_runs) / std_runs if std_runs > 0 else 0
-        cluster_info = self._detect_clusters(normalized)
-        return {'actual_runs': runs, 'expected_runs': f"{expected_runs:.2f}", 'std_runs': f"{std_runs:.2f}",
-                'z_score': f"{z_score:.2f}", 'n_red': n1, 'n_black': n2, 'sequence_length': n,
-                'run_analysis': {'is_random': abs(z_score) < 1.96,
-                                'has_clusters': runs < expected_runs - 1.96 * std_runs if std_runs > 0 else False,
-                                'too_alternating': runs > expected_runs + 1.96 * std_runs if std_runs > 0 else False,
+        return self._runs_details(accumulator.test(self.significance_level), len(accumulator),
+                                  accumulator.cluster_info())
+
+    def _runs_details(self, test: RunsTestResult, length: int, cluster_info: Dict) -> Dict:
+        return {'actual_runs': test.runs, 'expected_runs': test.expected_runs, 'std_runs': test.std_runs,
+                'z_score': test.z_score, 'p_value': test.p_value, 'method': test.method,
+                'critical_runs': (test.lower_critical, test.upper_critical),
+                'n_red': test.n1, 'n_black': test.n2, 'sequence_length': length,
+                'run_analysis': {'is_random': test.is_random,
+                                'has_clusters': test.has_clusters,
+                                'too_alternating': test.too_alternating,
                                 'cluster_info': cluster_info}}
     
     def _normalize_color(self, color: str) -> str:
-        color_lower = color.lower()
-        return 'R' if color_lower in ['vermelho', 'red', 'r'] else 'B'
-    
-    def _detect_clusters(self, sequence: List[str]) -> Dict:
-        clusters = []
-        if not sequence:
-            return {'clusters_detected': 0, 'clusters': [], 'max_cluster_length': 0}
-        current_color = sequence[0]
-        current_length = 1
-        for i in range(1, len(sequence)):
-            if sequence[i] == current_color:
-                current_length += 1
-            else:
-                if current_length >= 3:
-                    clusters.append({'color': current_color, 'length': current_length})
-                current_color = sequence[i]
-                current_length = 1
-        if current_length >= 3:
-            clusters.append({'color': current_color, 'length': current_length})
-        return {'clusters_detected': len(clusters), 'clusters': clusters,
-                'max_cluster_length': max([c['length'] for c in clusters]) if clusters else 0,
-                'interpretation': f"Detectados {len(clusters)} clusters"}
+        return normalize_run_color(color)
     
     def _evaluate_randomness_adaptive(self, runs_result: Dict, sequence_length: int) -> Tuple[StrategyResult, float, Dict]:
-        z_score = float(runs_result['z_score'])
+        z_score = runs_result['z_score']
         is_random = runs_result['run_analysis']['is_random']
         has_clusters = runs_result['run_analysis']['has_clusters']
         
+        # Rótulos fixos; o Z entra no texto só em describe()
         if sequence_length < 10:
             if has_clusters or abs(z_score) > 0.3:
-                interpretation, result, confidence = f"Padrão leve (Z={z_score:.2f})", StrategyResult.WEAK, 0.68
+                interpretation, result, confidence = "Padrão leve", StrategyResult.WEAK, 0.68
             else:
-                interpretation, result, confidence = f"Aleatório (Z={z_score:.2f})", StrategyResult.WEAK, 0.55
+                interpretation, result, confidence = "Aleatório", StrategyResult.WEAK, 0.55
         else:
             if has_clusters:
-                interpretation, result, confidence = f"Clusters detectados (Z={z_score:.2f})", StrategyResult.PASS, 0.85
+                interpretation, result, confidence = "Clusters detectados", StrategyResult.PASS, 0.85
             elif is_random:
-                interpretation, result, confidence = f"Aleatório (Z={z_score:.2f})", StrategyResult.WEAK, 0.60
+                interpretation, result, confidence = "Aleatório", StrategyResult.WEAK, 0.60
             else:
-                interpretation, result, confidence = f"Alternação regular (Z={z_score:.2f})", StrategyResult.WEAK, 0.65
+                interpretation, result, confidence = "Alternação regular", StrategyResult.WEAK, 0.65
         
         details = {'randomness_test': {'is_random': is_random, 'has_clusters': has_clusters,
                                       'interpretation': interpretation, 'z_score': z_score,
+                                      'p_value': runs_result['p_value'], 'method': runs_result['method'],
                                       'adaptive_mode': 'fallback_curto' if sequence_length < 10 else 'normal',
                                       'sequence_length': sequence_length}}
         return result, confidence, details
 
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        """Detalhes legíveis: interpretação com o Z-score"""
+        described = dict(details)
+        if 'randomness_test' in described:
+            test = dict(described['randomness_test'])
+            test['interpretation'] = f"{test['interpretation']} (Z={test['z_score']:.2f})"
+            described['randomness_test'] = test
+        return described
+
 
 if __name__ == "__main__":
     print("\n" + "="*80)
@@ -387,7 +698,7 @@ if __name__ == "__main__":
         print(f"\n{'─'*80}\nMétodo: {method.upper()}\n{'─'*80}")
         mc = Strategy5_MonteCarloValidation(n_simulations=10000, trv_method=method)
         result, confidence, details = mc.analyze(test_data)
-        mc_details = details['monte_carlo']
+        mc_details = mc.describe(details)['monte_carlo']
         print(f"✅ Resultado: {result.value.upper()}")
         print(f"📊 Confiança: {confidence:.1%}")
         print(f"🔬 Método: {mc_details['method']}")
@@ -36,7 +36,8 @@ class OptimizedBacktester(Backtester):
         self.use_pipeline = use_pipeline
         
         if use_pipeline:
-            self.pipeline = StrategyPipeline(logger)
+            # Relatório usa só códigos e confianças: sem detalhes por sinal
+            self.pipeline = StrategyPipeline(logger, keep_details=False)
         else:
             self.pipeline = None
         
@@ -99,7 +100,7 @@ class OptimizedBacktester(Backtester):
                     'signal_id': f"signal_{i}_{signal_type}",
                     'signal_type': signal_type,
                     'initial_confidence': initial_confidence,
-                    'timestamp': datetime.now(),
+                    'timestamp': self.record_time(window[-1]),
                     'recent_colors': colors,
                     'all_colors': colors,
                     'prices': prices,
@@ -223,12 +224,12 @@ class OptimizedBacktester(Backtester):
         # Contar sinais por estratégia
         strategy_stats = {}
         for signal in self.processed_signals:
+            passed = signal.passed_strategies
             for strategy_name in signal.strategy_results.keys():
                 if strategy_name not in strategy_stats:
                     strategy_stats[strategy_name] = {'passed': 0, 'total': 0}
                 strategy_stats[strategy_name]['total'] += 1
-                result, _ = signal.strategy_results[strategy_name]
-                if result.value == 'PASS':
+                if strategy_name in passed:
                     strategy_stats[strategy_name]['passed'] += 1
         
         report = f"""
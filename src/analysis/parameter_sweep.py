@@ -0,0 +1,267 @@
+"""
+Varredura de Parâmetros do Pipeline de Estratégias
+==================================================
+
+Avalia offline muitas configurações de limiares (PipelineConfig) sobre o
+histórico de rodadas e devolve um ranking com ROI, win rate e drawdown.
+
+- As janelas do histórico são montadas e suas grandezas independentes dos
+  limiares (WindowFeatures) são calculadas UMA vez e compartilhadas por
+  todas as configurações.
+- Cada configuração é avaliada com StrategyPipeline.process_windows()
+  (vetorizado), em paralelo entre processos.
+
+Aposta simulada: cada janela válida aposta `stake` na cor sugerida pelo
+pipeline; acerto paga `payout` x stake (double: 2x).
+
+Uso:
+    sweep = ParameterSweep.from_data_path('data/raw/', window_size=20)
+    ranking = sweep.run_grid({
+        'pattern_majority': [6, 7, 8],
+        'technical_pass': [0.65, 0.70, 0.75],
+    }, workers=4)
+    ranking = sweep.run_random({
+        'technical_pass': (0.60, 0.85),
+        'records_moderate': (10, 40),
+    }, n_iter=200)
+    print(ranking.head())
+"""
+
+import itertools
+import logging
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.rolls import BLAZE_COLOR_CODES, LOWER_COLOR_NAMES, WHITE
+from .strategy_pipeline import (
+    DEFAULT_CONFIG, PipelineConfig, StrategyPipeline, WindowFeatures, encode_window_colors
+)
+
+logger = logging.getLogger(__name__)
+
+# signal_type do lote (1 = Vermelho, 2 = Preto) → código de cor apostado
+BET_COLOR_BY_SIGNAL = np.array([0, 1, -1], dtype=np.int8)
+
+CONFIG_FIELDS = tuple(f.name for f in fields(PipelineConfig))
+
+# Estado de cada processo do pool (enviado uma vez pelo initializer)
+_WORKER_STATE: Optional['ParameterSweep'] = None
+
+
+def _record_color(record: Dict) -> str:
+    color = record.get('color', '')
+    if isinstance(color, (int, np.integer)):
+        return LOWER_COLOR_NAMES[BLAZE_COLOR_CODES.get(int(color), WHITE) + 1]
+    return str(color).lower()
+
+
+def build_windows(records: Sequence[Dict], window_size: int = 20
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Monta as janelas deslizantes do histórico
+
+    Janela i = records[i:i + window_size]; o resultado a prever é a cor de
+    records[i + window_size]. Registros sem cor são ignorados.
+
+    Returns:
+        (cores janelas x window_size, rolls janelas x window_size,
+         cor seguinte codificada: 1 vermelho, -1 preto, 0 branco)
+    """
+    records = [r for r in records if r.get('color') not in (None, '')]
+    if len(records) <= window_size:
+        raise ValueError(f"São necessários mais de {window_size} registros com cor")
+
+    colors = np.array([_record_color(r) for r in records])
+    rolls = np.array([float(r['roll']) if isinstance(r.get('roll'), (int, float)) else 0.0
+                      for r in records])
+
+    sliding = np.lib.stride_tricks.sliding_window_view
+    color_windows = sliding(colors[:-1], window_size)
+    roll_windows = sliding(rolls[:-1], window_size)
+
+    _, is_red, is_black = encode_window_colors(colors[window_size:, np.newaxis])
+    outcomes = (is_red[:, 0].astype(np.int8) - is_black[:, 0].astype(np.int8))
+    return color_windows, roll_windows, outcomes
+
+
+def grid_space(space: Dict[str, Sequence]) -> List[PipelineConfig]:
+    """Produto cartesiano de listas de valores por campo de PipelineConfig"""
+    _check_fields(space)
+    names = list(space)
+    return [DEFAULT_CONFIG.with_changes(**dict(zip(names, values)))
+            for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_space(space: Dict[str, Union[Sequence, Tuple]], n_iter: int,
+                 seed: Optional[int] = None) -> List[PipelineConfig]:
+    """
+    Amostra aleatória de configurações
+
+    Cada campo aceita uma lista (valor sorteado entre os itens) ou uma
+    tupla (mínimo, máximo): inteiros → randint inclusivo, floats → uniforme.
+    """
+    _check_fields(space)
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n_iter):
+        changes = {}
+        for name, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    changes[name] = rng.randint(low, high)
+                else:
+                    changes[name] = rng.uniform(low, high)
+            else:
+                changes[name] = rng.choice(list(values))
+        configs.append(DEFAULT_CONFIG.with_changes(**changes))
+    return configs
+
+
+def _check_fields(space: Dict):
+    unknown = set(space) - set(CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)} "
+                         f"(válidos: {', '.join(CONFIG_FIELDS)})")
+
+
+def _init_worker(sweep: 'ParameterSweep'):
+    global _WORKER_STATE
+    _WORKER_STATE = sweep
+
+
+def _evaluate_in_worker(config: PipelineConfig) -> Dict:
+    return _WORKER_STATE.evaluate(config)
+
+
+class ParameterSweep:
+    """
+    Avaliador de configurações do pipeline sobre janelas pré-calculadas
+
+    Args:
+        features: Grandezas das janelas (StrategyPipeline.window_features)
+        outcomes: Cor seguinte a cada janela (1 vermelho, -1 preto, 0 branco)
+        initial_confidence: Confiança inicial dos sinais (escalar ou array)
+        stake: Valor apostado por sinal válido
+        payout: Multiplicador pago no acerto (double vermelho/preto = 2x)
+        bankroll: Banca inicial (base do drawdown percentual)
+        min_bets: Configurações com menos apostas vão para o fim do ranking
+    """
+
+    def __init__(self, features: WindowFeatures, outcomes: np.ndarray,
+                 initial_confidence: Union[float, np.ndarray] = 0.60,
+                 stake: float = 1.0, payout: float = 2.0, bankroll: float = 100.0,
+                 min_bets: int = 30):
+        if len(features) != len(outcomes):
+            raise ValueError("features e outcomes devem ter o mesmo número de janelas")
+        self.features = features
+        self.outcomes = np.asarray(outcomes, dtype=np.int8)
+        self.initial_confidence = initial_confidence
+        self.stake = stake
+        self.payout = payout
+        self.bankroll = bankroll
+        self.min_bets = min_bets
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict], window_size: int = 20,
+                     **kwargs) -> 'ParameterSweep':
+        """Monta janelas e features a partir de registros {'color', 'roll'}"""
+        colors, rolls, outcomes = build_windows(records, window_size)
+        features = StrategyPipeline().window_features(colors, rolls)
+        logger.info("[SWEEP] %s janelas de %s rodadas pré-calculadas", len(outcomes), window_size)
+        return cls(features, outcomes, **kwargs)
+
+    @classmethod
+    def from_data_path(cls, data_path: str = 'data/raw/', start_date: str = None,
+                       end_date: str = None, window_size: int = 20,
+                       **kwargs) -> 'ParameterSweep':
+        """Carrega o histórico JSON (mesmo formato do Backtester)"""
+        from .backtester import Backtester
+
+        backtester = Backtester(data_path)
+        backtester.load_historical_data(start_date, end_date)
+        return cls.from_records(backtester.historical_data, window_size, **kwargs)
+
+    def evaluate(self, config: PipelineConfig) -> Dict:
+        """Simula as apostas de uma configuração e calcula as métricas"""
+        pipeline = StrategyPipeline(config=config)
+        batch = pipeline.process_windows(features=self.features,
+                                         initial_confidence=self.initial_confidence)
+
+        bet_colors = BET_COLOR_BY_SIGNAL[batch.results['signal_type']]
+        placed = batch.is_valid & (bet_colors != 0)
+        wins = bet_colors[placed] == self.outcomes[placed]
+
+        pnl = np.where(wins, self.stake * (self.payout - 1), -self.stake)
+        equity = np.concatenate(([0.0], np.cumsum(pnl)))
+        peak = np.maximum.accumulate(equity)
+        drawdown = peak - equity
+        worst = int(np.argmax(drawdown))
+
+        bets = int(placed.sum())
+        profit = float(equity[-1])
+        return {
+            **config.to_dict(),
+            'windows': len(self.features),
+            'bets': bets,
+            'wins': int(wins.sum()),
+            'win_rate': float(wins.mean()) if bets else 0.0,
+            'profit': profit,
+            'roi': profit / (bets * self.stake) if bets else 0.0,
+            'max_drawdown': float(drawdown[worst]),
+            'max_drawdown_pct': float(drawdown[worst] / (self.bankroll + peak[worst])),
+            'avg_confidence': float(batch.final_confidence[placed].mean()) if bets else 0.0,
+        }
+
+    def run(self, configs: Iterable[PipelineConfig], workers: Optional[int] = None,
+            chunksize: int = 8) -> pd.DataFrame:
+        """
+        Avalia as configurações (em paralelo) e devolve o ranking
+
+        Args:
+            configs: Configurações a avaliar
+            workers: Processos (None = nº de CPUs; 1 = no processo atual)
+            chunksize: Configurações por tarefa enviada ao pool
+
+        Returns:
+            DataFrame ordenado por ROI (desc), win rate e drawdown, com a
+            coluna `rank` (1 = melhor)
+        """
+        configs = list(configs)
+        logger.info("[SWEEP] Avaliando %s configurações (%s)",
+                    len(configs), 'sequencial' if workers == 1 else 'paralelo')
+
+        if workers == 1 or len(configs) <= 1:
+            rows = [self.evaluate(config) for config in configs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                rows = list(pool.map(_evaluate_in_worker, configs, chunksize=chunksize))
+
+        return self.rank(rows)
+
+    def run_grid(self, space: Dict[str, Sequence], **kwargs) -> pd.DataFrame:
+        """Busca em grade (ver grid_space)"""
+        return self.run(grid_space(space), **kwargs)
+
+    def run_random(self, space: Dict[str, Union[Sequence, Tuple]], n_iter: int = 100,
+                   seed: Optional[int] = None, **kwargs) -> pd.DataFrame:
+        """Busca aleatória (ver random_space)"""
+        return self.run(random_space(space, n_iter, seed), **kwargs)
+
+    def rank(self, rows: List[Dict]) -> pd.DataFrame:
+        """Ordena os resultados; poucas apostas (< min_bets) ficam no fim"""
+        table = pd.DataFrame(rows)
+        if table.empty:
+            return table
+
+        table['enough_bets'] = table['bets'] >= self.min_bets
+        table = table.sort_values(['enough_bets', 'roi', 'win_rate', 'max_drawdown'],
+                                  ascending=[False, False, False, True], kind='mergesort')
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table.reset_index(drop=True)
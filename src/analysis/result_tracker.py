@@ -9,8 +9,14 @@ from typing import Dict, List
 import pandas as pd
 
 class ResultTracker:
-    def __init__(self, db_path='data/results_history.json'):
+    def __init__(self, db_path='data/results_history.json', calibrator=None):
+        """
+        Args:
+            db_path: Arquivo JSON do histórico
+            calibrator: ConfidenceCalibrator alimentado a cada resultado (opcional)
+        """
         self.db_path = db_path
+        self.calibrator = calibrator
         self.ensure_db_exists()
     
     def ensure_db_exists(self):
@@ -30,7 +36,8 @@ class ResultTracker:
                 'confidence': 0.85,
                 'timestamp': datetime,
                 'game': 'Double',
-                'strategies_passed': 4
+                'strategies_passed': 4,
+                'strategies': 'Strategy1+Strategy2'  # opcional (calibração)
             }
         """
         data = self._load_db()
@@ -42,6 +49,7 @@ class ResultTracker:
             'timestamp': signal_data.get('timestamp').isoformat(),
             'game': signal_data.get('game', 'Double'),
             'strategies_passed': signal_data.get('strategies_passed', 0),
+            'strategies': signal_data.get('strategies'),
             'result': None,  # Será preenchido depois
             'verified_at': None
         }
@@ -64,12 +72,39 @@ class ResultTracker:
                 signal['result'] = 'WIN' if won else 'LOSS'
                 signal['verified_at'] = datetime.now().isoformat()
                 break
+        else:
+            return
         
+        # Estatísticas somadas só com este resultado (recálculo total só em arquivos antigos)
+        if 'total_verified' in data.get('stats', {}):
+            self._add_to_stats(data['stats'], signal)
+        else:
+            self._update_stats(data)
         self._save_db(data)
-        self._update_stats(data)
+        
+        if self.calibrator is not None and signal.get('confidence') is not None:
+            self.calibrator.record(signal['confidence'], won, signal.get('game', 'Double'),
+                                   signal.get('strategies'))
+    
+    def _add_to_stats(self, stats: Dict, signal: Dict):
+        """Soma um resultado às estatísticas já calculadas (O(1))"""
+        won = signal['result'] == 'WIN'
+        stats['total_verified'] += 1
+        stats['wins' if won else 'losses'] += 1
+        win_rate = stats['wins'] / stats['total_verified']
+        
+        bucket = stats['by_confidence'].setdefault(
+            self._get_confidence_range(signal['confidence']), {'wins': 0, 'total': 0})
+        bucket['total'] += 1
+        if won:
+            bucket['wins'] += 1
+        
+        stats['win_rate'] = round(win_rate, 3)
+        stats['win_rate_pct'] = f"{win_rate * 100:.1f}%"
+        stats['last_updated'] = datetime.now().isoformat()
     
     def _update_stats(self, data: Dict):
-        """Atualiza estatísticas globais"""
+        """Recalcula estatísticas globais a partir de todo o histórico"""
         verified = [s for s in data['signals'] if s['result'] is not None]
         
         if not verified:
@@ -99,8 +134,6 @@ class ResultTracker:
             'by_confidence': by_confidence,
             'last_updated': datetime.now().isoformat()
         }
-        
-        self._save_db(data)
     
     def _get_confidence_range(self, conf: float) -> str:
         """Agrupa confiança em ranges"""
@@ -118,6 +151,11 @@ class ResultTracker:
         data = self._load_db()
         return data.get('stats', {})
     
+    def verified_signals(self) -> List[Dict]:
+        """Sinais com resultado registrado (ex.: ConfidenceCalibrator.seed)"""
+        data = self._load_db()
+        return [s for s in data['signals'] if s['result'] is not None]
+    
     def get_pending_signals(self) -> List[Dict]:
         """Retorna sinais sem resultado registrado"""
         data = self._load_db()
@@ -0,0 +1,104 @@
+"""
+Signal Settlement - Liquidação dos sinais de cor do Double
+
+Cada sinal enviado fica aberto até a primeira rodada posterior à última
+rodada vista quando ele foi gerado. Cor igual à do sinal = WIN; qualquer
+outra (inclusive branco) = LOSS.
+
+Exemplo:
+    settler = SignalSettler()
+    settler.open('sig_1', signal, after_id=double_batch.last_id, bet_size=10.0)
+
+    # Próximo ciclo, com o lote novo da API
+    for entry, outcome in settler.settle(double_batch):
+        tracker.register_result(entry.signal_id, outcome.result == 'WIN')
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.rolls import WHITE, RollBatch, color_to_code
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OpenSignal:
+    """Sinal enviado à espera da próxima rodada"""
+    signal_id: str
+    signal: Any                 # Signal do pipeline (calibração e feedback)
+    color: int                  # código da cor apostada (core.rolls)
+    after_id: str               # última rodada vista quando o sinal foi gerado
+    bet_size: float = 0.0
+    odds: float = 2.0
+
+
+@dataclass
+class SettledOutcome:
+    """Desfecho de um sinal (interface de game_result em process_game_result_feedback)"""
+    result: str                 # 'WIN' ou 'LOSS'
+    payout: float
+    roll_id: str
+
+
+class SignalSettler:
+    """
+    Sinais de cor abertos, liquidados pela rodada seguinte do Double
+
+    Args:
+        max_open: Sinais abertos mantidos (os mais antigos são descartados)
+    """
+
+    def __init__(self, max_open: int = 100):
+        self.max_open = max_open
+        self._open: List[OpenSignal] = []
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def open(self, signal_id: str, signal: Any, after_id: Optional[str],
+             bet_size: float = 0.0, odds: float = 2.0) -> bool:
+        """
+        Abre um sinal para liquidação
+
+        Returns:
+            False se o sinal não aposta numa cor ou não há rodada de referência
+        """
+        color = color_to_code(getattr(signal, 'signal_type', None))
+        if color == WHITE or after_id is None:
+            return False
+        self._open.append(OpenSignal(signal_id, signal, color, after_id, bet_size, odds))
+        if len(self._open) > self.max_open:
+            dropped = self._open.pop(0)
+            logger.warning("[SETTLE] Sinal %s descartado sem resultado (limite %d)",
+                           dropped.signal_id, self.max_open)
+        return True
+
+    def settle(self, batch: RollBatch) -> List[Tuple[OpenSignal, SettledOutcome]]:
+        """
+        Liquida os sinais cuja próxima rodada já está no lote
+
+        Sinais cuja rodada de referência saiu do lote (lacuna na coleta) são
+        descartados: a rodada seguinte não é mais conhecida.
+        """
+        if not len(batch):
+            return []
+        settled, pending = [], []
+        for entry in self._open:
+            seen = np.flatnonzero(batch.ids == entry.after_id)
+            if not seen.size:
+                logger.warning("[SETTLE] Rodada %s fora do lote: sinal %s sem resultado",
+                               entry.after_id, entry.signal_id)
+                continue
+            index = seen[-1] + 1
+            if index >= len(batch):
+                pending.append(entry)
+                continue
+            won = int(batch.colors[index]) == entry.color
+            payout = entry.bet_size * (entry.odds - 1) if won else -entry.bet_size
+            settled.append((entry, SettledOutcome('WIN' if won else 'LOSS', payout,
+                                                  str(batch.ids[index]))))
+        self._open = pending
+        return settled
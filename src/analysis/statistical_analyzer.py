@@ -3,19 +3,22 @@ Módulo de análise estatística para geração de sinais
 """
 import pandas as pd
 import numpy as np
-from scipy import stats
 import logging
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from .crash_stats import CrashStatsStream, linear_trend, trailing_true_count
+
 logger = logging.getLogger(__name__)
 
 class StatisticalAnalyzer:
     """Analisador estatístico para padrões de apostas"""
 
-    def __init__(self):
+    def __init__(self, crash_window: int = 100):
         self.min_confidence = 0.65  # Confiança mínima para sinal
+        # Estado do Crash entre ciclos: cada rodada é processada uma vez
+        self.crash_stream = CrashStatsStream(window=crash_window)
 
     def analyze_patterns(self, data):
         """Analisa padrões nos dados coletados"""
@@ -35,38 +38,30 @@ class StatisticalAnalyzer:
                 logger.info("[OK] Analise do Double concluida")
 
         except Exception as e:
-            logger.error(f"Erro na analise de padroes: {str(e)}")
+            logger.error("Erro na analise de padroes: %s", e)
 
         return analysis_results
 
     def analyze_crash_patterns(self, df):
-        """Analisa padrões específicos do Crash"""
+        """
+        Analisa padrões específicos do Crash
+
+        Só as rodadas ainda não vistas entram no CrashStatsStream; estatísticas,
+        sequências, tendência e anomalias saem do estado acumulado. basic_stats
+        e os contadores cobrem as últimas `crash_window` rodadas vistas, não só
+        as de df nem o histórico inteiro.
+        """
         if df.empty or len(df) < 10:
             return {"error": "Dados insuficientes para análise"}
 
         analysis = {}
 
         try:
-            # Estatísticas básicas
-            analysis['basic_stats'] = {
-                'mean': float(df['crash_point'].mean()),
-                'median': float(df['crash_point'].median()),
-                'std': float(df['crash_point'].std()),
-                'min': float(df['crash_point'].min()),
-                'max': float(df['crash_point'].max())
-            }
-
-            # Padrões de sequência
-            analysis['sequences'] = self.analyze_crash_sequences(df)
-
-            # Tendências temporais
-            analysis['trends'] = self.analyze_trends(df, 'crash_point')
-
-            # Anomalias
-            analysis['anomalies'] = self.detect_anomalies(df, 'crash_point')
+            self.crash_stream.update_frame(df)
+            analysis.update(self.crash_stream.summary())
 
         except Exception as e:
-            logger.error(f"Erro na análise do Crash: {str(e)}")
+            logger.error("Erro na análise do Crash: %s", e)
             analysis['error'] = str(e)
 
         return analysis
@@ -101,7 +96,7 @@ class StatisticalAnalyzer:
             }
 
         except Exception as e:
-            logger.error(f"Erro na análise do Double: {str(e)}")
+            logger.error("Erro na análise do Double: %s", e)
             analysis['error'] = str(e)
 
         return analysis
@@ -115,9 +110,8 @@ class StatisticalAnalyzer:
         sequences['low_crash_count'] = len(low_crashes)
         sequences['low_crash_percentage'] = float(len(low_crashes) / len(df))
 
-        # Verifica sequências de crashes baixos
-        df['is_low'] = df['crash_point'] < 2.0
-        sequences['current_low_streak'] = self.get_current_streak(df, 'is_low')
+        # Verifica sequências de crashes baixos (sem alterar o DataFrame recebido)
+        sequences['current_low_streak'] = trailing_true_count(df['crash_point'] < 2.0)
 
         # Sequências de crashes altos
         high_crashes = df[df['crash_point'] > 5.0]
@@ -151,15 +145,7 @@ class StatisticalAnalyzer:
 
         if len(df) >= 5:
             # Tendência linear recente
-            recent_data = df.tail(5)
-            x = np.arange(len(recent_data))
-            y = recent_data[column].values
-
-            slope, _, r_value, _, _ = stats.linregress(x, y)
-
-            trends['recent_slope'] = float(slope)
-            trends['recent_correlation'] = float(r_value)
-            trends['trend_direction'] = 'alta' if slope > 0 else 'baixa' if slope < 0 else 'estável'
+            trends = linear_trend(df[column].tail(5).to_numpy(dtype=float))
 
         return trends
 
@@ -170,7 +156,8 @@ class StatisticalAnalyzer:
         if len(df) >= 10:
             recent_data = df[column].tail(10).values
             if len(recent_data) >= 3:  # Mínimo para cálculo de z-score
-                z_scores = np.abs(stats.zscore(recent_data))
+                std = recent_data.std()
+                z_scores = np.abs(recent_data - recent_data.mean()) / std if std > 0 else np.zeros(len(recent_data))
                 anomaly_indices = np.where(z_scores > 2)[0]
 
                 anomalies['count'] = len(anomaly_indices)
@@ -183,15 +170,7 @@ class StatisticalAnalyzer:
         """Calcula a sequência atual baseada em condição"""
         if df.empty:
             return 0
-
-        current_streak = 0
-        for i in range(len(df)-1, -1, -1):
-            if df.iloc[i][condition_column]:
-                current_streak += 1
-            else:
-                break
-
-        return current_streak
+        return trailing_true_count(df[condition_column])
 
     def generate_signals(self, analysis_results):
         """Gera sinais baseados na análise"""
@@ -208,10 +187,10 @@ class StatisticalAnalyzer:
                 double_signals = self.generate_double_signals(analysis_results['double'])
                 signals.extend(double_signals)
 
-            logger.info(f"[*] {len(signals)} sinal(is) gerado(s)")
+            logger.info("[*] %s sinal(is) gerado(s)", len(signals))
 
         except Exception as e:
-            logger.error(f"Erro na geracao de sinais: {str(e)}")
+            logger.error("Erro na geracao de sinais: %s", e)
 
         return signals
 
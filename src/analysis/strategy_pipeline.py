@@ -8,11 +8,18 @@ Dados fluem por múltiplas engrenagens/funis:
 4. Confirmação: Valida com volume e streaks
 
 Resultado: Sinais ALTAMENTE qualificados com alta taxa de acerto
+
+Modo em lote (backtests / varreduras de parâmetros):
+    batch = pipeline.process_windows(colors_matrix, prices_matrix)
+    batch.results['is_valid'].mean()       # colunas NumPy, sem objetos Signal
+    signals = batch.valid_signals()         # Signal criado só sob demanda
 """
 
 import logging
+import time
+from array import array
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, replace
 from enum import Enum
 from datetime import datetime
 import numpy as np
@@ -28,74 +35,267 @@ class StrategyResult(Enum):
     WEAK = "WEAK"  # Passou mas com confiança reduzida
 
 
-@dataclass
-class Signal:
-    """Sinal processado pelo pipeline"""
-    signal_id: str
-    signal_type: str  # 'Vermelho' ou 'Preto'
-    initial_confidence: float
-    timestamp: datetime
-    
-    # Resultado de cada estratégia
-    strategy_results: Dict[str, Tuple[StrategyResult, float]] = field(default_factory=dict)
+# Códigos de resultado no modo em lote (índice nesta tupla)
+RESULT_REJECT, RESULT_WEAK, RESULT_PASS = 0, 1, 2
+BATCH_RESULTS = (StrategyResult.REJECT, StrategyResult.WEAK, StrategyResult.PASS)
+
+# Códigos de signal_type no modo em lote (0 = mantém o tipo informado)
+BATCH_SIGNAL_TYPES = (None, 'Vermelho', 'Preto')
+
+# Ordem canônica das engrenagens (posição nos campos compactos do Signal)
+STAGE_NAMES = (
+    'Strategy1_Pattern',
+    'Strategy2_Technical',
+    'Strategy3_Confidence',
+    'Strategy4_Confirmation',
+    'Strategy5_MonteCarlo',
+    'Strategy6_RunTest',
+)
+STAGE_INDEX = {name: index for index, name in enumerate(STAGE_NAMES)}
+
+# Resultados por código compacto: 0-2 são BATCH_RESULTS; enums de outros
+# módulos (monte_carlo_strategy.StrategyResult) ganham código no primeiro uso
+RESULT_MEMBERS: List[Enum] = list(BATCH_RESULTS)
+_RESULT_CODES = {member: code for code, member in enumerate(RESULT_MEMBERS)}
+# Códigos cujo membro se chama PASS (os valores variam: 'PASS' aqui, 'pass' no Monte Carlo)
+PASS_CODES = {RESULT_PASS}
+NOT_RUN = 255
+_EMPTY_CODES = bytes([NOT_RUN]) * len(STAGE_NAMES)
+_EMPTY_CONFIDENCES = array('d', [0.0] * len(STAGE_NAMES))
+
+RED_NAMES = ('vermelho', 'red', 'r')
+BLACK_NAMES = ('preto', 'black', 'b')
+
+
+def result_code(result: Enum) -> int:
+    """Código compacto de um resultado de estratégia (registra enums novos)"""
+    code = _RESULT_CODES.get(result)
+    if code is None:
+        code = _RESULT_CODES[result] = len(RESULT_MEMBERS)
+        RESULT_MEMBERS.append(result)
+        if result.name == 'PASS':
+            PASS_CODES.add(code)
+    return code
+
+
+def encode_window_colors(colors) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Codifica uma matriz de cores (janelas x cores) para as estratégias em lote
     
-    # Confiança final após todos os filtros
-    final_confidence: float = 0.0
+    Returns:
+        (codes, is_red, is_black): codes é igual entre duas posições sse as
+        cores são iguais ignorando maiúsculas. Matrizes inteiras usam a
+        convenção 1 = vermelho, -1 = preto, 0 = branco.
+    """
+    arr = np.asarray(colors)
+    if arr.ndim != 2:
+        raise ValueError("colors deve ser uma matriz (janelas x cores)")
     
-    # Detalhes de cada estratégia
-    strategy_details: Dict[str, dict] = field(default_factory=dict)
+    if arr.dtype.kind in 'iub':
+        return arr, arr == 1, arr == -1
     
-    # Passou em todas as estratégias?
-    is_valid: bool = False
+    lowered = np.char.lower(arr.astype(str))
+    names, codes = np.unique(lowered, return_inverse=True)
+    codes = codes.reshape(arr.shape)
+    return codes, np.isin(names, RED_NAMES)[codes], np.isin(names, BLACK_NAMES)[codes]
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Limiares das engrenagens (padrões = comportamento histórico)
     
-    # Quantas estratégias passaram
-    strategies_passed: int = 0
+    Permite avaliar configurações offline (analysis.parameter_sweep) antes
+    de aplicá-las ao pipeline em produção.
+    """
+    pattern_majority: int = 7              # Strategy1: cor dominante >= N nas últimas 10
+    pattern_minority: int = 3              # Strategy1: cor subrepresentada <= N
+    technical_pass: float = 0.70           # Strategy2: confiança mínima para PASS
+    min_combined_confidence: float = 0.70  # Strategy3: confiança combinada para PASS
+    confirmation_pass: float = 0.72        # Strategy4: confiança mínima para PASS
+    pass_bonus: float = 0.12               # finalize: multiplicador 1 + N_PASS * bonus
+    records_moderate: int = 30             # < 30 registros: fallback (exige 1 estratégia)
+    records_good: int = 100                # >= 100 registros: dados bons (exige 3)
+
+    def with_changes(self, **changes) -> 'PipelineConfig':
+        """Cópia com os campos alterados"""
+        return replace(self, **changes)
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+
+DEFAULT_CONFIG = PipelineConfig()
+
+
+class Signal:
+    """
+    Sinal processado pelo pipeline
+
+    Layout compacto (__slots__): resultado e confiança de cada engrenagem
+    ficam em um bytearray de códigos e um array('d'), na ordem de
+    STAGE_NAMES. strategy_results e strategy_details são montados sob
+    demanda; os detalhes guardam valores brutos e os textos legíveis só
+    são gerados por render_details() ao exibir (Telegram, logs, relatórios).
+    """
+
+    __slots__ = ('signal_id', 'signal_type', 'initial_confidence', 'timestamp',
+                 'final_confidence', 'is_valid', 'strategies_passed',
+                 '_codes', '_confidences', '_details',
+                 # Anotações da FASE 2 (main._apply_fase2_optimizations)
+                 'optimal_bet_fraction', 'strategy_weights', 'pruning_result', 'meta_context',
+                 'calibrated_confidence')
+
+    def __init__(self, signal_id: str, signal_type: str, initial_confidence: float,
+                 timestamp: datetime, final_confidence: float = 0.0,
+                 is_valid: bool = False, strategies_passed: int = 0):
+        self.signal_id = signal_id
+        self.signal_type = signal_type          # 'Vermelho' ou 'Preto'
+        self.initial_confidence = initial_confidence
+        self.timestamp = timestamp
+        self.final_confidence = final_confidence    # após todos os filtros
+        self.is_valid = is_valid
+        self.strategies_passed = strategies_passed
+        self._codes = bytearray(_EMPTY_CODES)
+        self._confidences = array('d', _EMPTY_CONFIDENCES)
+        self._details: Optional[List[Optional[dict]]] = None    # brutos, só se pedidos
+        self.optimal_bet_fraction = None
+        self.strategy_weights = None
+        self.pruning_result = None
+        self.meta_context = None
+        self.calibrated_confidence = None
+
+    def __repr__(self) -> str:
+        return (f"Signal(signal_id={self.signal_id!r}, signal_type={self.signal_type!r}, "
+                f"final_confidence={self.final_confidence:.3f}, is_valid={self.is_valid}, "
+                f"strategies_passed={self.strategies_passed})")
+
+    @property
+    def strategy_results(self) -> Dict[str, Tuple[Enum, float]]:
+        """Resultado e confiança das engrenagens executadas, na ordem canônica"""
+        return {name: (RESULT_MEMBERS[code], self._confidences[index])
+                for index, (name, code) in enumerate(zip(STAGE_NAMES, self._codes))
+                if code != NOT_RUN}
+
+    @property
+    def passed_strategies(self) -> Tuple[str, ...]:
+        """
+        Engrenagens que deram PASS, na ordem canônica (chave da calibração)
+
+        Mesma definição de PASS (PASS_CODES) de strategies_passed e summary().
+        """
+        return tuple(name for name, code in zip(STAGE_NAMES, self._codes) if code in PASS_CODES)
+
+    @property
+    def strategy_details(self) -> Dict[str, dict]:
+        """Detalhes legíveis de cada engrenagem (gerados a cada acesso)"""
+        if self._details is None:
+            return {}
+        return {name: render_details(name, details)
+                for name, details in zip(STAGE_NAMES, self._details) if details}
+
+    def raw_details(self, strategy_name: str) -> dict:
+        """Detalhes brutos (números e códigos) de uma engrenagem"""
+        if self._details is None:
+            return {}
+        return self._details[STAGE_INDEX[strategy_name]] or {}
 
     def add_strategy_result(self, strategy_name: str, result: StrategyResult, 
                            confidence: float, details: dict = None):
         """Adiciona resultado de uma estratégia"""
-        self.strategy_results[strategy_name] = (result, confidence)
+        index = STAGE_INDEX[strategy_name]
+        self._codes[index] = result_code(result)
+        self._confidences[index] = confidence
         if details:
-            self.strategy_details[strategy_name] = details
+            if self._details is None:
+                self._details = [None] * len(STAGE_NAMES)
+            self._details[index] = details
         
-        if result == StrategyResult.PASS:
+        if self._codes[index] in PASS_CODES:
             self.strategies_passed += 1
 
-    def finalize(self, required_strategies: int = 2):
+    def finalize(self, required_strategies: int = 2,
+                 pass_bonus: float = DEFAULT_CONFIG.pass_bonus):
         """
         Finaliza o sinal após passar por todas as estratégias
         
         ADAPTATIVO: Com fallback data, aceita apenas 1-2 estratégias passando
                     Com dados normais, exigir 2-3
         """
+        self.is_valid, self.final_confidence = self.resolve_outcome(
+            self.initial_confidence, self.strategies_passed, required_strategies, pass_bonus
+        )
+
+    @staticmethod
+    def resolve_outcome(initial_confidence: float, strategies_passed: int,
+                        required_strategies: int,
+                        pass_bonus: float = DEFAULT_CONFIG.pass_bonus) -> Tuple[bool, float]:
+        """
+        Regra de decisão do finalize() como função pura: (is_valid, final_confidence)
+
+        Separada para que o pipeline consiga saber, antes de rodar todas as
+        estratégias, se o resultado final ainda pode mudar.
+        """
         # MENOS RIGOROSO: aceitar com apenas 1 estratégia passando (downgrade importante)
         # Se nenhuma estratégia passou mas houver confiança baixa, ainda marcar como válido se > 0.50
-        has_minimum_confidence = self.initial_confidence >= 0.50 and self.strategies_passed >= 1
-        
+        has_minimum_confidence = initial_confidence >= 0.50 and strategies_passed >= 1
+
         # Válido se:
         # 1. Passou em required_strategies (2 ou mais) OU
         # 2. Passou em 1 e tem confiança inicial >= 0.50
-        self.is_valid = (self.strategies_passed >= required_strategies) or has_minimum_confidence
-        
-        if self.is_valid:
+        is_valid = (strategies_passed >= required_strategies) or has_minimum_confidence
+
+        if is_valid:
             # Aumentar confiança baseado em quantas estratégias passaram
-            multiplier = 1.0 + (self.strategies_passed * 0.12)
-            self.final_confidence = min(0.99, self.initial_confidence * multiplier)
-        else:
-            # Não é válido, mas manter confiança baixa em vez de 0.0
-            self.final_confidence = max(0.30, self.initial_confidence * 0.5)
+            multiplier = 1.0 + (strategies_passed * pass_bonus)
+            return True, min(0.99, initial_confidence * multiplier)
+        # Não é válido, mas manter confiança baixa em vez de 0.0
+        return False, max(0.30, initial_confidence * 0.5)
+
+    @staticmethod
+    def resolve_outcomes(initial_confidence: np.ndarray, strategies_passed: np.ndarray,
+                         required_strategies: int,
+                         pass_bonus: float = DEFAULT_CONFIG.pass_bonus) -> Tuple[np.ndarray, np.ndarray]:
+        """resolve_outcome() vetorizado: (is_valid, final_confidence) por janela"""
+        has_minimum_confidence = (initial_confidence >= 0.50) & (strategies_passed >= 1)
+        is_valid = (strategies_passed >= required_strategies) | has_minimum_confidence
+        final_confidence = np.where(
+            is_valid,
+            np.minimum(0.99, initial_confidence * (1.0 + strategies_passed * pass_bonus)),
+            np.maximum(0.30, initial_confidence * 0.5))
+        return is_valid, final_confidence
+
+    @classmethod
+    def is_outcome_determined(cls, initial_confidence: float, strategies_passed: int,
+                              max_additional_passes: int, required_strategies: int,
+                              pass_bonus: float = DEFAULT_CONFIG.pass_bonus) -> bool:
+        """
+        True se nenhum resultado das estratégias restantes altera o finalize()
+
+        Enumera todas as contagens finais alcançáveis (no máximo 6 valores):
+        o desfecho está decidido quando todas produzem o mesmo (is_valid, final_confidence).
+        """
+        outcome = cls.resolve_outcome(initial_confidence, strategies_passed,
+                                      required_strategies, pass_bonus)
+        for extra in range(1, max_additional_passes + 1):
+            if cls.resolve_outcome(initial_confidence, strategies_passed + extra,
+                                   required_strategies, pass_bonus) != outcome:
+                return False
+        return True
 
     def summary(self) -> str:
         """Resumo do sinal com resultados das estratégias"""
         if not self.is_valid:
-            return f"[REJEITADO] {self.signal_type} - Passou em {self.strategies_passed}/4 estratégias"
+            return f"[REJEITADO] {self.signal_type} - Passou em {self.strategies_passed}/6 estratégias"
         
-        passed = [s for s, (r, _) in self.strategy_results.items() if r == StrategyResult.PASS]
-        return f"[VÁLIDO] {self.signal_type} ({self.final_confidence:.1%}) - {', '.join(passed)}"
+        return f"[VÁLIDO] {self.signal_type} ({self.final_confidence:.1%}) - {', '.join(self.passed_strategies)}"
 
 
 class StrategyBase:
     """Classe base para todas as estratégias"""
+
+    # Colunas do FeatureStore lidas em data['features'] (se presentes)
+    FEATURES: Tuple[str, ...] = ()
     
     def __init__(self, name: str, min_confidence: float = 0.55):
         self.name = name
@@ -109,6 +309,20 @@ class StrategyBase:
         """
         raise NotImplementedError
 
+    def analyze_batch(self, **columns) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Versão vetorizada de analyze() para muitas janelas de uma vez
+        
+        Returns:
+            (códigos de resultado em BATCH_RESULTS, confianças, colunas extras)
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        """Versão legível dos detalhes brutos de analyze() (textos e arredondamentos)"""
+        return dict(details)
+
 
 class Strategy1_PatternDetection(StrategyBase):
     """
@@ -117,9 +331,14 @@ class Strategy1_PatternDetection(StrategyBase):
     Detecta cores subrepresentadas nos últimos N jogos
     Este é o sinal inicial que entra no pipeline
     """
+
+    FEATURES = ('red_count_10', 'black_count_10')
     
-    def __init__(self):
+    def __init__(self, majority: int = DEFAULT_CONFIG.pattern_majority,
+                 minority: int = DEFAULT_CONFIG.pattern_minority):
         super().__init__("Pattern Detection")
+        self.majority = majority
+        self.minority = minority
 
     def analyze(self, data: Dict) -> Tuple[StrategyResult, float, Dict]:
         """
@@ -128,28 +347,29 @@ class Strategy1_PatternDetection(StrategyBase):
         Input:
             data: {
                 'recent_colors': ['vermelho', 'preto', ...],
-                'game_id': 'xxx'
+                'game_id': 'xxx',
+                'features': {...}   # opcional: linha do FeatureStore
             }
         """
         recent_colors = data.get('recent_colors', [])
+        features = data.get('features') or {}
+        history = len(recent_colors) if recent_colors else features.get('roll_index', -1) + 1
         
         # Se dados insuficientes, retornar WEAK em vez de REJECT
-        if len(recent_colors) < 10:
+        if history < 10:
             return StrategyResult.WEAK, 0.50, {'reason': 'Dados insuficientes - apenas WEAK'}
         
-        # Contar cores nos últimos 10
-        recent_10 = recent_colors[-10:]
-        red_count = sum(1 for c in recent_10 if str(c).lower() in ['vermelho', 'red', 'r'])
-        black_count = sum(1 for c in recent_10 if str(c).lower() in ['preto', 'black', 'b'])
-        
-        # Se cores não foram identificadas, tentar alternativas
-        if red_count + black_count == 0:
-            # Tentar cores em português ou inglês maiúsculas
-            red_count = sum(1 for c in recent_10 if str(c).upper() in ['VERMELHO', 'RED', 'VERMELHO'])
-            black_count = sum(1 for c in recent_10 if str(c).upper() in ['PRETO', 'BLACK', 'PRETO'])
+        if all(name in features for name in self.FEATURES):
+            # Contagens já calculadas pelo FeatureStore
+            red_count, black_count = features['red_count_10'], features['black_count_10']
+        else:
+            # Contar cores nos últimos 10
+            recent_10 = recent_colors[-10:]
+            red_count = sum(1 for c in recent_10 if str(c).lower() in ['vermelho', 'red', 'r'])
+            black_count = sum(1 for c in recent_10 if str(c).lower() in ['preto', 'black', 'b'])
         
         # Verificar desequilíbrio (menos rigoroso: 3+ de diferença)
-        if red_count <= 3 and black_count >= 7:
+        if red_count <= self.minority and black_count >= self.majority:
             # Vermelho subrepresentado
             confidence = min(0.95, 0.65 + (black_count * 0.03))
             return StrategyResult.PASS, confidence, {
@@ -160,7 +380,7 @@ class Strategy1_PatternDetection(StrategyBase):
                 'desequilibrio': black_count - red_count
             }
         
-        elif black_count <= 3 and red_count >= 7:
+        elif black_count <= self.minority and red_count >= self.majority:
             # Preto subrepresentado
             confidence = min(0.95, 0.65 + (red_count * 0.03))
             return StrategyResult.PASS, confidence, {
@@ -191,6 +411,43 @@ class Strategy1_PatternDetection(StrategyBase):
             'preto_count': black_count
         }
 
+    def analyze_batch(self, vermelho_count: np.ndarray, preto_count: np.ndarray,
+                      total_records: int, **_):
+        """
+        analyze() em lote a partir das contagens nas últimas 10 cores
+        (WindowFeatures)
+        
+        Extras: desequilibrio e signal_type (código em BATCH_SIGNAL_TYPES
+        da cor subrepresentada)
+        """
+        n = len(vermelho_count)
+        red_count, black_count = vermelho_count, preto_count
+        extras = {}
+        
+        if total_records < 10:
+            extras['desequilibrio'] = np.zeros(n, dtype=np.int64)
+            extras['signal_type'] = np.zeros(n, dtype=np.int8)
+            return np.full(n, RESULT_WEAK, dtype=np.int8), np.full(n, 0.50), extras
+        
+        red_under = (red_count <= self.minority) & (black_count >= self.majority)
+        black_under = (black_count <= self.minority) & (red_count >= self.majority)
+        diff = np.abs(red_count - black_count)
+        moderate = ~red_under & ~black_under & (diff >= 2)
+        
+        results = np.select([red_under | black_under, moderate],
+                            [RESULT_PASS, RESULT_WEAK], RESULT_REJECT).astype(np.int8)
+        confidences = np.select(
+            [red_under, black_under, moderate],
+            [np.minimum(0.95, 0.65 + black_count * 0.03),
+             np.minimum(0.95, 0.65 + red_count * 0.03),
+             0.55 + diff * 0.05],
+            0.40)
+        extras['desequilibrio'] = np.where(results == RESULT_REJECT, 0, diff)
+        extras['signal_type'] = np.select(
+            [red_under, black_under, moderate & (red_count < black_count), moderate],
+            [1, 2, 1, 2], 0).astype(np.int8)
+        return results, confidences, extras
+
 
 class Strategy2_TechnicalValidation(StrategyBase):
     """
@@ -202,8 +459,9 @@ class Strategy2_TechnicalValidation(StrategyBase):
     - MACD: Tendência
     """
     
-    def __init__(self):
+    def __init__(self, pass_threshold: float = DEFAULT_CONFIG.technical_pass):
         super().__init__("Technical Validation")
+        self.pass_threshold = pass_threshold
 
     def calculate_rsi(self, values: List[float], period: int = 14) -> float:
         """Calcula RSI"""
@@ -269,13 +527,13 @@ class Strategy2_TechnicalValidation(StrategyBase):
             rsi = self.calculate_rsi(prices, period=period)
             confidence_base = 0.75  # Mais permissivo com dados limitados
             details['rsi_period'] = period
-            details['rsi'] = round(rsi, 2)
+            details['rsi'] = float(rsi)
             details['status'] = 'Modo fallback com período reduzido'
         else:
             # Dados suficientes para período normal
             rsi = self.calculate_rsi(prices, period=14)
             confidence_base = 0.65
-            details['rsi'] = round(rsi, 2)
+            details['rsi'] = float(rsi)
             details['rsi_period'] = 14
             details['status'] = 'Modo normal'
         
@@ -284,10 +542,10 @@ class Strategy2_TechnicalValidation(StrategyBase):
         current_price = prices[-1]
         
         details.update({
-            'sma': round(sma, 2) if sma else None,
-            'upper_band': round(upper, 2) if upper else None,
-            'lower_band': round(lower, 2) if lower else None,
-            'current_price': round(current_price, 2)
+            'sma': float(sma) if sma else None,
+            'upper_band': float(upper) if upper else None,
+            'lower_band': float(lower) if lower else None,
+            'current_price': float(current_price)
         })
         
         # ===== SCORING ADAPTATIVO =====
@@ -327,16 +585,17 @@ class Strategy2_TechnicalValidation(StrategyBase):
             mean_price = np.mean(recent_prices)
             
             if mean_price != 0:
-                volatility_ratio = std / mean_price
+                volatility_ratio = float(std / mean_price)
+                details['volatility_ratio'] = volatility_ratio
                 if volatility_ratio > 0.08:
                     score += 0.25  # Volatilidade alta
-                    details['volatility'] = f'ALTA ({volatility_ratio:.4f})'
+                    details['volatility'] = 'ALTA'
                 elif volatility_ratio > 0.04:
                     score += 0.15
-                    details['volatility'] = f'MODERADA ({volatility_ratio:.4f})'
+                    details['volatility'] = 'MODERADA'
                 else:
                     score += 0.08
-                    details['volatility'] = f'BAIXA ({volatility_ratio:.4f})'
+                    details['volatility'] = 'BAIXA'
             else:
                 score += 0.10
                 details['volatility'] = 'CALCULADA (zero mean)'
@@ -353,10 +612,82 @@ class Strategy2_TechnicalValidation(StrategyBase):
         
         # Nunca rejeitar completamente na Strategy2 (deixa Strategy3-6 filtrar)
         # WEAK se confiança baixa, PASS se alta
-        result = StrategyResult.PASS if confidence >= 0.70 else StrategyResult.WEAK
+        result = StrategyResult.PASS if confidence >= self.pass_threshold else StrategyResult.WEAK
         
         return result, confidence, details
 
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        described = dict(details)
+        for key in ('rsi', 'sma', 'upper_band', 'lower_band', 'current_price'):
+            if described.get(key) is not None:
+                described[key] = round(described[key], 2)
+        ratio = described.pop('volatility_ratio', None)
+        if ratio is not None:
+            described['volatility'] = f"{described['volatility']} ({ratio:.4f})"
+        return described
+
+    def analyze_batch(self, technical_confidence: np.ndarray, has_prices: bool = True, **_):
+        """analyze() em lote a partir da confiança técnica (WindowFeatures)"""
+        if not has_prices:
+            # Modo fallback leve: sempre WEAK
+            return np.full(len(technical_confidence), RESULT_WEAK, dtype=np.int8), technical_confidence, {}
+        results = np.where(technical_confidence >= self.pass_threshold,
+                           RESULT_PASS, RESULT_WEAK).astype(np.int8)
+        return results, technical_confidence, {}
+
+    @staticmethod
+    def technical_features(prices: Optional[np.ndarray], n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Confiança técnica e RSI de cada janela (independem dos limiares)
+        
+        Args:
+            prices: Matriz (janelas x pontos) de preços, ou None
+        
+        Returns:
+            (confiança, rsi); rsi é NaN no modo fallback leve (< 5 pontos)
+        """
+        if prices is None or prices.shape[1] < 5:
+            return np.full(n, 0.72), np.full(n, np.nan)
+        
+        prices = prices.astype(float, copy=False)
+        points = prices.shape[1]
+        if points < 14:
+            period, confidence_base = max(3, points - 2), 0.75
+        else:
+            period, confidence_base = 14, 0.65
+        
+        # RSI sobre as últimas `period` variações
+        deltas = np.diff(prices, axis=1)[:, -period:]
+        avg_gain = np.where(deltas > 0, deltas, 0).mean(axis=1)
+        avg_loss = np.where(deltas < 0, -deltas, 0).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0,
+                           np.where(avg_gain > 0, 100.0, 50.0),
+                           100 - 100 / (1 + avg_gain / avg_loss))
+        score = np.select([(rsi < 25) | (rsi > 75), (rsi < 35) | (rsi > 65), (rsi >= 40) & (rsi <= 60)],
+                          [0.35, 0.25, 0.15], 0.10)
+        
+        # Bollinger Bands (bandas nulas contam como ausentes, como em analyze())
+        window = prices[:, -min(20, points - 1):]
+        sma = window.mean(axis=1)
+        std = window.std(axis=1)
+        lower, upper = sma - 2.0 * std, sma + 2.0 * std
+        current = prices[:, -1]
+        has_bands = (lower != 0) & (upper != 0)
+        score += np.where(has_bands,
+                          np.where((current > upper) | (current < lower), 0.3, 0.12), 0.0)
+        
+        # Volatilidade relativa
+        recent = prices[:, -min(14, points):]
+        mean_price = recent.mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volatility_ratio = recent.std(axis=1) / mean_price
+        score += np.select([mean_price == 0, volatility_ratio > 0.08, volatility_ratio > 0.04],
+                           [0.10, 0.25, 0.15], 0.08)
+        
+        return np.minimum(0.95, confidence_base + score), rsi
+
 
 class Strategy3_ConfidenceFilter(StrategyBase):
     """
@@ -405,9 +736,9 @@ class Strategy3_ConfidenceFilter(StrategyBase):
             source = 'media_ambas'
         
         details = {
-            'combined_confidence': round(combined, 3),
-            'pattern_confidence': round(conf_pattern, 3),
-            'technical_confidence': round(conf_technical, 3),
+            'combined_confidence': combined,
+            'pattern_confidence': conf_pattern,
+            'technical_confidence': conf_technical,
             'threshold': self.min_combined_confidence,
             'source': source
         }
@@ -425,6 +756,28 @@ class Strategy3_ConfidenceFilter(StrategyBase):
         
         return result, final_confidence, details
 
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        described = dict(details)
+        for key in ('combined_confidence', 'pattern_confidence', 'technical_confidence'):
+            if key in described:
+                described[key] = round(described[key], 3)
+        return described
+
+    def analyze_batch(self, confidence_pattern: np.ndarray,
+                      confidence_technical: np.ndarray, **_):
+        """analyze() em lote a partir das confianças das engrenagens 1 e 2"""
+        combined = np.select(
+            [confidence_pattern == 0.0, confidence_technical == 0.0],
+            [confidence_technical, confidence_pattern],
+            (confidence_pattern + confidence_technical) / 2)
+        both_zero = (confidence_pattern == 0.0) & (confidence_technical == 0.0)
+        
+        results = np.where(~both_zero & (combined >= self.min_combined_confidence),
+                           RESULT_PASS, RESULT_WEAK).astype(np.int8)
+        confidences = np.where(both_zero, 0.55, np.maximum(0.50, combined))
+        return results, confidences, {}
+
 
 class Strategy4_ConfirmationFilter(StrategyBase):
     """
@@ -435,9 +788,16 @@ class Strategy4_ConfirmationFilter(StrategyBase):
     - Volume: número de ocorrências recentes
     - Timing: quando o sinal foi gerado (melhor em certos períodos)
     """
+
+    FEATURES = ('max_streak_20',)
     
-    def __init__(self):
+    def __init__(self, pass_threshold: float = DEFAULT_CONFIG.confirmation_pass,
+                 records_moderate: int = DEFAULT_CONFIG.records_moderate,
+                 records_good: int = DEFAULT_CONFIG.records_good):
         super().__init__("Confirmation Filter")
+        self.pass_threshold = pass_threshold
+        self.records_moderate = records_moderate
+        self.records_good = records_good
 
     def analyze(self, data: Dict) -> Tuple[StrategyResult, float, Dict]:
         """
@@ -447,11 +807,13 @@ class Strategy4_ConfirmationFilter(StrategyBase):
             data: {
                 'all_colors': ['vermelho', 'preto', ...],
                 'desequilibrio': 4,
-                'streak_info': {...}
+                'streak_info': {...},
+                'features': {...}   # opcional: linha do FeatureStore
             }
         """
         all_colors = data.get('all_colors', [])
         desequilibrio = data.get('desequilibrio', 0)
+        features = data.get('features') or {}
         
         # ===== TRATAMENTO DE DADOS INSUFICIENTES =====
         # Com fallback data (100-200 records), ainda passar
@@ -467,10 +829,10 @@ class Strategy4_ConfirmationFilter(StrategyBase):
         # Quantidade maior = mais confiança, mas menos rigoroso
         confidence_base = 0.65
         
-        if len(all_colors) < 30:
+        if len(all_colors) < self.records_moderate:
             confidence_base = 0.62  # Muito permissivo com dados baixos
             details['data_quality'] = 'BAIXA (< 30 records)'
-        elif len(all_colors) < 100:
+        elif len(all_colors) < self.records_good:
             confidence_base = 0.65
             details['data_quality'] = 'MODERADA (30-100 records)'
         else:
@@ -485,8 +847,10 @@ class Strategy4_ConfirmationFilter(StrategyBase):
         # Verificar se há tendência nos últimos records
         if len(all_colors) >= 3:
             recent_n = min(20, len(all_colors))
-            recent = all_colors[-recent_n:]
-            max_streak = self._calculate_max_streak(recent)
+            if 'max_streak_20' in features:
+                max_streak = features['max_streak_20']
+            else:
+                max_streak = self._calculate_max_streak(all_colors[-recent_n:])
             
             details['max_streak'] = max_streak
             details['recent_sample_size'] = recent_n
@@ -494,7 +858,7 @@ class Strategy4_ConfirmationFilter(StrategyBase):
             # Streaks > 2 confirmam tendência (menos rigoroso de >= 3)
             if max_streak >= 2:
                 confidence += 0.12
-                details['streak_confirmation'] = f'SIM (streak={max_streak})'
+                details['streak_confirmation'] = 'SIM'
             elif max_streak >= 1:
                 details['streak_confirmation'] = 'LEVE (streak=1)'
             else:
@@ -504,10 +868,17 @@ class Strategy4_ConfirmationFilter(StrategyBase):
         
         # NUNCA REJEITAR na Strategy 4 (deixa 5-6 filtrar)
         # Sempre PASS ou WEAK
-        result = StrategyResult.PASS if confidence >= 0.72 else StrategyResult.WEAK
+        result = StrategyResult.PASS if confidence >= self.pass_threshold else StrategyResult.WEAK
         
         return result, confidence, details
 
+    @staticmethod
+    def describe(details: Dict) -> Dict:
+        described = dict(details)
+        if described.get('streak_confirmation') == 'SIM':
+            described['streak_confirmation'] = f"SIM (streak={described['max_streak']})"
+        return described
+
     def _calculate_max_streak(self, colors: List[str]) -> int:
         """Calcula maior sequência de cores iguais"""
         if not colors:
@@ -525,6 +896,227 @@ class Strategy4_ConfirmationFilter(StrategyBase):
         
         return max_streak
 
+    def analyze_batch(self, max_streak: np.ndarray, total_records: int,
+                      desequilibrio: np.ndarray, **_):
+        """
+        analyze() em lote: max_streak vem de WindowFeatures, desequilibrio
+        da engrenagem 1
+        """
+        n = len(max_streak)
+        if total_records < 10:
+            return np.full(n, RESULT_WEAK, dtype=np.int8), np.full(n, 0.65), {}
+        
+        if total_records < self.records_moderate:
+            confidence_base = 0.62
+        elif total_records < self.records_good:
+            confidence_base = 0.65
+        else:
+            confidence_base = 0.68
+        confidences = np.minimum(0.95, confidence_base + np.minimum(0.25, desequilibrio * 0.05))
+        confidences = np.minimum(0.99, confidences + np.where(max_streak >= 2, 0.12, 0.0))
+        results = np.where(confidences >= self.pass_threshold, RESULT_PASS, RESULT_WEAK).astype(np.int8)
+        return results, confidences, {}
+
+    @staticmethod
+    def max_streak_batch(codes: np.ndarray) -> np.ndarray:
+        """Maior sequência de cores iguais nas últimas 20 de cada janela"""
+        n, total = codes.shape
+        if total < 10:
+            return np.zeros(n, dtype=np.int64)
+        
+        # Coluna a coluna: no máximo 19 passos vetorizados
+        recent = codes[:, -20:]
+        current = np.ones(n, dtype=np.int64)
+        max_streak = np.ones(n, dtype=np.int64)
+        for same in (recent[:, 1:] == recent[:, :-1]).T:
+            current = np.where(same, current + 1, 1)
+            np.maximum(max_streak, current, out=max_streak)
+        return max_streak
+
+
+# describe() de cada engrenagem, preenchido no primeiro render_details()
+_DETAIL_RENDERERS: Dict[str, object] = {}
+
+
+def render_details(strategy_name: str, details: Dict) -> Dict:
+    """Detalhes legíveis de uma engrenagem a partir dos brutos guardados no Signal"""
+    if not _DETAIL_RENDERERS:
+        from .monte_carlo_strategy import Strategy5_MonteCarloValidation, Strategy6_RunTestValidation
+        _DETAIL_RENDERERS.update(zip(STAGE_NAMES, (
+            Strategy1_PatternDetection.describe, Strategy2_TechnicalValidation.describe,
+            Strategy3_ConfidenceFilter.describe, Strategy4_ConfirmationFilter.describe,
+            Strategy5_MonteCarloValidation.describe, Strategy6_RunTestValidation.describe)))
+    return _DETAIL_RENDERERS[strategy_name](details)
+
+
+@dataclass
+class StrategyStage:
+    """
+    Metadados de uma engrenagem para o avaliador com curto-circuito
+
+    cost é o tempo médio medido (EWMA, segundos) e define a ordem de execução
+    de decide() entre as etapas prontas. max_passes é o máximo que a etapa
+    pode somar em Signal.strategies_passed (cada PASS vale +12% no
+    multiplicador do finalize).
+    """
+    name: str
+    index: int
+    depends_on: Tuple[str, ...] = ()
+    max_passes: int = 1
+    cost: float = 0.0
+    runs: int = 0
+    skips: int = 0
+
+
+@dataclass
+class WindowFeatures:
+    """
+    Grandezas por janela que não dependem dos limiares (PipelineConfig)
+    
+    Calculadas uma vez (StrategyPipeline.window_features) e reaproveitadas
+    por qualquer configuração em process_windows(features=...).
+    """
+    total_records: int                  # cores por janela
+    vermelho_count: np.ndarray          # vermelhos nas últimas 10
+    preto_count: np.ndarray             # pretos nas últimas 10
+    technical_confidence: np.ndarray    # confiança da engrenagem 2
+    rsi: np.ndarray                     # NaN no modo fallback leve
+    max_streak: np.ndarray              # maior sequência nas últimas 20
+    red_total: np.ndarray               # vermelhos na janela inteira (engrenagem 5)
+    black_total: np.ndarray             # pretos na janela inteira (engrenagem 5)
+    runs_10: np.ndarray                 # runs vermelho x demais nas últimas 10 (engrenagem 6)
+    has_prices: bool = True             # False: engrenagem 2 em fallback (< 5 pontos)
+
+    def __len__(self) -> int:
+        return len(self.vermelho_count)
+
+    def take(self, indices) -> 'WindowFeatures':
+        """Subconjunto das janelas (ex.: um fold do walk-forward)"""
+        return WindowFeatures(
+            self.total_records, self.vermelho_count[indices], self.preto_count[indices],
+            self.technical_confidence[indices], self.rsi[indices], self.max_streak[indices],
+            self.red_total[indices], self.black_total[indices], self.runs_10[indices],
+            self.has_prices
+        )
+
+
+# Colunas de PipelineBatch.results
+BATCH_DTYPE = np.dtype([
+    ('pattern_result', 'i1'), ('pattern_confidence', 'f8'),
+    ('technical_result', 'i1'), ('technical_confidence', 'f8'),
+    ('confidence_result', 'i1'), ('confidence_confidence', 'f8'),
+    ('confirmation_result', 'i1'), ('confirmation_confidence', 'f8'),
+    ('montecarlo_result', 'i1'), ('montecarlo_confidence', 'f8'),
+    ('runtest_result', 'i1'), ('runtest_confidence', 'f8'),
+    ('vermelho_count', 'i4'),
+    ('preto_count', 'i4'),
+    ('desequilibrio', 'i4'),
+    ('signal_type', 'i1'),            # índice em BATCH_SIGNAL_TYPES
+    ('rsi', 'f8'),
+    ('max_streak', 'i4'),
+    ('probability', 'f8'),            # engrenagem 5: frequência da cor esperada na janela
+    ('runs_10', 'i4'),
+    ('initial_confidence', 'f8'),
+    ('strategies_passed', 'i1'),
+    ('final_confidence', 'f8'),
+    ('is_valid', '?'),
+])
+
+# Prefixo das colunas de cada engrenagem em BATCH_DTYPE (os resultados
+# são códigos de RESULT_MEMBERS, como no Signal)
+BATCH_STAGES = (
+    ('Strategy1_Pattern', 'pattern'),
+    ('Strategy2_Technical', 'technical'),
+    ('Strategy3_Confidence', 'confidence'),
+    ('Strategy4_Confirmation', 'confirmation'),
+    ('Strategy5_MonteCarlo', 'montecarlo'),
+    ('Strategy6_RunTest', 'runtest'),
+)
+
+
+class PipelineBatch:
+    """
+    Resultado colunar de StrategyPipeline.process_windows()
+    
+    results é um array estruturado (BATCH_DTYPE) com uma linha por janela.
+    Objetos Signal só são criados quando pedidos (signal(i), valid_signals()).
+    """
+
+    def __init__(self, results: np.ndarray, required_strategies: int, total_records: int,
+                 signal_type: str = 'Unknown', signal_id_prefix: str = 'window_',
+                 timestamp: Optional[datetime] = None,
+                 pass_bonus: float = DEFAULT_CONFIG.pass_bonus):
+        self.results = results
+        self.required_strategies = required_strategies
+        self.pass_bonus = pass_bonus
+        self.total_records = total_records
+        self.signal_type = signal_type
+        self.signal_id_prefix = signal_id_prefix
+        self.timestamp = timestamp or datetime.now()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def is_valid(self) -> np.ndarray:
+        return self.results['is_valid']
+
+    @property
+    def final_confidence(self) -> np.ndarray:
+        return self.results['final_confidence']
+
+    def signal(self, index: int) -> Signal:
+        """Materializa o Signal da janela `index`"""
+        row = self.results[index]
+        signal = Signal(
+            signal_id=f"{self.signal_id_prefix}{index}",
+            signal_type=BATCH_SIGNAL_TYPES[row['signal_type']] or self.signal_type,
+            initial_confidence=float(row['initial_confidence']),
+            timestamp=self.timestamp
+        )
+        
+        details = {
+            'Strategy1_Pattern': {
+                'vermelho_count': int(row['vermelho_count']),
+                'preto_count': int(row['preto_count']),
+                'desequilibrio': int(row['desequilibrio']),
+            },
+            'Strategy2_Technical': {} if np.isnan(row['rsi']) else {'rsi': float(row['rsi'])},
+            'Strategy3_Confidence': {},
+            'Strategy4_Confirmation': {
+                'desequilibrio_strength': int(row['desequilibrio']),
+                'total_records': self.total_records,
+                'max_streak': int(row['max_streak']),
+            },
+            'Strategy5_MonteCarlo': {
+                'observed': int(row['desequilibrio']),
+                'probability_historical': float(row['probability']),
+            },
+            'Strategy6_RunTest': {
+                'actual_runs': int(row['runs_10']),
+                'n_red': int(row['vermelho_count']),
+                'sequence_length': min(10, self.total_records),
+            },
+        }
+        if row['signal_type']:
+            details['Strategy1_Pattern']['subrepresentada'] = BATCH_SIGNAL_TYPES[row['signal_type']]
+        
+        for name, key in BATCH_STAGES:
+            signal.add_strategy_result(name, RESULT_MEMBERS[row[f'{key}_result']],
+                                       float(row[f'{key}_confidence']), details[name])
+        signal.finalize(required_strategies=self.required_strategies, pass_bonus=self.pass_bonus)
+        return signal
+
+    def signals(self, indices=None) -> List[Signal]:
+        """Materializa os Signals das janelas indicadas (padrão: todas)"""
+        if indices is None:
+            indices = range(len(self.results))
+        return [self.signal(int(i)) for i in indices]
+
+    def valid_signals(self) -> List[Signal]:
+        """Materializa apenas os Signals válidos"""
+        return self.signals(np.flatnonzero(self.results['is_valid']))
+
 
 class StrategyPipeline:
     """
@@ -537,29 +1129,114 @@ class StrategyPipeline:
         Dados → [Strategy 1] → [Strategy 2] → [Strategy 3] → [Strategy 4] → Sinal Válido
                     ↓              ↓              ↓              ↓
                  REJECT          WEAK          WEAK          WEAK/PASS
+
+    Avaliação com curto-circuito (short_circuit=True):
+        As etapas prontas rodam da mais barata para a mais cara e a
+        avaliação para assim que o desfecho do finalize() não pode mais
+        mudar; is_valid e final_confidence são idênticos aos de uma
+        avaliação completa (short_circuit=False). Cada etapa pulada conta
+        em get_evaluation_stats().
+        - process_signal(): ordem fixa pelo custo estimado
+          (DEFAULT_STAGE_COSTS), então os campos do Signal não dependem de
+          medições; o Signal só traz as engrenagens executadas.
+        - decide(): só o desfecho, na ordem do custo medido (EWMA).
+
+    keep_details=False descarta os detalhes das engrenagens nos Signals
+    (backtests longos guardam só códigos e confianças).
     """
-    
-    def __init__(self, logger=None):
+
+    # Ordem canônica (chaves de Signal.strategy_results)
+    STAGE_ORDER = STAGE_NAMES
+
+    # Custo inicial estimado (segundos) até existirem medições
+    DEFAULT_STAGE_COSTS = {
+        'Strategy1_Pattern': 5e-6,
+        'Strategy2_Technical': 6e-5,
+        'Strategy3_Confidence': 3e-6,
+        'Strategy4_Confirmation': 1e-5,
+        'Strategy5_MonteCarlo': 5e-3,
+        'Strategy6_RunTest': 3e-5,
+    }
+
+    # Peso da última medição na média móvel de custo
+    COST_EWMA_ALPHA = 0.1
+
+    # Semente do Monte Carlo (Strategy5): o mesmo sinal sempre recebe o mesmo
+    # resultado, e strategies_passed / passed_strategies não dependem do sorteio
+    MONTE_CARLO_SEED = 0
+
+    def __init__(self, logger=None, short_circuit: bool = True,
+                 config: Optional[PipelineConfig] = None, keep_details: bool = True):
         self.logger = logger or logging.getLogger(__name__)
+        self.short_circuit = short_circuit
+        self.keep_details = keep_details
+        self.config = config or DEFAULT_CONFIG
         
         # Importar as novas estratégias
         from .monte_carlo_strategy import Strategy5_MonteCarloValidation, Strategy6_RunTestValidation
         
         # Inicializar estratégias (engrenagens)
         self.strategies = [
-            Strategy1_PatternDetection(),
-            Strategy2_TechnicalValidation(),
-            Strategy3_ConfidenceFilter(),
-            Strategy4_ConfirmationFilter(),
-            Strategy5_MonteCarloValidation(n_simulations=10000),
+            Strategy1_PatternDetection(self.config.pattern_majority, self.config.pattern_minority),
+            Strategy2_TechnicalValidation(self.config.technical_pass),
+            Strategy3_ConfidenceFilter(self.config.min_combined_confidence),
+            Strategy4_ConfirmationFilter(self.config.confirmation_pass,
+                                         self.config.records_moderate, self.config.records_good),
+            Strategy5_MonteCarloValidation(n_simulations=10000, seed=self.MONTE_CARLO_SEED),
             Strategy6_RunTestValidation()
         ]
 
+        # PASS de qualquer engrenagem (PASS_CODES) soma 1 em strategies_passed
+        self.stages = {
+            'Strategy1_Pattern': StrategyStage('Strategy1_Pattern', 0),
+            'Strategy2_Technical': StrategyStage('Strategy2_Technical', 1, ('Strategy1_Pattern',)),
+            'Strategy3_Confidence': StrategyStage(
+                'Strategy3_Confidence', 2, ('Strategy1_Pattern', 'Strategy2_Technical')),
+            'Strategy4_Confirmation': StrategyStage('Strategy4_Confirmation', 3, ('Strategy1_Pattern',)),
+            'Strategy5_MonteCarlo': StrategyStage('Strategy5_MonteCarlo', 4, ('Strategy1_Pattern',)),
+            'Strategy6_RunTest': StrategyStage('Strategy6_RunTest', 5),
+        }
+        for name, stage in self.stages.items():
+            stage.cost = self.DEFAULT_STAGE_COSTS[name]
+        # Ordem fixa de process_signal(): custo estimado, respeitando dependências
+        self.execution_order = self._cost_order(lambda stage: self.DEFAULT_STAGE_COSTS[stage.name])
+
+        self.signals_evaluated = 0
+
+    def required_strategies_for(self, total_records: int) -> int:
+        """
+        Quantas estratégias precisam passar, conforme a qualidade dos dados
+
+        Heurística adaptativa:
+        - total_records < 30 : ambiente fallback -> exigir 1 estratégia
+        - 30 <= total_records < 100 : dados moderados -> exigir 2 estratégias
+        - total_records >= 100 : dados bons -> exigir 3 estratégias
+        
+        (limites configuráveis em PipelineConfig.records_moderate/records_good)
+        """
+        if total_records < self.config.records_moderate:
+            return 1
+        elif total_records < self.config.records_good:
+            return 2
+        return 3
+
+    def required_features(self) -> Tuple[str, ...]:
+        """Colunas do FeatureStore consumidas pelas estratégias (FEATURES)"""
+        columns = []
+        for strategy in self.strategies:
+            columns.extend(c for c in getattr(strategy, 'FEATURES', ()) if c not in columns)
+        return tuple(columns)
+
     def process_signal(self, signal_data: Dict) -> Signal:
         """
-        Processa um sinal através de todas as estratégias com EARLY STOPPING
+        Processa um sinal através das estratégias
         
-        OTIMIZAÇÃO: Para ao acertar 4/6 estratégias (economia de 33% computação)
+        Com short_circuit=True as engrenagens rodam em execution_order
+        (mais barata primeiro) e param quando o desfecho do finalize() está
+        decidido: Monte Carlo, a mais cara, só roda se ainda puder mudá-lo.
+        strategy_results, strategies_passed e passed_strategies trazem só as
+        engrenagens executadas; is_valid e final_confidence são os de uma
+        avaliação completa. Com short_circuit=False as seis rodam sempre.
         
         Args:
             signal_data: {
@@ -568,114 +1245,180 @@ class StrategyPipeline:
                 'all_colors': [...],
                 'prices': [...],
                 'game_id': 'xxx',
-                'timestamp': datetime
+                'timestamp': datetime,
+                'features': {...}     # opcional: FeatureStore.latest()
             }
         
         Returns:
-            Signal com resultados de todas as estratégias (ou até early stop)
+            Signal com os resultados das estratégias executadas
         """
-        signal_id = signal_data.get('signal_id', 'unknown')
-        timestamp = signal_data.get('timestamp', datetime.now())
+        signal = self._new_signal(signal_data)
+        required = self.required_strategies_for(len(signal_data.get('all_colors', [])))
+        self.signals_evaluated += 1
+
+        outputs, _ = self._evaluate(signal_data, signal, required,
+                                    lambda stage: self.execution_order.index(stage.name))
+
+        for name in self.STAGE_ORDER:
+            if name in outputs:
+                result, conf, details = outputs[name]
+                signal.add_strategy_result(name, result, conf,
+                                           details if self.keep_details else None)
+
+        # Finalizar sinal (determina validade)
+        signal.finalize(required_strategies=required, pass_bonus=self.config.pass_bonus)
         
-        # Criar sinal inicial
-        signal = Signal(
-            signal_id=signal_id,
+        return signal
+
+    def decide(self, signal_data: Dict) -> Tuple[bool, float, str]:
+        """
+        Só o desfecho do finalize(): (is_valid, final_confidence, signal_type)
+        
+        Com short_circuit=True, as etapas que ainda podem mudar o desfecho
+        rodam da mais barata para a mais cara (custo medido) e a avaliação
+        para assim que ele está matematicamente decidido. O desfecho é
+        idêntico ao de process_signal() para os mesmos dados.
+        """
+        signal = self._new_signal(signal_data)
+        required = self.required_strategies_for(len(signal_data.get('all_colors', [])))
+        self.signals_evaluated += 1
+
+        _, passed = self._evaluate(signal_data, signal, required, lambda stage: stage.cost)
+        is_valid, final_confidence = Signal.resolve_outcome(
+            signal.initial_confidence, passed, required, self.config.pass_bonus)
+        return is_valid, final_confidence, signal.signal_type
+
+    def _cost_order(self, cost) -> Tuple[str, ...]:
+        """Ordem de execução: a etapa pronta mais barata (cost) a cada passo"""
+        order: List[str] = []
+        pending = list(self.STAGE_ORDER)
+        while pending:
+            stage = min((self.stages[name] for name in pending
+                         if all(dep in order for dep in self.stages[name].depends_on)), key=cost)
+            pending.remove(stage.name)
+            order.append(stage.name)
+        return tuple(order)
+
+    def _evaluate(self, signal_data: Dict, signal: Signal, required: int, cost
+                  ) -> Tuple[Dict[str, Tuple[StrategyResult, float, Dict]], int]:
+        """
+        Roda as etapas prontas em ordem de `cost` até o desfecho estar decidido
+
+        Sem short_circuit roda todas. Returns: (saídas por etapa, nº de PASS)
+        """
+        outputs: Dict[str, Tuple[StrategyResult, float, Dict]] = {}
+        pending = list(self.STAGE_ORDER)
+        passed = 0
+
+        while pending:
+            remaining = sum(self.stages[name].max_passes for name in pending)
+            if self.short_circuit and Signal.is_outcome_determined(
+                    signal.initial_confidence, passed, remaining, required,
+                    self.config.pass_bonus):
+                self.logger.debug("[EARLY STOP] Sinal %s: resultado decidido com %d PASS. Pulando %s.",
+                                  signal.signal_id, passed, tuple(pending))
+                for name in pending:
+                    self.stages[name].skips += 1
+                break
+
+            # Etapa pronta mais barata
+            stage = min(
+                (self.stages[name] for name in pending
+                 if all(dep in outputs for dep in self.stages[name].depends_on)),
+                key=cost
+            )
+            pending.remove(stage.name)
+            if result_code(self._run_stage(stage, signal_data, signal, outputs)) in PASS_CODES:
+                passed += 1
+
+        return outputs, passed
+
+    def _new_signal(self, signal_data: Dict) -> Signal:
+        return Signal(
+            signal_id=signal_data.get('signal_id', 'unknown'),
             signal_type=signal_data.get('signal_type', 'Unknown'),
             initial_confidence=signal_data.get('initial_confidence', 0.60),
-            timestamp=timestamp
+            timestamp=signal_data.get('timestamp', datetime.now())
         )
-        
-        # ====== ENGRENAGEM 1: Detecção de Padrão ======
-        result1, conf1, details1 = self.strategies[0].analyze(signal_data)
-        signal.add_strategy_result('Strategy1_Pattern', result1, conf1, details1)
-        
+
+    def _run_stage(self, stage: StrategyStage, signal_data: Dict, signal: Signal,
+                   outputs: Dict[str, Tuple[StrategyResult, float, Dict]]) -> StrategyResult:
+        """Executa uma engrenagem, mede o custo (EWMA) e guarda a saída em outputs"""
+        stage_input = self._build_stage_input(stage.name, signal_data, signal, outputs)
+        started = time.perf_counter()
+        outputs[stage.name] = self.strategies[stage.index].analyze(stage_input)
+        elapsed = time.perf_counter() - started
+
+        stage.runs += 1
+        stage.cost += self.COST_EWMA_ALPHA * (elapsed - stage.cost)
+
+        result, _, details = outputs[stage.name]
         # NÃO PARAR se falhar - continuar nas outras estratégias
         # Salvar tipo de sinal para próximas estratégias
-        if result1 != StrategyResult.REJECT:
-            signal.signal_type = details1.get('subrepresentada', signal.signal_type)
-        
-        # ====== ENGRENAGEM 2: Validação Técnica ======
-        tech_data = {
-            'prices': signal_data.get('prices', []),
-            'signal_type': signal.signal_type
-        }
-        result2, conf2, details2 = self.strategies[1].analyze(tech_data)
-        signal.add_strategy_result('Strategy2_Technical', result2, conf2, details2)
-        
-        # ====== ENGRENAGEM 3: Filtro de Confiança ======
-        confidence_data = {
-            'confidence_pattern': conf1,
-            'confidence_technical': conf2,
-            'strategy_count': 2
-        }
-        result3, conf3, details3 = self.strategies[2].analyze(confidence_data)
-        signal.add_strategy_result('Strategy3_Confidence', result3, conf3, details3)
-        
-        # ====== ENGRENAGEM 4: Confirmação ======
-        confirmation_data = {
-            'all_colors': signal_data.get('all_colors', []),
-            'desequilibrio': details1.get('desequilibrio', 0),
-            'recent_colors': signal_data.get('recent_colors', [])
-        }
-        result4, conf4, details4 = self.strategies[3].analyze(confirmation_data)
-        signal.add_strategy_result('Strategy4_Confirmation', result4, conf4, details4)
-        
-        # ===== EARLY STOPPING CHECK #1 =====
-        # Se já passaram em 4 estratégias, parar aqui e economizar computação
-        # (Economy: -33% computation = ~2 menos validações)
-        if signal.strategies_passed >= 4:
-            self.logger.debug(f"[EARLY STOP] Sinal {signal_id}: "
-                            f"4/4 estratégias passaram em Strategy4. "
-                            f"Pulando Strategy5-6.")
-            signal.finalize(required_strategies=1)  # Já validado
-            return signal
-        
-        # ====== ENGRENAGEM 5: Monte Carlo Validation ======
-        monte_carlo_data = {
-            'historical_colors': signal_data.get('all_colors', []),
-            'observed_count': details1.get('desequilibrio', 0),
-            'total_games': 10,
-            'expected_color': signal.signal_type
-        }
-        result5, conf5, details5 = self.strategies[4].analyze(monte_carlo_data)
-        signal.add_strategy_result('Strategy5_MonteCarlo', result5, conf5, details5)
-        
-        # ===== EARLY STOPPING CHECK #2 =====
-        # Se passaram em 5 estratégias, parar aqui
-        if signal.strategies_passed >= 5:
-            self.logger.debug(f"[EARLY STOP] Sinal {signal_id}: "
-                            f"5/5 estratégias passaram em Strategy5. "
-                            f"Pulando Strategy6.")
-            signal.finalize(required_strategies=1)
-            return signal
-        
+        if stage.name == 'Strategy1_Pattern' and result != StrategyResult.REJECT:
+            signal.signal_type = details.get('subrepresentada', signal.signal_type)
+        return result
+
+    def _build_stage_input(self, name: str, signal_data: Dict, signal: Signal,
+                           outputs: Dict[str, Tuple[StrategyResult, float, Dict]]) -> Dict:
+        """Monta o dict de entrada de cada engrenagem a partir dos dados e etapas anteriores"""
+        if name == 'Strategy1_Pattern':
+            return signal_data
+
+        details1 = outputs['Strategy1_Pattern'][2] if 'Strategy1_Pattern' in outputs else {}
+
+        if name == 'Strategy2_Technical':
+            # ====== ENGRENAGEM 2: Validação Técnica ======
+            return {
+                'prices': signal_data.get('prices', []),
+                'signal_type': signal.signal_type
+            }
+        if name == 'Strategy3_Confidence':
+            # ====== ENGRENAGEM 3: Filtro de Confiança ======
+            return {
+                'confidence_pattern': outputs['Strategy1_Pattern'][1],
+                'confidence_technical': outputs['Strategy2_Technical'][1],
+                'strategy_count': 2
+            }
+        if name == 'Strategy4_Confirmation':
+            # ====== ENGRENAGEM 4: Confirmação ======
+            return {
+                'all_colors': signal_data.get('all_colors', []),
+                'desequilibrio': details1.get('desequilibrio', 0),
+                'recent_colors': signal_data.get('recent_colors', []),
+                'features': signal_data.get('features')
+            }
+        if name == 'Strategy5_MonteCarlo':
+            # ====== ENGRENAGEM 5: Monte Carlo Validation ======
+            return {
+                'historical_colors': signal_data.get('all_colors', []),
+                'observed_count': details1.get('desequilibrio', 0),
+                'total_games': 10,
+                'expected_color': signal.signal_type
+            }
         # ====== ENGRENAGEM 6: Run Test Validation ======
-        run_test_data = {
+        return {
             'historical_colors': signal_data.get('all_colors', []),
-            'color_sequence': signal_data.get('recent_colors', [])
+            'color_sequence': signal_data.get('recent_colors', []),
+            'features': signal_data.get('features')
         }
-        result6, conf6, details6 = self.strategies[5].analyze(run_test_data)
-        signal.add_strategy_result('Strategy6_RunTest', result6, conf6, details6)
-        
-        # Finalizar sinal (determina validade)
-        # Decidir required_strategies de forma adaptativa com base na qualidade dos dados
-        all_colors = signal_data.get('all_colors', [])
-        total_records = len(all_colors)
-
-        # Heurística adaptativa:
-        # - total_records < 30 : ambiente fallback -> exigir 1 estratégia
-        # - 30 <= total_records < 100 : dados moderados -> exigir 2 estratégias
-        # - total_records >= 100 : dados bons -> exigir 3 estratégias
-        if total_records < 30:
-            required = 1
-        elif total_records < 100:
-            required = 2
-        else:
-            required = 3
 
-        signal.finalize(required_strategies=required)
-        
-        return signal
+    def get_evaluation_stats(self) -> Dict:
+        """Contadores do avaliador: execuções, pulos e custo medido por estratégia"""
+        total = max(self.signals_evaluated, 1)
+        return {
+            'signals_evaluated': self.signals_evaluated,
+            'short_circuit': self.short_circuit,
+            'strategies': {
+                name: {
+                    'runs': stage.runs,
+                    'skips': stage.skips,
+                    'skip_rate': round(stage.skips / total, 3),
+                    'avg_cost_us': round(stage.cost * 1e6, 2),
+                }
+                for name, stage in self.stages.items()
+            }
+        }
 
     def process_batch(self, signals_data: List[Dict]) -> List[Signal]:
         """
@@ -692,6 +1435,123 @@ class StrategyPipeline:
         
         return signals
 
+    def window_features(self, colors, prices=None) -> WindowFeatures:
+        """
+        Pré-calcula as grandezas das janelas que independem dos limiares
+        
+        Args:
+            colors: Matriz (janelas x cores) de nomes de cores ou códigos
+                    (1 = vermelho, -1 = preto, 0 = branco)
+            prices: Matriz (janelas x pontos) de preços, ou None
+        """
+        codes, is_red, is_black = encode_window_colors(colors)
+        n, total_records = codes.shape
+        if prices is not None:
+            prices = np.asarray(prices)
+            if prices.ndim != 2 or len(prices) != n:
+                raise ValueError("prices deve ser uma matriz com uma linha por janela")
+        
+        technical_confidence, rsi = Strategy2_TechnicalValidation.technical_features(prices, n)
+        from .monte_carlo_strategy import Strategy6_RunTestValidation
+        return WindowFeatures(
+            total_records=total_records,
+            vermelho_count=is_red[:, -10:].sum(axis=1),
+            preto_count=is_black[:, -10:].sum(axis=1),
+            technical_confidence=technical_confidence,
+            rsi=rsi,
+            max_streak=Strategy4_ConfirmationFilter.max_streak_batch(codes),
+            red_total=is_red.sum(axis=1),
+            black_total=is_black.sum(axis=1),
+            runs_10=Strategy6_RunTestValidation.runs_batch(is_red[:, -10:]),
+            has_prices=prices is not None and prices.shape[1] >= 5,
+        )
+
+    def process_windows(self, colors=None, prices=None, initial_confidence=0.60,
+                        signal_type: str = 'Unknown',
+                        signal_id_prefix: str = 'window_',
+                        features: Optional[WindowFeatures] = None) -> PipelineBatch:
+        """
+        Processa muitas janelas de uma vez, em forma colunar
+        
+        Cada linha equivale a process_signal() com all_colors = colors[i],
+        recent_colors = colors[i][-10:] e prices = prices[i] (sem
+        curto-circuito): is_valid, final_confidence e o resultado/confiança
+        das seis engrenagens são os mesmos. Strategy5/6 avaliam cada
+        combinação distinta de entradas uma vez por lote.
+        
+        Args:
+            colors: Matriz (janelas x cores) de nomes de cores ou códigos
+                    (1 = vermelho, -1 = preto, 0 = branco)
+            prices: Matriz (janelas x pontos) de preços, ou None
+            initial_confidence: Escalar ou array com uma confiança por janela
+            signal_type: Tipo usado quando a engrenagem 1 não define a cor
+            features: WindowFeatures já calculadas (dispensa colors/prices)
+        
+        Returns:
+            PipelineBatch (array estruturado + Signals sob demanda)
+        """
+        if features is None:
+            features = self.window_features(colors, prices)
+        
+        n, total_records = len(features), features.total_records
+        out = np.zeros(n, dtype=BATCH_DTYPE)
+        pattern, technical, confidence, confirmation, monte_carlo, run_test = self.strategies
+        
+        # ====== ENGRENAGEM 1: Detecção de Padrão ======
+        results1, conf1, extras1 = pattern.analyze_batch(
+            features.vermelho_count, features.preto_count, total_records)
+        # ====== ENGRENAGEM 2: Validação Técnica ======
+        results2, conf2, _ = technical.analyze_batch(
+            features.technical_confidence, features.has_prices)
+        # ====== ENGRENAGEM 3: Filtro de Confiança ======
+        results3, conf3, _ = confidence.analyze_batch(
+            confidence_pattern=conf1, confidence_technical=conf2)
+        # ====== ENGRENAGEM 4: Confirmação ======
+        results4, conf4, _ = confirmation.analyze_batch(
+            features.max_streak, total_records, extras1['desequilibrio'])
+        
+        # ====== ENGRENAGEM 5: Monte Carlo Validation ======
+        # Cor esperada: a subrepresentada da engrenagem 1, senão signal_type
+        default_type = signal_type.lower()
+        default_count = (features.red_total if default_type in RED_NAMES else
+                         features.black_total if default_type in BLACK_NAMES else
+                         np.zeros(n, dtype=np.int64))
+        expected_count = np.select([extras1['signal_type'] == 1, extras1['signal_type'] == 2],
+                                   [features.red_total, features.black_total], default_count)
+        probability = expected_count / total_records if total_records else np.full(n, 0.5)
+        results5, conf5, _ = monte_carlo.analyze_batch(
+            probability, extras1['desequilibrio'], total_records)
+        # ====== ENGRENAGEM 6: Run Test Validation ======
+        results6, conf6, _ = run_test.analyze_batch(
+            features.runs_10, features.vermelho_count, min(10, total_records))
+        from .monte_carlo_strategy import VALIDATION_RESULTS
+        validation_codes = np.array([result_code(member) for member in VALIDATION_RESULTS], dtype=np.int8)
+        
+        stage_outputs = ((results1, conf1), (results2, conf2), (results3, conf3), (results4, conf4),
+                         (validation_codes[results5], conf5), (validation_codes[results6], conf6))
+        pass_codes = np.fromiter(PASS_CODES, dtype=np.int64)
+        for (_, key), (results, confidences) in zip(BATCH_STAGES, stage_outputs):
+            out[f'{key}_result'] = results
+            out[f'{key}_confidence'] = confidences
+            out['strategies_passed'] += np.isin(results, pass_codes)
+        
+        out['vermelho_count'] = features.vermelho_count
+        out['preto_count'] = features.preto_count
+        out['desequilibrio'] = extras1['desequilibrio']
+        out['signal_type'] = extras1['signal_type']
+        out['rsi'] = features.rsi
+        out['max_streak'] = features.max_streak
+        out['probability'] = probability
+        out['runs_10'] = features.runs_10
+        out['initial_confidence'] = initial_confidence
+        
+        required = self.required_strategies_for(total_records)
+        out['is_valid'], out['final_confidence'] = Signal.resolve_outcomes(
+            out['initial_confidence'], out['strategies_passed'], required, self.config.pass_bonus)
+        
+        return PipelineBatch(out, required, total_records, signal_type, signal_id_prefix,
+                             pass_bonus=self.config.pass_bonus)
+
     def get_valid_signals(self, signals: List[Signal]) -> List[Signal]:
         """Retorna apenas sinais válidos (passaram em 3+ estratégias)"""
         return [s for s in signals if s.is_valid]
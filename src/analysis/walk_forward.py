@@ -0,0 +1,307 @@
+"""
+Backtest Walk-Forward com resolução real dos resultados
+=======================================================
+
+Diferente do Backtester (que sorteia vitórias com um win_rate fixo), cada
+sinal é resolvido contra as rodadas REAIS seguintes do histórico.
+
+- Pré-cálculo O(N): cores codificadas, horários, features das janelas
+  (StrategyPipeline.window_features) e, para cada janela e cor, em qual
+  tentativa a cor aparece nas próximas `attempts` rodadas (hit_offset).
+- Resolução vetorizada: ganho/perda de todas as apostas de um fold por
+  indexação nesses arrays, sem loop por trade.
+- Folds deslizantes treino/teste: um `learner` (opcional) é ajustado no
+  treino e decide as apostas do teste (ex.: SweepLearner escolhe os
+  limiares do pipeline com a varredura de parâmetros).
+- Trades gravados em disco (JSONL) fold a fold.
+
+Gale: com attempts > 1, a aposta é repetida nas rodadas seguintes até a cor
+sair, multiplicando o stake por `gale_factor` a cada tentativa.
+
+Uso:
+    wf = WalkForwardBacktester.from_data_path('data/raw/', attempts=2)
+    report = wf.run(train_size=2000, test_size=500,
+                    learner=SweepLearner({'technical_pass': [0.65, 0.70, 0.75]}),
+                    output_path='data/backtests/walk_forward.jsonl')
+    print(report['summary'])
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .strategy_pipeline import (
+    BATCH_SIGNAL_TYPES, DEFAULT_CONFIG, PipelineBatch, PipelineConfig, StrategyPipeline,
+    WindowFeatures
+)
+from .parameter_sweep import BET_COLOR_BY_SIGNAL, ParameterSweep, build_windows
+
+logger = logging.getLogger(__name__)
+
+
+def _record_times(records: Sequence[Dict]) -> np.ndarray:
+    """Horário de cada registro (created_at/timestamp) como datetime64, NaT se ausente"""
+    raw = [r.get('created_at') or r.get('timestamp') for r in records]
+    times = pd.to_datetime(pd.Series(raw, dtype=object), errors='coerce', utc=True)
+    return times.dt.tz_localize(None).to_numpy('datetime64[ns]')
+
+
+def first_hit_offsets(outcomes: np.ndarray, color: int, attempts: int) -> np.ndarray:
+    """
+    Para cada janela i, em qual tentativa (0-based) `color` sai nas rodadas
+    outcomes[i], outcomes[i + 1], ... outcomes[i + attempts - 1]
+
+    Returns:
+        Array int8: tentativa do acerto, -1 se não saiu, -2 se o histórico
+        termina antes de resolver a aposta
+    """
+    n = len(outcomes)
+    offsets = np.full(n, -1, dtype=np.int8)
+    # Da última tentativa para a primeira: o menor acerto prevalece
+    for attempt in range(attempts - 1, -1, -1):
+        hit = np.zeros(n, dtype=bool)
+        hit[:n - attempt] = outcomes[attempt:] == color
+        offsets[hit] = attempt
+    unresolved = max(attempts - 1, 0)
+    if unresolved:
+        # Sem acerto e sem rodadas suficientes: aposta não resolvível
+        tail = offsets[n - unresolved:]
+        tail[tail == -1] = -2
+    return offsets
+
+
+@dataclass
+class FoldData:
+    """Fatia de janelas [start, stop) usada como treino ou teste"""
+    start: int
+    stop: int
+    features: WindowFeatures
+    outcomes: np.ndarray          # cor da rodada seguinte (1 / -1 / 0)
+    times: np.ndarray             # horário da última rodada de cada janela
+    backtester: 'WalkForwardBacktester'
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+
+class SweepLearner:
+    """
+    Learner de walk-forward: escolhe os limiares do pipeline no treino
+
+    fit() roda a varredura de parâmetros (grade) no fold de treino e guarda
+    a melhor PipelineConfig; decide() aplica essa configuração no teste.
+
+    Qualquer objeto com fit(FoldData) e decide(FoldData) -> PipelineBatch
+    serve como learner (ex.: ajustar o MetaLearner com os trades do treino).
+    """
+
+    def __init__(self, space: Dict[str, Sequence], min_bets: int = 30, workers: int = 1):
+        self.space = space
+        self.min_bets = min_bets
+        self.workers = workers
+        self.config: Optional[PipelineConfig] = None
+
+    def fit(self, train: FoldData):
+        bt = train.backtester
+        sweep = ParameterSweep(train.features, train.outcomes, bt.initial_confidence,
+                               stake=bt.stake, payout=bt.payout, min_bets=self.min_bets)
+        best = sweep.run_grid(self.space, workers=self.workers).iloc[0]
+        self.config = DEFAULT_CONFIG.with_changes(**{
+            name: type(getattr(DEFAULT_CONFIG, name))(best[name]) for name in self.space
+        })
+        logger.info("[WALK-FORWARD] Treino %s-%s: ROI %.2f%% com %s", train.start, train.stop, best['roi'] * 100,
+                    ', '.join(f"{name}={getattr(self.config, name)}" for name in self.space))
+
+    def decide(self, test: FoldData) -> PipelineBatch:
+        pipeline = StrategyPipeline(config=self.config)
+        return test.backtester.decide(test, pipeline)
+
+
+class WalkForwardBacktester:
+    """
+    Backtest walk-forward sobre o histórico de rodadas do Double
+
+    Args:
+        records: Registros {'color', 'roll', 'created_at'|'timestamp'} em ordem
+        window_size: Rodadas por janela de análise
+        pipeline: Pipeline padrão (sem learner)
+        stake: Aposta inicial por sinal
+        payout: Multiplicador pago no acerto (vermelho/preto = 2x)
+        attempts: Rodadas seguintes em que a aposta pode acertar (1 = sem gale)
+        gale_factor: Multiplicador do stake a cada nova tentativa
+        initial_confidence: Confiança inicial dos sinais
+    """
+
+    def __init__(self, records: Sequence[Dict], window_size: int = 20,
+                 pipeline: Optional[StrategyPipeline] = None,
+                 stake: float = 10.0, payout: float = 2.0,
+                 attempts: int = 1, gale_factor: float = 2.0,
+                 initial_confidence: Union[float, np.ndarray] = 0.60):
+        if attempts < 1:
+            raise ValueError("attempts deve ser >= 1")
+        self.window_size = window_size
+        self.pipeline = pipeline or StrategyPipeline()
+        self.stake = stake
+        self.payout = payout
+        self.attempts = attempts
+        self.gale_factor = gale_factor
+        self.initial_confidence = initial_confidence
+
+        records = [r for r in records if r.get('color') not in (None, '')]
+        colors, rolls, self.outcomes = build_windows(records, window_size)
+        self.features = self.pipeline.window_features(colors, rolls)
+        self.times = _record_times(records)[window_size - 1:-1]
+
+        # Tentativa do acerto por cor apostada
+        self.hit_offsets = {
+            color: first_hit_offsets(self.outcomes, color, attempts) for color in (1, -1)
+        }
+        # Resultado líquido por tentativa do acerto; último item = nenhuma acertou
+        stakes = stake * gale_factor ** np.arange(attempts)
+        self.net_by_offset = np.append(stakes * payout - np.cumsum(stakes), -stakes.sum())
+        self.cost_by_offset = np.append(np.cumsum(stakes), stakes.sum())
+
+        logger.info("[WALK-FORWARD] %s janelas pré-calculadas (janela=%s, tentativas=%s)",
+                    len(self.outcomes), window_size, attempts)
+
+    @classmethod
+    def from_data_path(cls, data_path: str = 'data/raw/', start_date: str = None,
+                       end_date: str = None, **kwargs) -> 'WalkForwardBacktester':
+        """Carrega o histórico JSON (mesmo formato do Backtester)"""
+        from .backtester import Backtester
+
+        backtester = Backtester(data_path)
+        backtester.load_historical_data(start_date, end_date)
+        return cls(backtester.historical_data, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def fold(self, start: int, stop: int) -> FoldData:
+        index = slice(start, stop)
+        return FoldData(start, stop, self.features.take(index), self.outcomes[index],
+                        self.times[index], self)
+
+    def decide(self, fold: FoldData, pipeline: Optional[StrategyPipeline] = None) -> PipelineBatch:
+        """Avalia as janelas do fold com o pipeline (padrão: o do backtester)"""
+        return (pipeline or self.pipeline).process_windows(
+            features=fold.features, initial_confidence=self.initial_confidence)
+
+    def resolve(self, fold: FoldData, batch: PipelineBatch) -> pd.DataFrame:
+        """
+        Resolve as apostas de um fold contra as rodadas reais seguintes
+
+        Aposta-se em toda janela válida cuja engrenagem 1 definiu a cor.
+
+        Returns:
+            DataFrame com um trade por linha (janelas sem aposta ou que o
+            histórico não consegue resolver são omitidas)
+        """
+        decisions = np.where(batch.is_valid, batch.results['signal_type'], 0)
+        bet_colors = BET_COLOR_BY_SIGNAL[decisions]
+        offsets = np.full(len(fold), -2, dtype=np.int8)
+        for color, hits in self.hit_offsets.items():
+            chosen = bet_colors == color
+            offsets[chosen] = hits[fold.start:fold.stop][chosen]
+
+        placed = np.flatnonzero((bet_colors != 0) & (offsets != -2))
+        attempt = offsets[placed]
+        lookup = np.where(attempt >= 0, attempt, self.attempts)
+
+        return pd.DataFrame({
+            'window': fold.start + placed,
+            'signal_time': fold.times[placed],
+            'signal_type': np.array(BATCH_SIGNAL_TYPES, dtype=object)[decisions[placed]],
+            'confidence': batch.final_confidence[placed],
+            'result': np.where(attempt >= 0, 'WIN', 'LOSS'),
+            'attempts_used': np.where(attempt >= 0, attempt + 1, self.attempts),
+            'staked': self.cost_by_offset[lookup],
+            'profit_loss': self.net_by_offset[lookup],
+        })
+
+    def run(self, train_size: int = 0, test_size: Optional[int] = None,
+            step: Optional[int] = None, learner=None,
+            output_path: Optional[Union[str, Path]] = None) -> Dict:
+        """
+        Executa o walk-forward
+
+        Folds: treino [s, s + train_size), teste [s + train_size, + test_size),
+        avançando `step` janelas (padrão: test_size, testes sem sobreposição).
+        Sem learner, train_size pode ser 0 e cada fold usa o pipeline padrão.
+
+        Args:
+            learner: Objeto com fit(FoldData) e decide(FoldData) -> PipelineBatch
+            output_path: Arquivo JSONL recriado a cada execução; os trades de
+                cada fold são gravados assim que o fold termina
+
+        Returns:
+            {'summary': métricas totais, 'folds': métricas por fold}
+        """
+        if learner is not None and train_size <= 0:
+            raise ValueError("train_size deve ser > 0 quando há learner")
+        total = len(self)
+        test_size = test_size or (total - train_size)
+        step = step or test_size
+        if test_size <= 0 or train_size + test_size > total:
+            raise ValueError(f"train_size + test_size excede as {total} janelas disponíveis")
+
+        sink = None
+        if output_path is not None:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(output_path, 'w', encoding='utf-8')
+
+        folds: List[Dict] = []
+        pnl_chunks: List[np.ndarray] = []
+        try:
+            for fold_id, start in enumerate(range(0, total - train_size - test_size + 1, step)):
+                test = self.fold(start + train_size, start + train_size + test_size)
+                if learner is not None:
+                    learner.fit(self.fold(start, start + train_size))
+                    batch = learner.decide(test)
+                else:
+                    batch = self.decide(test)
+
+                trades = self.resolve(test, batch)
+                trades.insert(0, 'fold', fold_id)
+                pnl_chunks.append(trades['profit_loss'].to_numpy())
+                folds.append({'fold': fold_id, 'test_start': test.start, 'test_stop': test.stop,
+                              **self._metrics(trades)})
+
+                if sink is not None and not trades.empty:
+                    trades.assign(signal_time=trades['signal_time'].dt.strftime('%Y-%m-%dT%H:%M:%S')) \
+                          .to_json(sink, orient='records', lines=True, force_ascii=False)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        all_pnl = np.concatenate(pnl_chunks) if pnl_chunks else np.array([])
+        summary = self._metrics_from_pnl(all_pnl, sum(f['staked'] for f in folds))
+        summary['folds'] = len(folds)
+        logger.info("[WALK-FORWARD] %s folds, %s trades, win rate %.1f%%, ROI %.2f%%",
+                    len(folds), summary['total_trades'], summary['win_rate'] * 100, summary['roi'] * 100)
+        return {'summary': summary, 'folds': folds}
+
+    def _metrics(self, trades: pd.DataFrame) -> Dict:
+        return self._metrics_from_pnl(trades['profit_loss'].to_numpy(), float(trades['staked'].sum()))
+
+    @staticmethod
+    def _metrics_from_pnl(pnl: np.ndarray, staked: float) -> Dict:
+        equity = np.concatenate(([0.0], np.cumsum(pnl)))
+        drawdown = np.maximum.accumulate(equity) - equity
+        trades = len(pnl)
+        wins = int((pnl > 0).sum())
+        return {
+            'total_trades': trades,
+            'wins': wins,
+            'losses': trades - wins,
+            'win_rate': wins / trades if trades else 0.0,
+            'total_profit': float(equity[-1]),
+            'staked': float(staked),
+            'roi': float(equity[-1]) / staked if staked else 0.0,
+            'max_drawdown': float(drawdown.max()),
+        }
@@ -1,12 +1,29 @@
 """
 Sistema de logging estruturado com múltiplos handlers
+
+Por padrão os handlers (console, arquivos rotativos, JSON) rodam numa
+thread própria (QueueListener): a thread de análise só enfileira o
+LogRecord, sem formatar a mensagem nem tocar em disco. Mensagens
+repetitivas por sinal passam por amostragem (SamplingFilter).
+
+Uso:
+    setup_logging(log_dir='logs')
+    logger.info("Sinal %s: confiança %.2f", signal_type, confidence)   # formatado no listener
+    stop_logging()                                                     # esvazia a fila (também no atexit)
 """
+import atexit
 import logging
 import logging.handlers
 import os
 import json
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List
+
+# Tamanho da fila entre a thread de análise e o listener
+DEFAULT_QUEUE_SIZE = 10000
 
 # Cores para console
 class ColoredFormatter(logging.Formatter):
@@ -22,6 +39,8 @@ class ColoredFormatter(logging.Formatter):
     RESET = '\033[0m'
     
     def format(self, record):
+        # Cópia: o mesmo record segue para os outros handlers do listener
+        record = logging.makeLogRecord(record.__dict__)
         log_color = self.COLORS.get(record.levelname, self.RESET)
         record.levelname = f"{log_color}{record.levelname}{self.RESET}"
         return super().format(record)
@@ -52,11 +71,177 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_data, ensure_ascii=False)
 
 
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem de mensagens repetitivas, por logger + template da mensagem
+
+    Em cada janela de `interval` segundos passam as `burst` primeiras
+    ocorrências de cada template; depois, 1 a cada `every`. Registros com
+    nível acima de `max_level` nunca são descartados. Com mensagens no
+    estilo %s (argumentos separados) o template é o mesmo para todos os
+    sinais; mensagens já formatadas (f-string) contam como templates
+    distintos.
+
+    Args:
+        loggers: Loggers amostrados (e seus filhos); vazio = todos
+        burst: Ocorrências por janela antes de amostrar
+        every: Fração mantida depois do burst (1 a cada `every`)
+        interval: Duração da janela em segundos
+        max_level: Maior nível amostrado
+        clock: Relógio monotônico (injetável em testes)
+    """
+
+    def __init__(self, loggers: Iterable[str] = (), burst: int = 20, every: int = 10,
+                 interval: float = 60.0, max_level: int = logging.INFO,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.loggers = tuple(loggers)
+        self.burst = burst
+        self.every = max(1, every)
+        self.interval = interval
+        self.max_level = max_level
+        self.clock = clock
+        self.window_start = clock()
+        self.counts: Dict[tuple, int] = {}
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def _sampled(self, name: str) -> bool:
+        if not self.loggers:
+            return True
+        return any(name == prefix or name.startswith(prefix + '.') for prefix in self.loggers)
+
+    def filter(self, record) -> bool:
+        if record.levelno > self.max_level or not self._sampled(record.name):
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else id(record.msg))
+        with self._lock:
+            now = self.clock()
+            if now - self.window_start >= self.interval:
+                # Janela nova: contadores zerados (também limita a memória)
+                self.window_start = now
+                self.counts.clear()
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+            if count <= self.burst or (count - self.burst) % self.every == 0:
+                return True
+            self.suppressed += 1
+            return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata na thread de origem
+
+    O QueueHandler padrão chama format() em prepare() (mensagem, exceção);
+    aqui o record vai intacto e getMessage()/format() acontecem nos
+    handlers do listener. Os argumentos da mensagem devem ser valores que
+    não mudam depois do log (números, strings, enums).
+
+    Fila cheia: registros até INFO são descartados (contados em `dropped`)
+    para não bloquear a análise; WARNING ou acima esperam até
+    `block_timeout` segundos por espaço.
+    """
+
+    def __init__(self, log_queue, block_timeout: float = 0.1):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                try:
+                    self.queue.put(record, timeout=self.block_timeout)
+                    return
+                except queue.Full:
+                    pass
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[LazyQueueHandler] = None
+_atexit_registered = False
+
+
+def start_queue_logging(
+    handlers: List[logging.Handler],
+    level: int = logging.INFO,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    sampling: Optional[SamplingFilter] = None
+) -> LazyQueueHandler:
+    """
+    Liga os handlers ao logger raiz através de uma fila
+
+    O logger raiz fica só com o LazyQueueHandler; os handlers rodam na
+    thread do QueueListener, respeitando o nível de cada um.
+
+    Args:
+        handlers: Handlers finais (console, arquivos...)
+        level: Nível do logger raiz
+        queue_size: Capacidade da fila (0 = sem limite)
+        sampling: Filtro aplicado antes de enfileirar
+
+    Returns:
+        O handler da fila (contador `dropped`)
+    """
+    global _listener, _queue_handler, _atexit_registered
+
+    stop_logging()
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = LazyQueueHandler(log_queue)
+    if sampling is not None:
+        _queue_handler.addFilter(sampling)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+    return _queue_handler
+
+
+def stop_logging():
+    """Processa o que resta na fila e encerra o listener"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+
+def logging_stats() -> Dict[str, Any]:
+    """Fila atual, descartes por fila cheia e mensagens suprimidas pela amostragem"""
+    handler = _queue_handler
+    if handler is None:
+        return {}
+    sampling = next((f for f in handler.filters if isinstance(f, SamplingFilter)), None)
+    return {
+        'queued': handler.queue.qsize(),
+        'dropped': handler.dropped,
+        'suppressed': sampling.suppressed if sampling else 0,
+    }
+
+
 def setup_logging(
     log_dir: str = 'logs',
     level: int = logging.INFO,
     console: bool = True,
-    structured: bool = True
+    structured: bool = True,
+    queued: bool = True,
+    sampling: Optional[SamplingFilter] = None
 ) -> logging.Logger:
     """
     Configura sistema de logging completo
@@ -66,6 +251,8 @@ def setup_logging(
         level: Nível de log (DEBUG, INFO, WARNING, ERROR)
         console: Mostrar logs no console?
         structured: Usar logs estruturados (JSON)?
+        queued: Rodar os handlers na thread do QueueListener?
+        sampling: Amostragem das mensagens repetitivas (só com queued)
     
     Returns:
         Logger configurado
@@ -78,8 +265,10 @@ def setup_logging(
     logger.setLevel(level)
     
     # Remover handlers antigos
+    stop_logging()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+    handlers = []
     
     # Format padrão
     if structured:
@@ -101,7 +290,7 @@ def setup_logging(
             ))
         else:
             console_handler.setFormatter(log_format)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Handler: Arquivo geral (rotating)
     file_handler = logging.handlers.RotatingFileHandler(
@@ -111,7 +300,7 @@ def setup_logging(
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(log_format)
-    logger.addHandler(file_handler)
+    handlers.append(file_handler)
     
     # Handler: Arquivo de erros apenas
     error_handler = logging.handlers.RotatingFileHandler(
@@ -121,7 +310,7 @@ def setup_logging(
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(log_format)
-    logger.addHandler(error_handler)
+    handlers.append(error_handler)
     
     # Handler: Arquivo de performance
     perf_handler = logging.handlers.RotatingFileHandler(
@@ -132,10 +321,20 @@ def setup_logging(
     perf_handler.setLevel(logging.DEBUG)
     perf_handler.setFormatter(log_format)
     
-    # Adicionar handler de performance ao logger de performance
     perf_logger = logging.getLogger('performance')
-    perf_logger.addHandler(perf_handler)
     perf_logger.setLevel(logging.DEBUG)
+    for handler in perf_logger.handlers[:]:
+        perf_logger.removeHandler(handler)
+    
+    if queued:
+        # Handler de performance no listener, só com registros do logger 'performance'
+        perf_handler.addFilter(logging.Filter('performance'))
+        start_queue_logging(handlers + [perf_handler], level=level, sampling=sampling)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+        # Adicionar handler de performance ao logger de performance
+        perf_logger.addHandler(perf_handler)
     
     return logger
 
@@ -175,6 +374,11 @@ def log_with_context(logger: logging.Logger, level: int, message: str, **context
 # Exportar
 __all__ = [
     'setup_logging',
+    'start_queue_logging',
+    'stop_logging',
+    'logging_stats',
+    'SamplingFilter',
+    'LazyQueueHandler',
     'get_logger',
     'log_with_context',
     'ColoredFormatter',
@@ -17,9 +17,11 @@ class Settings:
     ANALYSIS_INTERVAL_MINUTES = int(os.getenv('ANALYSIS_INTERVAL_MINUTES', '2'))
     MIN_CONFIDENCE_LEVEL = float(os.getenv('MIN_CONFIDENCE_LEVEL', '0.65'))
     DATA_RETENTION_DAYS = 30
+    RETENTION_INTERVAL_HOURS = int(os.getenv('RETENTION_INTERVAL_HOURS', '6'))  # 0 = desligado
 
     # APIs
     BLAZE_API_BASE_URL = os.getenv('BLAZE_API_URL', 'https://blaze.com/api')
+    BLAZE_WS_URL = os.getenv('BLAZE_WS_URL', '')  # Se definido, coleta via WebSocket (push)
     REQUEST_TIMEOUT = 10
     MAX_RETRIES = 3
 
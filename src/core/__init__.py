@@ -20,15 +20,29 @@ from .exceptions import (
     StrategyError,
     TelegramError,
     CacheError,
-    MonitoringError
+    MonitoringError,
+    APIError,
+    RetryableError,
+    CircuitOpenError
 )
 from .decorators import (
     retry,
     timing,
     log_errors,
     cache,
-    validate_input
+    validate_input,
+    TTLCache,
+    CacheStats
 )
+from .resilience import (
+    CircuitBreaker,
+    Deadline,
+    get_breaker,
+    breaker_metrics,
+    guarded_get,
+    remaining_timeout
+)
+from .rolls import RollBatch
 
 __all__ = [
     # Types
@@ -50,10 +64,24 @@ __all__ = [
     'TelegramError',
     'CacheError',
     'MonitoringError',
+    'APIError',
+    'RetryableError',
+    'CircuitOpenError',
     # Decorators
     'retry',
     'timing',
     'log_errors',
     'cache',
-    'validate_input'
+    'validate_input',
+    'TTLCache',
+    'CacheStats',
+    # Resiliência
+    'CircuitBreaker',
+    'Deadline',
+    'get_breaker',
+    'breaker_metrics',
+    'guarded_get',
+    'remaining_timeout',
+    # Rodadas
+    'RollBatch'
 ]
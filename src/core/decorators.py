@@ -1,18 +1,32 @@
 """
 Decoradores úteis para o sistema
 """
+import asyncio
 import functools
+import inspect
 import logging
+import random
+import threading
 import time
-from typing import Callable, Any, Optional
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Type
 from .exceptions import RetryableError
+from .resilience import current_deadline
 
 logger = logging.getLogger(__name__)
 
 
-def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
+def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0,
+          jitter: float = 0.1, max_delay: Optional[float] = None,
+          exceptions: Tuple[Type[BaseException], ...] = (RetryableError,)):
     """
-    Decorador para retry com backoff exponencial
+    Decorador para retry com backoff exponencial e jitter
+    
+    - Funções async esperam com asyncio.sleep (não bloqueiam o loop)
+    - jitter: fração aleatória do atraso somada a cada espera (0 = sem jitter)
+    - Respeita o Deadline do ciclo (core.resilience): não espera além dele
+    - wrapper.retry_stats: chamadas, novas tentativas e falhas definitivas
     
     Uso:
         @retry(max_attempts=3, delay=1.0)
@@ -20,27 +34,60 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
             ...
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            attempt = 1
-            current_delay = delay
-            
-            while attempt <= max_attempts:
-                try:
-                    return func(*args, **kwargs)
-                except RetryableError as e:
-                    if attempt == max_attempts:
-                        logger.error(f"Falhou após {max_attempts} tentativas: {func.__name__}")
-                        raise
-                    
-                    logger.warning(
-                        f"Tentativa {attempt}/{max_attempts} falhou para {func.__name__}. "
-                        f"Aguardando {current_delay}s..."
-                    )
-                    time.sleep(current_delay)
-                    current_delay *= backoff
-                    attempt += 1
-        
+        stats = {'calls': 0, 'retries': 0, 'failures': 0}
+
+        def next_wait(attempt: int) -> Optional[float]:
+            """Espera antes da próxima tentativa; None = desistir"""
+            if attempt >= max_attempts:
+                logger.error(f"Falhou após {max_attempts} tentativas: {func.__name__}")
+                return None
+            wait = delay * backoff ** (attempt - 1)
+            if max_delay is not None:
+                wait = min(wait, max_delay)
+            wait += wait * jitter * random.random()
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() <= wait:
+                logger.warning(f"Deadline do ciclo esgotado: sem nova tentativa para {func.__name__}")
+                return None
+            logger.warning(
+                f"Tentativa {attempt}/{max_attempts} falhou para {func.__name__}. "
+                f"Aguardando {wait:.2f}s..."
+            )
+            stats['retries'] += 1
+            return wait
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> Any:
+                stats['calls'] += 1
+                attempt = 1
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions:
+                        wait = next_wait(attempt)
+                        if wait is None:
+                            stats['failures'] += 1
+                            raise
+                        await asyncio.sleep(wait)
+                        attempt += 1
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                stats['calls'] += 1
+                attempt = 1
+                while True:
+                    try:
+                        return func(*args, **kwargs)
+                    except exceptions:
+                        wait = next_wait(attempt)
+                        if wait is None:
+                            stats['failures'] += 1
+                            raise
+                        time.sleep(wait)
+                        attempt += 1
+
+        wrapper.retry_stats = stats
         return wrapper
     return decorator
 
@@ -92,37 +139,254 @@ def log_errors(logger_instance: Optional[logging.Logger] = None):
     return decorator
 
 
-def cache(ttl_seconds: int = 300):
+class CacheStats:
+    """Contadores de um cache (compartilháveis entre vários TTLCache)"""
+
+    FIELDS = ('hits', 'misses', 'shared', 'evictions', 'expirations', 'uncacheable')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def add(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, float]:
+        with self._lock:
+            stats = {name: getattr(self, name) for name in self.FIELDS}
+        lookups = stats['hits'] + stats['misses'] + stats['shared']
+        stats['hit_rate'] = (stats['hits'] + stats['shared']) / lookups if lookups else 0.0
+        return stats
+
+
+class _Flight:
+    """Cálculo em andamento de uma chave (single-flight)"""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Cache LRU com TTL por chave, thread-safe
+
+    - maxsize: entradas mantidas; a menos usada recentemente sai primeiro
+    - ttl_seconds: validade padrão (None = sem expiração); set() aceita ttl próprio
+    - get_or_compute / get_or_compute_async: chamadas simultâneas para a mesma
+      chave ausente esperam um único cálculo (sem estouro de recálculos)
+
+    Uso:
+        blaze_cache = TTLCache(maxsize=256, ttl_seconds=60)
+        history = blaze_cache.get_or_compute(('double', 100), lambda: fetch(100))
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl_seconds: Optional[float] = 300,
+                 clock: Callable[[], float] = time.monotonic, stats: Optional[CacheStats] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = stats or CacheStats()
+        self._data: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._async_inflight: Dict[Tuple[int, Hashable], 'asyncio.Future'] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._lookup(key, count=False)[0]
+
+    def _lookup(self, key, count: bool = True) -> Tuple[bool, Any]:
+        """Busca com o lock já adquirido"""
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at >= self.clock():
+                self._data.move_to_end(key)
+                if count:
+                    self.stats.add('hits')
+                return True, value
+            del self._data[key]
+            self.stats.add('expirations')
+        return False, None
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit, value = self._lookup(key)
+        return value if hit else default
+
+    def set(self, key, value, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self.clock() + ttl if ttl is not None else float('inf')
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.add('evictions')
+
+    def delete(self, key) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_or_compute(self, key, factory: Callable[[], Any], ttl_seconds: Optional[float] = None):
+        """Valor em cache ou factory() calculado uma única vez entre threads concorrentes"""
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            # Outra thread já está calculando: esperar o mesmo resultado
+            flight.event.wait()
+            self.stats.add('shared')
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        self.stats.add('misses')
+        try:
+            flight.value = factory()
+            self.set(key, flight.value, ttl_seconds)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def get_or_compute_async(self, key, factory: Callable[[], Awaitable], ttl_seconds: Optional[float] = None):
+        """Versão assíncrona: corrotinas concorrentes (mesmo loop) aguardam um único factory()"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                return value
+            future = self._async_inflight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._async_inflight[flight_key] = loop.create_future()
+
+        if not leader:
+            self.stats.add('shared')
+            return await asyncio.shield(future)
+
+        self.stats.add('misses')
+        try:
+            value = await factory()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()          # marca como consumida se ninguém esperava
+            raise
+        else:
+            self.set(key, value, ttl_seconds)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._async_inflight.pop(flight_key, None)
+
+
+def _cache_key(args: Tuple, kwargs: Dict) -> Optional[Hashable]:
+    """Chave dos argumentos; None se algum não for hashable"""
+    key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def cache(ttl_seconds: Optional[float] = 300, maxsize: Optional[int] = 128,
+          clock: Callable[[], float] = time.monotonic):
     """
-    Decorador para cache com TTL
+    Decorador para cache LRU com TTL (ver TTLCache)
+    
+    - Funções síncronas e async (single-flight em ambas)
+    - Métodos (primeiro parâmetro self/cls): um cache por instância guardado
+      por referência fraca, sem manter a instância viva
+    - Argumentos não hashable: chama a função sem cache
+    - wrapper.cache_info() / wrapper.cache_clear()
     
     Uso:
-        @cache(ttl_seconds=600)
+        @cache(ttl_seconds=600, maxsize=256)
         def expensive_function(arg1, arg2):
             ...
     """
-    cache_dict = {}
-    cache_times = {}
-    
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            # Criar chave de cache
-            key = (func.__name__, args, tuple(sorted(kwargs.items())))
-            
-            # Verificar se está em cache e não expirou
-            if key in cache_dict:
-                cached_time = cache_times.get(key, 0)
-                if time.time() - cached_time < ttl_seconds:
-                    return cache_dict[key]
-            
-            # Executar e cachear
-            result = func(*args, **kwargs)
-            cache_dict[key] = result
-            cache_times[key] = time.time()
-            
-            return result
-        
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] in ('self', 'cls')
+        stats = CacheStats()
+        shared = TTLCache(maxsize, ttl_seconds, clock, stats)
+        per_owner: 'weakref.WeakKeyDictionary[Any, TTLCache]' = weakref.WeakKeyDictionary()
+        owners_lock = threading.Lock()
+
+        def resolve(args: Tuple) -> Tuple[TTLCache, Tuple, Tuple]:
+            """(cache, argumentos da chave, argumentos fixos da chamada)"""
+            if not is_method or not args:
+                return shared, args, ()
+            owner = args[0]
+            try:
+                with owners_lock:
+                    store = per_owner.get(owner)
+                    if store is None:
+                        store = per_owner[owner] = TTLCache(maxsize, ttl_seconds, clock, stats)
+                return store, args[1:], args[:1]
+            except TypeError:
+                # Sem weakref/hash: a instância entra na chave do cache comum
+                return shared, args, ()
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> Any:
+                store, key_args, bound = resolve(args)
+                key = _cache_key(key_args, kwargs)
+                if key is None:
+                    stats.add('uncacheable')
+                    return await func(*args, **kwargs)
+                return await store.get_or_compute_async(key, lambda: func(*bound, *key_args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                store, key_args, bound = resolve(args)
+                key = _cache_key(key_args, kwargs)
+                if key is None:
+                    stats.add('uncacheable')
+                    return func(*args, **kwargs)
+                return store.get_or_compute(key, lambda: func(*bound, *key_args, **kwargs))
+
+        def cache_info() -> Dict[str, float]:
+            info = stats.to_dict()
+            info['currsize'] = len(shared) + sum(len(store) for store in list(per_owner.values()))
+            info['maxsize'] = maxsize
+            info['ttl_seconds'] = ttl_seconds
+            return info
+
+        def cache_clear():
+            shared.clear()
+            for store in list(per_owner.values()):
+                store.clear()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
         return wrapper
     return decorator
 
@@ -62,3 +62,8 @@ class RetryableError(BetAnalysisPlatformError):
     """Erro que pode ser retentado"""
     max_retries = 3
     pass
+
+
+class CircuitOpenError(APIError):
+    """Chamada recusada: circuito do endpoint aberto"""
+    pass
@@ -0,0 +1,234 @@
+"""
+Resiliência para chamadas a serviços externos (Blaze)
+
+- CircuitBreaker por endpoint: após `failure_threshold` falhas seguidas o
+  circuito abre e as chamadas são recusadas em microssegundos; depois de
+  `reset_timeout` segundos uma chamada de teste (half-open) decide se fecha
+- Deadline por ciclo: orçamento de tempo propagado por contextvars; os
+  timeouts das requisições são limitados ao tempo restante
+- guarded_get: GET com breaker + deadline, usado pelos coletores
+
+Uso:
+    with Deadline(20):
+        response = guarded_get(session, url, timeout=5)   # None se falhou/recusado
+    breaker_metrics()
+"""
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .exceptions import CircuitOpenError, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker com teste half-open
+
+    Args:
+        name: Identificação (endpoint)
+        failure_threshold: Falhas consecutivas para abrir
+        reset_timeout: Segundos aberto antes de permitir o teste
+        half_open_max_calls: Chamadas de teste simultâneas no half-open
+        clock: Relógio monotônico (injetável em testes)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.metrics = {'calls': 0, 'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def allow(self) -> bool:
+        """Se a chamada pode prosseguir (conta como recusada se não)"""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == CLOSED or (self.state == HALF_OPEN and self._probes < self.half_open_max_calls):
+                if self.state == HALF_OPEN:
+                    self._probes += 1
+                self.metrics['calls'] += 1
+                return True
+            self.metrics['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.metrics['successes'] += 1
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info("[CIRCUIT] %s: fechado", self.name)
+            self.state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.metrics['failures'] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and
+                                           self.consecutive_failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.metrics['opened'] += 1
+                logger.warning("[CIRCUIT] %s: aberto por %.0fs (%s falhas seguidas)",
+                               self.name, self.reset_timeout, self.consecutive_failures)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Executa func pelo breaker; CircuitOpenError se recusado"""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuito aberto: {self.name}")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        """Versão para corrotinas"""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuito aberto: {self.name}")
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.consecutive_failures,
+                    **self.metrics}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_breaker_defaults: Dict[str, Any] = {}
+
+
+def configure_breakers(**defaults):
+    """Parâmetros padrão dos breakers criados por get_breaker (failure_threshold, reset_timeout...)"""
+    _breaker_defaults.update(defaults)
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Breaker compartilhado do endpoint `name` (criado na primeira chamada)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **{**_breaker_defaults, **kwargs})
+        return breaker
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def breaker_metrics() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+_current_deadline: contextvars.ContextVar[Optional['Deadline']] = contextvars.ContextVar(
+    'deadline', default=None)
+
+
+class Deadline:
+    """
+    Orçamento de tempo de um ciclo, visível para as chamadas aninhadas
+
+    Deadlines aninhados nunca estendem o externo.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.expires_at = clock() + seconds
+        outer = _current_deadline.get()
+        if outer is not None:
+            self.expires_at = min(self.expires_at, outer.expires_at)
+        self._token = None
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: float) -> float:
+        """Timeout limitado ao tempo restante"""
+        return min(default, self.remaining())
+
+    def check(self):
+        if self.expired:
+            raise TimeoutError("Deadline do ciclo esgotado")
+
+    def __enter__(self) -> 'Deadline':
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _current_deadline.reset(self._token)
+        return False
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def remaining_timeout(default: float) -> float:
+    """Timeout de uma chamada: default limitado pelo deadline atual (se houver)"""
+    deadline = _current_deadline.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def endpoint_name(url: str) -> str:
+    """Chave do breaker: URL sem query string"""
+    return url.split('?', 1)[0]
+
+
+def guarded_get(session, url: str, timeout: float, ok_status: Iterable[int] = (200,),
+                breaker: Optional[CircuitBreaker] = None, **kwargs):
+    """
+    GET protegido por breaker do endpoint e pelo deadline do ciclo
+
+    Returns:
+        Resposta com status em ok_status, ou None (falha, status inesperado,
+        circuito aberto ou deadline esgotado)
+    """
+    timeout = remaining_timeout(timeout)
+    if timeout <= 0:
+        return None
+    breaker = breaker or get_breaker(endpoint_name(url))
+    if not breaker.allow():
+        return None
+    try:
+        response = session.get(url, timeout=timeout, **kwargs)
+    except Exception as e:
+        logger.debug("[CIRCUIT] %s: %s", breaker.name, type(e).__name__)
+        breaker.record_failure()
+        return None
+    if response.status_code in ok_status:
+        breaker.record_success()
+        return response
+    breaker.record_failure()
+    return None
@@ -0,0 +1,238 @@
+"""
+Lote colunar de rodadas (RollBatch)
+
+Guarda as rodadas coletadas como colunas NumPy (struct-of-arrays) em vez
+de uma lista de dicts por rodada. O mesmo lote atravessa o ciclo inteiro:
+
+    coletor  → RollBatch.from_records (uma conversão por ciclo)
+    analisador → to_frame()   (colunas numéricas sem cópia)
+    pipeline → color_names()
+    banco / feature store → since(last_id).to_records() (só rodadas novas)
+
+Colunas:
+    ids          str     identificador da rodada (game_id da Blaze)
+    timestamps   int64   nanossegundos desde a época (NaT = ausente)
+    colors       int8    1 vermelho, -1 preto, 0 branco/desconhecido
+    rolls        int8    número sorteado no Double (-1 = ausente)
+    crash_points float64 multiplicador do Crash (NaN = ausente)
+
+As colunas são somente leitura: to_frame()/to_arrow() compartilham a
+memória com o lote. Substituir ou criar colunas no DataFrame funciona;
+escrever dentro de uma coluna numérica exige df.copy() antes.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Códigos das cores e nomes usados pelo coletor (índice = código + 1)
+RED, BLACK, WHITE = 1, -1, 0
+COLOR_NAMES = np.array(['BLACK', 'WHITE', 'RED'], dtype=object)
+LOWER_COLOR_NAMES = np.array(['black', 'white', 'red'], dtype=object)
+_NAME_CODES = {
+    'red': RED, 'vermelho': RED, 'r': RED,
+    'black': BLACK, 'preto': BLACK, 'b': BLACK,
+}
+# Códigos numéricos da API da Blaze (0 branco, 1 vermelho, 2 preto) → código da cor.
+# Única definição: feature_store e parameter_sweep importam daqui
+BLAZE_COLOR_CODES = {0: WHITE, 1: RED, 2: BLACK}
+
+NAT = np.iinfo(np.int64).min
+MISSING_ROLL = -1
+
+
+def color_to_code(color) -> int:
+    """1 vermelho, -1 preto, 0 branco/desconhecido (nomes ou códigos da Blaze)"""
+    if isinstance(color, (int, np.integer)):
+        return BLAZE_COLOR_CODES.get(int(color), WHITE)
+    return _NAME_CODES.get(str(color).lower(), WHITE)
+
+
+def _parse_time(value) -> int:
+    """Nanossegundos desde a época (horário sem fuso, como Backtester.record_time)"""
+    if isinstance(value, str) and value:
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            return NAT
+    if isinstance(value, datetime):
+        return int(np.datetime64(value, 'ns').astype(np.int64))
+    return NAT
+
+
+def _column(values, dtype) -> np.ndarray:
+    """Coluna somente leitura (sem alterar o array recebido)"""
+    array = np.asarray(values, dtype=dtype)
+    if array is values:
+        array = array.view()
+    array.flags.writeable = False
+    return array
+
+
+class RollBatch:
+    """
+    Rodadas de um jogo em colunas NumPy
+
+    Fatias (batch[10:], tail, since) são views: não copiam as colunas.
+    """
+
+    __slots__ = ('game', 'source', 'ids', 'timestamps', 'colors', 'rolls', 'crash_points')
+
+    def __init__(self, game: str, ids: Sequence[str], timestamps,
+                 colors=None, rolls=None, crash_points=None, source: str = 'api'):
+        size = len(ids)
+        self.game = game
+        self.source = source
+        self.ids = _column(ids, str)
+        self.timestamps = _column(timestamps, np.int64)
+        self.colors = _column(np.zeros(size) if colors is None else colors, np.int8)
+        self.rolls = _column(np.full(size, MISSING_ROLL) if rolls is None else rolls, np.int8)
+        self.crash_points = _column(np.full(size, np.nan) if crash_points is None else crash_points,
+                                    np.float64)
+        lengths = {len(self.timestamps), len(self.colors), len(self.rolls), len(self.crash_points)}
+        if lengths != {size}:
+            raise ValueError(f"Colunas com tamanhos diferentes: {sorted(lengths | {size})}")
+
+    @classmethod
+    def empty(cls, game: str, source: str = 'api') -> 'RollBatch':
+        return cls(game, [], [], source=source)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], game: str, source: str = 'api') -> 'RollBatch':
+        """
+        Converte os dicts do coletor (V2 ou stream) em colunas
+
+        Aceita cores por nome ('RED', 'vermelho'...) ou pelo código da
+        Blaze, e horários ISO 8601 ou datetime. As linhas ficam em ordem
+        cronológica (a API pode devolver da mais nova para a mais antiga):
+        last_id e since() contam com isso. Empates mantêm a ordem recebida;
+        se alguma rodada não tem horário, o lote fica na ordem recebida.
+        """
+        ids, times, colors, rolls, points = [], [], [], [], []
+        for record in records:
+            ids.append(str(record.get('game_id', record.get('id', ''))))
+            times.append(_parse_time(record.get('timestamp') or record.get('created_at')))
+            colors.append(color_to_code(record.get('color', '')))
+            roll = record.get('roll')
+            rolls.append(roll if isinstance(roll, (int, np.integer)) and 0 <= roll < 128
+                         else MISSING_ROLL)
+            point = record.get('crash_point')
+            points.append(float(point) if point is not None else np.nan)
+        times = np.array(times, dtype=np.int64)
+        if len(times) > 1 and (times[1:] < times[:-1]).any() and (times != NAT).all():
+            order = np.argsort(times, kind='stable')
+            ids, times = np.array(ids, dtype=str)[order], times[order]
+            colors, rolls, points = (np.asarray(colors)[order], np.asarray(rolls)[order],
+                                     np.asarray(points)[order])
+        return cls(game, ids, times, colors, rolls, points, source=source)
+
+    @classmethod
+    def concat(cls, batches: Sequence['RollBatch']) -> 'RollBatch':
+        """Junta lotes do mesmo jogo (copia as colunas)"""
+        if not batches:
+            raise ValueError("concat precisa de ao menos um lote")
+        first = batches[0]
+        return cls(first.game,
+                   np.concatenate([b.ids for b in batches]),
+                   np.concatenate([b.timestamps for b in batches]),
+                   np.concatenate([b.colors for b in batches]),
+                   np.concatenate([b.rolls for b in batches]),
+                   np.concatenate([b.crash_points for b in batches]),
+                   source=first.source)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key) -> 'RollBatch':
+        if isinstance(key, (int, np.integer)):
+            index = range(len(self))[key]
+            key = slice(index, index + 1)
+        return RollBatch(self.game, self.ids[key], self.timestamps[key], self.colors[key],
+                         self.rolls[key], self.crash_points[key], source=self.source)
+
+    def __repr__(self) -> str:
+        return f"RollBatch(game={self.game!r}, rows={len(self)}, source={self.source!r})"
+
+    @property
+    def last_id(self) -> Optional[str]:
+        return str(self.ids[-1]) if len(self) else None
+
+    @property
+    def has_rolls(self) -> bool:
+        """True se todas as rodadas trazem o número sorteado"""
+        return len(self) > 0 and bool((self.rolls >= 0).all())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes
+                   for name in ('ids', 'timestamps', 'colors', 'rolls', 'crash_points'))
+
+    def tail(self, n: int) -> 'RollBatch':
+        return self[max(0, len(self) - n):]
+
+    def since(self, last_id: Optional[str]) -> 'RollBatch':
+        """Rodadas posteriores a last_id (o lote todo se ela não estiver aqui)"""
+        if last_id is None:
+            return self
+        seen = np.flatnonzero(self.ids == last_id)
+        return self[seen[-1] + 1:] if seen.size else self
+
+    def datetimes(self) -> np.ndarray:
+        """timestamps como datetime64[ns] (view, sem cópia)"""
+        return self.timestamps.view('datetime64[ns]')
+
+    def color_names(self, lower: bool = True) -> List[str]:
+        return (LOWER_COLOR_NAMES if lower else COLOR_NAMES)[self.colors + 1].tolist()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame no formato esperado pelo StatisticalAnalyzer
+
+        Double: game_id, timestamp, color (+ roll se todas as rodadas o
+        trazem); Crash: game_id, timestamp, crash_point. timestamp, roll e
+        crash_point compartilham memória com o lote.
+        """
+        columns = {'game_id': self.ids.astype(object), 'timestamp': self.datetimes()}
+        if self.game == 'crash':
+            columns['crash_point'] = self.crash_points
+        else:
+            columns['color'] = COLOR_NAMES[self.colors + 1]
+            if self.has_rolls:
+                columns['roll'] = self.rolls
+        return pd.DataFrame(columns, copy=False)
+
+    def to_arrow(self):
+        """pyarrow.Table com as mesmas colunas de to_frame (numéricas sem cópia)"""
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow não instalado (pip install pyarrow)")
+        return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+
+    def to_records(self) -> List[Dict]:
+        """
+        Dicts por rodada para o banco e o feature store
+
+        Materializa só as linhas deste lote; use since()/tail() antes para
+        converter apenas as rodadas novas.
+        """
+        times = self.timestamps.view('datetime64[ns]').astype('datetime64[us]').tolist()
+        records = []
+        if self.game == 'crash':
+            for game_id, ts, point in zip(self.ids.tolist(), times, self.crash_points.tolist()):
+                point = None if point != point else point
+                records.append({'type': 'crash', 'id': game_id, 'game_id': game_id,
+                                'timestamp': ts, 'crash_point': point, 'price': point})
+        else:
+            for game_id, ts, name, roll in zip(self.ids.tolist(), times,
+                                               self.color_names(lower=False), self.rolls.tolist()):
+                records.append({'type': 'double', 'id': game_id, 'game_id': game_id,
+                                'timestamp': ts, 'color': name, 'result': name.lower(),
+                                'roll': roll if roll >= 0 else None})
+        return records
@@ -26,7 +26,8 @@ from core import (
     BlazeData,
     GameType,
     DataCollectionError,
-    RetryableError
+    RetryableError,
+    guarded_get
 )
 
 logger = logging.getLogger(__name__)
@@ -102,17 +103,15 @@ class BlazeClient:
             
             for url in self.base_urls:
                 for endpoint in endpoints:
-                    try:
-                        test_url = f"{url}{endpoint}"
-                        response = self.session.get(test_url, timeout=3)
-                        
-                        if response.status_code in [200, 404]:  # 404 é OK (endpoint existe mas vazio)
-                            self.base_url = url
-                            self.api_available = True
-                            logger.info(f"✅ Conectado à Blaze: {url}")
-                            return True
-                    except:
-                        continue
+                    # 404 é OK (endpoint existe mas vazio); circuito aberto = pulado
+                    test_url = f"{url}{endpoint}"
+                    response = guarded_get(self.session, test_url, timeout=3, ok_status=(200, 404))
+                    
+                    if response is not None:
+                        self.base_url = url
+                        self.api_available = True
+                        logger.info(f"✅ Conectado à Blaze: {url}")
+                        return True
             
             logger.warning("❌ Blaze API não disponível, usando fallback")
             self.api_available = False
@@ -187,15 +186,12 @@ class BlazeClient:
         ]
         
         for endpoint in endpoints:
-            try:
-                url = f"{self.base_url}{endpoint}"
-                response = self.session.get(url, timeout=self.timeout)
-                
-                if response.status_code == 200:
-                    raw_data = response.json()
-                    return self._process_api_response(raw_data, game)
-            except:
-                continue
+            response = guarded_get(self.session, f"{self.base_url}{endpoint}", timeout=self.timeout)
+            if response is not None:
+                try:
+                    return self._process_api_response(response.json(), game)
+                except ValueError:
+                    continue
         
         return None
     
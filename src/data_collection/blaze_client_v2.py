@@ -15,6 +15,13 @@ import random
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    from core.resilience import guarded_get
+    from core.rolls import RollBatch
+except ImportError:  # importado como src.data_collection (scripts/)
+    from ..core.resilience import guarded_get
+    from ..core.rolls import RollBatch
+
 logger = logging.getLogger(__name__)
 
 class BlazeDataCollectorV2:
@@ -66,21 +73,16 @@ class BlazeDataCollectorV2:
             # Testar cada URL base
             for url in self.base_urls:
                 for endpoint in endpoints:
-                    try:
-                        test_url = f"{url}{endpoint}"
-                        response = self.session.get(test_url, timeout=3)
-                        
-                        if response.status_code == 200:
-                            self.base_url = url
-                            self.use_fallback = False
-                            self.api_available = True
-                            logger.info(f"Conectado à Blaze API: {test_url}")
-                            return True
-                        
-                    except requests.exceptions.Timeout:
-                        continue
-                    except Exception:
-                        continue
+                    # Endpoints com circuito aberto são pulados sem rede
+                    test_url = f"{url}{endpoint}"
+                    response = guarded_get(self.session, test_url, timeout=3)
+                    
+                    if response is not None:
+                        self.base_url = url
+                        self.use_fallback = False
+                        self.api_available = True
+                        logger.info(f"Conectado à Blaze API: {test_url}")
+                        return True
             
             logger.warning("Blaze API não disponível, usando fallback")
             self.use_fallback = True
@@ -107,21 +109,18 @@ class BlazeDataCollectorV2:
             ]
             
             for endpoint in endpoints:
-                try:
-                    response = self.session.get(endpoint, timeout=5)
-                    if response.status_code == 200:
-                        # Tentar processar como JSON
-                        try:
-                            data = response.json()
-                            result = self._process_double_data(data)
-                            if result:
-                                logger.info(f"Double: {len(result)} registros da API")
-                                return result
-                        except ValueError:
-                            # Resposta não é JSON, continuar
-                            continue
-                except:
-                    continue
+                response = guarded_get(self.session, endpoint, timeout=5)
+                if response is not None:
+                    # Tentar processar como JSON
+                    try:
+                        data = response.json()
+                        result = self._process_double_data(data)
+                        if result:
+                            logger.info(f"Double: {len(result)} registros da API")
+                            return result
+                    except ValueError:
+                        # Resposta não é JSON, continuar
+                        continue
             
             # Se nenhum endpoint funcionou, usar fallback
             logger.warning("Nenhum endpoint de Double funcionou, usando fallback")
@@ -145,21 +144,18 @@ class BlazeDataCollectorV2:
             ]
             
             for endpoint in endpoints:
-                try:
-                    response = self.session.get(endpoint, timeout=5)
-                    if response.status_code == 200:
-                        # Tentar processar como JSON
-                        try:
-                            data = response.json()
-                            result = self._process_crash_data(data)
-                            if result:
-                                logger.info(f"Crash: {len(result)} registros da API")
-                                return result
-                        except ValueError:
-                            # Resposta não é JSON, continuar
-                            continue
-                except:
-                    continue
+                response = guarded_get(self.session, endpoint, timeout=5)
+                if response is not None:
+                    # Tentar processar como JSON
+                    try:
+                        data = response.json()
+                        result = self._process_crash_data(data)
+                        if result:
+                            logger.info(f"Crash: {len(result)} registros da API")
+                            return result
+                    except ValueError:
+                        # Resposta não é JSON, continuar
+                        continue
             
             logger.warning("Nenhum endpoint de Crash funcionou, usando fallback")
             return self._generate_fallback_crash_data(limit)
@@ -323,6 +319,19 @@ class BlazeDataCollectorV2:
             'count': len(double_data) + len(crash_data)
         }
 
+    def get_all_batches(self, limit: int = 100) -> Dict:
+        """
+        Como get_all_data, mas com 'double' e 'crash' em RollBatch
+
+        Os registros viram colunas uma única vez aqui; o restante do ciclo
+        (analisador, pipeline, banco) trabalha sobre o lote.
+        """
+        data = self.get_all_data(limit)
+        source = data['source']
+        data['double'] = RollBatch.from_records(data['double'], 'double', source)
+        data['crash'] = RollBatch.from_records(data['crash'], 'crash', source)
+        return data
+
 
 # Manter compatibilidade com código antigo
 class BlazeDataCollector(BlazeDataCollectorV2):
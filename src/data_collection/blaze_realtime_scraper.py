@@ -8,18 +8,34 @@ Captura dados REAIS da Blaze usando:
 3. WebSocket listeners
 4. DOM parsing
 
+Modo captura (capture_mode=True):
+    Mantém UM navegador aberto nas páginas dos jogos e lê os frames
+    WebSocket que a própria página recebe (logs de performance do Chrome),
+    em vez de recarregar a página e parsear o DOM a cada coleta.
+    ├─ Sem driver.get()/time.sleep() por chamada
+    ├─ Frames parseados incrementalmente (só os novos desde a última leitura)
+    ├─ Orçamento de recursos: heap JS máximo e idade máxima da página
+    │   (ao estourar, o navegador é reciclado)
+    └─ fixture_path: reproduz uma gravação de frames sem abrir o Chrome
+
 Funciona com as páginas que você abriu:
 - https://blaze.bet.br/pt/games/double
 - https://blaze.bet.br/pt/games/crash
 """
 
 import logging
+import os
 import time
 import json
-from typing import List, Dict, Optional
-from datetime import datetime
+import asyncio
+import threading
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, List, Dict, Optional, Sequence
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from .blaze_stream import RollDeduplicator, parse_stream_message
+
 logger = logging.getLogger(__name__)
 
 class BlazeRealtimeScraper:
@@ -32,15 +48,30 @@ class BlazeRealtimeScraper:
     - DOM: Extrai do HTML renderizado
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True,
+                 capture_mode: bool = False,
+                 fixture_path: Optional[str] = None,
+                 memory_cap_mb: float = 512.0,
+                 page_max_age_minutes: float = 30.0):
         """
         Inicializa scraper
         
         Args:
             headless: Se True, roda sem abrir navegador visível
+            capture_mode: Usa sessão persistente com captura de frames
+                WebSocket (BlazeNetworkCapture) em vez de recarregar o DOM
+            fixture_path: Gravação .jsonl de frames para modo de teste
+                (implica capture_mode, sem abrir o Chrome)
+            memory_cap_mb: Heap JS máximo antes de reciclar o navegador
+            page_max_age_minutes: Idade máxima da página antes de reciclar
         """
         self.headless = headless
         self.driver = None
+        self.capture_mode = capture_mode or fixture_path is not None
+        self.fixture_path = fixture_path
+        self.memory_cap_mb = memory_cap_mb
+        self.page_max_age = timedelta(minutes=page_max_age_minutes)
+        self.capture: Optional['BlazeNetworkCapture'] = None
         self.double_history = []
         self.crash_history = []
         self.websocket_data = []
@@ -59,6 +90,11 @@ class BlazeRealtimeScraper:
     
     def setup_driver(self):
         """Configura Selenium WebDriver"""
+        self.driver = self._build_driver()
+        return self.driver is not None
+    
+    def _build_driver(self):
+        """Cria um Chrome com logs de performance (network) habilitados"""
         try:
             from selenium import webdriver
             from selenium.webdriver.chrome.options import Options
@@ -79,18 +115,18 @@ class BlazeRealtimeScraper:
             # Habilitar logging de performance (captura network)
             options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
             
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.execute_cdp_cmd('Network.enable', {})
+            driver = webdriver.Chrome(options=options)
+            driver.execute_cdp_cmd('Network.enable', {})
             
             logger.info("[OK] WebDriver configurado")
-            return True
+            return driver
             
         except ImportError:
             logger.error("Selenium não instalado. Execute: pip install selenium")
-            return False
+            return None
         except Exception as e:
             logger.error(f"Erro ao configurar WebDriver: {str(e)}")
-            return False
+            return None
     
     def capture_network_requests(self) -> List[Dict]:
         """Captura requisições de rede (XHR/Fetch) que trazem dados dos jogos"""
@@ -283,6 +319,9 @@ class BlazeRealtimeScraper:
         Returns:
             Lista de dicionários com 'color', 'roll', 'timestamp'
         """
+        if self.capture_mode:
+            return self._capture_realtime('double', limit)
+        
         try:
             if not self.driver:
                 if not self.setup_driver():
@@ -322,6 +361,9 @@ class BlazeRealtimeScraper:
         Returns:
             Lista de dicionários com 'crash_point', 'timestamp'
         """
+        if self.capture_mode:
+            return self._capture_realtime('crash', limit)
+        
         try:
             if not self.driver:
                 if not self.setup_driver():
@@ -351,8 +393,56 @@ class BlazeRealtimeScraper:
             logger.error(f"Erro ao capturar Crash realtime: {str(e)}")
             return []
     
+    def _ensure_capture(self) -> Optional['BlazeNetworkCapture']:
+        """Abre a sessão de captura persistente (uma vez)"""
+        if self.capture is None:
+            if self.fixture_path:
+                factory = lambda: FixtureDriver(self.fixture_path)
+            else:
+                factory = self._build_driver
+            capture = BlazeNetworkCapture(
+                urls=[self.urls['double'], self.urls['crash']],
+                driver_factory=factory,
+                memory_cap_mb=self.memory_cap_mb,
+                page_max_age=self.page_max_age
+            )
+            if not capture.start():
+                logger.error("Não foi possível iniciar a captura de rede")
+                return None
+            self.capture = capture
+        return self.capture
+    
+    def _capture_realtime(self, game: str, limit: int) -> List[Dict]:
+        """Lê frames novos da sessão persistente e retorna as últimas rodadas"""
+        capture = self._ensure_capture()
+        if capture is None:
+            return []
+        
+        new_rolls = capture.poll()
+        records = capture.recent(game, limit)
+        
+        # Cache só quando chegaram rodadas novas deste jogo
+        if any(r['type'] == game for r in new_rolls):
+            cache_file = self.cache_dir / f'{game}_realtime.json'
+            with open(cache_file, 'w') as f:
+                json.dump(records, f, indent=2)
+        
+        return records
+    
+    async def rolls(self) -> AsyncIterator[Dict]:
+        """Iterador assíncrono de rodadas novas (modo captura)"""
+        capture = self._ensure_capture()
+        if capture is None:
+            return
+        async for record in capture.rolls():
+            yield record
+    
     def close(self):
         """Fecha o navegador"""
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+        
         if self.driver:
             try:
                 self.driver.quit()
@@ -361,6 +451,253 @@ class BlazeRealtimeScraper:
                 logger.error(f"Erro ao fechar driver: {str(e)}")
 
 
+# ============================================================
+# CAPTURA PERSISTENTE DE REDE
+# ============================================================
+
+class BlazeNetworkCapture:
+    """
+    Sessão de navegador persistente que captura frames WebSocket
+    
+    Abre as páginas dos jogos UMA vez e, a cada poll(), lê apenas as
+    entradas novas do log de performance do Chrome
+    (Network.webSocketFrameReceived). Os payloads passam por
+    parse_stream_message + RollDeduplicator e vão para buffers circulares.
+    
+    Orçamento de recursos (verificado a cada `budget_check_every` polls):
+        - heap JS acima de memory_cap_mb → recicla o navegador
+        - página aberta há mais de page_max_age → recicla o navegador
+    
+    Exemplo:
+        capture = BlazeNetworkCapture(urls, driver_factory=scraper._build_driver)
+        capture.start()
+        async for roll in capture.rolls():
+            processar(roll)
+    """
+    
+    FRAME_EVENT = 'Network.webSocketFrameReceived'
+    
+    def __init__(self,
+                 urls: Sequence[str],
+                 driver_factory: Callable[[], object],
+                 poll_interval: float = 0.25,
+                 history_size: int = 500,
+                 memory_cap_mb: float = 512.0,
+                 page_max_age: timedelta = timedelta(minutes=30),
+                 budget_check_every: int = 20):
+        self.urls = list(urls)
+        self.driver_factory = driver_factory
+        self.poll_interval = poll_interval
+        self.memory_cap_mb = memory_cap_mb
+        self.page_max_age = page_max_age
+        self.budget_check_every = budget_check_every
+        
+        self.driver = None
+        self.opened_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._polls = 0
+        self._dedup = RollDeduplicator(history_size * 2)
+        self._history: Dict[str, Deque[Dict]] = {
+            'double': deque(maxlen=history_size),
+            'crash': deque(maxlen=history_size),
+        }
+        
+        self.stats = {
+            'polls': 0,
+            'frames': 0,
+            'rolls': 0,
+            'recycles': 0,
+            'heap_mb': 0.0,
+        }
+    
+    def start(self) -> bool:
+        """Abre o navegador e as páginas dos jogos (uma aba por URL)"""
+        with self._lock:
+            return self._open()
+    
+    def _open(self) -> bool:
+        driver = self.driver_factory()
+        if driver is None:
+            return False
+        
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Performance.enable', {})
+            driver.get(self.urls[0])
+            for url in self.urls[1:]:
+                driver.execute_script("window.open(arguments[0], '_blank');", url)
+        except Exception as e:
+            logger.error(f"[Capture] Erro ao abrir páginas: {str(e)}")
+            self._quit(driver)
+            return False
+        
+        self.driver = driver
+        self.opened_at = datetime.now()
+        self._closed = False
+        logger.info(f"[Capture] Sessão aberta: {len(self.urls)} página(s)")
+        return True
+    
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"[Capture] Erro ao fechar driver: {str(e)}")
+    
+    def poll(self) -> List[Dict]:
+        """Processa os frames recebidos desde a última chamada; retorna rodadas novas"""
+        with self._lock:
+            if self.driver is None:
+                return []
+            
+            try:
+                entries = self.driver.get_log('performance')
+            except Exception as e:
+                logger.warning(f"[Capture] Falha ao ler logs ({str(e)[:80]}), reciclando")
+                self._recycle()
+                return []
+            
+            new_rolls = []
+            for entry in entries:
+                payload = self._frame_payload(entry)
+                if payload is None:
+                    continue
+                self.stats['frames'] += 1
+                for record in parse_stream_message(payload):
+                    if self._dedup.is_new(record):
+                        self._history[record['type']].append(record)
+                        new_rolls.append(record)
+            
+            self.stats['rolls'] += len(new_rolls)
+            self.stats['polls'] += 1
+            self._polls += 1
+            if self._polls % self.budget_check_every == 0:
+                self._check_budget()
+            
+            return new_rolls
+    
+    def _frame_payload(self, entry: Dict) -> Optional[str]:
+        """Extrai payloadData de uma entrada de log, se for frame WebSocket"""
+        message = entry.get('message')
+        # Filtro barato antes do json.loads (a maioria das entradas é outro evento)
+        if not message or self.FRAME_EVENT not in message:
+            return None
+        try:
+            event = json.loads(message)['message']
+            return event['params']['response']['payloadData']
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    def _heap_mb(self) -> float:
+        try:
+            metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {})
+            for metric in metrics.get('metrics', []):
+                if metric.get('name') == 'JSHeapUsedSize':
+                    return metric['value'] / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"[Capture] Métricas indisponíveis: {str(e)}")
+        return 0.0
+    
+    def _check_budget(self):
+        heap_mb = self._heap_mb()
+        self.stats['heap_mb'] = heap_mb
+        
+        if heap_mb > self.memory_cap_mb:
+            logger.info(f"[Capture] Heap {heap_mb:.0f}MB > {self.memory_cap_mb:.0f}MB, reciclando")
+            self._recycle()
+        elif self.opened_at and datetime.now() - self.opened_at > self.page_max_age:
+            logger.info("[Capture] Página expirou, reciclando")
+            self._recycle()
+    
+    def _recycle(self):
+        """Fecha e reabre o navegador (libera memória acumulada pela página)"""
+        if self.driver is not None:
+            self._quit(self.driver)
+            self.driver = None
+        self.stats['recycles'] += 1
+        self._open()
+    
+    def recent(self, game: str, limit: int = 100) -> List[Dict]:
+        """Últimas `limit` rodadas de um jogo, em ordem cronológica"""
+        with self._lock:
+            history = self._history[game]
+            start = max(0, len(history) - limit)
+            return [history[i] for i in range(start, len(history))]
+    
+    async def rolls(self) -> AsyncIterator[Dict]:
+        """Iterador assíncrono de rodadas novas (poll em executor)"""
+        loop = asyncio.get_running_loop()
+        while not self._closed:
+            new_rolls = await loop.run_in_executor(None, self.poll)
+            for record in new_rolls:
+                yield record
+            if not new_rolls:
+                await asyncio.sleep(self.poll_interval)
+    
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self.driver is not None:
+                self._quit(self.driver)
+                self.driver = None
+
+
+class FixtureDriver:
+    """
+    Driver de teste para BlazeNetworkCapture
+    
+    Entrega frames de uma gravação .jsonl (mesmo formato do ReplayServer)
+    como entradas do log de performance do Chrome, `frames_per_poll` por
+    chamada de get_log(). O heap reportado cresce `heap_per_frame_mb` a
+    cada frame, para exercitar a reciclagem.
+    """
+    
+    def __init__(self, path: str, frames_per_poll: int = 5, heap_per_frame_mb: float = 0.0):
+        self.frames: List[str] = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('{"delay"'):
+                    line = json.loads(line)['frame']
+                self.frames.append(line)
+        
+        self.frames_per_poll = frames_per_poll
+        self.heap_per_frame_mb = heap_per_frame_mb
+        self.position = 0
+        self.pages: List[str] = []
+        self.closed = False
+    
+    def get(self, url: str):
+        self.pages.append(url)
+    
+    def execute_script(self, script: str, *args):
+        self.pages.extend(args)
+    
+    def execute_cdp_cmd(self, cmd: str, params: Dict) -> Dict:
+        if cmd == 'Performance.getMetrics':
+            heap = 10 + self.position * self.heap_per_frame_mb
+            return {'metrics': [{'name': 'JSHeapUsedSize', 'value': heap * 1024 * 1024}]}
+        return {}
+    
+    def get_log(self, kind: str) -> List[Dict]:
+        chunk = self.frames[self.position:self.position + self.frames_per_poll]
+        self.position += len(chunk)
+        entries = []
+        for frame in chunk:
+            # Entradas de outro tipo misturadas, como no Chrome real
+            entries.append({'message': json.dumps({'message': {
+                'method': 'Network.dataReceived', 'params': {}}})})
+            entries.append({'message': json.dumps({'message': {
+                'method': BlazeNetworkCapture.FRAME_EVENT,
+                'params': {'response': {'opcode': 1, 'payloadData': frame}}}})})
+        return entries
+    
+    def quit(self):
+        self.closed = True
+
+
 # ============================================================
 # ALTERNATIVA: Captura via Browser DevTools Protocol
 # ============================================================
@@ -369,59 +706,39 @@ class BlazeDevToolsScraper:
     """
     Scraper que usa Chrome DevTools Protocol
     Mais leve que Selenium, captura WebSocket messages
+    
+    A conexão WebSocket é feita pelo BlazeStreamCollector
+    (data_collection.blaze_stream): cliente asyncio com reconexão,
+    heartbeat e buffers limitados.
     """
     
-    def __init__(self):
-        self.ws_messages = []
+    def __init__(self, ws_url: Optional[str] = None):
+        # WebSocket da Blaze (descobrir via DevTools Network)
+        self.ws_url = ws_url or os.getenv('BLAZE_WS_URL', 'wss://api.blaze.bet.br/ws')
+        self.collector = None
         logger.info("[Blaze DevTools Scraper] Inicializado")
     
     def connect_websocket(self):
         """Conecta ao WebSocket da Blaze para receber dados em tempo real"""
         try:
-            import websocket
-            
-            # WebSocket da Blaze (descobrir via DevTools Network)
-            ws_url = "wss://api.blaze.bet.br/ws"  # URL hipotética
-            
-            def on_message(ws, message):
-                try:
-                    data = json.loads(message)
-                    self.ws_messages.append(data)
-                    logger.debug(f"[WebSocket] Mensagem: {data}")
-                except:
-                    pass
-            
-            def on_error(ws, error):
-                logger.error(f"[WebSocket] Erro: {error}")
-            
-            def on_close(ws, close_status_code, close_msg):
-                logger.info("[WebSocket] Conexão fechada")
-            
-            def on_open(ws):
-                logger.info("[OK] WebSocket conectado")
-            
-            ws = websocket.WebSocketApp(
-                ws_url,
-                on_open=on_open,
-                on_message=on_message,
-                on_error=on_error,
-                on_close=on_close
-            )
-            
-            # Rodar em thread separada
-            import threading
-            wst = threading.Thread(target=ws.run_forever)
-            wst.daemon = True
-            wst.start()
+            from .blaze_stream import BlazeStreamCollector
             
+            if self.collector is None:
+                self.collector = BlazeStreamCollector(self.ws_url)
+            self.collector.start()
             return True
             
         except ImportError:
-            logger.error("websocket-client não instalado. Execute: pip install websocket-client")
+            logger.error("websockets não instalado. Execute: pip install websockets")
             return False
         except Exception as e:
             logger.error(f"Erro ao conectar WebSocket: {str(e)}")
             return False
+    
+    def close(self):
+        """Encerra a conexão WebSocket"""
+        if self.collector is not None:
+            self.collector.stop()
 
 
 # ============================================================
@@ -436,7 +753,7 @@ def install_dependencies():
     packages = [
         'selenium',
         'webdriver-manager',
-        'websocket-client'
+        'websockets'
     ]
     
     print("Instalando dependências para scraping realtime...")
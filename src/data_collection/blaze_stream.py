@@ -0,0 +1,477 @@
+"""
+Blaze Stream - Ingestão push via WebSocket
+==========================================
+
+Substitui o polling HTTP (get_all_data a cada ciclo) por uma conexão
+WebSocket persistente no protocolo socket.io da Blaze:
+
+    wss://.../replication/?EIO=3&transport=websocket
+        ├─ envia  420["cmd",{"id":"subscribe","payload":{"room":"double_room_1"}}]
+        ├─ recebe 42["data",{"id":"double.tick","payload":{...}}]
+        └─ heartbeat engine.io: "2" (ping) / "3" (pong)
+
+Componentes:
+    parse_stream_message   frame bruto → lista de registros normalizados
+                           (mesmo formato de BlazeDataCollectorV2)
+    RollDeduplicator       descarta ticks repetidos do mesmo jogo
+    BlazeStreamClient      cliente asyncio: reconexão com backoff exponencial,
+                           heartbeat, fila limitada e iterador assíncrono rolls()
+    BlazeStreamCollector   fachada síncrona com a interface do
+                           BlazeDataCollectorV2 (get_all_data etc.), alimentada
+                           pelo cliente numa thread com event loop próprio
+
+Para testes, ver data_collection.replay_server.ReplayServer.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence
+
+from .blaze_client_v2 import BlazeDataCollectorV2
+
+logger = logging.getLogger(__name__)
+
+
+# Cores do Double no payload da Blaze
+DOUBLE_COLORS = {0: 'WHITE', 1: 'RED', 2: 'BLACK'}
+
+# Rooms assinadas por padrão
+DEFAULT_SUBSCRIPTIONS = (
+    '420["cmd",{"id":"subscribe","payload":{"room":"double_room_1"}}]',
+    '421["cmd",{"id":"subscribe","payload":{"room":"crash_room_1"}}]',
+)
+
+# Frames engine.io
+PING_FRAME = '2'
+PONG_FRAME = '3'
+
+# Marca de fim do iterador rolls()
+_STOP = object()
+
+
+def _normalize_double(payload: Dict) -> Optional[Dict]:
+    color = payload.get('color')
+    if color is None:
+        return None
+    if isinstance(color, str):
+        color_name = color.upper()
+    else:
+        color_name = DOUBLE_COLORS.get(int(color))
+        if color_name is None:
+            return None
+
+    created_at = payload.get('created_at') or datetime.now().isoformat()
+    return {
+        'type': 'double',
+        'color': color_name,
+        'result': color_name.lower(),
+        'roll': payload.get('roll'),
+        'game_id': str(payload.get('id', payload.get('game_id', ''))),
+        'timestamp': created_at,
+        'created_at': created_at,
+    }
+
+
+def _normalize_crash(payload: Dict) -> Optional[Dict]:
+    crash_point = payload.get('crash_point')
+    if crash_point is None:
+        return None
+
+    created_at = payload.get('created_at') or datetime.now().isoformat()
+    return {
+        'type': 'crash',
+        'crash_point': float(crash_point),
+        'game_id': str(payload.get('id', payload.get('game_id', ''))),
+        'timestamp': created_at,
+        'created_at': created_at,
+        'status': 'completed',
+    }
+
+
+def parse_stream_message(raw: Any) -> List[Dict]:
+    """
+    Converte um frame recebido em registros de rodada finalizada
+
+    Aceita frames socket.io (42["data", {...}]) e JSON simples
+    ({"type": "double", ...}). Ticks intermediários (waiting/graphing) e
+    frames de controle retornam lista vazia.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8', errors='ignore')
+    if not isinstance(raw, str):
+        return []
+
+    text = raw.strip()
+    if text.startswith('42'):
+        # Remove prefixo socket.io (tipo + ack id opcional)
+        start = text.find('[')
+        if start < 0:
+            return []
+        text = text[start:]
+    elif not text.startswith(('{', '[')):
+        return []
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+
+    # 42["data", {...}]
+    if isinstance(data, list):
+        if len(data) < 2 or not isinstance(data[1], dict):
+            return []
+        data = data[1]
+    if not isinstance(data, dict):
+        return []
+
+    event_id = str(data.get('id', ''))
+    payload = data.get('payload')
+    if isinstance(payload, dict):
+        status = payload.get('status')
+        if event_id.startswith('double') and status in ('rolling', 'complete'):
+            record = _normalize_double(payload)
+        elif event_id.startswith('crash') and status == 'complete':
+            record = _normalize_crash(payload)
+        else:
+            record = None
+        return [record] if record else []
+
+    # JSON simples já no formato do coletor
+    game_type = str(data.get('type', '')).lower()
+    if game_type == 'double':
+        record = _normalize_double(data)
+    elif game_type == 'crash':
+        record = _normalize_crash(data)
+    else:
+        record = None
+    return [record] if record else []
+
+
+class RollDeduplicator:
+    """
+    Filtra rodadas repetidas por (tipo, game_id) numa janela limitada
+
+    A Blaze emite vários ticks para o mesmo jogo (rolling/complete) e uma
+    reconexão reenvia o estado atual; só a primeira ocorrência passa.
+    """
+
+    __slots__ = ('_order', '_seen')
+
+    def __init__(self, size: int = 1000):
+        self._order: Deque[str] = deque(maxlen=size)
+        self._seen = set()
+
+    def is_new(self, record: Dict) -> bool:
+        """True se a rodada ainda não foi vista (e passa a ser registrada)"""
+        if not record.get('game_id'):
+            return True
+        key = f"{record['type']}:{record['game_id']}"
+        if key in self._seen:
+            return False
+        if len(self._order) == self._order.maxlen:
+            self._seen.discard(self._order[0])
+        self._order.append(key)
+        self._seen.add(key)
+        return True
+
+
+class BlazeStreamClient:
+    """
+    Cliente WebSocket assíncrono com reconexão e fila limitada
+
+    Cada rodada finalizada (deduplicada por game_id) entra em uma
+    asyncio.Queue de tamanho fixo. Se o consumidor atrasar, a rodada mais
+    antiga é descartada (stats['dropped']) - o pipeline sempre vê as
+    rodadas mais recentes e a memória não cresce.
+
+    Exemplo:
+        client = BlazeStreamClient(url)
+        task = asyncio.create_task(client.run())
+        async for roll in client.rolls():
+            processar(roll)
+    """
+
+    def __init__(self,
+                 url: str,
+                 subscriptions: Sequence[str] = DEFAULT_SUBSCRIPTIONS,
+                 queue_size: int = 1000,
+                 heartbeat_interval: float = 25.0,
+                 backoff_initial: float = 0.5,
+                 backoff_max: float = 30.0,
+                 max_reconnects: Optional[int] = None):
+        """
+        Args:
+            url: Endpoint WebSocket
+            subscriptions: Frames enviados a cada (re)conexão
+            queue_size: Capacidade da fila de rodadas
+            heartbeat_interval: Segundos entre pings engine.io
+            backoff_initial: Espera inicial antes de reconectar
+            backoff_max: Espera máxima entre reconexões
+            max_reconnects: Limite de reconexões (None = infinito)
+        """
+        self.url = url
+        self.subscriptions = list(subscriptions)
+        self.heartbeat_interval = heartbeat_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_reconnects = max_reconnects
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._dedup = RollDeduplicator(queue_size)
+        self._stopping = False
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.connected = False
+        self.stats = {
+            'messages': 0,
+            'rolls': 0,
+            'duplicates': 0,
+            'dropped': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'last_message_at': None,
+        }
+
+    async def run(self):
+        """Loop de conexão: conecta, consome e reconecta com backoff + jitter"""
+        import websockets
+
+        delay = self.backoff_initial
+        attempts = 0
+        self._task = asyncio.current_task()
+
+        try:
+            while not self._stopping:
+                try:
+                    async with websockets.connect(self.url, ping_interval=None,
+                                                  open_timeout=10) as ws:
+                        self._ws = ws
+                        self.connected = True
+                        self.stats['connects'] += 1
+                        delay = self.backoff_initial
+                        logger.info("[STREAM] Conectado: %s", self.url)
+
+                        for frame in self.subscriptions:
+                            await ws.send(frame)
+
+                        heartbeat = asyncio.create_task(self._heartbeat(ws))
+                        try:
+                            async for message in ws:
+                                await self._handle_message(ws, message)
+                        finally:
+                            heartbeat.cancel()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("[STREAM] Conexão falhou: %s", str(e)[:100])
+                finally:
+                    self._ws = None
+                    self.connected = False
+
+                if self._stopping:
+                    break
+
+                attempts += 1
+                if self.max_reconnects is not None and attempts > self.max_reconnects:
+                    logger.error("[STREAM] Limite de reconexões atingido (%s)", self.max_reconnects)
+                    break
+
+                self.stats['reconnects'] += 1
+                wait = delay * (0.5 + random.random() / 2)
+                logger.info("[STREAM] Reconectando em %.2fs", wait)
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, self.backoff_max)
+        except asyncio.CancelledError:
+            # Cancelamento pedido por stop() encerra o loop normalmente
+            if not self._stopping:
+                raise
+        finally:
+            self._task = None
+            self._put(_STOP)
+
+    async def stop(self):
+        """Encerra a conexão e finaliza o iterador rolls()"""
+        self._stopping = True
+        ws = self._ws
+        if ws is not None:
+            await ws.close()
+        elif self._task is not None:
+            # Conectando ou na espera do backoff (até backoff_max): cancela já
+            self._task.cancel()
+
+    async def rolls(self) -> AsyncIterator[Dict]:
+        """Iterador assíncrono de rodadas finalizadas (termina após stop())"""
+        while True:
+            item = await self.queue.get()
+            if item is _STOP:
+                return
+            yield item
+
+    async def _heartbeat(self, ws):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await ws.send(PING_FRAME)
+
+    async def _handle_message(self, ws, message):
+        self.stats['messages'] += 1
+        self.stats['last_message_at'] = datetime.now()
+
+        if message == PING_FRAME:
+            await ws.send(PONG_FRAME)
+            return
+
+        for record in parse_stream_message(message):
+            if not self._dedup.is_new(record):
+                self.stats['duplicates'] += 1
+                continue
+
+            self.stats['rolls'] += 1
+            self._put(record)
+
+    def _put(self, item):
+        """Enfileira sem bloquear; descarta o mais antigo se a fila estiver cheia"""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                try:
+                    dropped = self.queue.get_nowait()
+                    if dropped is not _STOP:
+                        self.stats['dropped'] += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+
+class BlazeStreamCollector(BlazeDataCollectorV2):
+    """
+    Coletor push com a mesma interface do BlazeDataCollectorV2
+
+    start() sobe o BlazeStreamClient numa thread com event loop próprio; as
+    rodadas recebidas vão para buffers circulares por jogo. get_all_data()
+    apenas lê esses buffers (sem HTTP). Enquanto o stream ainda não trouxe
+    dados de um jogo, cai no comportamento do BlazeDataCollectorV2.
+
+    Exemplo:
+        collector = BlazeStreamCollector(Settings.BLAZE_WS_URL)
+        collector.start()
+        data = collector.get_all_data(limit=100)
+        collector.stop()
+    """
+
+    def __init__(self, url: str, history_size: int = 500, **client_kwargs):
+        super().__init__()
+        self.url = url
+        self.history_size = history_size
+        self.client_kwargs = client_kwargs
+
+        self._lock = threading.Lock()
+        self._history: Dict[str, Deque[Dict]] = {
+            'double': deque(maxlen=history_size),
+            'crash': deque(maxlen=history_size),
+        }
+        self._new_roll = threading.Condition(self._lock)
+
+        self.client: Optional[BlazeStreamClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Inicia a ingestão em background"""
+        if self.is_running:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(ready,),
+                                        name='blaze-stream')
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait(timeout=5)
+
+    def stop(self, timeout: float = 5.0):
+        """Encerra a conexão (ou cancela a espera de reconexão) e aguarda a thread"""
+        loop, client = self._loop, self.client
+        if loop is not None and client is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.stop(), loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _thread_main(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._consume(ready))
+        finally:
+            loop.close()
+            self._loop = None
+
+    async def _consume(self, ready: threading.Event):
+        self.client = BlazeStreamClient(self.url, **self.client_kwargs)
+        task = asyncio.create_task(self.client.run())
+        ready.set()
+        async for record in self.client.rolls():
+            with self._lock:
+                self._history[record['type']].append(record)
+                self._new_roll.notify_all()
+        await task
+
+    def wait_for_rolls(self, count: int, game: Optional[str] = None,
+                       timeout: float = 5.0) -> bool:
+        """Bloqueia até existirem `count` rodadas no buffer (útil em testes)"""
+        games = [game] if game else list(self._history)
+        with self._new_roll:
+            return self._new_roll.wait_for(
+                lambda: sum(len(self._history[g]) for g in games) >= count, timeout)
+
+    def _recent(self, game: str, limit: int) -> List[Dict]:
+        with self._lock:
+            # Do fim da deque (O(1) por item), depois de volta à ordem cronológica
+            records = list(islice(reversed(self._history[game]), limit))
+        records.reverse()
+        return records
+
+    def test_connectivity(self) -> bool:
+        """Stream conectado conta como API disponível"""
+        connected = self.client is not None and self.client.connected
+        self.api_available = connected
+        if connected:
+            self.use_fallback = False
+            return True
+        return super().test_connectivity()
+
+    def get_double_history(self, limit: int = 100) -> List[Dict]:
+        records = self._recent('double', limit)
+        if records:
+            return records
+        return super().get_double_history(limit)
+
+    def get_crash_history(self, limit: int = 100) -> List[Dict]:
+        records = self._recent('crash', limit)
+        if records:
+            return records
+        return super().get_crash_history(limit)
+
+    def get_all_data(self, limit: int = 100) -> Dict:
+        data = super().get_all_data(limit)
+        if self._history['double'] or self._history['crash']:
+            data['source'] = 'stream'
+        return data
+
+    def get_stream_stats(self) -> Dict:
+        """Contadores do cliente (mensagens, rodadas, descartes, reconexões)"""
+        stats = dict(self.client.stats) if self.client else {}
+        stats['connected'] = bool(self.client and self.client.connected)
+        with self._lock:
+            stats['buffered'] = {game: len(h) for game, h in self._history.items()}
+        return stats
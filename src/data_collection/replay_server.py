@@ -0,0 +1,122 @@
+"""
+Replay Server - Servidor WebSocket local que reproduz mensagens gravadas
+========================================================================
+
+Substituto da Blaze para testes e desenvolvimento do BlazeStreamClient:
+reproduz, para cada cliente conectado, uma gravação de frames (um por linha
+de um arquivo .jsonl ou lista em memória) e responde ao heartbeat engine.io.
+
+Formato da gravação (uma linha por frame):
+    42["data",{"id":"double.tick","payload":{...}}]
+    {"delay": 0.5, "frame": "42[\"data\", ...]"}    # com atraso explícito
+
+Exemplo:
+    async with ReplayServer.from_file('tests/fixtures/blaze_ws_recording.jsonl') as server:
+        client = BlazeStreamClient(server.url)
+        ...
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayServer:
+    """
+    Servidor WebSocket de replay
+
+    Args:
+        frames: Frames gravados (str) ou pares (atraso, frame)
+        interval: Atraso padrão entre frames (segundos)
+        drop_after: Fecha a primeira conexão após N frames (simula queda)
+        host/port: Endereço de escuta (port=0 escolhe porta livre)
+    """
+
+    def __init__(self,
+                 frames: Sequence[Union[str, Tuple[float, str]]],
+                 interval: float = 0.0,
+                 drop_after: Optional[int] = None,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        self.frames: List[Tuple[float, str]] = [
+            frame if isinstance(frame, tuple) else (interval, frame)
+            for frame in frames
+        ]
+        self.drop_after = drop_after
+        self.host = host
+        self.port = port
+
+        self.received: List[str] = []        # frames enviados pelos clientes
+        self.connections = 0
+        self._server = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> 'ReplayServer':
+        """Carrega uma gravação .jsonl"""
+        interval = kwargs.get('interval', 0.0)
+        frames = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('{"delay"'):
+                    entry = json.loads(line)
+                    frames.append((float(entry.get('delay', interval)), entry['frame']))
+                else:
+                    frames.append(line)
+        return cls(frames, **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/replication/?EIO=3&transport=websocket"
+
+    async def start(self):
+        import websockets
+
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("[REPLAY] Servindo %s frames em %s", len(self.frames), self.url)
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handler(self, ws, path=None):
+        self.connections += 1
+        first_connection = self.connections == 1
+        reader = asyncio.create_task(self._read(ws))
+        try:
+            for sent, (delay, frame) in enumerate(self.frames):
+                if first_connection and self.drop_after is not None \
+                        and sent >= self.drop_after:
+                    break
+                if delay:
+                    await asyncio.sleep(delay)
+                await ws.send(frame)
+            else:
+                # Gravação terminou: mantém a conexão aberta até o cliente sair
+                await reader
+        except Exception:
+            pass
+        finally:
+            reader.cancel()
+
+    async def _read(self, ws):
+        async for message in ws:
+            self.received.append(message)
+            if message == '2':
+                await ws.send('3')
@@ -9,6 +9,7 @@ from .models import (
     CacheModel,
     SystemStateModel,
     GameResultModel,
+    GameResultRollupModel,
     init_db
 )
 from .repository import (
@@ -19,6 +20,8 @@ from .repository import (
     CacheRepository,
     GameResultRepository
 )
+from .event_sink import EventSink
+from .retention import RetentionManager, RetentionPolicy, log_file_lock
 
 __all__ = [
     'SignalModel',
@@ -28,11 +31,16 @@ __all__ = [
     'CacheModel',
     'SystemStateModel',
     'GameResultModel',
+    'GameResultRollupModel',
     'init_db',
     'SignalRepository',
     'RawDataRepository',
     'PerformanceMetricRepository',
     'EventRepository',
     'CacheRepository',
-    'GameResultRepository'
+    'GameResultRepository',
+    'EventSink',
+    'RetentionManager',
+    'RetentionPolicy',
+    'log_file_lock'
 ]
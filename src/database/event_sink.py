@@ -0,0 +1,181 @@
+"""
+Sink de eventos com gravação em lote
+====================================
+
+Fica entre PersistenceManager.record_event e o EventRepository:
+
+- emit() só coloca o evento no buffer (nenhum acesso ao BD na thread que chama)
+- Uma thread grava o buffer quando ele chega a `batch_size` eventos ou a cada
+  `flush_interval` segundos, com uma transação por lote (save_batch)
+- Eventos WARNING ou acima repetidos (mesmo nível, origem e mensagem) viram um
+  único registro com contagem, primeira e última ocorrência (context_json)
+- Buffer cheio: política `overflow` — 'drop_newest' descarta o evento novo,
+  'drop_oldest' descarta o mais antigo, 'block' espera até `block_timeout`
+  segundos por um flush
+
+Uso:
+    sink = EventSink(EventRepository(Session))
+    sink.emit('ERROR', 'collector', 'Timeout na API')
+    sink.close()          # grava o que restou
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Níveis cujos eventos repetidos são agrupados
+DEDUPE_LEVELS = frozenset({'WARNING', 'ERROR', 'CRITICAL'})
+OVERFLOW_POLICIES = ('drop_newest', 'drop_oldest', 'block')
+
+
+class EventSink:
+    """
+    Buffer de eventos gravado em lotes
+
+    Args:
+        repository: EventRepository (ou objeto com save_batch(events))
+        batch_size: Eventos no buffer que disparam um flush
+        flush_interval: Segundos máximos entre flushes
+        max_buffer: Eventos distintos no buffer antes da política de overflow
+        overflow: 'drop_newest', 'drop_oldest' ou 'block'
+        block_timeout: Espera máxima por espaço com overflow='block'
+        background: Iniciar a thread de gravação (False = só flush() manual)
+    """
+
+    def __init__(self, repository, batch_size: int = 50, flush_interval: float = 2.0,
+                 max_buffer: int = 1000, overflow: str = 'drop_newest',
+                 block_timeout: float = 0.5, background: bool = True):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow deve ser um de {OVERFLOW_POLICIES}")
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self._buffer: 'OrderedDict[Any, Dict]' = OrderedDict()
+        self._ids = count()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._has_space = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self.stats = {'emitted': 0, 'deduplicated': 0, 'dropped': 0,
+                      'written': 0, 'batches': 0, 'failed': 0}
+
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name='event-sink', daemon=True)
+            self._thread.start()
+
+    def emit(self, level: str, source: str, message: str,
+             traceback: Optional[str] = None, context: Optional[Dict] = None) -> bool:
+        """
+        Enfileira um evento
+
+        Returns:
+            False se o evento foi descartado (buffer cheio ou sink fechado)
+        """
+        now = datetime.now()
+        level = level.upper()
+        key = (level, source, message) if level in DEDUPE_LEVELS else next(self._ids)
+
+        with self._lock:
+            if self._closed:
+                self.stats['dropped'] += 1
+                return False
+            self.stats['emitted'] += 1
+
+            pending = self._buffer.get(key)
+            if pending is not None:
+                pending['context']['count'] += 1
+                pending['context']['last_seen'] = now.isoformat()
+                if traceback:
+                    pending['traceback'] = traceback
+                self.stats['deduplicated'] += 1
+                return True
+
+            if len(self._buffer) >= self.max_buffer and not self._make_room():
+                self.stats['dropped'] += 1
+                return False
+
+            event = {'timestamp': now, 'level': level, 'source': source,
+                     'message': message, 'traceback': traceback, 'context': dict(context or {})}
+            if isinstance(key, tuple):
+                event['context'].update(count=1, first_seen=now.isoformat(), last_seen=now.isoformat())
+            self._buffer[key] = event
+            if len(self._buffer) >= self.batch_size:
+                self._has_work.notify()
+            return True
+
+    def _make_room(self) -> bool:
+        """Aplica a política de overflow (chamado com o lock)"""
+        if self.overflow == 'drop_oldest':
+            self._buffer.popitem(last=False)
+            self.stats['dropped'] += 1
+            return True
+        if self.overflow == 'block':
+            self._has_work.notify()
+            deadline = time.monotonic() + self.block_timeout
+            while len(self._buffer) >= self.max_buffer and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._has_space.wait(remaining):
+                    break
+            return len(self._buffer) < self.max_buffer
+        return False
+
+    def flush(self) -> int:
+        """Grava o buffer atual numa transação; retorna eventos gravados"""
+        with self._write_lock:
+            with self._lock:
+                if not self._buffer:
+                    return 0
+                events = list(self._buffer.values())
+                self._buffer.clear()
+                self._has_space.notify_all()
+            try:
+                written = self.repository.save_batch(events)
+            except Exception as e:
+                # Lote perdido: regravar alimentaria a mesma tempestade de escrita
+                with self._lock:
+                    self.stats['failed'] += len(events)
+                logger.warning("[EVENT-SINK] Falha ao gravar %s eventos: %s", len(events), e)
+                return 0
+            with self._lock:
+                self.stats['written'] += written
+                self.stats['batches'] += 1
+            return written
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._has_work.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self, timeout: float = 5.0):
+        """Para a thread e grava os eventos restantes"""
+        with self._lock:
+            self._closed = True
+            self._has_work.notify()
+            self._has_space.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, 'pending': len(self._buffer)}
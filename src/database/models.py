@@ -18,8 +18,11 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from typing import Optional
 import os
 
+from .postgres import create_postgres_engine, create_schema, is_postgres_url
+
 Base = declarative_base()
 
 
@@ -188,20 +191,66 @@ class GameResultModel(Base):
     
     collected_at = Column(DateTime, default=datetime.now, index=True)
     
+    __table_args__ = (
+        # Consultas por jogo + período (get_results_by_timeframe, get_win_rate_by_game)
+        Index('idx_game_results_game_timestamp', 'game', 'timestamp'),
+    )
+    
     def __repr__(self):
         return f"<GameResult {self.id}: {self.game} {self.result}>"
 
 
-def init_db(db_path: str = 'data/db/analysis.db') -> sessionmaker:
+class GameResultRollupModel(Base):
+    """Agregado horário de rodadas que saíram do banco (ver database.retention)"""
+    __tablename__ = 'game_result_rollups'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    game = Column(String(50))
+    result = Column(String(50))  # '*' = todas as rodadas do jogo naquela hora
+    hour = Column(DateTime)
+    
+    rounds = Column(Integer, default=0)
+    signal_wins = Column(Integer, default=0)  # Rodadas com sinal que acertou
+    signal_losses = Column(Integer, default=0)
+    
+    # Multiplicador (Crash): soma e contagem mantêm a média exata ao somar lotes
+    price_count = Column(Integer, default=0)
+    price_sum = Column(Float, default=0.0)
+    price_min = Column(Float, nullable=True)
+    price_max = Column(Float, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.now)
+    
+    __table_args__ = (
+        UniqueConstraint('game', 'result', 'hour', name='uq_rollup_game_result_hour'),
+        Index('idx_rollup_game_hour', 'game', 'hour'),
+    )
+    
+    def __repr__(self):
+        return f"<GameResultRollup {self.game}:{self.result} {self.hour}: {self.rounds}>"
+
+
+def init_db(db_path: str = 'data/db/analysis.db', database_url: Optional[str] = None,
+            **pool_options) -> sessionmaker:
     """
     Inicializa o banco de dados
     
     Args:
         db_path: Caminho para o arquivo SQLite
+        database_url: URL do PostgreSQL (padrão: DATABASE_URL); quando
+                      presente, o SQLite não é usado
+        pool_options: pool_size, max_overflow, pool_timeout, pool_recycle
+                      (só PostgreSQL; ver database.postgres)
     
     Returns:
         Session factory para criar sessões de BD
     """
+    database_url = database_url or os.getenv('DATABASE_URL')
+    if is_postgres_url(database_url):
+        engine = create_postgres_engine(database_url, **pool_options)
+        create_schema(engine, Base.metadata)
+        return sessionmaker(bind=engine)
+
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
     engine = create_engine(
@@ -213,5 +262,10 @@ def init_db(db_path: str = 'data/db/analysis.db') -> sessionmaker:
     # Criar todas as tabelas
     Base.metadata.create_all(engine)
     
+    # Índices adicionados depois da criação de bancos já existentes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    
     # Retornar factory de sessões
     return sessionmaker(bind=engine)
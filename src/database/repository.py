@@ -2,20 +2,28 @@
 Repository Pattern - Data Access Layer
 Abstração para acesso ao banco de dados
 """
+import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy import desc, func, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from .models import (
     SignalModel, RawDataModel, PerformanceMetricModel,
-    EventModel, CacheModel, SystemStateModel, GameResultModel
+    EventModel, CacheModel, SystemStateModel, GameResultModel, GameResultRollupModel
 )
+from .postgres import bulk_insert
 from core.types import Signal, SignalStatus
 from core.exceptions import DatabaseError
 
 
+def _json_safe(value: Any) -> Any:
+    """Valor aceito por colunas JSON (datetimes e afins viram texto)"""
+    return json.loads(json.dumps(value, default=str))
+
+
 class Repository:
     """Classe base para repositórios"""
     
@@ -35,6 +43,26 @@ class Repository:
         finally:
             session.close()
 
+    def _bulk_insert(self, model, records: List[Dict[str, Any]]) -> int:
+        """
+        Insere vários registros numa transação, ignorando chaves já gravadas
+
+        PostgreSQL: COPY/execute_values (database.postgres.bulk_insert);
+        SQLite: INSERT OR IGNORE com executemany.
+        """
+        if not records:
+            return 0
+        with self.get_session() as session:
+            connection = session.connection()
+            if connection.dialect.name == 'postgresql':
+                cursor = connection.connection.cursor()
+                try:
+                    return bulk_insert(cursor, model.__tablename__, records)
+                finally:
+                    cursor.close()
+            result = session.execute(sqlite_insert(model.__table__).on_conflict_do_nothing(), records)
+            return max(result.rowcount, 0)
+
 
 class SignalRepository(Repository):
     """Operações com sinais"""
@@ -158,6 +186,30 @@ class RawDataRepository(Repository):
             )
             session.add(model)
     
+    def save_many(self, game: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Salva um lote de dados brutos numa transação (duplicados ignorados)
+
+        Args:
+            records: Dicts com timestamp, result, data, hash_value e price
+
+        Returns:
+            Registros novos gravados
+        """
+        rows = [{
+            'id': f"{game}_{r['timestamp'].timestamp()}",
+            'game': game,
+            'timestamp': r['timestamp'],
+            'result': r.get('result'),
+            'price': r.get('price'),
+            'data_json': _json_safe(r.get('data')),
+            'source': r.get('source', 'blaze_api'),
+            'valid': r.get('valid', True),
+            'hash_value': r.get('hash_value'),
+            'collected_at': datetime.now(),
+        } for r in records]
+        return self._bulk_insert(RawDataModel, rows)
+
     def get_latest(self, game: str, limit: int = 100) -> List[Dict]:
         """Retorna dados brutos mais recentes"""
         with self.get_session() as session:
@@ -231,7 +283,34 @@ class EventRepository(Repository):
                 context_json=context or {}
             )
             session.add(model)
-    
+
+    def save_batch(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Registra vários eventos numa única transação
+
+        Args:
+            events: Dicts com level, source, message e, opcionais,
+                    traceback, context e timestamp
+
+        Returns:
+            Quantidade de eventos gravados
+        """
+        if not events:
+            return 0
+        with self.get_session() as session:
+            session.add_all([
+                EventModel(
+                    timestamp=event.get('timestamp') or datetime.now(),
+                    level=event['level'],
+                    source=event['source'],
+                    message=event['message'],
+                    traceback=event.get('traceback'),
+                    context_json=event.get('context') or {}
+                )
+                for event in events
+            ])
+        return len(events)
+
     def get_recent_errors(self, limit: int = 10) -> List[Dict]:
         """Retorna erros recentes"""
         with self.get_session() as session:
@@ -243,7 +322,8 @@ class EventRepository(Repository):
                 'timestamp': m.timestamp,
                 'level': m.level,
                 'source': m.source,
-                'message': m.message
+                'message': m.message,
+                'count': (m.context_json or {}).get('count', 1)
             } for m in models]
 
 
@@ -315,6 +395,60 @@ class GameResultRepository(Repository):
             )
             session.add(model)
     
+    def save_many(self, game_results: List[Dict[str, Any]]) -> int:
+        """
+        Salva vários resultados numa transação (IDs já gravados são ignorados)
+
+        Returns:
+            Resultados novos gravados
+        """
+        now = datetime.now()
+        rows = [{
+            'id': r.get('id', f"result_{r.get('timestamp', now)}"),
+            'timestamp': r.get('timestamp', now),
+            'game': r.get('game', 'Unknown'),
+            'result': r.get('result', 'Unknown'),
+            'price': r.get('price'),
+            'odds': r.get('odds', 1.9),
+            'signal_id': r.get('signal_id'),
+            'signal_matched': r.get('signal_matched', False),
+            'raw_data_json': _json_safe(r.get('raw_data', {})),
+            'analyzed': r.get('analyzed', False),
+            'analysis_json': _json_safe(r.get('analysis', {})),
+            'collected_at': now,
+        } for r in game_results]
+        return self._bulk_insert(GameResultModel, rows)
+
+    def get_rollups(self, game: str, hours: int = 24 * 7,
+                    result: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Agregados horários de rodadas gravados pela retenção (camada fria)
+
+        Args:
+            game: Double ou Crash
+            hours: Últimas N horas
+            result: Só as rodadas deste resultado (Vermelho, Preto...)
+        """
+        since = datetime.now() - timedelta(hours=hours)
+        with self.get_session() as session:
+            models = session.query(GameResultRollupModel).filter(
+                and_(
+                    GameResultRollupModel.game == game,
+                    GameResultRollupModel.result == (result or '*'),
+                    GameResultRollupModel.hour >= since
+                )
+            ).order_by(GameResultRollupModel.hour).all()
+            
+            return [{
+                'timestamp': m.hour,
+                'rounds': m.rounds,
+                'wins': m.signal_wins,
+                'losses': m.signal_losses,
+                'avg_price': m.price_sum / m.price_count if m.price_count else None,
+                'max_price': m.price_max,
+                'min_price': m.price_min
+            } for m in models]
+
     def get_by_id(self, result_id: str) -> Optional[Dict[str, Any]]:
         """Recupera um resultado por ID"""
         with self.get_session() as session:
@@ -0,0 +1,408 @@
+"""
+Retenção de dados: camada quente no banco, camada fria em arquivos
+==================================================================
+
+Com coleta 24/7, game_results, raw_data, events e signals crescem sem
+limite e as consultas por período ficam mais lentas com o uptime. O
+RetentionManager mantém no banco só a janela quente de cada tabela:
+
+- game_results antigos viram agregados horários em GameResultRollupModel
+  (ver rollup_game_results) antes de sair do banco
+- Linhas fora da janela quente são arquivadas em Parquet (zstd) em
+  archive_dir/<tabela>/date=AAAA-MM-DD/part-*.parquet e apagadas, em lotes
+  de batch_size por transação. Sem pyarrow, o arquivo é CSV gzip
+- Arquivos de log que só crescem (pipeline_stats.json, pipeline_metrics.csv)
+  mantêm as últimas linhas; o restante vai comprimido para o arquivo. Quem
+  anexa a esses arquivos usa log_file_lock, o mesmo lock da compactação
+- Compactação: partições mensais vazias removidas e VACUUM/ANALYZE
+  (Postgres) ou PRAGMA optimize e VACUUM quando há muitas páginas livres
+  (SQLite). Com maintenance_lock, a compactação é pulada enquanto outro
+  dono do lock (o ciclo de análise) estiver gravando
+
+Uso:
+    manager = RetentionManager(Session, RetentionPolicy.from_env())
+    report = manager.run()
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from .models import (
+    EventModel, GameResultModel, GameResultRollupModel, RawDataModel, SignalModel
+)
+from .postgres import PARTITIONED_TABLES, drop_expired_partitions
+
+try:
+    import pyarrow  # noqa: F401  (engine do DataFrame.to_parquet)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+# GameResultRollupModel.result do agregado com todas as rodadas do jogo
+ROLLUP_ALL_RESULTS = '*'
+
+# Tabela → (modelo, coluna de tempo)
+RETAINED_TABLES = {
+    'game_results': (GameResultModel, 'timestamp'),
+    'raw_data': (RawDataModel, 'timestamp'),
+    'events': (EventModel, 'timestamp'),
+    'signals': (SignalModel, 'timestamp'),
+}
+
+DEFAULT_LOG_FILES = ('logs/pipeline_stats.json', 'logs/pipeline_metrics.csv')
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Janelas da camada quente e destino da camada fria
+
+    Args:
+        hot_days: Dias mantidos no banco por tabela (ausente = sem retenção)
+        archive_dir: Raiz dos arquivos frios
+        batch_size: Linhas por transação ao arquivar/apagar
+        log_files: Arquivos de log (JSONL/CSV) compactados por compact_log_file
+        log_keep_lines: Linhas mantidas em cada arquivo de log
+        log_max_bytes: Tamanho a partir do qual o arquivo de log é compactado
+        vacuum_free_ratio: Fração de páginas livres que dispara VACUUM no SQLite
+    """
+    hot_days: Dict[str, int] = field(default_factory=lambda: {
+        'raw_data': 7, 'game_results': 30, 'events': 14, 'signals': 90
+    })
+    archive_dir: str = 'data/archive'
+    batch_size: int = 5000
+    log_files: Sequence[str] = DEFAULT_LOG_FILES
+    log_keep_lines: int = 10000
+    log_max_bytes: int = 5 * 1024 * 1024
+    vacuum_free_ratio: float = 0.2
+
+    @classmethod
+    def from_env(cls) -> 'RetentionPolicy':
+        """RETENTION_<TABELA>_DAYS, RETENTION_ARCHIVE_DIR, RETENTION_BATCH_SIZE"""
+        policy = cls()
+        for table in RETAINED_TABLES:
+            value = os.getenv(f'RETENTION_{table.upper()}_DAYS')
+            if value:
+                policy.hot_days[table] = int(value)
+        policy.archive_dir = os.getenv('RETENTION_ARCHIVE_DIR', policy.archive_dir)
+        policy.batch_size = int(os.getenv('RETENTION_BATCH_SIZE', policy.batch_size))
+        return policy
+
+
+_log_locks: Dict[str, threading.Lock] = {}
+_log_locks_guard = threading.Lock()
+
+
+@contextmanager
+def log_file_lock(path: str):
+    """
+    Exclusão mútua sobre um arquivo de log entre quem anexa e a compactação
+
+    Lock por caminho entre threads do processo e, onde há fcntl, flock em
+    <path>.lock entre processos (scripts que escrevem no mesmo arquivo).
+    """
+    key = os.path.abspath(path)
+    with _log_locks_guard:
+        lock = _log_locks.setdefault(key, threading.Lock())
+    with lock:
+        if not HAS_FCNTL:
+            yield
+            return
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        with open(f"{key}.lock", 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _row_dict(model, row) -> Dict:
+    """Linha ORM → dict com JSON serializado (colunas homogêneas no Parquet)"""
+    record = {}
+    for column in model.__table__.columns:
+        value = getattr(row, column.key)
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False, default=str)
+        record[column.key] = value
+    return record
+
+
+class RetentionManager:
+    """
+    Executa a política de retenção sobre um banco (SQLite ou Postgres)
+
+    Args:
+        session_factory: sessionmaker de init_db
+        policy: Janelas e destinos
+        clock: Relógio de parede (injetável em testes)
+        maintenance_lock: Lock mantido por quem grava no banco (o ciclo de
+            análise); VACUUM só roda se conseguir pegá-lo sem esperar
+    """
+
+    def __init__(self, session_factory, policy: Optional[RetentionPolicy] = None,
+                 clock: Callable[[], datetime] = datetime.now,
+                 maintenance_lock: Optional[threading.Lock] = None):
+        self.session_factory = session_factory
+        self.policy = policy or RetentionPolicy()
+        self.clock = clock
+        self.maintenance_lock = maintenance_lock
+
+    def cutoff(self, table: str) -> Optional[datetime]:
+        """Início da janela quente da tabela (em hora cheia), ou None sem retenção"""
+        days = self.policy.hot_days.get(table)
+        if days is None:
+            return None
+        return _hour(self.clock() - timedelta(days=days))
+
+    # Agregação ---------------------------------------------------------------
+
+    def rollup_game_results(self, session, rows: Sequence[GameResultModel]) -> int:
+        """
+        Soma rodadas em agregados horários de GameResultRollupModel
+
+        Um agregado por (jogo, resultado, hora) e outro com todas as rodadas
+        do jogo (result='*'). Agregados da mesma hora já existentes são somados.
+
+        Returns:
+            Agregados criados ou atualizados
+        """
+        buckets: Dict[tuple, Dict] = {}
+        for row in rows:
+            if row.timestamp is None:
+                continue
+            hour = _hour(row.timestamp)
+            for result in (ROLLUP_ALL_RESULTS, row.result):
+                bucket = buckets.setdefault((row.game, result, hour), {
+                    'rounds': 0, 'wins': 0, 'losses': 0, 'prices': []})
+                bucket['rounds'] += 1
+                if row.signal_id:
+                    bucket['wins' if row.signal_matched else 'losses'] += 1
+                if row.price is not None:
+                    bucket['prices'].append(row.price)
+
+        for (game, result, hour), bucket in buckets.items():
+            rollup = session.query(GameResultRollupModel).filter_by(
+                game=game, result=result, hour=hour).first()
+            if rollup is None:
+                rollup = GameResultRollupModel(
+                    game=game, result=result, hour=hour, rounds=0, signal_wins=0,
+                    signal_losses=0, price_count=0, price_sum=0.0)
+                session.add(rollup)
+            prices = bucket['prices']
+            if prices:
+                rollup.price_count += len(prices)
+                rollup.price_sum += sum(prices)
+                rollup.price_min = min(prices + ([rollup.price_min] if rollup.price_min is not None else []))
+                rollup.price_max = max(prices + ([rollup.price_max] if rollup.price_max is not None else []))
+            rollup.rounds += bucket['rounds']
+            rollup.signal_wins += bucket['wins']
+            rollup.signal_losses += bucket['losses']
+        return len(buckets)
+
+    # Arquivamento ------------------------------------------------------------
+
+    def _archive_path(self, table: str, day: str, extension: str) -> str:
+        directory = os.path.join(self.policy.archive_dir, table, f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        stamp = self.clock().strftime('%Y%m%dT%H%M%S')
+        index = len([f for f in os.listdir(directory) if f.startswith(f"part-{stamp}")])
+        return os.path.join(directory, f"part-{stamp}-{index:03d}.{extension}")
+
+    def archive_rows(self, table: str, records: List[Dict], time_column: str) -> List[str]:
+        """Grava as linhas em arquivos por dia (Parquet zstd, ou CSV gzip sem pyarrow)"""
+        if not records:
+            return []
+        frame = pd.DataFrame.from_records(records)
+        days = pd.to_datetime(frame[time_column]).dt.strftime('%Y-%m-%d').fillna('unknown')
+        paths = []
+        for day, part in frame.groupby(days, sort=True):
+            if HAS_PYARROW:
+                path = self._archive_path(table, day, 'parquet')
+                part.to_parquet(path, compression='zstd', index=False)
+            else:
+                path = self._archive_path(table, day, 'csv.gz')
+                part.to_csv(path, compression='gzip', index=False)
+            paths.append(path)
+        return paths
+
+    def expire_table(self, table: str) -> Dict:
+        """Arquiva e apaga (agregando game_results antes) as linhas fora da janela quente"""
+        cutoff = self.cutoff(table)
+        report = {'archived': 0, 'files': 0, 'rollups': 0}
+        if cutoff is None:
+            return report
+        model, time_column = RETAINED_TABLES[table]
+        column = getattr(model, time_column)
+        primary_key = inspect(model).primary_key[0]
+
+        while True:
+            session = self.session_factory()
+            try:
+                query = session.query(model).filter(column < cutoff)
+                if model is SignalModel:
+                    query = query.filter(model.status != 'pending')   # pendentes ainda serão verificados
+                rows = query.order_by(column).limit(self.policy.batch_size).all()
+                if not rows:
+                    session.commit()
+                    break
+                if model is GameResultModel:
+                    report['rollups'] += self.rollup_game_results(session, rows)
+                # Arquivo escrito antes do DELETE: uma falha no commit só duplica o arquivo
+                paths = self.archive_rows(table, [_row_dict(model, r) for r in rows], time_column)
+                keys = [getattr(r, primary_key.key) for r in rows]
+                session.query(model).filter(primary_key.in_(keys)).delete(synchronize_session=False)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+            report['archived'] += len(rows)
+            report['files'] += len(paths)
+            if len(rows) < self.policy.batch_size:
+                break
+
+        if report['archived']:
+            logger.info("[RETENTION] %s: %s linhas anteriores a %s arquivadas (%s arquivos)",
+                        table, report['archived'], cutoff.strftime('%Y-%m-%d %H:%M'), report['files'])
+        return report
+
+    # Logs --------------------------------------------------------------------
+
+    def compact_log_file(self, path: str) -> int:
+        """
+        Mantém as últimas log_keep_lines linhas de um arquivo JSONL/CSV
+
+        As linhas removidas vão para archive_dir/logs/<nome>.<data>.gz; o
+        cabeçalho de arquivos .csv é preservado. A leitura e a troca do
+        arquivo acontecem sob log_file_lock: linhas anexadas nesse meio
+        tempo não se perdem.
+
+        Returns:
+            Linhas movidas para o arquivo
+        """
+        if not os.path.exists(path) or os.path.getsize(path) < self.policy.log_max_bytes:
+            return 0
+        with log_file_lock(path):
+            return self._compact_log_file(path)
+
+    def _compact_log_file(self, path: str) -> int:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.readlines()
+        header = lines[:1] if path.endswith('.csv') else []
+        body = lines[len(header):]
+        split = max(len(body) - self.policy.log_keep_lines, 0)
+        old, recent = body[:split], body[split:]
+        if not old:
+            return 0
+
+        directory = os.path.join(self.policy.archive_dir, 'logs')
+        os.makedirs(directory, exist_ok=True)
+        name = os.path.basename(path)
+        archive = os.path.join(directory, f"{name}.{self.clock():%Y%m%dT%H%M%S}.gz")
+        with gzip.open(archive, 'wt', encoding='utf-8') as f:
+            f.writelines(header + old)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(header + recent)
+        os.replace(tmp_path, path)
+        logger.info("[RETENTION] %s: %s linhas arquivadas em %s", name, len(old), archive)
+        return len(old)
+
+    # Compactação -------------------------------------------------------------
+
+    def vacuum(self) -> str:
+        """
+        Compacta/atualiza estatísticas do banco; retorna a ação executada
+
+        VACUUM bloqueia as escritas (no SQLite, o banco inteiro): se o
+        maintenance_lock estiver ocupado, a compactação fica para a próxima
+        execução ('skipped'); se não, o lock fica com ela até o fim.
+        """
+        lock = self.maintenance_lock
+        if lock is not None and not lock.acquire(blocking=False):
+            logger.info("[RETENTION] Banco em uso pelo ciclo de análise; compactação adiada")
+            return 'skipped'
+        try:
+            return self._vacuum()
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def _vacuum(self) -> str:
+        session = self.session_factory()
+        try:
+            engine = session.get_bind()
+        finally:
+            session.close()
+
+        if engine.dialect.name == 'postgresql':
+            # VACUUM não roda dentro de transação
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                for table in PARTITIONED_TABLES:
+                    cutoff = self.cutoff(table)
+                    if cutoff is not None:
+                        dropped = drop_expired_partitions(conn, table, cutoff)
+                        if dropped:
+                            logger.info("[RETENTION] Partições removidas: %s", ', '.join(dropped))
+                for table in RETAINED_TABLES:
+                    conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+            return 'vacuum_analyze'
+
+        with engine.connect() as conn:
+            pages = conn.execute(text("PRAGMA page_count")).scalar() or 0
+            free = conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+            conn.execute(text("PRAGMA optimize"))
+        if pages and free / pages >= self.policy.vacuum_free_ratio:
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text("VACUUM"))
+            return 'vacuum'
+        return 'optimize'
+
+    def run(self) -> Dict:
+        """Aplica a política completa: tabelas, arquivos de log e compactação"""
+        started = time.monotonic()
+        report = {'tables': {}, 'logs': {}}
+        for table in RETAINED_TABLES:
+            try:
+                report['tables'][table] = self.expire_table(table)
+            except Exception as e:
+                logger.error("[RETENTION] Falha em %s: %s", table, e)
+                report['tables'][table] = {'error': str(e)}
+        for path in self.policy.log_files:
+            try:
+                report['logs'][path] = self.compact_log_file(path)
+            except OSError as e:
+                logger.warning("[RETENTION] Falha ao compactar %s: %s", path, e)
+        try:
+            report['vacuum'] = self.vacuum()
+        except Exception as e:
+            logger.warning("[RETENTION] Falha na compactação do banco: %s", e)
+            report['vacuum'] = 'error'
+        report['elapsed_seconds'] = time.monotonic() - started
+        return report
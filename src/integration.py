@@ -6,6 +6,7 @@ Uso:
     from integration import integrate_persistence
     integrate_persistence(platform)
 """
+import atexit
 import logging
 from datetime import datetime
 from typing import List, Dict, Any
@@ -14,7 +15,7 @@ from core import Signal, SignalStatus
 from database import (
     SignalRepository, RawDataRepository, 
     PerformanceMetricRepository, EventRepository,
-    CacheRepository, init_db
+    CacheRepository, EventSink, init_db
 )
 from data_collection.validators import DataValidator
 
@@ -41,7 +42,12 @@ class PersistenceManager:
         self.events = EventRepository(self.Session)
         self.cache = CacheRepository(self.Session)
         
-        logger.info(f"✅ Persistência inicializada: {db_path}")
+        # Eventos gravados em lote, fora da thread que os registra; a thread
+        # do sink é daemon, então close() roda também na saída do processo
+        self.event_sink = EventSink(self.events)
+        atexit.register(self.close)
+        
+        logger.info("✅ Persistência inicializada: %s", db_path)
     
     def save_signal(self, signal: Signal) -> bool:
         """
@@ -55,10 +61,10 @@ class PersistenceManager:
         """
         try:
             self.signals.save(signal)
-            logger.debug(f"💾 Sinal salvo: {signal.id}")
+            logger.debug("💾 Sinal salvo: %s", signal.id)
             return True
         except Exception as e:
-            logger.error(f"❌ Erro ao salvar sinal: {e}")
+            logger.error("❌ Erro ao salvar sinal: %s", e)
             return False
     
     def save_raw_data(self, game: str, data_list: List[Dict[str, Any]]) -> bool:
@@ -73,35 +79,29 @@ class PersistenceManager:
             True se sucesso
         """
         try:
-            count = 0
+            import hashlib
+            
+            records = []
             for data in data_list:
-                try:
-                    timestamp = data.get('timestamp', datetime.now())
-                    result = data.get('result', 'unknown')
-                    
-                    # Criar hash para deduplicação
-                    import hashlib
-                    hash_value = hashlib.md5(
-                        str(data).encode()
-                    ).hexdigest()
-                    
-                    self.raw_data.save(
-                        game=game,
-                        timestamp=timestamp,
-                        result=result,
-                        data=data,
-                        hash_value=hash_value,
-                        price=data.get('price')
-                    )
-                    count += 1
-                except Exception as e:
-                    logger.debug(f"Erro ao salvar dado: {e}")
+                timestamp = data.get('timestamp', datetime.now())
+                if not isinstance(timestamp, datetime):
+                    logger.debug("Dado sem timestamp válido ignorado: %r", timestamp)
                     continue
+                records.append({
+                    'timestamp': timestamp,
+                    'result': data.get('result', 'unknown'),
+                    'data': data,
+                    # Hash para deduplicação
+                    'hash_value': hashlib.md5(str(data).encode()).hexdigest(),
+                    'price': data.get('price')
+                })
             
-            logger.info(f"💾 {count}/{len(data_list)} registros brutos salvos ({game})")
+            # Um lote por chamada: COPY/execute_values no Postgres, executemany no SQLite
+            count = self.raw_data.save_many(game, records)
+            logger.info("💾 %s/%s registros brutos salvos (%s)", count, len(data_list), game)
             return True
         except Exception as e:
-            logger.error(f"❌ Erro ao salvar dados brutos: {e}")
+            logger.error("❌ Erro ao salvar dados brutos: %s", e)
             return False
     
     def verify_signal_result(self, signal_id: str, won: bool) -> bool:
@@ -118,10 +118,10 @@ class PersistenceManager:
         try:
             self.signals.verify_result(signal_id, won)
             status = "WIN" if won else "LOSS"
-            logger.info(f"✅ Resultado registrado: {signal_id} → {status}")
+            logger.info("✅ Resultado registrado: %s → %s", signal_id, status)
             return True
         except Exception as e:
-            logger.error(f"❌ Erro ao verificar resultado: {e}")
+            logger.error("❌ Erro ao verificar resultado: %s", e)
             return False
     
     def get_pending_signals(self, hours: int = 24) -> List[Signal]:
@@ -137,7 +137,7 @@ class PersistenceManager:
         try:
             return self.signals.get_pending(hours=hours)
         except Exception as e:
-            logger.error(f"❌ Erro ao buscar sinais pendentes: {e}")
+            logger.error("❌ Erro ao buscar sinais pendentes: %s", e)
             return []
     
     def get_performance_stats(self, game: str = None, hours: int = 24) -> Dict[str, Any]:
@@ -154,7 +154,7 @@ class PersistenceManager:
         try:
             return self.signals.get_stats(game=game, hours=hours)
         except Exception as e:
-            logger.error(f"❌ Erro ao obter stats: {e}")
+            logger.error("❌ Erro ao obter stats: %s", e)
             return {}
     
     def record_event(self, level: str, source: str, message: str, 
@@ -162,6 +162,9 @@ class PersistenceManager:
         """
         Registra evento (log estruturado)
         
+        O evento vai para o EventSink: gravado em lote pela thread do sink,
+        com erros repetidos agrupados (context_json['count']).
+        
         Args:
             level: INFO, WARNING, ERROR, CRITICAL
             source: Origem do evento
@@ -170,14 +173,14 @@ class PersistenceManager:
             context: Contexto JSON (opcional)
         
         Returns:
-            True se sucesso
+            True se aceito (False se descartado pelo buffer cheio)
         """
-        try:
-            self.events.save(level, source, message, traceback, context)
-            return True
-        except Exception as e:
-            logger.error(f"❌ Erro ao registrar evento: {e}")
-            return False
+        return self.event_sink.emit(level, source, message, traceback, context)
+    
+    def close(self):
+        """Grava os eventos pendentes e encerra o sink"""
+        atexit.unregister(self.close)
+        self.event_sink.close()
     
     def get_health_check(self) -> Dict[str, Any]:
         """
@@ -193,11 +196,12 @@ class PersistenceManager:
                 'database_ok': True,
                 'signals_count': stats.get('total', 0),
                 'win_rate': stats.get('win_rate', 0),
+                'events': self.event_sink.get_stats(),
                 'last_updated': datetime.now().isoformat(),
                 'status': 'OK'
             }
         except Exception as e:
-            logger.error(f"❌ Erro em health check: {e}")
+            logger.error("❌ Erro em health check: %s", e)
             return {
                 'database_ok': False,
                 'error': str(e),
@@ -242,7 +246,7 @@ def integrate_persistence(platform_instance):
                 )
                 platform_instance.persistence.save_signal(signal)
             except Exception as e:
-                logger.warning(f"Erro ao salvar sinal: {e}")
+                logger.warning("Erro ao salvar sinal: %s", e)
         
         # Chamar método original
         return original_send_signals(signals)
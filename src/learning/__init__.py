@@ -7,6 +7,7 @@ Componentes:
 - optimal_sequencer: Programação dinâmica para sequências
 - signal_pruner: Branch & Bound para filtro de sinais
 - meta_learner: Meta-Learning para seleção de estratégia
+- calibration: Calibração online da confiança (curvas de confiabilidade)
 - feedback_loop: Integração de feedback automático
 - ab_tester: Framework para A/B Testing
 - live_optimizer: Dashboard em tempo real
@@ -99,7 +99,9 @@ EXEMPLO:
 """
 
 import logging
-from typing import Dict, List, Tuple, Optional
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -107,6 +109,8 @@ import json
 import numpy as np
 from scipy import stats
 
+from .shared_state import AtomicRef
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,6 +173,11 @@ class ABTestManager:
     
     Comparação estatística entre duas versões do sistema
     
+    Concorrência:
+        record_result_a/b, analyze e mudanças de fase são escritores (lock
+        próprio). A fase atual é publicada atomicamente: current_phase e
+        get_current_rollout() leem sem lock.
+    
     Exemplo:
         ab_test = ABTestManager(
             min_samples=100,
@@ -190,26 +199,31 @@ class ABTestManager:
     def __init__(self,
                  min_samples: int = 100,
                  significance_level: float = 0.05,
-                 analysis_interval_hours: int = 24):
+                 analysis_interval_hours: int = 24,
+                 max_results: int = 10000):
         """
         Args:
             min_samples: Mínimo de amostras antes de analisar
             significance_level: α para teste estatístico (default 0.05 = 95%)
             analysis_interval_hours: Intervalo entre análises (horas)
+            max_results: Janela máxima de resultados mantidos por versão
         """
         self.min_samples = min_samples
         self.significance_level = significance_level
         self.analysis_interval = timedelta(hours=analysis_interval_hours)
         
-        # Resultados de cada versão
-        self.results_a: List[TestResult] = []
-        self.results_b: List[TestResult] = []
+        # Serializa escritores; a fase é publicada em _phase
+        self._write_lock = threading.RLock()
+        
+        # Resultados de cada versão (janela deslizante)
+        self.results_a: Deque[TestResult] = deque(maxlen=max_results)
+        self.results_b: Deque[TestResult] = deque(maxlen=max_results)
         
         # Histórico de análises
-        self.analyses: List[AnalysisResult] = []
+        self.analyses: Deque[AnalysisResult] = deque(maxlen=1000)
         
         # Controle de rollout
-        self.current_phase = RolloutPhase.COLLECTION
+        self._phase = AtomicRef(RolloutPhase.COLLECTION)
         self.phase_history: Dict = {}
         self.last_analysis_time: Optional[datetime] = None
         
@@ -225,26 +239,36 @@ class ABTestManager:
             RolloutPhase.COMPLETE: (0, 100),
         }
         
-        logger.info(f"[AB-TEST] ABTestManager inicializado:")
-        logger.info(f"  - Min Samples: {min_samples}")
-        logger.info(f"  - Significance Level: {significance_level:.1%}")
-        logger.info(f"  - Analysis Interval: {analysis_interval_hours}h")
+        logger.info("[AB-TEST] ABTestManager inicializado:")
+        logger.info("  - Min Samples: %s", min_samples)
+        logger.info("  - Significance Level: %.1f%%", significance_level * 100)
+        logger.info("  - Analysis Interval: %sh", analysis_interval_hours)
+    
+    @property
+    def current_phase(self) -> RolloutPhase:
+        return self._phase.get()
+    
+    @current_phase.setter
+    def current_phase(self, phase: RolloutPhase):
+        self._phase.set(phase)
     
     def record_result_a(self, result: TestResult):
         """Registra resultado para Versão A (controle)"""
         if result.version != 'A':
             result.version = 'A'
         
-        self.results_a.append(result)
-        logger.debug(f"[AB-TEST] Resultado A registrado: {result.bet_id} → {result.result}")
+        with self._write_lock:
+            self.results_a.append(result)
+        logger.debug("[AB-TEST] Resultado A registrado: %s → %s", result.bet_id, result.result)
     
     def record_result_b(self, result: TestResult):
         """Registra resultado para Versão B (teste)"""
         if result.version != 'B':
             result.version = 'B'
         
-        self.results_b.append(result)
-        logger.debug(f"[AB-TEST] Resultado B registrado: {result.bet_id} → {result.result}")
+        with self._write_lock:
+            self.results_b.append(result)
+        logger.debug("[AB-TEST] Resultado B registrado: %s → %s", result.bet_id, result.result)
     
     def should_analyze(self) -> bool:
         """Verifica se deve fazer análise"""
@@ -266,35 +290,43 @@ class ABTestManager:
         Returns:
             AnalysisResult com conclusões e recomendações
         """
+        # Snapshot consistente das duas janelas; estatística roda fora do lock
+        with self._write_lock:
+            results_a = list(self.results_a)
+            results_b = list(self.results_b)
+        
         # Validar dados
-        if len(self.results_a) < self.min_samples or len(self.results_b) < self.min_samples:
-            logger.warning(f"[AB-TEST] Amostras insuficientes para análise")
+        if len(results_a) < self.min_samples or len(results_b) < self.min_samples:
+            logger.warning("[AB-TEST] Amostras insuficientes para análise")
             return None
         
+        payouts_a = [r.payout for r in results_a]
+        payouts_b = [r.payout for r in results_b]
+        
         # Calcular métricas Versão A
-        wins_a = sum(1 for r in self.results_a if r.result == 'WIN')
-        wr_a = wins_a / len(self.results_a)
-        roi_a = np.mean([r.payout for r in self.results_a])
-        std_a = np.std([r.payout for r in self.results_a])
+        wins_a = sum(1 for r in results_a if r.result == 'WIN')
+        wr_a = wins_a / len(results_a)
+        roi_a = np.mean(payouts_a)
+        std_a = np.std(payouts_a)
         
         # Calcular métricas Versão B
-        wins_b = sum(1 for r in self.results_b if r.result == 'WIN')
-        wr_b = wins_b / len(self.results_b)
-        roi_b = np.mean([r.payout for r in self.results_b])
-        std_b = np.std([r.payout for r in self.results_b])
+        wins_b = sum(1 for r in results_b if r.result == 'WIN')
+        wr_b = wins_b / len(results_b)
+        roi_b = np.mean(payouts_b)
+        std_b = np.std(payouts_b)
         
         # Testes estatísticos
         # 1. Win Rate (Chi-square test)
         contingency_table = np.array([
-            [wins_a, len(self.results_a) - wins_a],
-            [wins_b, len(self.results_b) - wins_b]
+            [wins_a, len(results_a) - wins_a],
+            [wins_b, len(results_b) - wins_b]
         ])
         chi2, pvalue_wr, dof, expected = stats.chi2_contingency(contingency_table)
         
         # 2. ROI (t-test independente)
         t_stat, pvalue_roi = stats.ttest_ind(
-            [r.payout for r in self.results_a],
-            [r.payout for r in self.results_b],
+            payouts_a,
+            payouts_b,
             equal_var=False  # Welch's t-test
         )
         
@@ -312,12 +344,12 @@ class ABTestManager:
         # Criar resultado
         analysis = AnalysisResult(
             timestamp=datetime.now(),
-            results_a=len(self.results_a),
+            results_a=len(results_a),
             wins_a=wins_a,
             wr_a=wr_a,
             roi_a=roi_a,
             std_a=std_a,
-            results_b=len(self.results_b),
+            results_b=len(results_b),
             wins_b=wins_b,
             wr_b=wr_b,
             roi_b=roi_b,
@@ -331,15 +363,16 @@ class ABTestManager:
         )
         
         # Registrar análise
-        self.analyses.append(analysis)
-        self.last_analysis_time = datetime.now()
+        with self._write_lock:
+            self.analyses.append(analysis)
+            self.last_analysis_time = datetime.now()
         
-        logger.info(f"[AB-TEST] Análise concluída:")
-        logger.info(f"  A: {wr_a:.1%} WR, {roi_a:.2f}% ROI")
-        logger.info(f"  B: {wr_b:.1%} WR, {roi_b:.2f}% ROI")
-        logger.info(f"  p-value (WR): {pvalue_wr:.4f}")
-        logger.info(f"  B melhor? {b_is_better}, Significante? {significant}")
-        logger.info(f"  Recomendação: {recommendation}")
+        logger.info("[AB-TEST] Análise concluída:")
+        logger.info("  A: %.1f%% WR, %.2f%% ROI", wr_a * 100, roi_a)
+        logger.info("  B: %.1f%% WR, %.2f%% ROI", wr_b * 100, roi_b)
+        logger.info("  p-value (WR): %.4f", pvalue_wr)
+        logger.info("  B melhor? %s, Significante? %s", b_is_better, significant)
+        logger.info("  Recomendação: %s", recommendation)
         
         return analysis
     
@@ -378,20 +411,20 @@ class ABTestManager:
         
         # Critério 1: B melhor em WR
         if analysis.wr_b <= analysis.wr_a:
-            logger.warning(f"[AB-TEST] B não tem melhor WR ({analysis.wr_b:.1%} vs {analysis.wr_a:.1%})")
+            logger.warning("[AB-TEST] B não tem melhor WR (%.1f%% vs %.1f%%)", analysis.wr_b * 100, analysis.wr_a * 100)
             return False
         
         # Critério 2: Significância estatística
         if analysis.pvalue_wr > self.significance_level:
-            logger.warning(f"[AB-TEST] Diferença não significante (p={analysis.pvalue_wr:.4f})")
+            logger.warning("[AB-TEST] Diferença não significante (p=%.4f)", analysis.pvalue_wr)
             return False
         
         # Critério 3: ROI positivo
         if analysis.roi_b < 0:
-            logger.warning(f"[AB-TEST] ROI de B é negativo ({analysis.roi_b:.2f}%)")
+            logger.warning("[AB-TEST] ROI de B é negativo (%.2f%%)", analysis.roi_b)
             return False
         
-        logger.info(f"[AB-TEST] Critérios para rollout atendidos")
+        logger.info("[AB-TEST] Critérios para rollout atendidos")
         return True
     
     def increase_rollout(self) -> bool:
@@ -401,19 +434,20 @@ class ABTestManager:
         Returns:
             True se rollout foi aumentado
         """
-        current_idx = list(RolloutPhase).index(self.current_phase)
-        
-        if current_idx >= len(RolloutPhase) - 1:
-            logger.info(f"[AB-TEST] Rollout já em 100%")
-            return False
-        
-        next_phase = list(RolloutPhase)[current_idx + 1]
-        pct_a, pct_b = self.rollout_percentages[next_phase]
-        
-        self.current_phase = next_phase
-        self.phase_history[next_phase.value] = datetime.now()
-        
-        logger.info(f"[AB-TEST] Rollout aumentado para {next_phase.value}: {pct_b}% B, {pct_a}% A")
+        with self._write_lock:
+            current_idx = list(RolloutPhase).index(self.current_phase)
+            
+            if current_idx >= len(RolloutPhase) - 1:
+                logger.info("[AB-TEST] Rollout já em 100%%")
+                return False
+            
+            next_phase = list(RolloutPhase)[current_idx + 1]
+            pct_a, pct_b = self.rollout_percentages[next_phase]
+            
+            self.current_phase = next_phase
+            self.phase_history[next_phase.value] = datetime.now()
+        
+        logger.info("[AB-TEST] Rollout aumentado para %s: %s%% B, %s%% A", next_phase.value, pct_b, pct_a)
         return True
     
     def decrease_rollout(self) -> bool:
@@ -422,23 +456,24 @@ class ABTestManager:
         
         Usado se B apresentar problemas
         """
-        current_idx = list(RolloutPhase).index(self.current_phase)
-        
-        if current_idx <= 1:
-            logger.warning(f"[AB-TEST] Não é possível diminuir rollout")
-            return False
-        
-        prev_phase = list(RolloutPhase)[current_idx - 1]
-        pct_a, pct_b = self.rollout_percentages[prev_phase]
-        
-        self.current_phase = prev_phase
+        with self._write_lock:
+            current_idx = list(RolloutPhase).index(self.current_phase)
+            
+            if current_idx <= 1:
+                logger.warning("[AB-TEST] Não é possível diminuir rollout")
+                return False
+            
+            prev_phase = list(RolloutPhase)[current_idx - 1]
+            pct_a, pct_b = self.rollout_percentages[prev_phase]
+            
+            self.current_phase = prev_phase
         
-        logger.warning(f"[AB-TEST] Rollout reduzido para {prev_phase.value}: {pct_b}% B, {pct_a}% A")
+        logger.warning("[AB-TEST] Rollout reduzido para %s: %s%% B, %s%% A", prev_phase.value, pct_b, pct_a)
         return True
     
     def get_current_rollout(self) -> Tuple[int, int]:
-        """Retorna percentual atual de (A%, B%)"""
-        return self.rollout_percentages[self.current_phase]
+        """Retorna percentual atual de (A%, B%) (sem lock)"""
+        return self.rollout_percentages[self._phase.get()]
     
     def get_status(self) -> Dict:
         """Retorna status atual do A/B test"""
@@ -470,6 +505,8 @@ class ABTestManager:
     
     def get_analysis_history(self, limit: int = 10) -> List[Dict]:
         """Retorna histórico de análises"""
+        with self._write_lock:
+            recent = list(self.analyses)[-limit:]
         return [
             {
                 'timestamp': a.timestamp.isoformat(),
@@ -483,7 +520,7 @@ class ABTestManager:
                 'significant': a.significant,
                 'recommendation': a.recommendation
             }
-            for a in self.analyses[-limit:]
+            for a in recent
         ]
 
 
@@ -0,0 +1,397 @@
+"""
+Calibration - Calibração online da confiança dos sinais
+
+A confiança que sai do pipeline (Signal.finalize) e entra no SignalPruner
+e no Kelly é uma pontuação, não uma probabilidade. Este módulo mede, a
+cada resultado, quanto cada faixa de confiança realmente acerta e publica
+um mapeamento confiança → probabilidade calibrada.
+
+ESTRUTURA:
+    Curvas por (jogo, combinação de estratégias aprovadas) e por jogo
+    (combinação '*'), cada uma um histograma de confiabilidade:
+        bins fixos em [0, 1] com acertos, total e soma das confianças
+
+    record()   → O(1): incrementa um bin em duas curvas
+    refresh()  → ajuste isotônico (PAV) de cada curva com amostras
+                 suficientes e tabela de consulta com LUT_SIZE pontos;
+                 publicado como snapshot (AtomicRef)
+    calibrate()→ O(1) no hot path: índice na tabela, sem lock
+
+SUAVIZAÇÃO:
+    Cada bin é puxado para a própria confiança média com peso
+    prior_strength (pseudo-amostras): com poucos dados a curva fica perto
+    da identidade e converge para a taxa observada conforme o bin enche.
+
+Exemplo:
+    calibrator = ConfidenceCalibrator.load('data/calibration.json')
+
+    # Resultado verificado (ResultTracker.register_result)
+    calibrator.record(0.78, won=False, game='Double', strategies=('Strategy1', 'Strategy2'))
+    if calibrator.should_refresh():
+        calibrator.refresh_async()
+
+    # Hot path
+    p = calibrator.calibrate(0.78, 'Double', ('Strategy1', 'Strategy2'))  # None sem curva
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .shared_state import AtomicRef
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BINS = 20
+LUT_SIZE = 1001                  # resolução de 0.001 na tabela de consulta
+ALL_STRATEGIES = '*'             # curva do jogo inteiro (qualquer combinação)
+STATE_VERSION = 1
+
+Strategies = Union[None, str, Sequence[str]]
+
+
+def combo_key(strategies: Strategies) -> Optional[str]:
+    """Chave da combinação: nomes aprovados unidos por '+' (None = sem combinação)"""
+    if strategies is None or isinstance(strategies, str):
+        return strategies
+    return '+'.join(strategies)
+
+
+def isotonic(values: Sequence[float], weights: Sequence[float]) -> List[float]:
+    """Regressão isotônica (não decrescente) ponderada, pool-adjacent-violators"""
+    blocks: List[List[float]] = []          # [média, peso, quantidade de pontos]
+    for value, weight in zip(values, weights):
+        blocks.append([value, weight, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            value2, weight2, size2 = blocks.pop()
+            value1, weight1, size1 = blocks[-1]
+            total = weight1 + weight2
+            blocks[-1] = [(value1 * weight1 + value2 * weight2) / total, total, size1 + size2]
+    fitted = []
+    for value, _, size in blocks:
+        fitted.extend([value] * size)
+    return fitted
+
+
+@dataclass(frozen=True)
+class CalibrationTable:
+    """Mapeamento publicado: lookup[i] = probabilidade para confiança i/(LUT_SIZE-1)"""
+    lookup: Tuple[float, ...]
+    samples: int
+    ece: float                              # erro de calibração esperado da curva crua
+
+    def apply(self, confidence: float) -> float:
+        last = len(self.lookup) - 1
+        index = int(confidence * last + 0.5)
+        return self.lookup[0 if index < 0 else last if index > last else index]
+
+
+class ReliabilityCurve:
+    """
+    Histograma de confiabilidade incremental
+
+    Bin i cobre [i/bins, (i+1)/bins); confiança 1.0 cai no último bin.
+    """
+
+    __slots__ = ('bins', 'wins', 'totals', 'confidence_sums')
+
+    def __init__(self, bins: int = DEFAULT_BINS, wins: Optional[List[int]] = None,
+                 totals: Optional[List[int]] = None, confidence_sums: Optional[List[float]] = None):
+        self.bins = bins
+        self.wins = list(wins) if wins is not None else [0] * bins
+        self.totals = list(totals) if totals is not None else [0] * bins
+        self.confidence_sums = (list(confidence_sums) if confidence_sums is not None
+                                else [0.0] * bins)
+        if not len(self.wins) == len(self.totals) == len(self.confidence_sums) == bins:
+            raise ValueError(f"Curva com {bins} bins e listas de tamanhos diferentes")
+
+    def bin_of(self, confidence: float) -> int:
+        index = int(confidence * self.bins)
+        return 0 if index < 0 else self.bins - 1 if index >= self.bins else index
+
+    def add(self, confidence: float, won: bool):
+        index = self.bin_of(confidence)
+        self.totals[index] += 1
+        self.wins[index] += 1 if won else 0
+        self.confidence_sums[index] += confidence
+
+    @property
+    def count(self) -> int:
+        return sum(self.totals)
+
+    def copy(self) -> 'ReliabilityCurve':
+        return ReliabilityCurve(self.bins, self.wins, self.totals, self.confidence_sums)
+
+    def mean_confidence(self, index: int) -> float:
+        """Confiança média do bin (centro do bin se vazio)"""
+        total = self.totals[index]
+        return self.confidence_sums[index] / total if total else (index + 0.5) / self.bins
+
+    def expected_calibration_error(self) -> float:
+        """Σ |taxa de acerto − confiança média| ponderado pelo total de cada bin"""
+        count = self.count
+        if not count:
+            return 0.0
+        return sum(abs(wins / total - self.mean_confidence(i)) * total
+                   for i, (wins, total) in enumerate(zip(self.wins, self.totals)) if total) / count
+
+    def fit(self, prior_strength: float = 5.0, lut_size: int = LUT_SIZE) -> CalibrationTable:
+        """Ajuste isotônico dos bins suavizados e interpolação linear na tabela"""
+        xs = [self.mean_confidence(i) for i in range(self.bins)]
+        rates = [(wins + prior_strength * x) / (total + prior_strength)
+                 for wins, total, x in zip(self.wins, self.totals, xs)]
+        ys = isotonic(rates, [total + prior_strength for total in self.totals])
+
+        lookup = []
+        segment = 0
+        for i in range(lut_size):
+            x = i / (lut_size - 1)
+            if x <= xs[0]:
+                y = ys[0]
+            elif x >= xs[-1]:
+                y = ys[-1]
+            else:
+                while xs[segment + 1] < x:
+                    segment += 1
+                x0, x1 = xs[segment], xs[segment + 1]
+                y = ys[segment] + (ys[segment + 1] - ys[segment]) * (x - x0) / (x1 - x0)
+            lookup.append(round(y, 6))
+        return CalibrationTable(tuple(lookup), self.count, round(self.expected_calibration_error(), 6))
+
+    def to_dict(self) -> Dict:
+        return {'wins': self.wins, 'totals': self.totals,
+                'confidence_sums': [round(value, 6) for value in self.confidence_sums]}
+
+
+class ConfidenceCalibrator:
+    """
+    Curvas de confiabilidade por jogo e por combinação de estratégias
+
+    Concorrência (ver learning.shared_state):
+        record() atualiza as curvas sob um lock curto.
+        refresh() copia as curvas, ajusta fora do lock e publica todas as
+        tabelas num único snapshot; calibrate() só lê esse snapshot.
+        refresh_async() roda o mesmo ajuste (e o save) numa thread de fundo.
+
+    Args:
+        path: Arquivo JSON do estado (None = sem persistência)
+        bins: Bins de cada curva
+        min_samples: Resultados mínimos para uma curva ser publicada
+        prior_strength: Pseudo-amostras que puxam cada bin para a identidade
+        refresh_every: Resultados novos que pedem um refresh (should_refresh)
+    """
+
+    def __init__(self, path: Optional[str] = None, bins: int = DEFAULT_BINS,
+                 min_samples: int = 30, prior_strength: float = 5.0,
+                 refresh_every: int = 25):
+        self.path = path
+        self.bins = bins
+        self.min_samples = min_samples
+        self.prior_strength = prior_strength
+        self.refresh_every = refresh_every
+
+        self._curves: Dict[Tuple[str, str], ReliabilityCurve] = {}
+        self._pending = 0                       # resultados desde o último refresh
+        self._write_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._tables: AtomicRef[Dict[Tuple[str, str], CalibrationTable]] = AtomicRef({})
+        self.last_refresh: Optional[datetime] = None
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'ConfidenceCalibrator':
+        """Restaura as curvas salvas (se houver) e publica as tabelas"""
+        calibrator = cls(path, **kwargs)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    state = json.load(f)
+                calibrator._restore(state)
+                calibrator.refresh(save=False)
+                logger.info("[CALIBRATION] %s curvas restauradas de %s", len(calibrator._curves), path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("[CALIBRATION] Estado ignorado (%s): %s", path, e)
+        return calibrator
+
+    def _restore(self, state: Dict):
+        bins = state.get('bins', self.bins)
+        if bins != self.bins:
+            raise ValueError(f"estado com {bins} bins, configurado com {self.bins}")
+        curves = {}
+        for item in state['curves']:
+            curves[(item['game'], item['strategies'])] = ReliabilityCurve(
+                bins, item['wins'], item['totals'], item['confidence_sums'])
+        with self._write_lock:
+            self._curves = curves
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def record(self, confidence: float, won: bool, game: str = 'Double',
+               strategies: Strategies = None):
+        """Registra um resultado verificado na curva do jogo e na da combinação"""
+        combo = combo_key(strategies)
+        keys = ((game, ALL_STRATEGIES),) if combo is None else ((game, ALL_STRATEGIES), (game, combo))
+        with self._write_lock:
+            for key in keys:
+                curve = self._curves.get(key)
+                if curve is None:
+                    curve = self._curves[key] = ReliabilityCurve(self.bins)
+                curve.add(confidence, won)
+            self._pending += 1
+
+    def record_signal(self, signal, won: bool, game: Optional[str] = None) -> bool:
+        """
+        Registra o resultado de um Signal do pipeline
+
+        Usa a confiança bruta (final_confidence), não a calibrada: a curva
+        mapeia uma na outra. Jogo: argumento, meta_context ou 'Double'.
+
+        Returns:
+            False se o sinal não tem confiança
+        """
+        confidence = getattr(signal, 'final_confidence', None)
+        if confidence is None:
+            confidence = getattr(signal, 'confidence', None)
+        if confidence is None:
+            return False
+        if game is None:
+            meta_context = getattr(signal, 'meta_context', None)
+            game = meta_context.game_type if meta_context is not None else getattr(signal, 'game_type', None)
+        self.record(float(confidence), won, getattr(game, 'value', game) or 'Double',
+                    getattr(signal, 'passed_strategies', None))
+        return True
+
+    def seed(self, records: Iterable[Dict]) -> int:
+        """
+        Carrega resultados já verificados (ex.: ResultTracker.verified_signals)
+
+        Cada registro: confidence, result ('WIN'/'LOSS'), game, strategies (opcional)
+        """
+        count = 0
+        for record in records:
+            if record.get('confidence') is None or record.get('result') not in ('WIN', 'LOSS'):
+                continue
+            self.record(float(record['confidence']), record['result'] == 'WIN',
+                        record.get('game', 'Double'), record.get('strategies'))
+            count += 1
+        return count
+
+    def should_refresh(self) -> bool:
+        return self._pending >= self.refresh_every
+
+    def refresh(self, save: bool = True) -> int:
+        """
+        Ajusta as curvas com amostras suficientes e publica as tabelas
+
+        Returns:
+            Quantidade de tabelas publicadas
+        """
+        with self._write_lock:
+            curves = {key: curve.copy() for key, curve in self._curves.items()
+                      if curve.count >= self.min_samples}
+            self._pending = 0
+
+        tables = {key: curve.fit(self.prior_strength) for key, curve in curves.items()}
+        self._tables.set(tables)
+        self.last_refresh = datetime.now()
+        logger.debug("[CALIBRATION] %s curvas publicadas", len(tables))
+
+        if save and self.path:
+            self.save()
+        return len(tables)
+
+    def refresh_async(self) -> bool:
+        """
+        Dispara refresh() numa thread de fundo
+
+        Returns:
+            False se já existe um refresh em andamento (não enfileira outro)
+        """
+        with self._write_lock:
+            thread = self._refresh_thread
+            if thread is not None and thread.is_alive():
+                return False
+            thread = threading.Thread(target=self.refresh, name='calibration-refresh')
+            thread.daemon = True
+            self._refresh_thread = thread
+        thread.start()
+        return True
+
+    def wait_for_refresh(self, timeout: Optional[float] = None):
+        """Aguarda o refresh em background (se houver)"""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def save(self, path: Optional[str] = None):
+        """Grava as curvas em JSON (arquivo temporário + os.replace)"""
+        path = path or self.path
+        if not path:
+            raise ValueError("Nenhum caminho para salvar a calibração")
+        with self._write_lock:
+            curves = [{'game': game, 'strategies': strategies, **curve.to_dict()}
+                      for (game, strategies), curve in self._curves.items()]
+        state = {'version': STATE_VERSION, 'bins': self.bins,
+                 'saved_at': datetime.now().isoformat(), 'curves': curves}
+        with self._save_lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(temp_path, path)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def calibrate(self, confidence: float, game: str = 'Double',
+                  strategies: Strategies = None,
+                  default: Optional[float] = None) -> Optional[float]:
+        """
+        Probabilidade calibrada (O(1), sem lock)
+
+        Usa a curva da combinação; sem ela, a do jogo; sem nenhuma, default.
+        """
+        tables = self._tables.get()
+        table = None
+        combo = combo_key(strategies)
+        if combo is not None:
+            table = tables.get((game, combo))
+        if table is None:
+            table = tables.get((game, ALL_STRATEGIES))
+        return default if table is None else table.apply(confidence)
+
+    def reliability(self, game: str = 'Double', strategies: Strategies = None) -> List[Dict]:
+        """Linhas da curva crua (bins com resultados) e valor calibrado publicado"""
+        key = (game, combo_key(strategies) or ALL_STRATEGIES)
+        with self._write_lock:
+            curve = self._curves.get(key)
+            curve = curve.copy() if curve is not None else None
+        if curve is None:
+            return []
+        table = self._tables.get().get(key)
+        rows = []
+        for i, (wins, total) in enumerate(zip(curve.wins, curve.totals)):
+            if not total:
+                continue
+            confidence = curve.mean_confidence(i)
+            rows.append({
+                'range': f"{i / curve.bins:.2f}-{(i + 1) / curve.bins:.2f}",
+                'total': total,
+                'wins': wins,
+                'win_rate': round(wins / total, 4),
+                'mean_confidence': round(confidence, 4),
+                'calibrated': round(table.apply(confidence), 4) if table else None,
+            })
+        return rows
+
+    def summary(self) -> Dict[str, Dict]:
+        """Amostras e ECE de cada curva publicada ('jogo|combinação')"""
+        return {f"{game}|{strategies}": {'samples': table.samples, 'ece': table.ece}
+                for (game, strategies), table in self._tables.get().items()}
@@ -70,18 +70,23 @@ IMPACTO:
     - Melhor risk management
 
 COMPLEXIDADE:
-    - Coleta: O(1) por resultado
-    - Análise: O(50) = últimas 50 apostas
+    - Coleta: O(1) por resultado (acumuladores de janela deslizante)
+    - Análise: O(1) - lê somas/streak/drawdown já mantidos
     - Ajuste: O(1) por métrica
-    - Total: ~100ms por ciclo
 """
 
 import logging
-from typing import Dict, List, Tuple, Optional
+import threading
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Mapping, Tuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 
+from .shared_state import AtomicRef, freeze
+from .rolling_stats import DrawdownTracker, RollingMaxStreak, RollingSum
+
 logger = logging.getLogger(__name__)
 
 
@@ -126,6 +131,12 @@ class FeedbackLoop:
     
     Coleta resultados reais e ajusta parâmetros para otimização contínua
     
+    Concorrência:
+        record_result/analyze_and_adjust são escritores (lock próprio).
+        Parâmetros e métricas são publicados como snapshot imutável:
+        get_current_parameters(), stats, current_confidence e current_kelly
+        leem sem lock.
+    
     Exemplo:
         feedback = FeedbackLoop(
             initial_confidence=0.65,
@@ -163,20 +174,34 @@ class FeedbackLoop:
             adjustment_threshold: Desvio máximo para acionar ajuste (5%)
         """
         self.initial_confidence = initial_confidence
-        self.current_confidence = initial_confidence
-        
         self.initial_kelly = initial_kelly
-        self.current_kelly = initial_kelly
         
         self.min_samples = min_samples
         self.adjustment_threshold = adjustment_threshold
         
-        # Histórico de resultados
-        self.results: List[SignalResult] = []
+        # Serializa escritores; leitores usam o snapshot publicado
+        self._write_lock = threading.RLock()
+        
+        # Histórico de resultados (buffer circular)
         self.max_history = 500
+        self.results: Deque[SignalResult] = deque(maxlen=self.max_history)
+        
+        # Acumuladores O(1) por resultado
+        #   janela de métricas (últimas 50): WR e ROI publicados
+        #   janela de análise (últimas 100): desvios de WR, ROI e streak
+        self.metrics_window = 50
+        self.analysis_window = 100
+        self._metric_wins = RollingSum(self.metrics_window)
+        self._metric_payouts = RollingSum(self.metrics_window)
+        self._metric_losses = RollingSum(self.metrics_window)
+        self._window_wins = RollingSum(self.analysis_window)
+        self._window_expected_wr = RollingSum(self.analysis_window)
+        self._window_payouts = RollingSum(self.analysis_window)
+        self._loss_streak = RollingMaxStreak(self.analysis_window)
+        self._drawdown = DrawdownTracker()
         
         # Histórico de ajustes
-        self.adjustments: List[AdjustmentAction] = []
+        self.adjustments: Deque[AdjustmentAction] = deque(maxlen=1000)
         
         # Timestamps de último ajuste (cooldown)
         self.last_adjustment_time = {
@@ -186,20 +211,52 @@ class FeedbackLoop:
         }
         self.cooldown_hours = 6
         
-        # Métricas
-        self.stats = {
+        # Métricas (mutáveis apenas sob _write_lock)
+        self._stats = {
             'total_results': 0,
             'wins': 0,
             'losses': 0,
             'total_adjustments': 0,
             'current_wr': 0.5,
-            'current_roi': 1.0
+            'current_roi': 1.0,
+            'equity': 0.0,
+            'peak_equity': 0.0,
+            'current_drawdown': 0.0,
+            'max_drawdown': 0.0
         }
         
-        logger.info(f"[FEEDBACK] FeedbackLoop inicializado:")
-        logger.info(f"  - Initial Confidence: {initial_confidence:.0%}")
-        logger.info(f"  - Initial Kelly: {initial_kelly:.2f}")
-        logger.info(f"  - Min Samples: {min_samples}")
+        self._state = AtomicRef(freeze({}))
+        self._publish(initial_confidence, initial_kelly)
+        
+        logger.info("[FEEDBACK] FeedbackLoop inicializado:")
+        logger.info("  - Initial Confidence: %.0f%%", initial_confidence * 100)
+        logger.info("  - Initial Kelly: %.2f", initial_kelly)
+        logger.info("  - Min Samples: %s", min_samples)
+    
+    def _publish(self, min_confidence: Optional[float] = None,
+                 kelly_fraction: Optional[float] = None):
+        """Publica novo snapshot de parâmetros e métricas (chamar sob _write_lock)"""
+        current = self._state.get()
+        last_results = tuple(islice(reversed(self.results), 5))[::-1]
+        self._state.set(freeze({
+            'min_confidence': current.get('min_confidence') if min_confidence is None else min_confidence,
+            'kelly_fraction': current.get('kelly_fraction') if kelly_fraction is None else kelly_fraction,
+            'stats': freeze(self._stats),
+            'last_results': tuple((r.signal_id, r.result) for r in last_results),
+        }))
+    
+    @property
+    def current_confidence(self) -> float:
+        return self._state.get()['min_confidence']
+    
+    @property
+    def current_kelly(self) -> float:
+        return self._state.get()['kelly_fraction']
+    
+    @property
+    def stats(self) -> Mapping:
+        """Métricas publicadas (somente leitura)"""
+        return self._state.get()['stats']
     
     def record_result(self, result: SignalResult):
         """
@@ -210,45 +267,64 @@ class FeedbackLoop:
         """
         # Validar
         if result.result not in ['WIN', 'LOSS']:
-            logger.warning(f"[FEEDBACK] Resultado inválido: {result.result}")
+            logger.warning("[FEEDBACK] Resultado inválido: %s", result.result)
             return
         
-        # Armazenar
-        self.results.append(result)
+        with self._write_lock:
+            # Armazenar (deque descarta o mais antigo ao atingir max_history)
+            self.results.append(result)
+            
+            # Atualizar stats
+            self._stats['total_results'] += 1
+            if result.result == 'WIN':
+                self._stats['wins'] += 1
+            else:
+                self._stats['losses'] += 1
+            
+            # Atualizar acumuladores e métricas
+            self._push_rolling(result)
+            self._update_metrics()
+            self._publish()
         
-        # Manter histórico limpo
-        if len(self.results) > self.max_history:
-            self.results.pop(0)
+        logger.debug("[FEEDBACK] Resultado registrado: %s → %s", result.signal_id, result.result)
+    
+    def _push_rolling(self, result: SignalResult):
+        """Atualiza os acumuladores de janela com um resultado (chamar sob _write_lock)"""
+        won = 1.0 if result.result == 'WIN' else 0.0
         
-        # Atualizar stats
-        self.stats['total_results'] += 1
-        if result.result == 'WIN':
-            self.stats['wins'] += 1
-        else:
-            self.stats['losses'] += 1
+        self._metric_wins.push(won)
+        self._metric_payouts.push(result.payout)
+        self._metric_losses.push(min(result.payout, 0.0))
         
-        # Recalcular métricas
-        self._update_metrics()
+        self._window_wins.push(won)
+        self._window_expected_wr.push(result.expected_wr)
+        self._window_payouts.push(result.payout)
+        self._loss_streak.push(result.result == 'LOSS')
         
-        logger.debug(f"[FEEDBACK] Resultado registrado: {result.signal_id} → {result.result}")
+        self._drawdown.push(result.payout)
     
     def _update_metrics(self):
-        """Recalcula métricas de performance"""
-        if not self.results:
-            self.stats['current_wr'] = 0.5
-            self.stats['current_roi'] = 1.0
+        """Atualiza métricas de performance a partir dos acumuladores (O(1))"""
+        if not self._metric_wins.count:
+            self._stats['current_wr'] = 0.5
+            self._stats['current_roi'] = 1.0
             return
         
         # Win Rate das últimas 50 apostas
-        recent = self.results[-50:]
-        wins = sum(1 for r in recent if r.result == 'WIN')
-        self.stats['current_wr'] = wins / len(recent) if recent else 0.5
+        self._stats['current_wr'] = self._metric_wins.mean(0.5)
         
         # ROI
-        total_gain = sum(r.payout for r in recent)
-        total_loss = abs(sum(r.payout for r in recent if r.payout < 0))
+        total_gain = self._metric_payouts.sum
+        total_loss = abs(self._metric_losses.sum)
         total_return = 1.0 + (total_gain - total_loss) / 100.0
-        self.stats['current_roi'] = total_return
+        self._stats['current_roi'] = total_return
+        
+        # Drawdown (pico → valor atual da soma de payouts)
+        equity, peak, current_dd, max_dd = self._drawdown.snapshot()
+        self._stats['equity'] = equity
+        self._stats['peak_equity'] = peak
+        self._stats['current_drawdown'] = current_dd
+        self._stats['max_drawdown'] = max_dd
     
     def should_adjust(self) -> bool:
         """Verifica se deve fazer ajustes"""
@@ -263,50 +339,54 @@ class FeedbackLoop:
         """
         adjustments = []
         
-        if not self.should_adjust():
-            return adjustments
-        
-        # Analisar cada métrica
-        recent = self.results[-100:] if len(self.results) >= 100 else self.results
-        
-        # 1. Win Rate Analysis
-        wr_adj = self._analyze_win_rate(recent)
-        if wr_adj:
-            adjustments.append(wr_adj)
-        
-        # 2. ROI Analysis
-        roi_adj = self._analyze_roi(recent)
-        if roi_adj:
-            adjustments.append(roi_adj)
-        
-        # 3. Drawdown Analysis
-        dd_adj = self._analyze_drawdown(recent)
-        if dd_adj:
-            adjustments.append(dd_adj)
+        with self._write_lock:
+            if not self.should_adjust():
+                return adjustments
+            
+            # Analisar cada métrica (acumuladores das últimas 100 apostas)
+            
+            # 1. Win Rate Analysis
+            wr_adj = self._analyze_win_rate()
+            if wr_adj:
+                adjustments.append(wr_adj)
+            
+            # 2. ROI Analysis
+            roi_adj = self._analyze_roi()
+            if roi_adj:
+                adjustments.append(roi_adj)
+            
+            # 3. Drawdown Analysis
+            dd_adj = self._analyze_drawdown()
+            if dd_adj:
+                adjustments.append(dd_adj)
+            
+            # Aplicar ajustes
+            for adj in adjustments:
+                self._apply_adjustment(adj)
+                self._stats['total_adjustments'] += 1
+            
+            if adjustments:
+                self._publish()
         
-        # Aplicar ajustes
         for adj in adjustments:
-            self._apply_adjustment(adj)
-            self.stats['total_adjustments'] += 1
-            
-            logger.info(f"[FEEDBACK-ADJ] {adj.parameter}:")
-            logger.info(f"     {adj.old_value:.4f} → {adj.new_value:.4f}")
-            logger.info(f"     Razão: {adj.reason}")
-            logger.info(f"     Desvio: {adj.desvio_pct:.1%}")
+            logger.info("[FEEDBACK-ADJ] %s:", adj.parameter)
+            logger.info("     %.4f → %.4f", adj.old_value, adj.new_value)
+            logger.info("     Razão: %s", adj.reason)
+            logger.info("     Desvio: %.1f%%", adj.desvio_pct * 100)
         
         return adjustments
     
-    def _analyze_win_rate(self, recent: List[SignalResult]) -> Optional[AdjustmentAction]:
+    def _analyze_win_rate(self) -> Optional[AdjustmentAction]:
         """Analisa win rate e sugere ajustes"""
-        if not recent:
+        samples = self._window_wins.count
+        if not samples:
             return None
         
         # Calcular WR
-        wins = sum(1 for r in recent if r.result == 'WIN')
-        current_wr = wins / len(recent)
+        current_wr = self._window_wins.mean()
         
         # Comparar com esperado
-        expected_wr = sum(r.expected_wr for r in recent) / len(recent)
+        expected_wr = self._window_expected_wr.mean()
         
         desvio = current_wr - expected_wr
         
@@ -334,17 +414,17 @@ class FeedbackLoop:
             reason=reason,
             desvio_pct=abs(desvio),
             timestamp=datetime.now(),
-            samples_used=len(recent)
+            samples_used=samples
         )
     
-    def _analyze_roi(self, recent: List[SignalResult]) -> Optional[AdjustmentAction]:
+    def _analyze_roi(self) -> Optional[AdjustmentAction]:
         """Analisa ROI e sugere ajustes de kelly"""
-        if len(recent) < 20:
+        samples = self._window_payouts.count
+        if samples < 20:
             return None
         
         # ROI recente
-        payouts = [r.payout for r in recent]
-        avg_payout = sum(payouts) / len(payouts)
+        avg_payout = self._window_payouts.mean()
         
         # Se ROI é muito positivo, aumentar agressividade
         if avg_payout > 2.0:  # +2% por aposta em média
@@ -360,7 +440,7 @@ class FeedbackLoop:
                 reason="ROI muito positivo, aumentar agressividade",
                 desvio_pct=avg_payout,
                 timestamp=datetime.now(),
-                samples_used=len(recent)
+                samples_used=samples
             )
         
         # Se ROI negativo, reduzir agressividade
@@ -377,26 +457,19 @@ class FeedbackLoop:
                 reason="ROI negativo, reduzir agressividade",
                 desvio_pct=abs(avg_payout),
                 timestamp=datetime.now(),
-                samples_used=len(recent)
+                samples_used=samples
             )
         
         return None
     
-    def _analyze_drawdown(self, recent: List[SignalResult]) -> Optional[AdjustmentAction]:
+    def _analyze_drawdown(self) -> Optional[AdjustmentAction]:
         """Analisa drawdown e sugere ajustes"""
-        if len(recent) < 20:
+        samples = self._window_payouts.count
+        if samples < 20:
             return None
         
-        # Simular drawdown (sequência de perdas)
-        max_streak = 0
-        current_streak = 0
-        
-        for r in recent:
-            if r.result == 'LOSS':
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 0
+        # Drawdown como maior sequência de perdas na janela
+        max_streak = self._loss_streak.max_streak
         
         # Se muitas perdas seguidas
         if max_streak > 5:  # Mais de 5 perdas em sequência
@@ -412,7 +485,7 @@ class FeedbackLoop:
                 reason=f"Streak de {max_streak} perdas, reduzir risco",
                 desvio_pct=max_streak / 10.0,  # Normalizar
                 timestamp=datetime.now(),
-                samples_used=len(recent)
+                samples_used=samples
             )
         
         return None
@@ -428,31 +501,34 @@ class FeedbackLoop:
         return elapsed > timedelta(hours=self.cooldown_hours)
     
     def _apply_adjustment(self, adjustment: AdjustmentAction):
-        """Aplica um ajuste e registra"""
+        """Aplica um ajuste e registra (chamar sob _write_lock)"""
         if adjustment.parameter == 'min_confidence':
-            self.current_confidence = adjustment.new_value
+            self._publish(min_confidence=adjustment.new_value)
         elif adjustment.parameter == 'kelly_fraction':
-            self.current_kelly = adjustment.new_value
+            self._publish(kelly_fraction=adjustment.new_value)
         
         self.last_adjustment_time[adjustment.parameter] = datetime.now()
         self.adjustments.append(adjustment)
     
     def get_current_parameters(self) -> Dict:
-        """Retorna parâmetros atuais após ajustes"""
+        """Retorna parâmetros atuais após ajustes (sem lock: lê o snapshot publicado)"""
+        state = self._state.get()
         return {
-            'min_confidence': self.current_confidence,
-            'kelly_fraction': self.current_kelly,
-            'current_wr': self.stats['current_wr'],
-            'current_roi': self.stats['current_roi'],
-            'total_adjustments': self.stats['total_adjustments'],
+            'min_confidence': state['min_confidence'],
+            'kelly_fraction': state['kelly_fraction'],
+            'current_wr': state['stats']['current_wr'],
+            'current_roi': state['stats']['current_roi'],
+            'total_adjustments': state['stats']['total_adjustments'],
             'last_5_results': [
-                {'signal': r.signal_id, 'result': r.result}
-                for r in self.results[-5:]
+                {'signal': signal_id, 'result': result}
+                for signal_id, result in state['last_results']
             ]
         }
     
     def get_adjustment_history(self, limit: int = 20) -> List[Dict]:
         """Retorna histórico de ajustes"""
+        with self._write_lock:
+            recent = list(self.adjustments)[-limit:]
         return [
             {
                 'parameter': adj.parameter,
@@ -463,19 +539,20 @@ class FeedbackLoop:
                 'timestamp': adj.timestamp.isoformat(),
                 'samples': adj.samples_used
             }
-            for adj in self.adjustments[-limit:]
+            for adj in recent
         ]
     
     def export_metrics(self) -> Dict:
         """Exporta todas as métricas para monitoramento"""
+        stats = self.stats
         return {
             'timestamp': datetime.now().isoformat(),
-            'total_results': self.stats['total_results'],
-            'wins': self.stats['wins'],
-            'losses': self.stats['losses'],
-            'win_rate': f"{self.stats['current_wr']:.1%}",
-            'roi': f"{self.stats['current_roi']:.2f}x",
-            'total_adjustments': self.stats['total_adjustments'],
+            'total_results': stats['total_results'],
+            'wins': stats['wins'],
+            'losses': stats['losses'],
+            'win_rate': f"{stats['current_wr']:.1%}",
+            'roi': f"{stats['current_roi']:.2f}x",
+            'total_adjustments': stats['total_adjustments'],
             'current_parameters': self.get_current_parameters(),
             'recent_adjustments': self.get_adjustment_history(5)
         }
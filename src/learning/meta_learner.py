@@ -42,7 +42,15 @@ SOLUÇÃO (Random Forest):
             [w1=0.15, w2=0.10, w3=0.20, w4=0.18, w5=0.12, w6=0.25]
     
     Treino: Histórico de sinais + seus resultados reais
-    Retraining: A cada 1000 sinais ou 24h
+    Retraining: A cada 100 amostras novas, em thread de fundo (train_async)
+
+MODELO ONLINE (contagens bayesianas por bucket):
+    - Cada amostra incrementa contagem[bucket][estratégia] → O(1)
+    - bucket = (hora, jogo)
+    - Pesos = média posterior Dirichlet com prior nas heurísticas:
+          w_i = (c_i + s * h_i) / (n + s)
+    - Sem amostras no bucket → exatamente as heurísticas
+    - Usado enquanto o Random Forest não está treinado
 
 FEATURES USADAS:
     - hour: 0-23 (hora do dia - performance varia)
@@ -77,13 +85,17 @@ COMPLEXIDADE:
 """
 
 import logging
-from typing import Dict, List, Tuple, Optional
+import threading
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
 import pickle
 import json
 
+from .shared_state import AtomicRef
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,6 +123,83 @@ class MetaContext:
             self.recent_drawdown,
             self.bankroll_pct / 100.0
         ]
+    
+    def bucket(self) -> Tuple:
+        """
+        Contexto quantizado (chave de cache de predição)
+        
+        Features contínuas são arredondadas para que contextos praticamente
+        iguais compartilhem a mesma predição.
+        """
+        return (
+            self.hour_of_day,
+            self.day_of_week,
+            self.pattern_id,
+            0 if self.game_type == 'Double' else 1,
+            round(self.recent_wr, 2),
+            round(self.recent_drawdown * 2) / 2,
+            int(self.bankroll_pct) // 5 * 5
+        )
+
+
+class ModelState(NamedTuple):
+    """
+    Estado do modelo publicado atomicamente (imutável)
+    
+    predictions é o cache bucket → pesos do modelo deste snapshot; como vem
+    junto com o modelo, trocar o modelo descarta o cache automaticamente.
+    Nunca é alterado no lugar: uma entrada nova publica outro ModelState
+    (cópia do dict) sob o _write_lock do MetaLearner.
+    """
+    model: Any
+    is_trained: bool
+    training_count: int
+    last_training: Optional[datetime]
+    predictions: Dict[Tuple, Tuple[float, ...]]
+
+
+class OnlineBucketModel:
+    """
+    Modelo incremental: contagens de estratégia vencedora por bucket de contexto
+    
+    update() é O(1). weights() devolve a média posterior de uma Dirichlet
+    cujo prior são os pesos heurísticos (força `prior_strength`).
+    
+    Concorrência: update() deve ser chamado sob o lock de escrita do dono;
+    weights() copia a lista de contagens do bucket e normaliza pela soma da
+    cópia, então nunca devolve pesos inconsistentes.
+    """
+    
+    __slots__ = ('n_strategies', 'prior_strength', '_counts')
+    
+    def __init__(self, n_strategies: int = 6, prior_strength: float = 6.0):
+        self.n_strategies = n_strategies
+        self.prior_strength = prior_strength
+        self._counts: Dict[Tuple, List[int]] = {}
+    
+    @staticmethod
+    def bucket_of(context: MetaContext) -> Tuple:
+        return (context.hour_of_day, 0 if context.game_type == 'Double' else 1)
+    
+    def update(self, context: MetaContext, target: int):
+        key = self.bucket_of(context)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = [0] * self.n_strategies
+            self._counts[key] = counts
+        counts[target] += 1
+    
+    def samples_in_bucket(self, context: MetaContext) -> int:
+        counts = self._counts.get(self.bucket_of(context))
+        return sum(counts) if counts else 0
+    
+    def weights(self, context: MetaContext, prior: List[float]) -> List[float]:
+        counts = self._counts.get(self.bucket_of(context))
+        if not counts:
+            return list(prior)
+        counts = list(counts)
+        total = sum(counts) + self.prior_strength
+        return [(c + self.prior_strength * p) / total for c, p in zip(counts, prior)]
 
 
 @dataclass
@@ -130,6 +219,20 @@ class MetaLearner:
     
     Treina modelo para prever qual estratégia é melhor em cada contexto
     
+    Concorrência:
+        train() ajusta o modelo fora de qualquer lock de leitura e publica
+        (model, is_trained, training_count) como um único ModelState.
+        predict_strategy_weights lê esse snapshot sem lock; só uma predição
+        nova (cache miss) publica outro snapshot, sob o _write_lock.
+        train_async() roda o mesmo treino numa thread de fundo, fora do
+        caminho do sinal; o modelo antigo atende até a troca atômica.
+    
+    Predição:
+        - Random Forest treinado: predict_proba com cache por bucket
+          (MetaContext.bucket) no próprio snapshot do modelo
+        - Antes do primeiro treino: OnlineBucketModel (use_online_model=True)
+          ou heurísticas
+    
     Exemplo:
         meta = MetaLearner()
         
@@ -150,8 +253,25 @@ class MetaLearner:
         # weights = [0.15, 0.10, 0.20, 0.18, 0.12, 0.25]
     """
     
-    def __init__(self):
-        self.training_data: List[Tuple] = []
+    # Limite de entradas no cache de predição por snapshot de modelo
+    MAX_CACHED_PREDICTIONS = 4096
+    
+    def __init__(self, max_training_samples: int = 10000,
+                 use_online_model: bool = True):
+        self.max_training_samples = max_training_samples  # Limitar memória
+        self.training_data: Deque[Tuple] = deque(maxlen=self.max_training_samples)
+        
+        # Contadores mantidos a cada append/descarte (O(1) por amostra)
+        self.samples_seen = 0                        # total já recebido (não limitado)
+        self._target_counts: Counter = Counter()     # target → amostras na janela
+        self._samples_at_training = 0                # samples_seen no último treino
+        self._write_lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._training_thread: Optional[threading.Thread] = None
+        
+        # Modelo incremental (atualizado a cada amostra)
+        self.use_online_model = use_online_model
+        self.online_model = OnlineBucketModel()
         self.strategy_names = [
             'Strategy1_Pattern',
             'Strategy2_Technical',
@@ -162,10 +282,7 @@ class MetaLearner:
         ]
         
         # Modelo treinado (será substituído com sklearn depois)
-        self.model = None
-        self.is_trained = False
-        self.training_count = 0
-        self.last_training = None
+        self._state = AtomicRef(ModelState(None, False, 0, None, {}))
         
         # Heurísticas iniciais (baseline antes de treinar)
         self.default_weights = [1.0/6] * 6  # Igual para todos
@@ -175,6 +292,32 @@ class MetaLearner:
         
         logger.info("[META] MetaLearner inicializado")
     
+    @property
+    def model(self):
+        return self._state.get().model
+    
+    @property
+    def is_trained(self) -> bool:
+        return self._state.get().is_trained
+    
+    @property
+    def training_count(self) -> int:
+        return self._state.get().training_count
+    
+    @property
+    def last_training(self) -> Optional[datetime]:
+        return self._state.get().last_training
+    
+    @property
+    def training_sample_count(self) -> int:
+        return len(self.training_data)
+    
+    @property
+    def is_training(self) -> bool:
+        """True enquanto um treino em background está rodando"""
+        thread = self._training_thread
+        return thread is not None and thread.is_alive()
+    
     def add_training_sample(self, context: MetaContext,
                            winning_strategies: List[int],
                            signal_id: str = ''):
@@ -191,12 +334,15 @@ class MetaLearner:
         # Target: estratégia principal (primeiro que acertou)
         target = winning_strategies[0] - 1 if winning_strategies else 0
         
-        self.training_data.append((features, target, signal_id))
-        
-        if len(self.training_data) > 10000:  # Limitar memória
-            self.training_data.pop(0)
+        with self._write_lock:
+            if len(self.training_data) == self.max_training_samples:
+                self._target_counts[self.training_data[0][1]] -= 1
+            self.training_data.append((features, target, signal_id))
+            self._target_counts[target] += 1
+            self.samples_seen += 1
+            self.online_model.update(context, target)
         
-        logger.debug(f"[META] Amostra adicionada: {len(self.training_data)} total")
+        logger.debug("[META] Amostra adicionada: %s total", len(self.training_data))
     
     def should_retrain(self) -> bool:
         """Verifica se modelo deve ser retreinado"""
@@ -204,57 +350,85 @@ class MetaLearner:
         if not self.is_trained:
             return len(self.training_data) >= self.min_samples
         
-        if len(self.training_data) >= self.training_count + 100:
+        # Conta amostras novas (continua valendo com o buffer cheio)
+        if self.samples_seen >= self._samples_at_training + 100:
             return True
         
         return False
     
     def train(self):
         """Treina o modelo com amostras coletadas"""
-        if len(self.training_data) < self.min_samples:
-            logger.warning(f"[META] Amostras insuficientes: "
-                          f"{len(self.training_data)} < {self.min_samples}")
+        with self._write_lock:
+            samples = list(self.training_data)
+            seen = self.samples_seen
+        
+        if len(samples) < self.min_samples:
+            logger.warning("[META] Amostras insuficientes: %s < %s", len(samples), self.min_samples)
             return False
         
         try:
             from sklearn.ensemble import RandomForestClassifier
             
             # Preparar dados
-            X = np.array([item[0] for item in self.training_data])
-            y = np.array([item[1] for item in self.training_data])
-            
-            # Treinar modelo
-            self.model = RandomForestClassifier(
-                n_estimators=50,      # 50 árvores
-                max_depth=10,         # Profundidade limitada
-                random_state=42
-            )
-            self.model.fit(X, y)
+            X = np.array([item[0] for item in samples])
+            y = np.array([item[1] for item in samples])
             
-            self.is_trained = True
-            self.training_count = len(self.training_data)
-            self.last_training = datetime.now()
+            # Treinar modelo (leitores continuam usando o snapshot anterior)
+            with self._train_lock:
+                model = RandomForestClassifier(
+                    n_estimators=50,      # 50 árvores
+                    max_depth=10,         # Profundidade limitada
+                    random_state=42
+                )
+                model.fit(X, y)
+                
+                with self._write_lock:
+                    self._state.set(ModelState(model, True, len(samples), datetime.now(), {}))
+                self._samples_at_training = seen
             
             # Calcular importância de features
             feature_names = ['hour', 'day_of_week', 'pattern', 'game', 'wr', 'dd', 'br%']
-            importances = self.model.feature_importances_
+            importances = model.feature_importances_
             
-            logger.info(f"[META] Modelo treinado com {self.training_count} amostras")
-            logger.info(f"[META] Feature importances:")
+            logger.info("[META] Modelo treinado com %s amostras", len(samples))
+            logger.info("[META] Feature importances:")
             for name, importance in zip(feature_names, importances):
                 if importance > 0.05:
-                    logger.info(f"  {name}: {importance:.3f}")
+                    logger.info("  %s: %.3f", name, importance)
             
             return True
             
         except ImportError:
             logger.warning("[META] sklearn não disponível, usando heurísticas")
-            self.model = None
+            with self._write_lock:
+                self._state.set(ModelState(None, False, 0, None, {}))
             return False
         except Exception as e:
-            logger.error(f"[META] Erro ao treinar: {e}")
+            logger.error("[META] Erro ao treinar: %s", e)
             return False
     
+    def train_async(self) -> bool:
+        """
+        Dispara train() numa thread de fundo
+        
+        Returns:
+            False se já existe um treino em andamento (não enfileira outro)
+        """
+        with self._write_lock:
+            if self.is_training:
+                return False
+            thread = threading.Thread(target=self.train, name='meta-learner-train')
+            thread.daemon = True
+            self._training_thread = thread
+        thread.start()
+        return True
+    
+    def wait_for_training(self, timeout: Optional[float] = None):
+        """Aguarda o treino em background (se houver)"""
+        thread = self._training_thread
+        if thread is not None:
+            thread.join(timeout)
+    
     def predict_strategy_weights(self, context: MetaContext) -> List[float]:
         """
         Prediz pesos para cada estratégia
@@ -262,31 +436,49 @@ class MetaLearner:
         Returns:
             Lista de 6 pesos que somam 1.0
         """
-        if not self.is_trained or self.model is None:
+        state = self._state.get()
+        if not state.is_trained or state.model is None:
+            if self.use_online_model:
+                return self.online_model.weights(context, self._heuristic_weights(context))
             # Usar heurísticas se modelo não disponível
             return self._heuristic_weights(context)
         
+        # Bucket só como chave do cache; o modelo vê as features cruas do treino
+        key = context.bucket()
+        cached = state.predictions.get(key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             features = np.array([context.to_features()])
             
-            # Predizer estratégia mais provável
-            best_strategy = self.model.predict(features)[0]
+            # Probabilidades por classe vista no treino → vetor de 6 pesos
+            probabilities = state.model.predict_proba(features)[0]
+            weights = [0.0] * len(self.strategy_names)
+            for cls, prob in zip(state.model.classes_, probabilities):
+                weights[int(cls)] = float(prob)
             
-            # Obter probabilidades
-            probabilities = self.model.predict_proba(features)[0]
+            self._cache_prediction(state.model, key, tuple(weights))
             
-            # Usar probabilidades como pesos
-            weights = list(probabilities)
-            
-            logger.debug(f"[META] Predição: estratégia {best_strategy}, "
-                        f"pesos={[f'{w:.2f}' for w in weights]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[META] Predição: estratégia %d, pesos=%s",
+                             int(np.argmax(weights)), [round(float(w), 2) for w in weights])
             
             return weights
             
         except Exception as e:
-            logger.error(f"[META] Erro na predição: {e}")
+            logger.error("[META] Erro na predição: %s", e)
             return self._heuristic_weights(context)
     
+    def _cache_prediction(self, model, key: Tuple, weights: Tuple[float, ...]):
+        """Publica o snapshot com a predição no cache (descartada se o modelo mudou)"""
+        with self._write_lock:
+            current = self._state.get()
+            if (current.model is not model or key in current.predictions
+                    or len(current.predictions) >= self.MAX_CACHED_PREDICTIONS):
+                return
+            self._state.set(current._replace(predictions={**current.predictions, key: weights}))
+    
     def _heuristic_weights(self, context: MetaContext) -> List[float]:
         """
         Heurísticas baseadas em contexto
@@ -318,18 +510,18 @@ class MetaLearner:
     
     def get_strategy_performance(self, strategy_id: int) -> Dict:
         """Retorna performance de uma estratégia baseado em histórico"""
-        if not self.training_data:
+        target = strategy_id - 1
+        with self._write_lock:
+            total = len(self.training_data)
+            wins = self._target_counts[target]
+        
+        if not total:
             return {
                 'strategy': strategy_id,
                 'accuracy': 0.0,
                 'samples': 0
             }
         
-        # Contar vitórias
-        target = strategy_id - 1
-        wins = sum(1 for _, t, _ in self.training_data if t == target)
-        total = len(self.training_data)
-        
         accuracy = wins / total if total > 0 else 0
         
         return {
@@ -362,29 +554,37 @@ class MetaLearner:
     def save_model(self, filepath: str):
         """Salva modelo treinado"""
         try:
+            state = self._state.get()
             data = {
-                'model': self.model,
-                'is_trained': self.is_trained,
-                'training_count': self.training_count,
-                'last_training': self.last_training.isoformat() if self.last_training else None
+                'model': state.model,
+                'is_trained': state.is_trained,
+                'training_count': state.training_count,
+                'last_training': state.last_training.isoformat() if state.last_training else None
             }
             with open(filepath, 'wb') as f:
                 pickle.dump(data, f)
-            logger.info(f"[META] Modelo salvo: {filepath}")
+            logger.info("[META] Modelo salvo: %s", filepath)
         except Exception as e:
-            logger.error(f"[META] Erro ao salvar: {e}")
+            logger.error("[META] Erro ao salvar: %s", e)
     
     def load_model(self, filepath: str):
         """Carrega modelo treinado"""
         try:
             with open(filepath, 'rb') as f:
                 data = pickle.load(f)
-            self.model = data['model']
-            self.is_trained = data['is_trained']
-            self.training_count = data['training_count']
-            logger.info(f"[META] Modelo carregado: {filepath}")
+            last_training = data.get('last_training')
+            with self._write_lock:
+                self._state.set(ModelState(
+                    data['model'],
+                    data['is_trained'],
+                    data['training_count'],
+                    datetime.fromisoformat(last_training) if last_training else None,
+                    {}
+                ))
+            self._samples_at_training = self.samples_seen
+            logger.info("[META] Modelo carregado: %s", filepath)
         except Exception as e:
-            logger.error(f"[META] Erro ao carregar: {e}")
+            logger.error("[META] Erro ao carregar: %s", e)
     
     def __repr__(self):
         return (f"MetaLearner(trained={self.is_trained}, "
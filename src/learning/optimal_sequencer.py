@@ -55,10 +55,10 @@ EXEMPLO:
     - Se drawdown perto do limite: $0 (não apostar)
 
 COMPLEXIDADE:
-    - Estados: ~100 confiança x 100 bankroll% x 24 horas = 240,000 estados
-    - Tempo: ~1ms para computar cada estado
-    - Total: ~240ms (computado offline, 1x por hora)
-    - Runtime: ~1ms para lookup (muito rápido!)
+    - Estados: 8 confiança x 10 bankroll% x 24 horas = 1,920 estados
+    - Tabela densa NumPy [confiança, bankroll, hora] montada por broadcasting
+    - Recomputada só quando win_rate_by_hour muda (set_win_rate / setter)
+    - Runtime: lookup por índice direto (sem hashing de dataclass)
 
 GANHO:
     - +15-25% lucro vs Kelly simples
@@ -67,7 +67,9 @@ GANHO:
 """
 
 import logging
-from typing import Dict, Tuple, Optional, List
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import numpy as np
@@ -75,6 +77,24 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+# Bins da tabela DP
+CONFIDENCE_BINS = np.linspace(0.60, 0.95, 8)        # passo de 0.05
+BANKROLL_BINS = np.arange(10, 101, 10)              # 10%, 20%, ..., 100%
+HOURS = 24
+
+
+def _confidence_index(confidence: float) -> int:
+    """Bin de confiança (arredonda para 0.05 e limita a 0.60-0.95)"""
+    idx = int(round(confidence * 20)) - 12
+    return 0 if idx < 0 else 7 if idx > 7 else idx
+
+
+def _bankroll_index(bankroll_pct: float) -> int:
+    """Bin de bankroll (trunca para múltiplo de 10 e limita a 10-100)"""
+    idx = int(bankroll_pct // 10) - 1
+    return 0 if idx < 0 else 9 if idx > 9 else idx
+
+
 @dataclass
 class DPState:
     """Estado da Programação Dinâmica"""
@@ -105,6 +125,54 @@ class DPValue:
                 f"adj={self.adjustment_factor:.2f}x)")
 
 
+class DPTable:
+    """
+    Tabela DP densa, indexada por (bin de confiança, bin de bankroll, hora)
+    
+    Imutável depois de montada: o sequenciador publica uma nova instância a
+    cada recomputação. Mantém também as apostas como listas Python aninhadas,
+    para que o lookup no hot path seja só indexação (sem escalares NumPy).
+    """
+    
+    __slots__ = ('bets', 'expected_returns', 'kelly', 'adjustment',
+                 'win_rates', 'version', '_bet_rows')
+    
+    def __init__(self, bets: np.ndarray, expected_returns: np.ndarray,
+                 kelly: np.ndarray, adjustment: np.ndarray,
+                 win_rates: np.ndarray, version: int):
+        self.bets = bets                        # (8, 10, 24)
+        self.expected_returns = expected_returns
+        self.kelly = kelly                      # (24,)
+        self.adjustment = adjustment            # (8, 10, 24)
+        self.win_rates = win_rates              # (24,)
+        self.version = version
+        self._bet_rows = bets.tolist()
+    
+    def bet(self, conf_idx: int, br_idx: int, hour: int) -> float:
+        return self._bet_rows[conf_idx][br_idx][hour]
+    
+    def value_at(self, conf_idx: int, br_idx: int, hour: int) -> DPValue:
+        return DPValue(
+            optimal_bet_fraction=float(self.bets[conf_idx, br_idx, hour]),
+            expected_return=float(self.expected_returns[conf_idx, br_idx, hour]),
+            confidence_score=float(CONFIDENCE_BINS[conf_idx]),
+            win_rate_expected=float(self.win_rates[hour]),
+            kelly_fraction=float(self.kelly[hour]),
+            adjustment_factor=float(self.adjustment[conf_idx, br_idx, hour])
+        )
+    
+    def get(self, state: DPState, default: Optional[DPValue] = None) -> Optional[DPValue]:
+        """Lookup compatível com a antiga tabela dict[DPState, DPValue]"""
+        if not 0 <= state.hour_of_day < HOURS:
+            return default
+        return self.value_at(_confidence_index(state.confidence),
+                             _bankroll_index(state.bankroll_pct),
+                             state.hour_of_day)
+    
+    def __len__(self):
+        return self.bets.size
+
+
 class OptimalSequencer:
     """
     Sequenciador ótimo usando Programação Dinâmica
@@ -115,6 +183,12 @@ class OptimalSequencer:
     - Hora do dia (performance varia)
     - Histórico recente
     
+    Concorrência:
+        compute_dp_table monta uma tabela nova e publica trocando a referência
+        de dp_table; get_optimal_bet lê a referência uma vez, sem lock.
+        A recomputação acontece no escritor que altera win_rate_by_hour,
+        nunca no caminho de get_optimal_bet.
+    
     Exemplo:
         sequencer = OptimalSequencer(historical_wr_by_hour=hourly_data)
         
@@ -128,12 +202,13 @@ class OptimalSequencer:
     
     def __init__(self, base_kelly_fraction: float = 0.25):
         self.base_kelly_fraction = base_kelly_fraction
-        self.dp_table: Dict[DPState, DPValue] = {}
+        self.dp_table: Optional[DPTable] = None
+        self._compute_lock = threading.Lock()
+        self._version = 0                    # incrementa quando win rates mudam
         self.last_compute = None
-        self.compute_interval = timedelta(hours=1)
         
         # Win rates por hora do dia (histórico típico)
-        self.win_rate_by_hour = {
+        self._win_rate_by_hour = {
             0: 0.55, 1: 0.54, 2: 0.52, 3: 0.50, 4: 0.50,   # Madrugada (pior)
             5: 0.55, 6: 0.58, 7: 0.60, 8: 0.62, 9: 0.63,   # Manhã
             10: 0.62, 11: 0.61, 12: 0.60, 13: 0.60, 14: 0.61,  # Meio-dia
@@ -145,14 +220,34 @@ class OptimalSequencer:
         self.win_rate_boost_evening = 0.05  # +5% em noites boas
         
         self.logger = logging.getLogger(__name__)
+        self.compute_dp_table()
         self.logger.info("[DP] OptimalSequencer inicializado")
     
+    @property
+    def win_rate_by_hour(self) -> Mapping[int, float]:
+        """Win rates por hora (somente leitura; alterar via setter/set_win_rate)"""
+        return MappingProxyType(self._win_rate_by_hour)
+    
+    @win_rate_by_hour.setter
+    def win_rate_by_hour(self, rates: Dict[int, float]):
+        with self._compute_lock:
+            self._win_rate_by_hour = dict(rates)
+            self._version += 1
+        self._refresh_if_needed()
+    
+    def set_win_rate(self, hour: int, win_rate: float):
+        """Atualiza o win rate de uma hora e recomputa a tabela se mudou"""
+        with self._compute_lock:
+            if self._win_rate_by_hour.get(hour) == win_rate:
+                return
+            self._win_rate_by_hour[hour] = win_rate
+            self._version += 1
+        self._refresh_if_needed()
+    
     def should_recompute(self) -> bool:
-        """Verifica se DP table deve ser recomputada"""
-        if self.last_compute is None:
-            return True
-        
-        return datetime.now() - self.last_compute >= self.compute_interval
+        """Verifica se DP table está desatualizada em relação aos win rates"""
+        table = self.dp_table
+        return table is None or table.version != self._version
     
     def compute_dp_table(self):
         """
@@ -165,26 +260,43 @@ class OptimalSequencer:
         
         Total: 8 * 10 * 24 = 1920 estados
         
-        Para cada estado, computar:
-        - Aposta Kelly ótima
-        - Retorno esperado
-        - Fator de ajuste para hora/contexto
+        Mesmas fórmulas de _compute_state_value, aplicadas por broadcasting
+        sobre os eixos (confiança, bankroll, hora).
         """
-        self.dp_table.clear()
-        
-        confidences = np.linspace(0.60, 0.95, 8)
-        bankroll_pcts = range(10, 101, 10)
-        hours = range(24)
+        with self._compute_lock:
+            version = self._version
+            rates = dict(self._win_rate_by_hour)
         
-        for conf in confidences:
-            for br_pct in bankroll_pcts:
-                for hour in hours:
-                    state = DPState(conf, br_pct, hour)
-                    value = self._compute_state_value(state)
-                    self.dp_table[state] = value
-        
-        self.last_compute = datetime.now()
-        self.logger.info(f"[DP] DP table recomputada: {len(self.dp_table)} estados")
+        b = 2.0  # Odds médias (Crash/Double)
+        hours = np.arange(HOURS)
+        
+        # Eixo hora: win rate, Kelly puro e multiplicador de hora
+        wr = np.array([rates.get(h, 0.60) for h in hours])
+        kelly = np.maximum(0.0, (wr * b - (1 - wr)) / b)
+        hour_mult = np.where(hours < 5, 0.6, np.where((hours == 20) | (hours == 21), 1.2, 1.0))
+        
+        # Eixos confiança e bankroll
+        conf_mult = np.clip((CONFIDENCE_BINS - 0.60) / 0.35, 0.5, 1.5)
+        br_mult = np.where(BANKROLL_BINS < 30, 0.5, np.where(BANKROLL_BINS < 50, 0.75, 1.0))
+        
+        adjustment = conf_mult[:, None, None] * br_mult[None, :, None] * hour_mult[None, None, :]
+        bets = np.clip(kelly[None, None, :] * adjustment, 0.0, 0.5)
+        expected_returns = (2 * wr - 1)[None, None, :] * bets
+        
+        # Publicar de uma vez (leitores nunca veem tabela parcial)
+        table = DPTable(bets, expected_returns, kelly, adjustment, wr, version)
+        with self._compute_lock:
+            current = self.dp_table
+            if current is None or current.version <= version:
+                self.dp_table = table
+                self.last_compute = datetime.now()
+        self.logger.info("[DP] DP table recomputada: %s estados", len(table))
+    
+    def _refresh_if_needed(self) -> DPTable:
+        """Recomputa se os win rates mudaram e retorna a tabela publicada"""
+        if self.should_recompute():
+            self.compute_dp_table()
+        return self.dp_table
     
     def _compute_state_value(self, state: DPState) -> DPValue:
         """
@@ -204,7 +316,7 @@ class OptimalSequencer:
         b = 2.0  # Odds médias (Crash/Double)
         
         # 1. Win rate base por hora
-        wr = self.win_rate_by_hour.get(state.hour_of_day, 0.60)
+        wr = self._win_rate_by_hour.get(state.hour_of_day, 0.60)
         
         # 2. Kelly Criterion puro
         # f = (p*b - q) / b = (p*2 - (1-p)) / 2 = (3p - 1) / 2
@@ -267,28 +379,19 @@ class OptimalSequencer:
         if hour_of_day is None:
             hour_of_day = datetime.now().hour
         
-        # Recomputar DP table se necessário
-        if not self.dp_table or self.should_recompute():
-            self.compute_dp_table()
-        
-        # Quantizar estado para lookup (DP table usa bins)
-        conf_quantized = round(confidence * 20) / 20  # Bins de 0.05
-        br_quantized = (bankroll_pct // 10) * 10      # Bins de 10%
-        
-        conf_quantized = np.clip(conf_quantized, 0.60, 0.95)
-        br_quantized = np.clip(br_quantized, 10, 100)
+        # Lookup direto na DP table (bins de 0.05 de confiança e 10% de bankroll)
+        table = self.dp_table
+        if 0 <= hour_of_day < HOURS:
+            return table.bet(_confidence_index(confidence),
+                             _bankroll_index(bankroll_pct),
+                             hour_of_day)
         
+        # Fallback se hora fora da tabela
+        conf_quantized = float(CONFIDENCE_BINS[_confidence_index(confidence)])
+        br_quantized = int(BANKROLL_BINS[_bankroll_index(bankroll_pct)])
         state = DPState(conf_quantized, br_quantized, hour_of_day)
-        
-        # Lookup na DP table
-        if state in self.dp_table:
-            value = self.dp_table[state]
-            self.logger.debug(f"[DP] Lookup: {state} → {value}")
-            return value.optimal_bet_fraction
-        else:
-            # Fallback se estado não existe (should not happen)
-            self.logger.warning(f"[DP] Estado não encontrado: {state}, using Kelly")
-            return self._compute_state_value(state).optimal_bet_fraction
+        self.logger.warning("[DP] Estado não encontrado: %s, using Kelly", state)
+        return float(self._compute_state_value(state).optimal_bet_fraction)
     
     def get_state_info(self, confidence: float, bankroll_pct: int,
                        hour_of_day: Optional[int] = None) -> Dict:
@@ -296,14 +399,13 @@ class OptimalSequencer:
         if hour_of_day is None:
             hour_of_day = datetime.now().hour
         
-        if not self.dp_table:
-            self.compute_dp_table()
+        table = self._refresh_if_needed()
         
-        conf_quantized = round(confidence * 20) / 20
-        br_quantized = (bankroll_pct // 10) * 10
+        conf_quantized = float(CONFIDENCE_BINS[_confidence_index(confidence)])
+        br_quantized = int(BANKROLL_BINS[_bankroll_index(bankroll_pct)])
         
         state = DPState(conf_quantized, br_quantized, hour_of_day)
-        value = self.dp_table.get(state) or self._compute_state_value(state)
+        value = table.get(state) or self._compute_state_value(state)
         
         return {
             'state': str(state),
@@ -337,7 +439,7 @@ class OptimalSequencer:
         print("-"*70)
         
         for hour in range(24):
-            wr = self.win_rate_by_hour.get(hour, 0.60)
+            wr = self._win_rate_by_hour.get(hour, 0.60)
             kelly = max(0.0, (wr * 2.0 - (1 - wr)) / 2.0)
             
             bet_70 = self.get_optimal_bet(0.70, 80, hour)
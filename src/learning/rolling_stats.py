@@ -0,0 +1,153 @@
+"""
+Rolling Stats - Métricas de janela deslizante em O(1) por resultado
+
+Substitui re-somas das últimas N apostas (O(N) a cada resultado) por
+acumuladores atualizados incrementalmente:
+
+    RollingSum        soma/média das últimas N observações
+    RollingMaxStreak  maior sequência de True nas últimas N observações
+    DrawdownTracker   pico/vale da curva de resultados acumulados
+
+COMPLEXIDADE:
+    - push: O(1) amortizado
+    - leitura (sum, mean, max_streak, drawdown): O(1)
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingSum:
+    """
+    Soma das últimas `size` observações
+
+    A soma é atualizada somando o novo valor e subtraindo o que sai da
+    janela. A cada `size` inserções ela é recalculada do buffer para
+    limitar o erro acumulado de ponto flutuante (custo amortizado O(1)).
+    """
+
+    __slots__ = ('size', '_values', '_sum', '_pushes')
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values: Deque[float] = deque(maxlen=size)
+        self._sum = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> Optional[float]:
+        """Adiciona valor; retorna o valor que saiu da janela (se houver)"""
+        evicted = self._values[0] if len(self._values) == self.size else None
+        self._values.append(value)
+        self._sum += value
+        if evicted is not None:
+            self._sum -= evicted
+
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self._sum = float(sum(self._values))
+        return evicted
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def mean(self, default: float = 0.0) -> float:
+        return self._sum / len(self._values) if self._values else default
+
+    def __len__(self):
+        return len(self._values)
+
+
+class RollingMaxStreak:
+    """
+    Maior sequência consecutiva de True nas últimas `size` observações
+
+    Guarda as sequências (runs) de True que ainda tocam a janela e uma fila
+    monotônica (decrescente) com os comprimentos das runs após a primeira.
+    A primeira run pode estar cortada pelo início da janela, por isso é
+    tratada à parte.
+    """
+
+    __slots__ = ('size', '_index', '_runs', '_max_queue')
+
+    def __init__(self, size: int):
+        self.size = size
+        self._index = -1                                  # índice da última observação
+        self._runs: Deque[list] = deque()                 # [run_id(start), length]
+        self._max_queue: Deque[list] = deque()            # runs exceto a primeira, length decrescente
+
+    def push(self, flag: bool):
+        self._index += 1
+
+        if flag:
+            last = self._runs[-1] if self._runs else None
+            if last is not None and last[0] + last[1] == self._index:
+                last[1] += 1
+            else:
+                last = [self._index, 1]
+                self._runs.append(last)
+
+            if len(self._runs) > 1:
+                # A run atual é sempre a mais nova: reinsere no fim da fila
+                # removendo runs anteriores de comprimento menor ou igual
+                if self._max_queue and self._max_queue[-1] is last:
+                    self._max_queue.pop()
+                while self._max_queue and self._max_queue[-1][1] <= last[1]:
+                    self._max_queue.pop()
+                self._max_queue.append(last)
+
+        # Runs que saíram inteiramente da janela
+        window_start = self._index - self.size + 1
+        while self._runs and self._runs[0][0] + self._runs[0][1] <= window_start:
+            self._runs.popleft()
+            # A nova primeira run deixa de participar da fila monotônica
+            if self._runs and self._max_queue and self._max_queue[0] is self._runs[0]:
+                self._max_queue.popleft()
+
+    @property
+    def max_streak(self) -> int:
+        if not self._runs:
+            return 0
+        window_start = self._index - self.size + 1
+        start, length = self._runs[0]
+        first = length - max(0, window_start - start)
+        rest = self._max_queue[0][1] if self._max_queue else 0
+        return max(first, rest)
+
+
+class DrawdownTracker:
+    """
+    Pico e vale da curva de resultados acumulados (soma dos payouts)
+
+    current_drawdown: distância do pico até o valor atual
+    max_drawdown: maior queda pico→vale já observada
+    """
+
+    __slots__ = ('equity', 'peak', 'trough', 'max_drawdown')
+
+    def __init__(self):
+        self.equity = 0.0
+        self.peak = 0.0
+        self.trough = 0.0
+        self.max_drawdown = 0.0
+
+    def push(self, payout: float):
+        self.equity += payout
+        if self.equity > self.peak:
+            self.peak = self.equity
+            self.trough = self.equity
+        elif self.equity < self.trough:
+            self.trough = self.equity
+            self.max_drawdown = max(self.max_drawdown, self.peak - self.trough)
+
+    @property
+    def current_drawdown(self) -> float:
+        return self.peak - self.equity
+
+    def snapshot(self) -> Tuple[float, float, float, float]:
+        """(equity, peak, current_drawdown, max_drawdown)"""
+        return self.equity, self.peak, self.current_drawdown, self.max_drawdown
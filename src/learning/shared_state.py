@@ -0,0 +1,74 @@
+"""
+Shared State - Estado compartilhado entre threads no módulo learning
+
+Modelo de concorrência da camada de aprendizado:
+
+    Escritores (record_result, train, compute_dp_table, ajustes):
+        └─ Serializados por um lock de escrita por objeto
+        └─ Montam um NOVO snapshot imutável e publicam com uma única
+           atribuição de referência (copy-on-write)
+
+    Leitores no hot path (get_optimal_bet, predict_strategy_weights,
+    get_current_parameters, get_current_rollout):
+        └─ Leem a referência publicada uma vez e trabalham sobre ela
+        └─ Nunca tomam lock e nunca veem um estado pela metade
+
+    Históricos (resultados, amostras de treino):
+        └─ collections.deque com maxlen (limite de memória, descarte O(1))
+        └─ Só são mutados/iterados sob o lock de escrita
+
+Exemplo:
+    params = AtomicRef(freeze({'min_confidence': 0.65}))
+
+    # Hot path (sem lock)
+    threshold = params.get()['min_confidence']
+
+    # Escritor
+    params.update(lambda old: freeze({**old, 'min_confidence': 0.70}))
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Generic, Mapping, TypeVar
+
+T = TypeVar('T')
+
+
+class AtomicRef(Generic[T]):
+    """
+    Referência publicada atomicamente
+
+    get() é uma leitura simples de atributo (atômica no CPython) e não toma
+    lock. set()/update() são serializados entre si, então um update()
+    nunca perde a escrita de outro.
+    """
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self, value: T):
+        self._value = value
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Snapshot atual (sem lock)"""
+        return self._value
+
+    def set(self, value: T) -> T:
+        """Publica um novo valor"""
+        with self._lock:
+            self._value = value
+        return value
+
+    def update(self, fn: Callable[[T], T]) -> T:
+        """Publica fn(valor_atual) de forma atômica em relação a outros escritores"""
+        with self._lock:
+            self._value = fn(self._value)
+            return self._value
+
+    def __repr__(self):
+        return f"AtomicRef({self._value!r})"
+
+
+def freeze(values: Dict[str, Any]) -> Mapping[str, Any]:
+    """Cópia somente-leitura de um dict, para publicar como snapshot"""
+    return MappingProxyType(dict(values))
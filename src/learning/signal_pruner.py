@@ -81,7 +81,9 @@ IMPACTO:
 """
 
 import logging
-from typing import Dict, Tuple, Optional, List
+import threading
+from collections import deque
+from typing import Deque, Dict, Tuple, Optional, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import numpy as np
@@ -108,6 +110,12 @@ class SignalPruner:
     Remove sinais com baixa probabilidade de sucesso
     Economiza recursos em apostas ineficientes
     
+    Concorrência:
+        prune_signal só lê parâmetros escalares (atribuição atômica) e
+        incrementa contadores da própria thread, sem lock. Cada thread
+        registra sua lista de contadores uma vez (list.append é atômico) e
+        get_pruning_stats soma todas. O histórico é um deque limitado.
+    
     Exemplo:
         pruner = SignalPruner(min_threshold=0.0)
         
@@ -137,18 +145,23 @@ class SignalPruner:
         self.min_threshold = min_threshold
         self.use_historical = use_historical_performance
         
-        # Histórico de performance
-        self.signal_history: List[Dict] = []
+        # Protege o histórico contra escritas concorrentes
+        self._write_lock = threading.Lock()
+        
+        # Contadores [descartados, mantidos] por thread (sem lock no hot path)
+        self._local = threading.local()
+        self._thread_counters: List[List[int]] = []
+        
+        # Histórico de performance (buffer circular)
         self.max_history = 100
+        self.signal_history: Deque[Dict] = deque(maxlen=self.max_history)
         
         self.stats = {
-            'signals_pruned': 0,
-            'signals_kept': 0,
             'false_positives': 0,  # Sinais que foram mantidos e perderam
             'true_positives': 0,   # Sinais que foram mantidos e ganharam
         }
         
-        logger.info(f"[PRUNER] Inicializado: threshold={min_threshold:.1%}")
+        logger.info("[PRUNER] Inicializado: threshold=%.1f%%", min_threshold * 100)
     
     def prune_signal(self, signal_id: str, confidence: float,
                      game: str = 'Unknown',
@@ -194,13 +207,12 @@ class SignalPruner:
             recent_performance
         )
         
-        # 5. Registrar estatística
+        # 5. Registrar estatística (contadores da thread atual)
+        self._counters()[0 if should_prune else 1] += 1
         if should_prune:
-            self.stats['signals_pruned'] += 1
-            logger.debug(f"[PRUNE] {signal_id}: {prune_reason}")
+            logger.debug("[PRUNE] %s: %s", signal_id, prune_reason)
         else:
-            self.stats['signals_kept'] += 1
-            logger.debug(f"[KEEP] {signal_id}: {prune_reason}")
+            logger.debug("[KEEP] %s: %s", signal_id, prune_reason)
         
         return PruningResult(
             signal_id=signal_id,
@@ -235,7 +247,7 @@ class SignalPruner:
             gap = 0.60 - recent_performance
             adjustment = -gap * 0.5
             base_lb += adjustment
-            logger.debug(f"[PRUNE] Ajuste performance: {adjustment:+.1%}")
+            logger.debug("[PRUNE] Ajuste performance: %+.1f%%", adjustment * 100)
         
         # Ajuste por padrão histórico
         if win_rate_by_pattern:
@@ -247,7 +259,7 @@ class SignalPruner:
                     gap = 0.60 - median_wr
                     adjustment = -gap * 0.3
                     base_lb += adjustment
-                    logger.debug(f"[PRUNE] Ajuste padrão: {adjustment:+.1%}")
+                    logger.debug("[PRUNE] Ajuste padrão: %+.1f%%", adjustment * 100)
         
         return base_lb
     
@@ -328,23 +340,32 @@ class SignalPruner:
             'won': won,
             'timestamp': datetime.now()
         }
-        self.signal_history.append(entry)
-        
-        if len(self.signal_history) > self.max_history:
-            self.signal_history.pop(0)
+        with self._write_lock:
+            self.signal_history.append(entry)
+    
+    def _counters(self) -> List[int]:
+        """Contadores [descartados, mantidos] da thread atual"""
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            counters = self._local.counters = [0, 0]
+            self._thread_counters.append(counters)
+        return counters
     
     def get_pruning_stats(self) -> Dict:
         """Retorna estatísticas de pruning"""
-        total = self.stats['signals_pruned'] + self.stats['signals_kept']
-        prune_rate = (self.stats['signals_pruned'] / total * 100) if total > 0 else 0
+        stats = dict(self.stats)
+        stats['signals_pruned'] = sum(counters[0] for counters in list(self._thread_counters))
+        stats['signals_kept'] = sum(counters[1] for counters in list(self._thread_counters))
+        total = stats['signals_pruned'] + stats['signals_kept']
+        prune_rate = (stats['signals_pruned'] / total * 100) if total > 0 else 0
         
         return {
             'total_signals': total,
-            'signals_pruned': self.stats['signals_pruned'],
-            'signals_kept': self.stats['signals_kept'],
+            'signals_pruned': stats['signals_pruned'],
+            'signals_kept': stats['signals_kept'],
             'prune_rate_pct': round(prune_rate, 1),
-            'true_positives': self.stats['true_positives'],
-            'false_positives': self.stats['false_positives'],
+            'true_positives': stats['true_positives'],
+            'false_positives': stats['false_positives'],
             'min_threshold': self.min_threshold
         }
     
@@ -17,6 +17,7 @@ from dotenv import load_dotenv
 import os
 import sys
 import json
+import threading
 import time
 
 # Adiciona o diretório src ao path
@@ -24,10 +25,14 @@ src_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, src_dir)
 
 from data_collection.blaze_client_v2 import BlazeDataCollectorV2 as BlazeDataCollector
+from data_collection.blaze_stream import BlazeStreamCollector
 from analysis.statistical_analyzer import StatisticalAnalyzer
 from analysis.strategy_pipeline import StrategyPipeline
+from analysis.feature_store import FeatureStore
 from telegram_bot.bot_manager import TelegramBotManager
 from config.settings import Settings
+from core.resilience import Deadline, breaker_metrics
+from config.logger_config import SamplingFilter, start_queue_logging, logging_stats
 from strategies.kelly_criterion import KellyCriterion
 
 # Import drawdown manager (relative to scripts/)
@@ -37,11 +42,13 @@ from drawdown_manager import DrawdownManager
 # Adicione este import
 from analysis.result_tracker import ResultTracker
 from analysis.game_result_tracker import GameResultTracker
+from analysis.signal_settlement import SignalSettler
 
 # FASE 2: Novos módulos de otimização
 from learning.optimal_sequencer import OptimalSequencer
 from learning.signal_pruner import SignalPruner
 from learning.meta_learner import MetaLearner, MetaContext
+from learning.calibration import ConfidenceCalibrator
 
 # FASE 3: Feedback Loop Automático
 from learning.feedback_loop import FeedbackLoop, SignalResult
@@ -54,15 +61,19 @@ from core import Signal, SignalType, GameType
 
 # Banco de dados
 from database import SignalRepository, GameResultRepository, init_db
-
-# Configuração de logging
-logging.basicConfig(
+from database import RetentionManager, RetentionPolicy, log_file_lock
+
+# Configuração de logging: handlers na thread do QueueListener, mensagens
+# por sinal amostradas (ver config.logger_config)
+os.makedirs('logs', exist_ok=True)
+_log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('logs/bet_analysis.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_format)
+start_queue_logging(
+    _log_handlers,
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/bet_analysis.log'),
-        logging.StreamHandler()
-    ]
+    sampling=SamplingFilter(loggers=('__main__', 'main', 'analysis.strategy_pipeline'))
 )
 
 logger = logging.getLogger(__name__)
@@ -75,13 +86,28 @@ class BetAnalysisPlatform:
         self.settings = Settings()
         self.setup_directories()
 
-        self.data_collector = BlazeDataCollector()
+        if self.settings.BLAZE_WS_URL:
+            # Ingestão push: rodadas chegam pelo WebSocket, sem polling HTTP
+            self.data_collector = BlazeStreamCollector(self.settings.BLAZE_WS_URL)
+            self.data_collector.start()
+        else:
+            self.data_collector = BlazeDataCollector()
         self.analyzer = StatisticalAnalyzer()
         self.bot_manager = TelegramBotManager()
         self.test_mode = test_mode
         
         # Inicializar novo pipeline com 6 estratégias
         self.pipeline = StrategyPipeline(logger)
+
+        # Features por rodada do Double (calculadas uma vez e gravadas com o histórico)
+        self.feature_store = FeatureStore(
+            'double', self.pipeline.required_features() + ('hour', 'weekday'))
+        self.features_path = os.getenv('FEATURES_PATH', 'data/features/double.jsonl')
+
+        # Orçamento de tempo da coleta em cada ciclo (timeouts limitados a ele)
+        self.cycle_deadline = float(os.getenv('CYCLE_DEADLINE_SECONDS', '20'))
+        # Última rodada já persistida por jogo (RollBatch.since)
+        self._last_round_ids = {}
         
         # Inicializar Kelly Criterion e Drawdown Manager
         self.kelly = KellyCriterion(
@@ -102,8 +128,20 @@ class BetAnalysisPlatform:
             'start_time': datetime.now()
         }
 
-        # Inicializar tracker de resultados
+        # Calibração da confiança: curvas por jogo/combinação de estratégias,
+        # alimentadas pela liquidação dos sinais (_record_calibration) e
+        # consultadas em O(1) no hot path
+        calibration_path = os.getenv('CALIBRATION_PATH', 'data/calibration.json')
+        seed_calibration = not os.path.exists(calibration_path)
+        self.calibrator = ConfidenceCalibrator.load(calibration_path)
+
+        # Inicializar tracker de resultados (histórico já verificado semeia a calibração)
         self.tracker = ResultTracker()
+        if seed_calibration and self.calibrator.seed(self.tracker.verified_signals()):
+            self.calibrator.refresh_async()
+
+        # Sinais de cor enviados, liquidados pela rodada seguinte do Double
+        self.settler = SignalSettler()
 
         # Inicializa sessão do banco de dados
         self.Session = init_db()
@@ -111,6 +149,13 @@ class BetAnalysisPlatform:
         self.result_repo = GameResultRepository(self.Session)
         self.game_result_tracker = GameResultTracker(self.result_repo)
         
+        # Retenção: camada quente no banco, histórico arquivado (ver database.retention).
+        # O ciclo segura o _db_lock enquanto grava; VACUUM não roda nesse intervalo
+        self._db_lock = threading.Lock()
+        self.retention = RetentionManager(self.Session, RetentionPolicy.from_env(),
+                                          maintenance_lock=self._db_lock)
+        self._retention_thread = None
+        
         # FASE 2: Inicializar módulos de otimização
         self.optimal_sequencer = OptimalSequencer()
         self.signal_pruner = SignalPruner(min_threshold=0.02)  # 2% minimum profit
@@ -139,47 +184,53 @@ class BetAnalysisPlatform:
 
     def run_analysis_cycle(self):
         """Executa um ciclo completo de coleta e análise com Pipeline de 6 Estratégias"""
+        with self._db_lock:
+            self._run_analysis_cycle()
+
+    def _run_analysis_cycle(self):
         try:
             logger.info("[*] Iniciando ciclo de analise com Pipeline (6 estratégias)")
 
             # Coleta dados (novo cliente V2)
             logger.info("[*] Coletando dados...")
-            all_data = self.data_collector.get_all_data(limit=100)
+            with Deadline(self.cycle_deadline):
+                all_data = self.data_collector.get_all_batches(limit=100)
             
-            if all_data and (all_data.get('double') or all_data.get('crash')):
-                double_data = all_data.get('double', [])
-                crash_data = all_data.get('crash', [])
-                
-                logger.info(f"[*] Coletados: {len(double_data)} Double + {len(crash_data)} Crash")
+            double_batch = all_data.get('double') if all_data else None
+            crash_batch = all_data.get('crash') if all_data else None
+            if double_batch is not None and (len(double_batch) or len(crash_batch)):
+                logger.info("[*] Coletados: %d Double + %d Crash (%d bytes)",
+                            len(double_batch), len(crash_batch),
+                            double_batch.nbytes + crash_batch.nbytes)
+
+                # Só as rodadas ainda não vistas viram dicts (features e banco)
+                new_double = double_batch.since(self._last_round_ids.get('double'))
+                new_crash = crash_batch.since(self._last_round_ids.get('crash'))
+                new_double_records = new_double.to_records()
+
+                # Resultado dos sinais do ciclo anterior (rodada seguinte do Double)
+                self._settle_signals(double_batch)
+
+                # Features só das rodadas novas
+                if new_double_records:
+                    self.feature_store.extend(new_double_records)
+                    self.feature_store.flush(self.features_path)
                 
                 # Preparar dados para análise
-                # Converter listas em pandas DataFrame para compatibilidade com o analisador
-                import pandas as pd
-
-                # Crash -> DataFrame com coluna 'crash_point'
-                try:
-                    df_crash = pd.DataFrame(crash_data)
-                except Exception:
-                    df_crash = pd.DataFrame()
-
-                # Double -> DataFrame com colunas 'color' e 'roll' (cria 'roll' sintético se não existir)
-                try:
-                    df_double = pd.DataFrame(double_data)
-                except Exception:
-                    df_double = pd.DataFrame()
+                # DataFrames sobre as colunas do lote (sem cópia das numéricas)
+                df_double = double_batch.to_frame()
+                df_crash = crash_batch.to_frame()
 
                 if 'roll' not in df_double.columns:
                     # gerar um número sintético 0-36 para compatibilidade
                     import numpy as _np
-                    if not df_double.empty:
-                        df_double['roll'] = _np.random.randint(0, 37, size=(len(df_double),))
-                    else:
-                        df_double['roll'] = []
+                    df_double['roll'] = _np.random.randint(0, 37, size=(len(df_double),))
 
                 raw_data = {
                     'double': df_double,
                     'crash': df_crash,
-                    'source': all_data.get('source', 'fallback')
+                    'source': all_data.get('source', 'fallback'),
+                    'batches': {'double': double_batch, 'crash': crash_batch}
                 }
                 
                 # Analisa dados
@@ -192,19 +243,21 @@ class BetAnalysisPlatform:
 
                 # Verificar se trading está pausado por drawdown
                 if self.drawdown.is_paused:
-                    logger.warning(f"[AVISO] TRADING PAUSED: Drawdown {self.drawdown.get_status()['drawdown_percent']:.2f}% exceeded limit")
+                    logger.warning("[AVISO] TRADING PAUSED: Drawdown %.2f%% exceeded limit", self.drawdown.get_status()['drawdown_percent'])
                     signals = []  # Não gerar novos sinais durante pausa
                 
                 # Envia para Telegram apenas sinais válidos
                 if signals:
-                    logger.info(f"[*] Enviando {len(signals)} sinal(is) válido(s) para Telegram...")
+                    logger.info("[*] Enviando %s sinal(is) válido(s) para Telegram...", len(signals))
                     
                     # Calcular tamanho da aposta via Kelly Criterion
-                    win_rate = self._calculate_recent_win_rate()
+                    # (probabilidade calibrada do sinal; sem curva, a confiança final,
+                    # como no pruner e no sequencer)
                     for signal in signals:
+                        calibrated = signal.get('calibrated_confidence')
                         # Adicionar tamanho da aposta ao sinal
                         signal['bet_size'] = self.kelly.calculate_bet_size(
-                            win_rate=win_rate,
+                            win_rate=calibrated if calibrated is not None else signal['confidence'],
                             odds=float(signal.get('odds', 1.9)),
                             min_bet=1.0
                         )
@@ -212,13 +265,17 @@ class BetAnalysisPlatform:
                     
                     # Salvar sinais com toda informação importante
                     for signal in signals:
+                        # Mesmo id no tracker, no banco e na liquidação
+                        signal_id = signal.setdefault('game_id', f"sig_{uuid.uuid4().hex[:12]}")
                         # Preparar dados para banco de dados
                         signal_data = {
-                            'game_id': signal.get('game_id', f"sig_{uuid.uuid4().hex[:12]}"),
+                            'game_id': signal_id,
                             'game': signal.get('game', 'Double'),
                             'signal_type': signal.get('signal', 'Unknown'),
                             'confidence': signal.get('confidence', 0.0),
                             'strategies_passed': signal.get('strategies_passed', 0),
+                            'strategies': signal.get('strategies', ''),
+                            'calibrated_confidence': signal.get('calibrated_confidence'),
                             'timestamp': datetime.now(),
                             'bet_size': signal.get('bet_size', 0.0),
                             'odds': signal.get('odds', 1.9),
@@ -231,11 +288,15 @@ class BetAnalysisPlatform:
                                 'analysis_results': str(analysis_results)
                             },
                             'optimal_bet_fraction': signal.get('optimal_bet_fraction', 0.25),
-                            'signal_id': signal.get('game_id', f"sig_{uuid.uuid4().hex[:12]}")
+                            'signal_id': signal_id
                         }
                         
                         # Salvar para tracking de resultados
                         self.tracker.save_signal(signal_data)
+                        if signal_data['game'] == 'Double':
+                            self.settler.open(signal_id, signal['pipeline_signal'], double_batch.last_id,
+                                              bet_size=signal_data['bet_size'],
+                                              odds=float(signal_data['odds']))
                         
                         # Salvar no banco de dados com metadados
                         # Mapear tipo de sinal para enum
@@ -262,11 +323,14 @@ class BetAnalysisPlatform:
                                 'drawdown_percent': signal_data['drawdown_status'].get('drawdown_percent', 0),
                                 'data_source': signal_data['metadata']['data_source'],
                                 'colors_analyzed': signal_data['metadata']['colors_analyzed'],
+                                # Estratégias aprovadas (relatório 'strategies' do analytics)
+                                'strategies': signal_data['strategies'],
+                                'calibrated_confidence': signal_data['calibrated_confidence'],
                                 'optimal_bet_fraction': signal_data['optimal_bet_fraction']
                             }
                         )
                         self.repo.save(db_signal)
-                        logger.info(f"[OK] Sinal {signal_data['game_id']} salvo no banco de dados")
+                        logger.info("[OK] Sinal %s salvo no banco de dados", signal_data['game_id'])
                     # Enviar ao Telegram com mensagens formatadas
                     self.bot_manager.send_signals(signals)
                     self.stats['signals_sent'] += len(signals)
@@ -277,30 +341,34 @@ class BetAnalysisPlatform:
                 # Isso permite análise histórica e correlação com sinais
                 try:
                     # Processar dados de Double como resultados
-                    if double_data:
-                        self.game_result_tracker.process_raw_data_as_results(double_data, 'Double')
+                    if new_double_records:
+                        self.game_result_tracker.process_raw_data_as_results(new_double_records, 'Double')
                     
                     # Processar dados de Crash como resultados
-                    if crash_data:
-                        self.game_result_tracker.process_raw_data_as_results(crash_data, 'Crash')
+                    if len(new_crash):
+                        self.game_result_tracker.process_raw_data_as_results(new_crash.to_records(), 'Crash')
                     
-                    logger.info(f"[OK] Dados de jogos armazenados para análise histórica")
+                    logger.info("[OK] Dados de jogos armazenados para análise histórica")
                 except Exception as e:
-                    logger.warning(f"[AVISO] Erro ao armazenar resultados: {str(e)}")
+                    logger.warning("[AVISO] Erro ao armazenar resultados: %s", e)
 
-                # Salva dados em cache (passando os arrays originais)
-                self.data_collector.save_cache(double_data, crash_data)
-                self.stats['colors_collected'] += len(raw_data['crash']) + len(raw_data['double'])
+                # O cache já foi salvo pelo coletor em get_all_data
+                self._last_round_ids.update(double=double_batch.last_id, crash=crash_batch.last_id)
+                self.stats['colors_collected'] += len(double_batch) + len(crash_batch)
             else:
                 logger.warning("[!] Nenhum dado coletado para analise")
 
             # Salvar estatísticas
             self._save_statistics()
 
+            # Recalibrar em background quando houver resultados novos suficientes
+            if self.calibrator.should_refresh():
+                self.calibrator.refresh_async()
+
             logger.info("[OK] Ciclo de analise concluido com sucesso")
 
         except Exception as e:
-            logger.error(f"[ERRO] Erro no ciclo de analise: {str(e)}")
+            logger.error("[ERRO] Erro no ciclo de analise: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -329,7 +397,7 @@ class BetAnalysisPlatform:
             recent_colors = all_colors[-10:] if len(all_colors) >= 10 else all_colors
             
             if not all_colors or len(all_colors) < 20:
-                logger.warning(f"[!] Histórico insuficiente ({len(all_colors)} cores)")
+                logger.warning("[!] Histórico insuficiente (%s cores)", len(all_colors))
                 return signals
             
             # Normalizar resultados para processamento: criar lista de resultados por jogo
@@ -350,10 +418,12 @@ class BetAnalysisPlatform:
             # Processar análise através do pipeline
             for result in results_to_process:
                 signal_data = {
+                    'signal_id': f"sig_{uuid.uuid4().hex[:12]}",
                     'all_colors': all_colors,
                     'recent_colors': recent_colors,
                     'observed_count': result.get('desequilibrio', 0) if isinstance(result, dict) else 0,
-                    'initial_confidence': result.get('confidence', 0.72) if isinstance(result, dict) else 0.72
+                    'initial_confidence': result.get('confidence', 0.72) if isinstance(result, dict) else 0.72,
+                    'features': self.feature_store.latest()
                 }
                 
                 # Processar através de 6 estratégias
@@ -369,14 +439,16 @@ class BetAnalysisPlatform:
                     if optimized_signal is not None:
                         signals.append(self._format_signal_for_telegram(optimized_signal, result))
                         
-                        logger.info(f"SINAL VÁLIDO: {optimized_signal.signal_type}")
-                        logger.info(f"   Confiança final: {optimized_signal.final_confidence:.1%}")
-                        logger.info(f"   Estratégias passadas: {optimized_signal.strategies_passed}/6")
-                        logger.info(f"   Tamanho ótimo: {optimized_signal.optimal_bet_fraction:.1%} do bankroll")
+                        logger.info("SINAL VÁLIDO: %s | confiança final %.1f%% | "
+                                    "estratégias passadas %d/6 | tamanho ótimo %.1f%% do bankroll",
+                                    optimized_signal.signal_type,
+                                    optimized_signal.final_confidence * 100,
+                                    optimized_signal.strategies_passed,
+                                    optimized_signal.optimal_bet_fraction * 100)
                     else:
-                        logger.debug(f"Sinal rejeitado pela filtragem FASE 2 (Signal Pruner)")
+                        logger.debug("Sinal rejeitado pela filtragem FASE 2 (Signal Pruner)")
                 else:
-                    logger.debug(f"Sinal rejeitado (estratégias passadas: {signal.strategies_passed}/6)")
+                    logger.debug("Sinal rejeitado (estratégias passadas: %d/6)", signal.strategies_passed)
 
             # Se estivermos em modo de teste forçado, e nenhum sinal válido foi gerado,
             # fabricar um sinal de teste com confiança alta para forçar envio ao Telegram.
@@ -401,12 +473,12 @@ class BetAnalysisPlatform:
                 if test_signal.is_valid:
                     signals.append(self._format_signal_for_telegram(test_signal, test_result))
                     self.stats['signals_valid'] += 1
-                    logger.info(f"[TEST-MODE] Sinal de teste válido gerado: {test_signal.signal_type} ({test_signal.final_confidence:.1%})")
+                    logger.info("[TEST-MODE] Sinal de teste válido gerado: %s (%.1f%%)", test_signal.signal_type, test_signal.final_confidence * 100)
             
             return signals
             
         except Exception as e:
-            logger.error(f"[ERRO] Erro ao gerar sinais com pipeline: {str(e)}")
+            logger.error("[ERRO] Erro ao gerar sinais com pipeline: %s", e)
             import traceback
             traceback.print_exc()
             return signals
@@ -415,15 +487,18 @@ class BetAnalysisPlatform:
         """
         Aplica otimizações FASE 2:
         1. Meta-Learner: Seleciona estratégias ótimas por contexto
-        2. Signal Pruner: Filtra sinais ineficientes
-        3. Optimal Sequencer: Calcula tamanho ótimo de aposta
+        2. Calibração: Probabilidade calibrada (jogo + estratégias aprovadas)
+        3. Signal Pruner: Filtra sinais ineficientes
+        4. Optimal Sequencer: Calcula tamanho ótimo de aposta
         """
         try:
             from datetime import datetime
             
             # 1. META-LEARNING: Predizer pesos das estratégias por contexto
-            current_hour = datetime.now().hour
-            current_day = datetime.now().weekday()
+            # (hora/dia da última rodada, do FeatureStore)
+            features = self.feature_store.latest()
+            current_hour = features.get('hour', datetime.now().hour)
+            current_day = features.get('weekday', datetime.now().weekday())
             
             # Extrair contexto do sinal
             meta_context = MetaContext(
@@ -440,31 +515,40 @@ class BetAnalysisPlatform:
             # Predizer pesos usando meta-learner
             strategy_weights = self.meta_learner.predict_strategy_weights(meta_context)
             
-            logger.debug(f"   Meta-Learning: Pesos das estratégias = {strategy_weights}")
+            logger.debug("   Meta-Learning: Pesos das estratégias = %s", strategy_weights)
+            
+            # 2. CALIBRAÇÃO: confiança → probabilidade observada (None sem curva);
+            # pruner e sequencer usam a mesma probabilidade
+            signal.calibrated_confidence = self.calibrator.calibrate(
+                signal.final_confidence, result.get('game', 'Double'), signal.passed_strategies)
+            probability = (signal.calibrated_confidence if signal.calibrated_confidence is not None
+                           else signal.final_confidence)
             
-            # 2. SIGNAL PRUNING: Verificar se sinal é economicamente viável
+            # 3. SIGNAL PRUNING: Verificar se sinal é economicamente viável
             pruning_result = self.signal_pruner.prune_signal(
                 signal_id=signal.signal_type,
-                confidence=signal.final_confidence,
+                confidence=probability,
                 game=result.get('game', 'Double'),
                 recent_performance=self._calculate_recent_win_rate()
             )
             
             if pruning_result.should_prune:
-                logger.debug(f"   Signal Pruner: Sinal rejeitado (lower_bound={pruning_result.lower_bound:.1%}, min={self.signal_pruner.min_threshold:.1%})")
+                logger.debug("   Signal Pruner: Sinal rejeitado (lower_bound=%.1f%%, min=%.1f%%)",
+                             pruning_result.lower_bound * 100, self.signal_pruner.min_threshold * 100)
                 return None
             
-            logger.debug(f"   Signal Pruner: Sinal aprovado (lower_bound={pruning_result.lower_bound:.1%}, bet_adjustment={pruning_result.bet_adjustment:.1%})")
+            logger.debug("   Signal Pruner: Sinal aprovado (lower_bound=%.1f%%, bet_adjustment=%.1f%%)",
+                         pruning_result.lower_bound * 100, pruning_result.bet_adjustment * 100)
             
-            # 3. OPTIMAL SEQUENCER: Calcular tamanho ótimo de aposta
+            # 4. OPTIMAL SEQUENCER: Calcular tamanho ótimo de aposta
             bankroll_pct = 100.0  # Simplificado - seria calculado do atual vs inicial
             optimal_bet = self.optimal_sequencer.get_optimal_bet(
-                confidence=signal.final_confidence,
-                bankroll_percentage=bankroll_pct,
+                confidence=probability,
+                bankroll_pct=bankroll_pct,
                 hour_of_day=current_hour
             )
             
-            logger.debug(f"   Optimal Sequencer: Tamanho ótimo = {optimal_bet:.1%} do bankroll")
+            logger.debug("   Optimal Sequencer: Tamanho ótimo = %.1f%% do bankroll", optimal_bet * 100)
             
             # Adicionar informações FASE 2 ao sinal
             signal.optimal_bet_fraction = optimal_bet
@@ -475,7 +559,7 @@ class BetAnalysisPlatform:
             return signal
             
         except Exception as e:
-            logger.warning(f"[AVISO] Erro na aplicação de otimizações FASE 2: {str(e)}")
+            logger.warning("[AVISO] Erro na aplicação de otimizações FASE 2: %s", e)
             import traceback
             traceback.print_exc()
             # Retornar sinal original sem otimizações FASE 2
@@ -484,6 +568,11 @@ class BetAnalysisPlatform:
     
     def _extract_all_colors(self, raw_data):
         """Extrai todas as cores do histórico"""
+        batches = raw_data.get('batches')
+        if batches:
+            # Crash não tem cor; o Double já guarda os códigos
+            return batches['double'].color_names()
+
         colors = []
         
         # Extrair cores do crash (Blaze)
@@ -504,6 +593,7 @@ class BetAnalysisPlatform:
         game = original_result.get('game', 'Double') if isinstance(original_result, dict) else 'Double'
         
         return {
+            'game_id': signal.signal_id,
             'game': game,
             'signal': signal.signal_type,
             'message': f"Sinal: {signal.signal_type} | Confianca: {signal.final_confidence:.1%} | Estrategias: {signal.strategies_passed}/6",
@@ -511,7 +601,10 @@ class BetAnalysisPlatform:
             'confidence': signal.final_confidence,
             'timestamp': datetime.now(),
             'strategies_passed': signal.strategies_passed,
+            'strategies': '+'.join(signal.passed_strategies),
+            'calibrated_confidence': signal.calibrated_confidence,
             'original_confidence': original_result.get('confidence', 0.72) if isinstance(original_result, dict) else 0.72,
+            'pipeline_signal': signal,      # liquidação (calibração e feedback)
             'details': {
                 'pipeline_results': {
                     name: {
@@ -552,16 +645,14 @@ class BetAnalysisPlatform:
                 winning_strategies=winning_strategy_ids
             )
             
-            logger.debug(f"[Meta-Learning] Amostra de treinamento coletada (total: {self.meta_learner.training_sample_count})")
+            logger.debug("[Meta-Learning] Amostra de treinamento coletada (total: %s)", self.meta_learner.training_sample_count)
             
-            # Verificar se deve retrainer
-            if self.meta_learner.should_retrain():
-                logger.info("[Meta-Learning] Acionando retreinamento do modelo...")
-                self.meta_learner.train()
-                logger.info("[Meta-Learning] Modelo retreinado com sucesso!")
+            # Verificar se deve retrainer (em background, fora do caminho do sinal)
+            if self.meta_learner.should_retrain() and self.meta_learner.train_async():
+                logger.info("[Meta-Learning] Retreinamento do modelo iniciado em background")
                 
         except Exception as e:
-            logger.warning(f"[AVISO] Erro ao coletar dados para meta-learner: {str(e)}")
+            logger.warning("[AVISO] Erro ao coletar dados para meta-learner: %s", e)
     
     def process_game_result_feedback(self, signal, game_result):
         """
@@ -600,38 +691,56 @@ class BetAnalysisPlatform:
             
             # Registrar resultado no feedback loop
             self.feedback_loop.record_result(signal_result)
+            self._record_calibration(signal, game_result.result)
             
-            logger.debug(f"[Feedback] Resultado registrado: {signal_result.signal_id} → {signal_result.result}")
+            logger.debug("[Feedback] Resultado registrado: %s → %s", signal_result.signal_id, signal_result.result)
             
             # Analisar e fazer ajustes automáticos
             adjustments = self.feedback_loop.analyze_and_adjust()
             
             if adjustments:
-                logger.info(f"[Feedback-ADJ] {len(adjustments)} parâmetros ajustados automaticamente")
+                logger.info("[Feedback-ADJ] %s parâmetros ajustados automaticamente", len(adjustments))
                 
                 # Aplicar ajustes ao sistema
                 for adj in adjustments:
                     if adj.parameter == 'min_confidence':
                         # Atualizar threshold mínimo de confiança
                         self.pipeline.min_confidence_threshold = adj.new_value
-                        logger.info(f"[Feedback] min_confidence: {adj.old_value:.3f} → {adj.new_value:.3f}")
+                        logger.info("[Feedback] min_confidence: %.3f → %.3f", adj.old_value, adj.new_value)
                     
                     elif adj.parameter == 'kelly_fraction':
                         # Atualizar kelly fraction
                         self.kelly.kelly_fraction = adj.new_value
-                        logger.info(f"[Feedback] kelly_fraction: {adj.old_value:.3f} → {adj.new_value:.3f}")
+                        logger.info("[Feedback] kelly_fraction: %.3f → %.3f", adj.old_value, adj.new_value)
             
             # Exportar métricas para monitoramento
             metrics = self.feedback_loop.export_metrics()
             
             if metrics['total_adjustments'] % 5 == 0:  # Log a cada 5 ajustes
-                logger.info(f"[Feedback-Status] WR: {metrics['win_rate']}, "
-                          f"ROI: {metrics['roi']}, "
-                          f"Total Ajustes: {metrics['total_adjustments']}")
+                logger.info("[Feedback-Status] WR: %s, ROI: %s, Total Ajustes: %s",
+                            metrics['win_rate'], metrics['roi'], metrics['total_adjustments'])
             
         except Exception as e:
-            logger.warning(f"[AVISO] Erro ao processar feedback: {str(e)}")
+            logger.warning("[AVISO] Erro ao processar feedback: %s", e)
     
+    def _settle_signals(self, double_batch):
+        """Liquida os sinais abertos: tracker, feedback loop e calibração"""
+        for entry, outcome in self.settler.settle(double_batch):
+            self.tracker.register_result(entry.signal_id, outcome.result == 'WIN')
+            self.process_game_result_feedback(entry.signal, outcome)
+            logger.info("[SETTLE] Sinal %s: %s (rodada %s)",
+                        entry.signal_id, outcome.result, outcome.roll_id)
+
+    def _record_calibration(self, signal, outcome):
+        """
+        Alimenta a calibração com um resultado verificado (WIN/LOSS)
+
+        Única entrada viva do calibrador (o tracker não recebe o calibrador,
+        senão cada resultado contaria duas vezes).
+        """
+        if outcome in ('WIN', 'LOSS'):
+            self.calibrator.record_signal(signal, outcome == 'WIN')
+
     def _save_statistics(self):
         """Salva estatísticas de análise"""
         elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
@@ -643,17 +752,32 @@ class BetAnalysisPlatform:
             'signals_valid': self.stats['signals_valid'],
             'signals_sent': self.stats['signals_sent'],
             'colors_collected': self.stats['colors_collected'],
-            'valid_rate': f"{self.stats['signals_valid']/max(self.stats['signals_processed'], 1)*100:.1f}%"
+            'valid_rate': f"{self.stats['signals_valid']/max(self.stats['signals_processed'], 1)*100:.1f}%",
+            'circuit_breakers': breaker_metrics(),
+            'logging': logging_stats()
         }
         
         # Salvar em arquivo de log
         try:
             os.makedirs('logs', exist_ok=True)
-            with open('logs/pipeline_stats.json', 'a') as f:
+            with log_file_lock('logs/pipeline_stats.json'), open('logs/pipeline_stats.json', 'a') as f:
                 json.dump(stats_data, f)
                 f.write('\n')
         except Exception as e:
-            logger.warning(f"[!] Não foi possível salvar estatísticas: {e}")
+            logger.warning("[!] Não foi possível salvar estatísticas: %s", e)
+
+    def run_retention(self):
+        """Dispara a retenção numa thread, sem atrasar os ciclos de análise"""
+        if self._retention_thread is not None and self._retention_thread.is_alive():
+            logger.info("[RETENTION] Execução anterior ainda em andamento")
+            return
+        
+        def job():
+            report = self.retention.run()
+            logger.info("[RETENTION] Concluída em %.1fs", report['elapsed_seconds'])
+        
+        self._retention_thread = threading.Thread(target=job, name='retention', daemon=True)
+        self._retention_thread.start()
 
     def start_scheduled_analysis(self, interval_minutes=None):
         """Inicia análise agendada com coleta contínua de dados"""
@@ -664,10 +788,12 @@ class BetAnalysisPlatform:
             interval_minutes = 2
 
         schedule.every(interval_minutes).minutes.do(self.run_analysis_cycle)
+        if self.settings.RETENTION_INTERVAL_HOURS > 0:
+            schedule.every(self.settings.RETENTION_INTERVAL_HOURS).hours.do(self.run_retention)
 
-        logger.info(f"[*] Analise agendada iniciada - Intervalo: {interval_minutes} minutos")
-        logger.info(f"[*] Pipeline com 6 estratégias ativo")
-        logger.info(f"[*] Coleta contínua de dados iniciada...")
+        logger.info("[*] Analise agendada iniciada - Intervalo: %s minutos", interval_minutes)
+        logger.info("[*] Pipeline com 6 estratégias ativo")
+        logger.info("[*] Coleta contínua de dados iniciada...")
 
         # Executa imediatamente o primeiro ciclo
         self.run_analysis_cycle()
@@ -680,9 +806,17 @@ class BetAnalysisPlatform:
             logger.info("[*] Analise agendada interrompida pelo usuario")
             self._print_final_statistics()
         except Exception as e:
-            logger.error(f"[ERRO] Erro no agendador: {str(e)}")
+            logger.error("[ERRO] Erro no agendador: %s", e)
             time.sleep(60)
 
+    def shutdown(self):
+        """Encerra os componentes com threads próprias, gravando o que estiver pendente"""
+        if isinstance(self.data_collector, BlazeStreamCollector):
+            self.data_collector.stop()
+        persistence = getattr(self, 'persistence', None)   # ver integration.integrate_persistence
+        if persistence is not None:
+            persistence.close()
+
     def _print_final_statistics(self):
         """Exibe estatísticas finais da sessão"""
         elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
@@ -691,12 +825,12 @@ class BetAnalysisPlatform:
         logger.info("\n" + "="*80)
         logger.info("ESTATÍSTICAS FINAIS DA SESSÃO")
         logger.info("="*80)
-        logger.info(f"Tempo decorrido: {hours:.2f} horas")
-        logger.info(f"Sinais processados: {self.stats['signals_processed']}")
-        logger.info(f"Sinais válidos: {self.stats['signals_valid']} ({self.stats['signals_valid']/max(self.stats['signals_processed'], 1)*100:.1f}%)")
-        logger.info(f"Sinais enviados: {self.stats['signals_sent']}")
-        logger.info(f"Cores coletadas: {self.stats['colors_collected']}")
-        logger.info(f"Sinais/hora: {self.stats['signals_processed']/max(hours, 0.01):.1f}")
+        logger.info("Tempo decorrido: %.2f horas", hours)
+        logger.info("Sinais processados: %s", self.stats['signals_processed'])
+        logger.info("Sinais válidos: %s (%.1f%%)", self.stats['signals_valid'], self.stats['signals_valid']/max(self.stats['signals_processed'], 1)*100)
+        logger.info("Sinais enviados: %s", self.stats['signals_sent'])
+        logger.info("Cores coletadas: %s", self.stats['colors_collected'])
+        logger.info("Sinais/hora: %.1f", self.stats['signals_processed']/max(hours, 0.01))
         logger.info("="*80 + "\n")
 
 def main():
@@ -712,20 +846,22 @@ def main():
     args = parser.parse_args()
 
     platform = BetAnalysisPlatform()
-
-    if args.scheduled or args.collect_only:
-        logger.info("\n" + "="*80)
-        logger.info("MODO DE COLETA CONTÍNUA INICIADO")
-        logger.info("Pipeline com 6 Estratégias (incluindo Monte Carlo + Run Test)")
-        logger.info("="*80)
-        logger.info("Pressione CTRL+C para parar e exibir estatísticas\n")
-        platform.start_scheduled_analysis(args.interval)
-    else:
-        logger.info("\n" + "="*80)
-        logger.info("ANÁLISE SIMPLES (UMA VEZ)")
-        logger.info("Pipeline com 6 Estratégias")
-        logger.info("="*80 + "\n")
-        platform.run_analysis_cycle()
+    try:
+        if args.scheduled or args.collect_only:
+            logger.info("\n" + "="*80)
+            logger.info("MODO DE COLETA CONTÍNUA INICIADO")
+            logger.info("Pipeline com 6 Estratégias (incluindo Monte Carlo + Run Test)")
+            logger.info("="*80)
+            logger.info("Pressione CTRL+C para parar e exibir estatísticas\n")
+            platform.start_scheduled_analysis(args.interval)
+        else:
+            logger.info("\n" + "="*80)
+            logger.info("ANÁLISE SIMPLES (UMA VEZ)")
+            logger.info("Pipeline com 6 Estratégias")
+            logger.info("="*80 + "\n")
+            platform.run_analysis_cycle()
+    finally:
+        platform.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
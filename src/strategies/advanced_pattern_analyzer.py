@@ -12,11 +12,16 @@ Melhorias nas estratégias:
 Uso:
     analyzer = AdvancedPatternAnalyzer()
     result = analyzer.analyze(historical_data)
+
+    # Backtest: todas as janelas de 50 rodadas de uma série, em lote
+    batch = analyzer.analyze_series(colors, window=50)
+    signals = analyzer.to_signals(batch[-10:])
 """
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from typing import Deque, List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
@@ -70,12 +75,67 @@ class PatternSignal:
         }
 
 
+# Codificação de cores usada por todas as análises
+COLOR_RED = 1
+COLOR_BLACK = -1
+COLOR_WHITE = 0
+
+# Códigos de sinal / risco no resultado em lote
+SIGNAL_NAMES = {COLOR_RED: 'Vermelho', COLOR_BLACK: 'Preto'}
+RISK_NAMES = ('BAIXO', 'MEDIO', 'ALTO')
+
+# Resultado de analyze_batch: uma linha por janela
+BATCH_DTYPE = np.dtype([
+    ('volume_score', 'f8'),
+    ('trend_score', 'f8'),
+    ('sequence_score', 'f8'),
+    ('volatility_score', 'f8'),
+    ('confidence', 'f8'),
+    ('current_streak', 'i4'),
+    ('expected_reversal', '?'),
+    ('signal', 'i1'),             # COLOR_RED (Vermelho) / COLOR_BLACK (Preto)
+    ('trend_direction', 'i1'),    # sinal da soma das últimas 5 cores
+    ('risk', 'i1'),               # índice em RISK_NAMES
+    ('suggested_stake', 'f8'),
+    ('valid', '?'),               # confidence >= min_confidence
+])
+
+
+def encode_colors(colors) -> np.ndarray:
+    """
+    Codifica cores em int8 (red=1, black=-1, white/outras=0)
+    
+    Arrays já numéricos são devolvidos como view (sem cópia quando já int8).
+    Strings são comparadas sem diferenciar maiúsculas.
+    """
+    arr = np.asarray(colors)
+    if arr.dtype.kind in 'iub':
+        return arr.astype(np.int8, copy=False)
+    
+    lowered = np.char.lower(arr.astype(str))
+    codes = np.zeros(arr.shape, dtype=np.int8)
+    codes[lowered == 'red'] = COLOR_RED
+    codes[lowered == 'black'] = COLOR_BLACK
+    return codes
+
+
+def sliding_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Janelas deslizantes (n - window + 1, window) como view, sem cópia"""
+    return np.lib.stride_tricks.sliding_window_view(np.asarray(values), window)
+
+
 class AdvancedPatternAnalyzer:
-    """Analisador avançado de padrões com múltiplos indicadores"""
+    """
+    Analisador avançado de padrões com múltiplos indicadores
+    
+    Todas as análises rodam sobre arrays NumPy pré-codificados, para muitas
+    janelas de uma vez (analyze_batch / analyze_series). analyze() é o caso
+    de uma janela só e não altera o DataFrame recebido.
+    """
     
-    def __init__(self, min_confidence: float = 0.65):
+    def __init__(self, min_confidence: float = 0.65, history_size: int = 1000):
         self.min_confidence = min_confidence
-        self.history: List[PatternSignal] = []
+        self.history: Deque[PatternSignal] = deque(maxlen=history_size)
         
         # Configurações adaptativas
         self.config = {
@@ -99,6 +159,7 @@ class AdvancedPatternAnalyzer:
         
         Args:
             data: DataFrame com colunas ['color', 'roll', 'timestamp']
+                  (somente leitura: nenhuma coluna é criada ou alterada)
         
         Returns:
             PatternSignal ou None se não houver sinal válido
@@ -108,282 +169,207 @@ class AdvancedPatternAnalyzer:
             return None
         
         try:
-            # 1. Análise de Volume
-            volume_score, volume_details = self._analyze_volume(data)
-            
-            # 2. Análise de Tendência
-            trend_score, trend_details = self._analyze_trend(data)
-            
-            # 3. Análise de Sequência
-            sequence_score, sequence_details = self._analyze_sequence(data)
-            
-            # 4. Análise de Volatilidade
-            volatility_score, volatility_details = self._analyze_volatility(data)
+            colors = encode_colors(data['color'].to_numpy())[np.newaxis, :]
             
-            # 5. Calcular Confiança Final (Média Ponderada)
-            confidence = self._calculate_weighted_confidence(
-                volume_score, trend_score, sequence_score, volatility_score
-            )
+            intervals = None
+            if 'timestamp' in data.columns:
+                seconds = pd.to_datetime(data['timestamp']).to_numpy('datetime64[ns]')
+                intervals = (np.diff(seconds).astype(np.int64) / 1e9)[np.newaxis, :]
             
-            # 6. Determinar Tipo de Sinal
-            signal_type = self._determine_signal_type(data, trend_details, sequence_details)
+            row = self._score_windows(colors, intervals)[0]
+            signal = self._to_signal(row)
             
-            # 7. Avaliar Força do Sinal
-            strength = self._evaluate_strength(confidence)
-            
-            # 8. Calcular Nível de Risco
-            risk_level = self._calculate_risk_level(volatility_score, sequence_details)
-            
-            # 9. Sugestões de Gestão de Banca
-            suggested_stake = self._calculate_stake(confidence, risk_level)
-            stop_loss, take_profit = self._calculate_risk_reward(confidence)
-            
-            # Criar sinal
-            signal = PatternSignal(
-                signal_type=signal_type,
-                confidence=confidence,
-                strength=strength,
-                volume_score=volume_score,
-                trend_score=trend_score,
-                sequence_score=sequence_score,
-                volatility_score=volatility_score,
-                current_streak=sequence_details.get('current_streak', 0),
-                expected_reversal=sequence_details.get('expected_reversal', False),
-                risk_level=risk_level,
-                suggested_stake=suggested_stake,
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                timestamp=datetime.now()
-            )
-            
-            # Adicionar ao histórico
+            # Adicionar ao histórico (limitado)
             self.history.append(signal)
             
             # Log detalhado
-            logger.info(f"[SINAL AVANÇADO] {signal_type} - Confiança: {confidence:.1%}")
-            logger.info(f"  Volume: {volume_score:.2f} | Tendência: {trend_score:.2f} | "
-                       f"Sequência: {sequence_score:.2f} | Volatilidade: {volatility_score:.2f}")
-            logger.info(f"  Força: {strength} | Risco: {risk_level} | Stake: {suggested_stake:.1%}")
+            logger.info("[SINAL AVANÇADO] %s - Confiança: %.1f%%", signal.signal_type, signal.confidence * 100)
+            logger.info("  Volume: %.2f | Tendência: %.2f | Sequência: %.2f | Volatilidade: %.2f",
+                        signal.volume_score, signal.trend_score, signal.sequence_score, signal.volatility_score)
+            logger.info("  Força: %s | Risco: %s | Stake: %.1f%%", signal.strength, signal.risk_level, signal.suggested_stake * 100)
             
             # Retornar apenas se confiança > mínimo
-            if confidence >= self.min_confidence:
+            if row['valid']:
                 return signal
             else:
-                logger.warning(f"Sinal descartado - Confiança {confidence:.1%} < {self.min_confidence:.1%}")
+                logger.warning("Sinal descartado - Confiança %.1f%% < %.1f%%", signal.confidence * 100, self.min_confidence * 100)
                 return None
                 
         except Exception as e:
-            logger.error(f"Erro na análise avançada: {str(e)}")
+            logger.error("Erro na análise avançada: %s", e)
             return None
     
-    def _analyze_volume(self, data: pd.DataFrame) -> Tuple[float, dict]:
-        """
-        Analisa volume de apostas
-        
-        Volume alto = Mais confiabilidade
+    def analyze_batch(self, colors, intervals: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        details = {}
-        
-        # Simular volume baseado em frequência de jogos
-        if 'timestamp' in data.columns:
-            data['timestamp'] = pd.to_datetime(data['timestamp'])
-            time_diffs = data['timestamp'].diff().dt.total_seconds()
-            avg_interval = time_diffs.mean()
-            recent_interval = time_diffs.tail(5).mean()
-            
-            # Intervalo menor = Volume maior
-            volume_ratio = avg_interval / (recent_interval + 1)
-            details['volume_ratio'] = volume_ratio
-            details['avg_interval_sec'] = avg_interval
-            details['recent_interval_sec'] = recent_interval
-        else:
-            volume_ratio = 1.0
-            details['volume_ratio'] = 1.0
+        Analisa muitas janelas de uma vez
         
-        # Score: 0.0 - 1.0
-        # Volume alto (ratio > threshold) = Score alto
-        threshold = self.config['high_volume_threshold']
-        if volume_ratio >= threshold:
-            score = min(1.0, 0.7 + (volume_ratio - threshold) * 0.15)
-            details['status'] = 'VOLUME_ALTO'
-        elif volume_ratio >= 1.0:
-            score = 0.5 + (volume_ratio - 1.0) * 0.4
-            details['status'] = 'VOLUME_NORMAL'
-        else:
-            score = 0.3 + volume_ratio * 0.2
-            details['status'] = 'VOLUME_BAIXO'
-        
-        return score, details
-    
-    def _analyze_trend(self, data: pd.DataFrame) -> Tuple[float, dict]:
-        """
-        Analisa tendências multi-timeframe
+        Args:
+            colors: Matriz (janelas x cores) de strings ou códigos (encode_colors)
+            intervals: Matriz (janelas x cores-1) de segundos entre rodadas
+                       (None = volume neutro)
         
-        Confirma tendência em múltiplos períodos
+        Returns:
+            Array estruturado BATCH_DTYPE com uma linha por janela
         """
-        details = {}
-        scores = []
-        
-        # Converter cores para valores numéricos
-        color_map = {'red': 1, 'black': -1, 'white': 0}
-        data['color_value'] = data['color'].map(
-            lambda x: color_map.get(x.lower(), 0)
-        )
-        
-        periods = self.config['trend_confirmation_periods']
-        
-        for period in periods:
-            if len(data) >= period:
-                recent = data.tail(period)
-                trend_sum = recent['color_value'].sum()
-                
-                # Normalizar por período
-                trend_normalized = trend_sum / period
-                
-                # Score baseado na força da tendência
-                trend_score = abs(trend_normalized)
-                scores.append(trend_score)
-                
-                details[f'trend_{period}'] = {
-                    'sum': trend_sum,
-                    'normalized': round(trend_normalized, 3),
-                    'score': round(trend_score, 3)
-                }
-        
-        # Média dos scores
-        final_score = np.mean(scores) if scores else 0.5
-        
-        # Determinar direção dominante
-        if scores:
-            last_trend = data.tail(periods[0])['color_value'].sum()
-            details['direction'] = 'RED' if last_trend > 0 else 'BLACK' if last_trend < 0 else 'NEUTRO'
-        else:
-            details['direction'] = 'NEUTRO'
-        
-        return final_score, details
+        codes = encode_colors(colors)
+        if codes.ndim != 2 or codes.shape[1] < 10:
+            raise ValueError("colors deve ser uma matriz (janelas x cores) com >= 10 cores")
+        if intervals is not None:
+            intervals = np.asarray(intervals, dtype=float)
+        return self._score_windows(codes, intervals)
     
-    def _analyze_sequence(self, data: pd.DataFrame) -> Tuple[float, dict]:
+    def analyze_series(self, colors, window: int = 50,
+                       timestamps: Optional[np.ndarray] = None,
+                       chunk_size: int = 10000) -> np.ndarray:
         """
-        Analisa padrões de sequência
+        Analisa todas as janelas deslizantes de uma série (backtests)
         
-        Detecta streaks e probabilidade de reversão
-        """
-        details = {}
+        Linha i corresponde à janela colors[i:i + window]. As janelas são
+        views da série e são processadas em blocos de `chunk_size` para
+        limitar a memória intermediária.
         
-        # Calcular streak atual
-        current_color = data.iloc[-1]['color']
-        current_streak = 1
-        
-        for i in range(len(data) - 2, -1, -1):
-            if data.iloc[i]['color'] == current_color:
-                current_streak += 1
+        Args:
+            colors: Série 1-D de cores (strings ou códigos)
+            window: Tamanho da janela
+            timestamps: Série 1-D de datetimes/segundos (opcional)
+            chunk_size: Janelas por bloco
+        """
+        codes = encode_colors(colors)
+        windows = sliding_windows(codes, window)
+        
+        interval_windows = None
+        if timestamps is not None:
+            ts = np.asarray(timestamps)
+            if ts.dtype.kind == 'M':
+                deltas = np.diff(ts.astype('datetime64[ns]')).astype(np.int64) / 1e9
             else:
-                break
-        
-        details['current_color'] = current_color
-        details['current_streak'] = current_streak
-        
-        # Streak longo sugere reversão iminente
-        reversal_threshold = self.config['reversal_streak_min']
-        expected_reversal = current_streak >= reversal_threshold
-        details['expected_reversal'] = expected_reversal
-        
-        # Score baseado em probabilidade de reversão
-        # Streaks longos têm maior probabilidade de reverter
-        if current_streak >= 5:
-            sequence_score = 0.85  # Muito provável reverter
-        elif current_streak >= reversal_threshold:
-            sequence_score = 0.70  # Provável reverter
-        elif current_streak == 2:
-            sequence_score = 0.55  # Pode continuar ou reverter
+                deltas = np.diff(ts.astype(float))
+            interval_windows = sliding_windows(deltas, window - 1)
+        
+        result = np.empty(len(windows), dtype=BATCH_DTYPE)
+        for start in range(0, len(windows), chunk_size):
+            stop = start + chunk_size
+            block_intervals = None if interval_windows is None else interval_windows[start:stop]
+            result[start:stop] = self.analyze_batch(windows[start:stop], block_intervals)
+        return result
+    
+    def _score_windows(self, codes: np.ndarray,
+                       intervals: Optional[np.ndarray]) -> np.ndarray:
+        """Calcula os quatro scores e a decisão para cada linha de `codes`"""
+        n, length = codes.shape
+        cfg = self.config
+        out = np.empty(n, dtype=BATCH_DTYPE)
+        
+        # 1. Volume: intervalo médio vs intervalo recente (menor = volume maior)
+        if intervals is not None and intervals.shape[1] > 0:
+            avg_interval = np.nanmean(intervals, axis=1)
+            recent_interval = np.nanmean(intervals[:, -5:], axis=1)
+            volume_ratio = avg_interval / (recent_interval + 1)
         else:
-            sequence_score = 0.50  # Neutro
-        
-        details['sequence_score_explanation'] = (
-            f"Streak de {current_streak} {current_color} - "
-            f"{'Alta' if expected_reversal else 'Baixa'} probabilidade de reversão"
+            volume_ratio = np.ones(n)
+        threshold = cfg['high_volume_threshold']
+        out['volume_score'] = np.select(
+            [volume_ratio >= threshold, volume_ratio >= 1.0],
+            [np.minimum(1.0, 0.7 + (volume_ratio - threshold) * 0.15),
+             0.5 + (volume_ratio - 1.0) * 0.4],
+            0.3 + volume_ratio * 0.2
         )
         
-        return sequence_score, details
-    
-    def _analyze_volatility(self, data: pd.DataFrame) -> Tuple[float, dict]:
-        """
-        Analisa volatilidade dos resultados
-        
-        Baixa volatilidade = Padrão mais previsível
-        """
-        details = {}
-        
-        # Calcular frequência de mudanças de cor
-        data['color_changed'] = (data['color'] != data['color'].shift(1)).astype(int)
-        change_rate = data['color_changed'].tail(20).mean()
-        
-        details['change_rate'] = change_rate
-        details['stability'] = 1 - change_rate
-        
-        # Score: Baixa volatilidade = Alto score
-        # Ideal: 30-50% de mudanças (padrão estável mas não rígido)
-        if 0.3 <= change_rate <= 0.5:
-            volatility_score = 0.85  # Ideal
-        elif 0.2 <= change_rate < 0.3 or 0.5 < change_rate <= 0.6:
-            volatility_score = 0.70  # Bom
-        elif change_rate < 0.2 or change_rate > 0.6:
-            volatility_score = 0.50  # Muito volátil ou muito estável
+        # 2. Tendência multi-timeframe: |soma das últimas p cores| / p
+        periods = [p for p in cfg['trend_confirmation_periods'] if length >= p]
+        if periods:
+            trend_scores = [np.abs(codes[:, -p:].sum(axis=1, dtype=np.int32)) / p for p in periods]
+            out['trend_score'] = np.mean(trend_scores, axis=0)
+            direction = np.sign(codes[:, -cfg['trend_confirmation_periods'][0]:].sum(axis=1, dtype=np.int32))
         else:
-            volatility_score = 0.40  # Errático
-        
-        max_vol = self.config['max_volatility']
-        if change_rate > (1 - max_vol) or change_rate < max_vol:
-            details['status'] = 'ALTA_VOLATILIDADE'
+            out['trend_score'] = 0.5
+            direction = np.zeros(n, dtype=np.int32)
+        out['trend_direction'] = direction
+        
+        # 3. Sequência: streak final (repetições da última cor)
+        last = codes[:, -1]
+        same_as_last = codes == last[:, np.newaxis]
+        streak = np.where(same_as_last.all(axis=1), length,
+                          np.argmin(same_as_last[:, ::-1], axis=1))
+        reversal_min = cfg['reversal_streak_min']
+        expected_reversal = streak >= reversal_min
+        out['current_streak'] = streak
+        out['expected_reversal'] = expected_reversal
+        out['sequence_score'] = np.select(
+            [streak >= 5, expected_reversal, streak == 2], [0.85, 0.70, 0.55], 0.50)
+        
+        # 4. Volatilidade: taxa de troca de cor nas últimas 20 posições
+        #    (a primeira posição da série conta como troca)
+        changed = codes[:, 1:] != codes[:, :-1]
+        if length > 20:
+            change_rate = changed[:, -20:].mean(axis=1)
         else:
-            details['status'] = 'VOLATILIDADE_NORMAL'
-        
-        return volatility_score, details
+            change_rate = (changed.sum(axis=1) + 1) / length
+        out['volatility_score'] = np.select(
+            [(change_rate >= 0.3) & (change_rate <= 0.5),
+             ((change_rate >= 0.2) & (change_rate < 0.3)) | ((change_rate > 0.5) & (change_rate <= 0.6)),
+             (change_rate < 0.2) | (change_rate > 0.6)],
+            [0.85, 0.70, 0.50], 0.40)
+        
+        # 5. Confiança ponderada
+        out['confidence'] = np.clip(
+            out['volume_score'] * cfg['volume_weight'] +
+            out['trend_score'] * cfg['trend_weight'] +
+            out['sequence_score'] * cfg['sequence_weight'] +
+            out['volatility_score'] * cfg['volatility_weight'],
+            0.0, 1.0)
+        
+        # 6. Tipo de sinal
+        #    reversão esperada → cor oposta (branco: contra a tendência)
+        #    senão → segue a tendência; neutro → cor mais frequente nas últimas 20
+        recent = codes[:, -20:]
+        majority = np.where((recent == COLOR_RED).sum(axis=1) > (recent == COLOR_BLACK).sum(axis=1),
+                            COLOR_RED, COLOR_BLACK)
+        reversal_signal = np.where(last == COLOR_RED, COLOR_BLACK,
+                                   np.where(last == COLOR_BLACK, COLOR_RED,
+                                            np.where(direction < 0, COLOR_RED, COLOR_BLACK)))
+        trend_signal = np.where(direction > 0, COLOR_RED,
+                                np.where(direction < 0, COLOR_BLACK, majority))
+        out['signal'] = np.where(expected_reversal, reversal_signal, trend_signal)
+        
+        # 7. Risco e stake
+        volatility_score = out['volatility_score']
+        risk = np.select(
+            [(volatility_score < 0.5) | (streak > 6), (volatility_score < 0.7) | (streak >= 4)],
+            [2, 1], 0)
+        out['risk'] = risk
+        risk_multiplier = np.array([1.5, 1.0, 0.5])[risk]
+        out['suggested_stake'] = np.clip(
+            0.02 * (1 + (out['confidence'] - 0.65) * 2) * risk_multiplier, 0.01, 0.05)
+        
+        out['valid'] = out['confidence'] >= self.min_confidence
+        return out
     
-    def _calculate_weighted_confidence(self, volume: float, trend: float, 
-                                      sequence: float, volatility: float) -> float:
-        """Calcula confiança final com pesos"""
-        weights = self.config
-        
-        confidence = (
-            volume * weights['volume_weight'] +
-            trend * weights['trend_weight'] +
-            sequence * weights['sequence_weight'] +
-            volatility * weights['volatility_weight']
+    def _to_signal(self, row) -> PatternSignal:
+        """Linha de BATCH_DTYPE → PatternSignal"""
+        confidence = float(row['confidence'])
+        stop_loss, take_profit = self._calculate_risk_reward(confidence)
+        return PatternSignal(
+            signal_type=SIGNAL_NAMES[int(row['signal'])],
+            confidence=confidence,
+            strength=self._evaluate_strength(confidence),
+            volume_score=float(row['volume_score']),
+            trend_score=float(row['trend_score']),
+            sequence_score=float(row['sequence_score']),
+            volatility_score=float(row['volatility_score']),
+            current_streak=int(row['current_streak']),
+            expected_reversal=bool(row['expected_reversal']),
+            risk_level=RISK_NAMES[int(row['risk'])],
+            suggested_stake=float(row['suggested_stake']),
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            timestamp=datetime.now()
         )
-        
-        # Normalizar para 0.0 - 1.0
-        return min(1.0, max(0.0, confidence))
     
-    def _determine_signal_type(self, data: pd.DataFrame, 
-                               trend_details: dict, 
-                               sequence_details: dict) -> str:
-        """Determina o tipo de sinal a sugerir"""
-        current_color = sequence_details['current_color']
-        expected_reversal = sequence_details['expected_reversal']
-        trend_direction = trend_details.get('direction', 'NEUTRO')
-        
-        # Se espera reversão, sugerir cor oposta
-        if expected_reversal:
-            if current_color.lower() == 'red':
-                return 'Preto'
-            elif current_color.lower() == 'black':
-                return 'Vermelho'
-            else:
-                return 'Vermelho' if trend_direction == 'BLACK' else 'Preto'
-        
-        # Caso contrário, seguir a tendência
-        if trend_direction == 'RED':
-            return 'Vermelho'
-        elif trend_direction == 'BLACK':
-            return 'Preto'
-        else:
-            # Neutro: escolher baseado no padrão histórico
-            color_counts = data['color'].tail(20).value_counts()
-            if 'red' in color_counts and color_counts.get('red', 0) > color_counts.get('black', 0):
-                return 'Vermelho'
-            else:
-                return 'Preto'
+    def to_signals(self, batch: np.ndarray, only_valid: bool = True) -> List[PatternSignal]:
+        """Materializa PatternSignal para as linhas de um resultado em lote"""
+        rows = batch[batch['valid']] if only_valid else batch
+        return [self._to_signal(row) for row in rows]
     
     def _evaluate_strength(self, confidence: float) -> str:
         """Avalia força do sinal"""
@@ -396,43 +382,6 @@ class AdvancedPatternAnalyzer:
         else:
             return 'FRACO'
     
-    def _calculate_risk_level(self, volatility_score: float, 
-                              sequence_details: dict) -> str:
-        """Calcula nível de risco"""
-        current_streak = sequence_details.get('current_streak', 0)
-        
-        # Volatilidade alta ou streak muito longo = Risco alto
-        if volatility_score < 0.5 or current_streak > 6:
-            return 'ALTO'
-        elif volatility_score < 0.7 or current_streak >= 4:
-            return 'MEDIO'
-        else:
-            return 'BAIXO'
-    
-    def _calculate_stake(self, confidence: float, risk_level: str) -> float:
-        """
-        Calcula stake sugerido (% da banca)
-        
-        Kelly Criterion simplificado
-        """
-        base_stake = 0.02  # 2% base
-        
-        # Ajustar por confiança
-        confidence_multiplier = 1 + (confidence - 0.65) * 2
-        
-        # Ajustar por risco
-        risk_multipliers = {
-            'BAIXO': 1.5,
-            'MEDIO': 1.0,
-            'ALTO': 0.5
-        }
-        risk_multiplier = risk_multipliers.get(risk_level, 1.0)
-        
-        stake = base_stake * confidence_multiplier * risk_multiplier
-        
-        # Limitar entre 1% e 5%
-        return min(0.05, max(0.01, stake))
-    
     def _calculate_risk_reward(self, confidence: float) -> Tuple[Optional[float], Optional[float]]:
         """Calcula stop-loss e take-profit"""
         # Para apostas binárias, adaptar conceito
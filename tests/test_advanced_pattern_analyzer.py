@@ -0,0 +1,89 @@
+"""
+Testes do AdvancedPatternAnalyzer vetorizado
+"""
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategies.advanced_pattern_analyzer import (
+    AdvancedPatternAnalyzer, encode_colors, RISK_NAMES, SIGNAL_NAMES
+)
+
+
+def _frame(n=40, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'color': rng.choice(['red', 'black', 'white'], n, p=[0.47, 0.47, 0.06]),
+        'roll': rng.integers(0, 15, n),
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(
+            np.cumsum(rng.integers(20, 40, n)), unit='s'),
+    })
+
+
+class TestSingleWindow:
+    def test_does_not_mutate_input(self):
+        data = _frame()
+        snapshot = data.copy()
+        AdvancedPatternAnalyzer(min_confidence=0.0).analyze(data)
+        assert list(data.columns) == ['color', 'roll', 'timestamp']
+        pd.testing.assert_frame_equal(data, snapshot)
+
+    def test_streak_and_reversal(self):
+        data = pd.DataFrame({'color': ['black', 'red'] * 5 + ['red'] * 4})
+        signal = AdvancedPatternAnalyzer(min_confidence=0.0).analyze(data)
+        assert signal.current_streak == 5
+        assert signal.expected_reversal
+        assert signal.signal_type == 'Preto'
+        assert signal.sequence_score == 0.85
+
+    def test_history_is_bounded(self):
+        analyzer = AdvancedPatternAnalyzer(min_confidence=0.0, history_size=3)
+        data = _frame()
+        for _ in range(5):
+            analyzer.analyze(data)
+        assert len(analyzer.history) == 3
+        assert analyzer.get_performance_stats()['total_signals'] == 3
+
+
+class TestBatch:
+    def test_encode_colors(self):
+        assert encode_colors(['Red', 'BLACK', 'white', '?']).tolist() == [1, -1, 0, 0]
+        codes = np.array([1, -1, 0], dtype=np.int8)
+        assert encode_colors(codes) is codes
+
+    def test_series_matches_single_analyze(self):
+        data = _frame(n=80)
+        analyzer = AdvancedPatternAnalyzer(min_confidence=0.0)
+        window = 30
+
+        batch = analyzer.analyze_series(data['color'].to_numpy(), window=window,
+                                        timestamps=data['timestamp'].to_numpy(),
+                                        chunk_size=7)
+        assert len(batch) == len(data) - window + 1
+
+        for i in (0, 13, len(batch) - 1):
+            signal = analyzer.analyze(data.iloc[i:i + window])
+            row = batch[i]
+            assert row['confidence'] == pytest.approx(signal.confidence)
+            assert row['volume_score'] == pytest.approx(signal.volume_score)
+            assert row['current_streak'] == signal.current_streak
+            assert SIGNAL_NAMES[row['signal']] == signal.signal_type
+            assert RISK_NAMES[row['risk']] == signal.risk_level
+            assert row['suggested_stake'] == pytest.approx(signal.suggested_stake)
+
+    def test_valid_mask_and_signals(self):
+        analyzer = AdvancedPatternAnalyzer(min_confidence=0.6)
+        batch = analyzer.analyze_series(_frame(n=200)['color'].to_numpy(), window=20)
+        np.testing.assert_array_equal(batch['valid'], batch['confidence'] >= 0.6)
+        signals = analyzer.to_signals(batch)
+        assert len(signals) == int(batch['valid'].sum())
+        assert not analyzer.history
+
+    def test_rejects_short_windows(self):
+        with pytest.raises(ValueError):
+            AdvancedPatternAnalyzer().analyze_batch(np.ones((3, 5), dtype=np.int8))
@@ -0,0 +1,145 @@
+"""
+Testes do analytics (relatórios e exportação)
+"""
+import csv
+import gzip
+import json
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.analytics import HAS_DUCKDB, AnalyticsEngine, main
+from database import GameResultRepository, RetentionManager, RetentionPolicy, init_db
+from database.models import SignalModel
+
+NOW = datetime(2024, 3, 1, 12, 30)
+
+# (hora, confiança, status, estratégias aprovadas)
+SIGNALS = [
+    (10, 0.62, 'win', 'Strategy1+Strategy2'),
+    (10, 0.64, 'loss', 'Strategy1+Strategy2'),
+    (10, 0.70, 'win', 'Strategy1+Strategy2+Strategy3'),
+    (14, 0.71, 'win', 'Strategy1+Strategy2+Strategy3'),
+    (14, 0.73, 'pending', 'Strategy1+Strategy2+Strategy3'),
+    (14, 0.81, 'loss', None),
+]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    db_path = str(tmp_path / 'analysis.db')
+    session_factory = init_db(db_path, database_url='')
+    session = session_factory()
+    for i, (hour, confidence, status, strategies) in enumerate(SIGNALS):
+        metadata = {'strategies': strategies} if strategies else {}
+        session.add(SignalModel(id=f"s{i}", timestamp=NOW.replace(hour=hour, minute=i),
+                                game='Double', signal_type='Vermelho', confidence=confidence,
+                                status=status, strategies_passed=3, metadata_json=metadata))
+    session.commit()
+    session.close()
+
+    # Rodadas antigas vão para o arquivo frio; as recentes ficam no banco
+    repo = GameResultRepository(session_factory)
+    repo.save_many([{'id': f"old{i}", 'game': 'Crash', 'timestamp': NOW - timedelta(days=40, minutes=i),
+                     'result': 'Caia', 'price': 1.5 + i} for i in range(3)])
+    repo.save_many([{'id': f"new{i}", 'game': 'Crash', 'timestamp': NOW - timedelta(minutes=i),
+                     'result': 'Suba', 'price': 3.0} for i in range(2)])
+    archive_dir = str(tmp_path / 'archive')
+    RetentionManager(session_factory, RetentionPolicy(archive_dir=archive_dir, log_files=()),
+                     clock=lambda: NOW).expire_table('game_results')
+
+    trades_path = str(tmp_path / 'backtest_results.csv')
+    with open(trades_path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['trade_id', 'signal_time', 'signal_type', 'confidence', 'result', 'profit_loss'])
+        writer.writerow(['t1', '2024-03-01T10:00:00', 'Vermelho', 0.66, 'WIN', 9.5])
+        writer.writerow(['t2', '2024-03-01T11:00:00', 'Vermelho', 0.68, 'LOSS', -10.0])
+        writer.writerow(['t3', '2024-03-02T11:00:00', 'Preto', 0.91, 'WIN', 9.5])
+    return {'db_path': db_path, 'archive_dir': archive_dir, 'trades_path': trades_path}
+
+
+def run(engine, name, **options):
+    columns, rows = engine.report(name, **options)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+ENGINES = ['sqlite'] + (['duckdb'] if HAS_DUCKDB else [])
+
+
+@pytest.mark.parametrize('engine_name', ENGINES)
+class TestReports:
+    def test_confidence_bands(self, sources, engine_name):
+        with AnalyticsEngine(engine=engine_name, batch_size=2, **sources) as engine:
+            rows = run(engine, 'confidence', band=0.05)
+
+        assert [row['band_start'] for row in rows] == [0.6, 0.7, 0.8]
+        assert (rows[0]['signals'], rows[0]['wins'], rows[0]['win_rate']) == (2, 1, 0.5)
+        # Pendente conta no total, mas não na taxa
+        assert (rows[1]['signals'], rows[1]['win_rate']) == (3, 1.0)
+
+    def test_hourly_and_since(self, sources, engine_name):
+        with AnalyticsEngine(engine=engine_name, **sources) as engine:
+            rows = run(engine, 'hourly')
+            later = run(engine, 'hourly', since=NOW.replace(hour=12))
+
+        assert [(row['hour'], row['signals']) for row in rows] == [(10, 3), (14, 3)]
+        assert [row['hour'] for row in later] == [14]
+
+    def test_strategy_combinations(self, sources, engine_name):
+        with AnalyticsEngine(engine=engine_name, **sources) as engine:
+            rows = {row['strategies']: row for row in run(engine, 'strategies')}
+
+        assert rows['Strategy1+Strategy2+Strategy3']['win_rate'] == 1.0
+        assert rows['Strategy1+Strategy2']['losses'] == 1
+        assert rows['(sem registro)']['signals'] == 1
+
+    def test_results_include_archived_rounds(self, sources, engine_name):
+        with AnalyticsEngine(engine=engine_name, **sources) as engine:
+            rows = run(engine, 'results', game='Crash')
+
+        assert sum(row['rounds'] for row in rows) == 5
+        assert sum(row['rounds'] * row['below_2x'] for row in rows) == 1   # só 1.5 < 2
+
+    def test_trades_from_backtest_csv(self, sources, engine_name):
+        with AnalyticsEngine(engine=engine_name, **sources) as engine:
+            rows = run(engine, 'trades', band=0.1)
+
+        assert [(row['band_start'], row['trades'], row['win_rate']) for row in rows] == [
+            (0.6, 2, 0.5), (0.9, 1, 1.0)]
+        assert rows[0]['profit_loss'] == -0.5
+
+
+class TestAnalyticsEngine:
+    def test_unknown_report_and_missing_trades(self, sources):
+        with AnalyticsEngine(engine='sqlite', db_path=sources['db_path']) as engine:
+            with pytest.raises(ValueError):
+                engine.report('inexistente')
+            with pytest.raises(FileNotFoundError):
+                engine.report('trades')
+
+    def test_missing_database_uses_archives_only(self, sources, tmp_path):
+        with AnalyticsEngine(str(tmp_path / 'nada.db'), sources['archive_dir'], engine='sqlite') as engine:
+            assert sum(row['rounds'] for row in run(engine, 'results')) == 3
+            with pytest.raises(FileNotFoundError):
+                engine.report('confidence')
+
+    def test_export_streams_database_and_archives(self, sources, tmp_path):
+        output = str(tmp_path / 'exports' / 'game_results.csv.gz')
+        with AnalyticsEngine(engine='sqlite', batch_size=2, **sources) as engine:
+            assert engine.export('game_results', output) == 5
+
+        with gzip.open(output, 'rt') as handle:
+            rows = list(csv.DictReader(handle))
+        assert sorted(row['id'] for row in rows) == ['new0', 'new1', 'old0', 'old1', 'old2']
+
+    def test_cli_report_jsonl(self, sources, capsys):
+        main(['--db', sources['db_path'], '--archive-dir', sources['archive_dir'], '--engine', 'sqlite',
+              'report', 'hourly', '--format', 'jsonl'])
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line['hour'] for line in lines] == [10, 14]
@@ -0,0 +1,83 @@
+"""
+Testes do simulador Monte Carlo de banca (Kelly + Drawdown)
+"""
+import pytest
+import sys
+import os
+import numpy as np
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from analysis.bankroll_simulator import (
+    BankrollSimulator, SignalModel, RiskConfig, SequencerSizer
+)
+from strategies.kelly_criterion import KellyCriterion
+from scripts.drawdown_manager import DrawdownManager
+from learning.optimal_sequencer import OptimalSequencer
+
+
+def _replay_with_live_components(model, n_cycles, seed, max_drawdown_percent):
+    """Mesmo sorteio do simulador (1 trajetória) usando as classes ao vivo"""
+    rng = np.random.default_rng(seed)
+    kelly = KellyCriterion(initial_bankroll=1000.0, kelly_fraction=0.25)
+    drawdown = DrawdownManager(initial_bankroll=1000.0, max_drawdown_percent=max_drawdown_percent)
+    first_pause = -1
+    for cycle in range(n_cycles):
+        has_signal = rng.random(1)[0] < model.signal_rate
+        if drawdown.is_paused or not has_signal:
+            continue
+        # main._calculate_recent_win_rate
+        recent = kelly.history[-50:]
+        win_rate = sum(h['result'] == 'WIN' for h in recent) / len(recent) if recent else 0.5
+        bet = kelly.calculate_bet_size(max(0.3, min(0.7, win_rate)), odds=1.9, min_bet=1.0)
+        won = rng.random(1)[0] < model.win_probability
+        kelly.record_bet(bet, won, payout_odds=2.0)
+        if drawdown.update_bankroll(kelly.current_bankroll)['action'] == 'PAUSED':
+            first_pause = cycle
+    return kelly.current_bankroll, first_pause
+
+
+class TestBankrollSimulator:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_single_path_matches_live_components(self, seed, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)   # Kelly/Drawdown persistem estado em logs/
+        model = SignalModel(win_probability=0.50, signal_rate=0.7)
+        result = BankrollSimulator(model, RiskConfig(max_drawdown_percent=3.0)).run(
+            n_paths=1, n_cycles=150, seed=seed)
+
+        bankroll, first_pause = _replay_with_live_components(model, 150, seed, 3.0)
+        assert result.terminal_bankroll[0] == pytest.approx(bankroll)
+        assert result.first_pause_cycle[0] == first_pause
+
+    def test_summary_statistics(self):
+        result = BankrollSimulator(SignalModel(win_probability=0.45),
+                                   RiskConfig(max_drawdown_percent=5.0)).run(
+            n_paths=5000, n_cycles=300, seed=7, keep_paths=3)
+        summary = result.summary()
+
+        assert summary['paths'] == 5000
+        assert 0.9 < summary['pause_probability'] <= 1.0
+        assert summary['time_to_pause']['p5'] <= summary['time_to_pause']['p95']
+        assert summary['max_drawdown_pct']['p50'] >= 5.0
+        assert summary['win_rate'] == pytest.approx(0.45, abs=0.02)
+        assert result.sample_paths.shape == (3, 301)
+        assert result.sample_paths[0, -1] == result.terminal_bankroll[0]
+
+    def test_resume_and_ruin(self):
+        config = RiskConfig(initial_bankroll=50.0, min_bet=5.0, max_drawdown_percent=10.0, resume_after=5)
+        result = BankrollSimulator(SignalModel(win_probability=0.30), config).run(
+            n_paths=2000, n_cycles=500, seed=3)
+
+        assert result.pause_count.max() > 1
+        assert result.ruined.mean() > 0.5
+        assert (result.terminal_bankroll[result.ruined] < 5.0).all()
+
+    def test_sequencer_sizer(self):
+        model = SignalModel(win_probability=0.55, confidence=0.80, cycles_per_hour=10)
+        config = RiskConfig(max_drawdown_percent=50.0)
+        sizer = SequencerSizer(OptimalSequencer(), config, model)
+        result = BankrollSimulator(model, config, sizer).run(n_paths=1000, n_cycles=100, seed=5)
+        assert result.bets.min() > 0
+        assert np.isfinite(result.terminal_bankroll).all()
@@ -0,0 +1,180 @@
+"""
+Testes da ingestão via WebSocket (BlazeStreamClient / BlazeStreamCollector)
+
+Usa o ReplayServer local com a gravação em tests/fixtures.
+"""
+import pytest
+import sys
+import os
+import asyncio
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip('websockets')
+
+from data_collection.blaze_stream import (
+    BlazeStreamClient, BlazeStreamCollector, parse_stream_message
+)
+from data_collection.replay_server import ReplayServer
+
+RECORDING = os.path.join(os.path.dirname(__file__), 'fixtures', 'blaze_ws_recording.jsonl')
+
+
+async def _collect(client, count, timeout=5.0):
+    rolls = []
+
+    async def consume():
+        async for roll in client.rolls():
+            rolls.append(roll)
+            if len(rolls) == count:
+                return
+
+    await asyncio.wait_for(consume(), timeout)
+    return rolls
+
+
+class TestParseMessage:
+    def test_socketio_double_tick(self):
+        frame = '42["data",{"id":"double.tick","payload":{"id":"x1","status":"complete","color":2,"roll":9}}]'
+        [record] = parse_stream_message(frame)
+        assert record['type'] == 'double'
+        assert record['color'] == 'BLACK'
+        assert record['result'] == 'black'
+        assert record['roll'] == 9
+        assert record['game_id'] == 'x1'
+
+    def test_crash_only_when_complete(self):
+        graphing = '42["data",{"id":"crash.tick","payload":{"id":"c1","status":"graphing","crash_point":null}}]'
+        complete = '42["data",{"id":"crash.tick","payload":{"id":"c1","status":"complete","crash_point":"2.35"}}]'
+        assert parse_stream_message(graphing) == []
+        assert parse_stream_message(complete)[0]['crash_point'] == 2.35
+
+    @pytest.mark.parametrize("frame", ['2', '40', '0{"sid":"a"}', 'not json', '42["data"]'])
+    def test_control_and_invalid_frames(self, frame):
+        assert parse_stream_message(frame) == []
+
+    def test_plain_json(self):
+        [record] = parse_stream_message('{"type": "crash", "crash_point": 1.5, "id": 7}')
+        assert record['crash_point'] == 1.5
+        assert record['game_id'] == '7'
+
+
+class TestStreamClient:
+    def test_replay_dedup_and_heartbeat(self):
+        async def scenario():
+            async with ReplayServer.from_file(RECORDING) as server:
+                client = BlazeStreamClient(server.url, heartbeat_interval=0.05)
+                task = asyncio.create_task(client.run())
+                rolls = await _collect(client, 15)
+                await asyncio.sleep(0.15)
+                await client.stop()
+                await task
+                return client, server, rolls
+
+        client, server, rolls = asyncio.run(scenario())
+
+        doubles = [r for r in rolls if r['type'] == 'double']
+        crashes = [r for r in rolls if r['type'] == 'crash']
+        assert [r['game_id'] for r in doubles] == [f"dbl{i:03d}" for i in range(10)]
+        assert [r['crash_point'] for r in crashes] == [1.0, 2.35, 1.47, 12.8, 1.12]
+        # rolling + complete do mesmo jogo viram uma única rodada
+        assert client.stats['duplicates'] == 10
+        # Assinaturas enviadas, pong respondido e pings do heartbeat
+        assert any('double_room_1' in m for m in server.received)
+        assert '3' in server.received
+        assert '2' in server.received
+
+    def test_reconnects_after_drop(self):
+        async def scenario():
+            server = ReplayServer.from_file(RECORDING, drop_after=10)
+            async with server:
+                client = BlazeStreamClient(server.url, backoff_initial=0.01)
+                task = asyncio.create_task(client.run())
+                rolls = await _collect(client, 15)
+                await client.stop()
+                await task
+                return client, server, rolls
+
+        client, server, rolls = asyncio.run(scenario())
+        assert server.connections == 2
+        assert client.stats['reconnects'] == 1
+        # Rodadas já vistas antes da queda não são repetidas
+        assert len({(r['type'], r['game_id']) for r in rolls}) == 15
+
+    def test_bounded_queue_drops_oldest(self):
+        async def scenario():
+            async with ReplayServer.from_file(RECORDING) as server:
+                client = BlazeStreamClient(server.url, queue_size=4)
+                task = asyncio.create_task(client.run())
+                while client.stats['rolls'] < 15:
+                    await asyncio.sleep(0.01)
+                await client.stop()
+                await task
+                return client, [r async for r in client.rolls()]
+
+        client, rolls = asyncio.run(scenario())
+        assert client.stats['dropped'] == 12
+        assert len(rolls) == 3
+        assert rolls[-1]['game_id'] == 'dbl009'
+
+
+class TestStreamCollector:
+    def test_collector_interface(self, tmp_path):
+        loop = asyncio.new_event_loop()
+        server = ReplayServer.from_file(RECORDING)
+        loop.run_until_complete(server.start())
+
+        import threading
+        serving = threading.Thread(target=loop.run_forever, daemon=True)
+        serving.start()
+
+        collector = BlazeStreamCollector(server.url)
+        collector.cache_file = tmp_path / 'cache.json'
+        try:
+            collector.start()
+            assert collector.wait_for_rolls(15, timeout=5)
+
+            data = collector.get_all_data(limit=4)
+            assert data['source'] == 'stream'
+            assert [r['game_id'] for r in data['double']] == ['dbl006', 'dbl007', 'dbl008', 'dbl009']
+            assert len(data['crash']) == 4
+            assert collector.test_connectivity()
+            assert collector.get_stream_stats()['buffered'] == {'double': 10, 'crash': 5}
+        finally:
+            collector.stop()
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            serving.join(5)
+
+        assert not collector.is_running
+
+    def test_stop_cancels_reconnect_backoff(self):
+        import socket
+        import time
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        # Sem servidor: a conexão falha e o cliente dorme o backoff (30s)
+        collector = BlazeStreamCollector(f"ws://127.0.0.1:{port}/",
+                                         backoff_initial=30.0, backoff_max=30.0)
+        collector.start()
+        deadline = time.monotonic() + 5
+        while collector.client.stats['reconnects'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert collector.client.stats['reconnects'] == 1
+
+        started = time.monotonic()
+        collector.stop(timeout=5)
+        assert not collector.is_running
+        assert time.monotonic() - started < 2
+
+    def test_recent_keeps_chronological_order(self):
+        collector = BlazeStreamCollector('ws://unused', history_size=5)
+        for i in range(8):
+            collector._history['double'].append({'game_id': f"dbl{i}"})
+
+        assert [r['game_id'] for r in collector._recent('double', 3)] == ['dbl5', 'dbl6', 'dbl7']
+        assert len(collector._recent('double', 100)) == 5
+        assert collector._recent('crash', 3) == []
@@ -0,0 +1,154 @@
+"""
+Testes da calibração de confiança (learning.calibration)
+"""
+import json
+import random
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from learning.calibration import ConfidenceCalibrator, ReliabilityCurve, combo_key, isotonic
+from analysis.result_tracker import ResultTracker
+
+
+def overconfident(calibrator, n, game='Double', strategies=None, seed=1):
+    """Confiança entre 0.6 e 0.9, mas acerto real de confiança - 0.2"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        confidence = rng.uniform(0.6, 0.9)
+        calibrator.record(confidence, rng.random() < confidence - 0.2, game, strategies)
+
+
+class TestReliabilityCurve:
+    def test_isotonic_pools_violators(self):
+        assert isotonic([0.1, 0.5, 0.3, 0.7], [1, 1, 1, 1]) == pytest.approx([0.1, 0.4, 0.4, 0.7])
+        assert isotonic([0.6, 0.2], [3, 1]) == pytest.approx([0.5, 0.5])
+
+    def test_add_bins_and_edges(self):
+        curve = ReliabilityCurve(bins=10)
+        curve.add(0.75, True)
+        curve.add(1.0, False)
+        curve.add(-0.1, False)
+
+        assert curve.totals[7] == curve.wins[7] == 1
+        assert curve.totals[9] == curve.totals[0] == 1
+        assert curve.count == 3
+
+    def test_fit_is_monotonic_and_starts_near_identity(self):
+        empty = ReliabilityCurve().fit(prior_strength=5.0)
+        assert empty.apply(0.3) == pytest.approx(0.3, abs=0.01)
+        assert empty.apply(0.8) == pytest.approx(0.8, abs=0.01)
+
+        curve = ReliabilityCurve(bins=10)
+        for i in range(200):
+            curve.add(0.65, i % 2 == 0)        # 50% de acerto
+            curve.add(0.85, i % 5 < 3)         # 60% de acerto
+        table = curve.fit(prior_strength=5.0)
+
+        assert all(a <= b for a, b in zip(table.lookup, table.lookup[1:]))
+        assert table.apply(0.65) == pytest.approx(0.5, abs=0.01)
+        assert table.apply(0.85) == pytest.approx(0.6, abs=0.01)
+        assert table.ece == pytest.approx(0.2)
+
+        # Curva invertida (confiança maior acerta menos): isotônica achata
+        inverted = ReliabilityCurve(bins=10)
+        for _ in range(200):
+            inverted.add(0.85, False)
+            inverted.add(0.65, True)
+        table = inverted.fit(prior_strength=5.0)
+        assert table.apply(0.65) == table.apply(0.85) == pytest.approx(0.5, abs=0.02)
+
+
+class TestConfidenceCalibrator:
+    def test_no_table_until_min_samples(self):
+        calibrator = ConfidenceCalibrator(min_samples=50)
+        overconfident(calibrator, 40)
+        calibrator.refresh(save=False)
+
+        assert calibrator.calibrate(0.8) is None
+        assert calibrator.calibrate(0.8, default=0.55) == 0.55
+
+    def test_overconfident_scores_are_pulled_down(self):
+        calibrator = ConfidenceCalibrator(min_samples=50)
+        overconfident(calibrator, 2000)
+        calibrator.refresh(save=False)
+
+        assert calibrator.calibrate(0.8, 'Double') == pytest.approx(0.6, abs=0.06)
+        assert calibrator.calibrate(0.8, 'Crash') is None
+
+    def test_combination_curve_with_game_fallback(self):
+        calibrator = ConfidenceCalibrator(min_samples=50)
+        overconfident(calibrator, 1000, strategies=('Strategy1', 'Strategy2'))
+        for _ in range(500):
+            calibrator.record(0.8, True, 'Double', 'Strategy1+Strategy2+Strategy3')
+        calibrator.refresh(save=False)
+
+        weak = calibrator.calibrate(0.8, 'Double', ('Strategy1', 'Strategy2'))
+        strong = calibrator.calibrate(0.8, 'Double', 'Strategy1+Strategy2+Strategy3')
+        unseen = calibrator.calibrate(0.8, 'Double', ('Strategy4',))
+
+        assert weak < unseen < strong
+        assert unseen == calibrator.calibrate(0.8, 'Double')
+        assert combo_key(('Strategy1', 'Strategy2')) == 'Strategy1+Strategy2'
+
+    def test_should_refresh_and_async_refresh(self):
+        calibrator = ConfidenceCalibrator(min_samples=10, refresh_every=25)
+        overconfident(calibrator, 24)
+        assert not calibrator.should_refresh()
+        overconfident(calibrator, 1, seed=2)
+        assert calibrator.should_refresh()
+
+        assert calibrator.refresh_async()
+        calibrator.wait_for_refresh(5)
+
+        assert not calibrator.should_refresh()
+        assert calibrator.calibrate(0.7) is not None
+        assert 'Double|*' in calibrator.summary()
+
+    def test_state_round_trip(self, tmp_path):
+        path = str(tmp_path / 'calibration.json')
+        calibrator = ConfidenceCalibrator(path, min_samples=50)
+        overconfident(calibrator, 500, strategies='Strategy1')
+        calibrator.refresh()
+
+        restored = ConfidenceCalibrator.load(path, min_samples=50)
+
+        assert restored.calibrate(0.75, 'Double', 'Strategy1') == calibrator.calibrate(0.75, 'Double', 'Strategy1')
+        assert restored.reliability('Double') == calibrator.reliability('Double')
+        assert json.load(open(path))['bins'] == 20
+
+    def test_corrupt_state_is_ignored(self, tmp_path):
+        path = tmp_path / 'calibration.json'
+        path.write_text('{"curves": [')
+
+        assert ConfidenceCalibrator.load(str(path)).calibrate(0.7) is None
+
+
+class TestResultTrackerCalibration:
+    def test_results_feed_calibrator_and_stats_incrementally(self, tmp_path):
+        calibrator = ConfidenceCalibrator(min_samples=1)
+        tracker = ResultTracker(str(tmp_path / 'history.json'), calibrator=calibrator)
+        for i, confidence in enumerate((0.72, 0.75, 0.92)):
+            tracker.save_signal({'signal_id': f"s{i}", 'signal_type': 'Vermelho',
+                                 'confidence': confidence, 'timestamp': datetime(2024, 1, 1),
+                                 'strategies': 'Strategy1+Strategy2'})
+
+        tracker.register_result('s0', won=True)
+        tracker.register_result('s1', won=False)
+        tracker.register_result('s2', won=True)
+        tracker.register_result('s2', won=False)      # já verificado: ignorado
+
+        stats = tracker.get_stats()
+        assert (stats['total_verified'], stats['wins'], stats['losses']) == (3, 2, 1)
+        assert stats['by_confidence']['70-80%'] == {'wins': 1, 'total': 2}
+        assert stats['win_rate'] == 0.667
+        rows = calibrator.reliability('Double', 'Strategy1+Strategy2')
+        assert sum(row['total'] for row in rows) == 3
+
+        seeded = ConfidenceCalibrator()
+        assert seeded.seed(tracker.verified_signals()) == 3
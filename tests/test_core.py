@@ -13,7 +13,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core import (
     Signal, SignalType, GameType, SignalStatus,
-    BlazeData, retry, cache, DataValidationError
+    BlazeData, retry, cache, DataValidationError, TTLCache
 )
 from database import SignalRepository, init_db
 from data_collection.validators import DataValidator
@@ -229,6 +229,93 @@ class TestDecorators:
         assert result2 == 10
         assert call_count == 1  # Chamado uma vez apenas (cache)
     
+    def test_cache_lru_and_ttl(self):
+        """Testa limite LRU e expiração por chave"""
+        now = [0.0]
+        store = TTLCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+        store.set('a', 1)
+        store.set('b', 2)
+        assert store.get('a') == 1          # 'a' passa a ser o mais recente
+        store.set('c', 3)                   # sai 'b'
+        assert 'b' not in store and len(store) == 2
+        store.set('d', 4, ttl_seconds=100)
+        now[0] = 11
+        assert store.get('c') is None       # expirou
+        assert store.get('d') == 4
+        assert store.stats.to_dict()['evictions'] == 2
+
+    def test_cache_single_flight(self):
+        """Testa chamadas simultâneas calculando uma única vez"""
+        import threading
+        import time as _time
+        calls = []
+        barrier = threading.Barrier(8)
+
+        @cache(ttl_seconds=10)
+        def slow(x):
+            calls.append(x)
+            _time.sleep(0.05)
+            return x * 2
+
+        def worker(results):
+            barrier.wait()
+            results.append(slow(3))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [6] * 8
+        assert calls == [3]
+        info = slow.cache_info()
+        assert info['misses'] == 1 and info['hits'] + info['shared'] == 7
+
+    def test_cache_async_single_flight(self):
+        """Testa cache de corrotinas com single-flight"""
+        import asyncio
+        calls = []
+
+        @cache(ttl_seconds=10)
+        async def fetch(x):
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return x + 1
+
+        async def run():
+            return await asyncio.gather(*(fetch(1) for _ in range(5)), fetch(2))
+
+        assert asyncio.run(run()) == [2, 2, 2, 2, 2, 3]
+        assert calls == [1, 2]
+
+    def test_cache_method_does_not_pin_instance(self):
+        """Testa cache por instância sem manter a instância viva"""
+        import gc
+        import weakref
+
+        class Client:
+            def __init__(self, base):
+                self.base = base
+                self.calls = 0
+
+            @cache(ttl_seconds=10)
+            def history(self, limit=100):
+                self.calls += 1
+                return [self.base] * limit
+
+        first, second = Client(1), Client(2)
+        assert first.history(3) == [1, 1, 1] and first.history(3) == [1, 1, 1]
+        assert second.history(3) == [2, 2, 2]
+        assert (first.calls, second.calls) == (1, 1)
+
+        ref = weakref.ref(first)
+        del first
+        gc.collect()
+        assert ref() is None
+        assert Client.history.cache_info()['currsize'] == 1
+
     def test_retry_decorator(self):
         """Testa retry"""
         call_count = 0
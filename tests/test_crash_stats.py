@@ -0,0 +1,117 @@
+"""
+Testes das estatísticas do Crash em streaming (analysis.crash_stats)
+
+O estado O(1) deve bater com o recálculo direto sobre a janela.
+"""
+import random
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.crash_stats import CrashStatsStream, linear_trend, trailing_true_count
+from analysis.statistical_analyzer import StatisticalAnalyzer
+
+
+def _crash_frame(n, start=0, seed=1):
+    rng = random.Random(seed)
+    points = [round(rng.choice([rng.uniform(1.0, 2.0), rng.uniform(2.0, 12.0)]), 2) for _ in range(n)]
+    return pd.DataFrame({'crash_point': points,
+                         'game_id': [f"crash_{start + i}" for i in range(n)]})
+
+
+class TestCrashStatsStream:
+    def test_window_matches_batch(self):
+        df = _crash_frame(400)
+        stream = CrashStatsStream(window=50)
+        for i, value in enumerate(df['crash_point']):
+            stream.push(value)
+            window = df['crash_point'].iloc[max(0, i - 49):i + 1]
+            if len(window) < 5:
+                continue
+            basic = stream.basic_stats()
+            assert basic['mean'] == pytest.approx(window.mean())
+            assert basic['std'] == pytest.approx(window.std())
+            assert basic['median'] == pytest.approx(window.median())
+            assert (basic['min'], basic['max']) == (window.min(), window.max())
+
+            sequences = stream.sequences()
+            assert sequences['low_crash_count'] == int((window < 2.0).sum())
+            assert sequences['high_crash_count'] == int((window > 5.0).sum())
+            assert sequences['current_low_streak'] == trailing_true_count(
+                df['crash_point'].iloc[:i + 1] < 2.0)
+
+            slope, _, r_value, _, _ = stats.linregress(np.arange(5), window.tail(5).to_numpy())
+            assert stream.trends()['recent_slope'] == pytest.approx(slope)
+            assert stream.trends()['recent_correlation'] == pytest.approx(r_value)
+
+    def test_linear_trend_matches_linregress(self):
+        y = [1.2, 3.4, 1.1, 8.0, 2.5]
+        slope, _, r_value, _, _ = stats.linregress(np.arange(5), y)
+        trend = linear_trend(y)
+        assert trend['recent_slope'] == pytest.approx(slope)
+        assert trend['recent_correlation'] == pytest.approx(r_value)
+
+    def test_ewma_anomaly(self):
+        stream = CrashStatsStream()
+        for value in [1.5, 1.6, 1.4, 1.5, 1.7, 1.5, 1.6, 1.4, 1.5, 1.6, 1.5, 25.0]:
+            stream.push(value)
+        anomalies = stream.anomalies()
+        assert anomalies['count'] == 1
+        assert anomalies['values'] == [25.0]
+        assert anomalies['positions'] == [9]
+
+    def test_update_frame_only_new_rounds(self):
+        df = _crash_frame(150)
+        incremental = CrashStatsStream(window=100)
+        assert incremental.update_frame(df.iloc[:100]) == 100
+        # Próximo ciclo: janela de 100 sobrepondo 60 rodadas já vistas
+        assert incremental.update_frame(df.iloc[40:140]) == 40
+        assert incremental.update_frame(df.iloc[40:140]) == 0
+        assert incremental.update_frame(df.iloc[50:150]) == 10
+
+        batch = CrashStatsStream(window=100)
+        for value in df['crash_point']:
+            batch.push(value)
+        assert incremental.summary() == batch.summary()
+
+    def test_update_frame_sorts_newest_first_frames(self):
+        df = _crash_frame(150)
+        df['timestamp'] = pd.date_range('2024-01-01', periods=150, freq='30s')
+        newest_first = CrashStatsStream(window=100)
+        # A API devolve a rodada mais recente primeiro
+        assert newest_first.update_frame(df.iloc[:100].iloc[::-1]) == 100
+        assert newest_first.update_frame(df.iloc[40:140].iloc[::-1]) == 40
+        assert newest_first.last_key == 'crash_139'
+
+        chronological = CrashStatsStream(window=100)
+        chronological.update_frame(df.iloc[:140])
+        assert newest_first.summary() == chronological.summary()
+
+    def test_trailing_true_count(self):
+        assert trailing_true_count([True, False, True, True]) == 2
+        assert trailing_true_count([True, True]) == 2
+        assert trailing_true_count([]) == trailing_true_count([False]) == 0
+        frame = pd.DataFrame({'is_low': [False, True, True]})
+        assert StatisticalAnalyzer().get_current_streak(frame, 'is_low') == 2
+
+
+class TestAnalyzerCrash:
+    def test_does_not_mutate_input(self):
+        df = _crash_frame(30)
+        columns = list(df.columns)
+        analyzer = StatisticalAnalyzer()
+        analysis = analyzer.analyze_crash_patterns(df)
+        analyzer.analyze_crash_sequences(df)
+
+        assert list(df.columns) == columns
+        assert set(analysis) == {'basic_stats', 'sequences', 'trends', 'anomalies'}
+        assert analysis['basic_stats']['mean'] == pytest.approx(df['crash_point'].mean())
+        assert analysis['sequences'] == pytest.approx(analyzer.analyze_crash_sequences(df))
+        assert analysis['trends'] == pytest.approx(analyzer.analyze_trends(df, 'crash_point'))
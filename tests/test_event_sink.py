@@ -0,0 +1,160 @@
+"""
+Testes do EventSink (eventos gravados em lote)
+"""
+import sys
+import os
+import threading
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import EventRepository, EventSink, init_db
+from database.models import EventModel
+
+
+class FakeRepository:
+    """Guarda os lotes recebidos por save_batch"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def save_batch(self, events):
+        if self.fail:
+            raise RuntimeError("disco cheio")
+        self.batches.append(events)
+        self.written.set()
+        return len(events)
+
+
+class TestEventSink:
+    def test_flush_writes_single_batch(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, background=False)
+        for i in range(5):
+            sink.emit('INFO', 'test', f"evento {i}")
+
+        assert repo.batches == []
+        assert sink.flush() == 5
+        assert len(repo.batches) == 1
+        assert [e['message'] for e in repo.batches[0]] == [f"evento {i}" for i in range(5)]
+
+    def test_repeated_errors_are_deduplicated_with_count(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, background=False)
+        for _ in range(100):
+            sink.emit('ERROR', 'collector', 'Timeout na API')
+        sink.emit('ERROR', 'collector', 'Resposta inválida')
+        sink.emit('INFO', 'collector', 'ok')
+        sink.emit('INFO', 'collector', 'ok')
+        sink.flush()
+
+        events = repo.batches[0]
+        assert len(events) == 4
+        assert events[0]['context']['count'] == 100
+        assert events[0]['context']['first_seen'] <= events[0]['context']['last_seen']
+        assert events[1]['context']['count'] == 1
+        assert 'count' not in events[2]['context']
+        assert sink.get_stats()['deduplicated'] == 99
+
+    def test_drop_newest_when_full(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, max_buffer=3, background=False)
+        accepted = [sink.emit('INFO', 'test', f"e{i}") for i in range(5)]
+        # Repetição de erro já no buffer não ocupa espaço novo
+        sink.emit('ERROR', 'test', 'falha')
+
+        assert accepted == [True, True, True, False, False]
+        sink.flush()
+        assert [e['message'] for e in repo.batches[0]] == ['e0', 'e1', 'e2']
+        assert sink.get_stats()['dropped'] == 3
+
+    def test_drop_oldest_when_full(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, max_buffer=3, overflow='drop_oldest', background=False)
+        for i in range(5):
+            assert sink.emit('INFO', 'test', f"e{i}")
+        sink.flush()
+
+        assert [e['message'] for e in repo.batches[0]] == ['e2', 'e3', 'e4']
+
+    def test_block_waits_for_background_flush(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, batch_size=1000, flush_interval=60, max_buffer=2,
+                         overflow='block', block_timeout=5)
+        try:
+            assert all(sink.emit('INFO', 'test', f"e{i}") for i in range(5))
+        finally:
+            sink.close()
+
+        assert sum(len(b) for b in repo.batches) == 5
+        assert sink.get_stats()['dropped'] == 0
+
+    def test_background_flush_on_batch_size(self):
+        repo = FakeRepository()
+        sink = EventSink(repo, batch_size=10, flush_interval=60)
+        try:
+            for i in range(10):
+                sink.emit('INFO', 'test', f"e{i}")
+            assert repo.written.wait(5)
+        finally:
+            sink.close()
+
+        assert len(repo.batches[0]) == 10
+
+    def test_failed_batch_is_counted_not_retried(self):
+        sink = EventSink(FakeRepository(fail=True), background=False)
+        sink.emit('ERROR', 'test', 'falha')
+
+        assert sink.flush() == 0
+        assert sink.get_stats()['failed'] == 1
+        assert sink.pending() == 0
+
+    def test_closed_sink_rejects_events(self):
+        sink = EventSink(FakeRepository())
+        sink.close()
+        assert not sink.emit('INFO', 'test', 'tarde demais')
+
+    def test_invalid_overflow_policy(self):
+        with pytest.raises(ValueError):
+            EventSink(FakeRepository(), overflow='ignorar', background=False)
+
+
+class TestEventRepositoryBatch:
+    def test_save_batch_single_transaction(self, tmp_path):
+        Session = init_db(str(tmp_path / "events.db"))
+        repo = EventRepository(Session)
+        sink = EventSink(repo, background=False)
+        for _ in range(3):
+            sink.emit('ERROR', 'collector', 'Timeout na API', context={'url': '/roulette'})
+        sink.emit('WARNING', 'collector', 'Lento')
+        sink.flush()
+
+        session = Session()
+        try:
+            assert session.query(EventModel).count() == 2
+        finally:
+            session.close()
+        errors = repo.get_recent_errors()
+        assert errors[0]['message'] == 'Timeout na API'
+        assert errors[0]['count'] == 3
+
+
+class TestPersistenceManagerClose:
+    def test_close_flushes_pending_events(self, tmp_path):
+        from integration import PersistenceManager
+
+        manager = PersistenceManager(str(tmp_path / "events.db"))
+        manager.event_sink.flush_interval = 60      # nada sai antes do close
+        manager.record_event('ERROR', 'collector', 'Timeout na API')
+        manager.close()
+        manager.close()                              # idempotente (também roda no atexit)
+
+        session = manager.Session()
+        try:
+            assert session.query(EventModel).count() == 1
+        finally:
+            session.close()
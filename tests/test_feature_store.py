@@ -0,0 +1,135 @@
+"""
+Testes do FeatureStore: features incrementais iguais ao recálculo das estratégias
+"""
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.feature_store import FeatureStore
+from analysis.monte_carlo_strategy import RunsAccumulator, Strategy6_RunTestValidation
+from analysis.parameter_sweep import build_windows
+from analysis.strategy_pipeline import (
+    StrategyPipeline, Strategy1_PatternDetection, Strategy2_TechnicalValidation,
+    Strategy4_ConfirmationFilter, StrategyResult
+)
+
+
+def _records(n, seed=7, start=0):
+    rng = random.Random(seed)
+    base = datetime(2025, 3, 1, 22, 0)
+    records = []
+    for i in range(start, start + n):
+        roll = rng.randint(0, 14)
+        color = 'white' if roll == 0 else 'red' if roll <= 7 else 'black'
+        records.append({'game_id': f"dbl{i}", 'color': color, 'roll': roll,
+                        'created_at': (base + timedelta(seconds=30 * i)).isoformat()})
+    return records
+
+
+class TestFeatureStore:
+    def test_matches_strategy_computations(self):
+        records = _records(120)
+        store = FeatureStore('double')
+        strategy2 = Strategy2_TechnicalValidation()
+        strategy4 = Strategy4_ConfirmationFilter()
+
+        for i, record in enumerate(records):
+            row = store.append(record)
+            colors = [r['color'] for r in records[:i + 1]]
+            rolls = [r['roll'] for r in records[:i + 1]]
+
+            assert row['roll_index'] == i
+            assert row['red_count_10'] == colors[-10:].count('red')
+            assert row['black_count_10'] == colors[-10:].count('black')
+            assert row['max_streak_20'] == strategy4._calculate_max_streak(colors[-20:])
+
+            runs = RunsAccumulator.from_sequence(colors[-10:])
+            assert (row['runs_10'], row['red_10'], row['black_10'], row['clusters_10']) == \
+                   (runs.runs, runs.n_red, runs.n_black, runs.clusters)
+
+            assert row['rsi_14'] == pytest.approx(strategy2.calculate_rsi(rolls))
+            lower, mid, _ = strategy2.calculate_bollinger_bands(rolls)
+            if mid is None:
+                assert np.isnan(row['bb_mid_20'])
+            else:
+                assert row['bb_mid_20'] == pytest.approx(mid)
+                assert row['bb_mid_20'] - 2 * row['bb_std_20'] == pytest.approx(lower)
+
+        assert (store.latest()['hour'], store.latest()['weekday']) == (22, 5)
+
+    def test_strategies_same_result_with_features(self):
+        records = _records(60, seed=3)
+        pipeline = StrategyPipeline()
+        store = FeatureStore('double', pipeline.required_features())
+        for end in range(20, 60):
+            store.extend(records[:end])
+            colors = [r['color'] for r in records[:end]]
+            features = store.latest()
+
+            plain = Strategy1_PatternDetection().analyze({'recent_colors': colors[-10:]})
+            assert Strategy1_PatternDetection().analyze({'features': features}) == plain
+
+            data = {'all_colors': colors, 'desequilibrio': 2}
+            assert Strategy4_ConfirmationFilter().analyze({**data, 'features': features}) == \
+                   Strategy4_ConfirmationFilter().analyze(data)
+
+            result, confidence, details = Strategy6_RunTestValidation().analyze(
+                {'color_sequence': colors[-10:], 'features': features})
+            expected = Strategy6_RunTestValidation().analyze({'color_sequence': colors[-10:]})
+            assert (result, confidence) == expected[:2]
+            assert details['z_score'] == expected[2]['z_score']
+
+    def test_pattern_with_features_and_all_white_window(self):
+        store = FeatureStore('double', ('red_count_10',))
+        store.extend([{'game_id': f"w{i}", 'color': 'white', 'roll': 0} for i in range(12)])
+        colors = ['white'] * 12
+
+        with_features = Strategy1_PatternDetection().analyze(
+            {'recent_colors': colors, 'features': store.latest()})
+
+        assert with_features == Strategy1_PatternDetection().analyze({'recent_colors': colors})
+        assert with_features[0] == StrategyResult.REJECT
+
+    def test_extend_only_new_rounds(self):
+        records = _records(150)
+        store = FeatureStore('double', ('red_count_10',))
+        assert store.columns == ('color', 'roll', 'red_count_10', 'black_count_10')
+        assert store.extend(records[:100]) == 100
+        assert store.extend(records[40:140]) == 40
+        assert store.extend(records[40:140]) == 0
+        assert store.next_index == 140
+
+        with pytest.raises(ValueError):
+            FeatureStore('double', ('unknown',))
+
+    def test_flush_and_window_features(self, tmp_path):
+        records = _records(200, seed=11)
+        store = FeatureStore('double')
+        path = tmp_path / 'features' / 'double.jsonl'
+        store.extend(records[:120])
+        assert store.flush(path) == 120
+        store.extend(records[100:])
+        assert store.flush(path) == 80
+        assert store.flush(path) == 0
+
+        saved = FeatureStore.read(path)
+        assert len(saved) == 200
+        assert saved.loc[('double', 150), 'red_count_10'] == store.row(150)['red_count_10']
+
+        colors, _, _ = build_windows(records, 20)
+        expected = StrategyPipeline().window_features(colors)
+        # Janelas do build_windows terminam nas rodadas 19..198 (a 199 não tem resultado)
+        features = store.to_window_features(20).take(slice(0, len(colors)))
+        np.testing.assert_array_equal(features.vermelho_count, expected.vermelho_count)
+        np.testing.assert_array_equal(features.preto_count, expected.preto_count)
+        np.testing.assert_array_equal(features.max_streak, expected.max_streak)
+        np.testing.assert_array_equal(features.red_total, expected.red_total)
+        np.testing.assert_array_equal(features.black_total, expected.black_total)
+        np.testing.assert_array_equal(features.runs_10, expected.runs_10)
@@ -0,0 +1,188 @@
+"""
+Testes do logging assíncrono (config.logger_config)
+"""
+import logging
+import queue
+import sys
+import os
+import threading
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.logger_config import (
+    ColoredFormatter, LazyQueueHandler, SamplingFilter, logging_stats, setup_logging,
+    start_queue_logging, stop_logging
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingHandler(logging.Handler):
+    """Guarda a mensagem formatada e a thread em que foi formatada"""
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.gate = gate
+        self.records = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.records.append((self.format(record), threading.current_thread().name))
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class LazyValue:
+    """Argumento que registra quando é convertido em texto"""
+
+    def __init__(self):
+        self.formatted_in = None
+
+    def __str__(self):
+        self.formatted_in = threading.current_thread().name
+        return 'valor'
+
+
+class TestQueueLogging:
+    def test_records_are_formatted_in_listener_thread(self):
+        handler = RecordingHandler()
+        start_queue_logging([handler], level=logging.INFO)
+        value = LazyValue()
+
+        logging.getLogger('test.queue').info("sinal %s", value)
+        stop_logging()
+
+        assert handler.records[0][0] == 'sinal valor'
+        assert handler.records[0][1] != threading.current_thread().name
+        assert value.formatted_in == handler.records[0][1]
+
+    def test_slow_handler_does_not_block_emit(self):
+        gate = threading.Event()
+        handler = RecordingHandler(gate)
+        start_queue_logging([handler], level=logging.INFO)
+
+        log = logging.getLogger('test.queue')
+        for i in range(200):
+            log.info("sinal %d", i)
+        # O handler ainda está bloqueado: nada foi escrito, mas o log já retornou
+        assert len(handler.records) == 0
+
+        gate.set()
+        stop_logging()
+        assert len(handler.records) == 200
+
+    def test_full_queue_drops_info_and_counts(self):
+        handler = LazyQueueHandler(queue.Queue(maxsize=2))
+        log = logging.getLogger('test.full')
+        for i in range(5):
+            handler.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "m %d", (i,), None))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_handler_levels_are_respected(self):
+        info_handler = RecordingHandler()
+        error_handler = RecordingHandler()
+        error_handler.setLevel(logging.ERROR)
+        start_queue_logging([info_handler, error_handler], level=logging.INFO)
+
+        log = logging.getLogger('test.levels')
+        log.info("informação")
+        log.error("erro")
+        stop_logging()
+
+        assert len(info_handler.records) == 2
+        assert [m for m, _ in error_handler.records] == ['erro']
+
+    def test_setup_logging_writes_files(self, tmp_path):
+        setup_logging(log_dir=str(tmp_path), console=False, structured=True)
+        logging.getLogger('test.setup').info("mensagem %s", 'json')
+        logging.getLogger('performance').info("latência %d ms", 12)
+        stop_logging()
+
+        app_log = (tmp_path / 'app.log').read_text(encoding='utf-8')
+        perf_log = (tmp_path / 'performance.log').read_text(encoding='utf-8')
+        assert '"message": "mensagem json"' in app_log
+        assert 'latência 12 ms' in perf_log
+        assert 'mensagem json' not in perf_log
+
+    def test_colored_formatter_does_not_leak_to_other_handlers(self):
+        console = RecordingHandler()
+        console.setFormatter(ColoredFormatter('%(levelname)s'))
+        plain = RecordingHandler()
+        plain.setFormatter(logging.Formatter('%(levelname)s'))
+        start_queue_logging([console, plain], level=logging.INFO)
+
+        logging.getLogger('test.color').info("x")
+        stop_logging()
+
+        assert '\033[' in console.records[0][0]
+        assert plain.records[0][0] == 'INFO'
+
+
+class TestSamplingFilter:
+    def make_record(self, name='analysis.strategy_pipeline', level=logging.INFO, msg="sinal %s"):
+        return logging.LogRecord(name, level, __file__, 0, msg, ('x',), None)
+
+    def test_burst_then_one_in_every(self):
+        sampling = SamplingFilter(burst=3, every=5, clock=FakeClock())
+        kept = [sampling.filter(self.make_record()) for _ in range(23)]
+
+        # 3 do burst + 1 a cada 5 das 20 seguintes
+        assert sum(kept) == 3 + 4
+        assert sampling.suppressed == 23 - 7
+
+    def test_window_resets_counts(self):
+        clock = FakeClock()
+        sampling = SamplingFilter(burst=2, every=100, interval=60, clock=clock)
+        assert [sampling.filter(self.make_record()) for _ in range(3)] == [True, True, False]
+
+        clock.now = 60
+        assert sampling.filter(self.make_record())
+
+    def test_warnings_and_other_loggers_are_never_sampled(self):
+        sampling = SamplingFilter(loggers=('analysis',), burst=0, every=1000, clock=FakeClock())
+        sampling.filter(self.make_record())
+
+        assert not sampling.filter(self.make_record())
+        assert sampling.filter(self.make_record(level=logging.WARNING))
+        assert sampling.filter(self.make_record(name='data_collection.blaze_client_v2'))
+        assert sampling.filter(self.make_record(name='analysis_extra'))
+
+    def test_templates_are_sampled_independently(self):
+        sampling = SamplingFilter(burst=1, every=1000, clock=FakeClock())
+        assert sampling.filter(self.make_record(msg="a %s"))
+        assert sampling.filter(self.make_record(msg="b %s"))
+        assert not sampling.filter(self.make_record(msg="a %s"))
+
+    def test_suppressed_records_never_reach_queue(self):
+        handler = RecordingHandler()
+        sampling = SamplingFilter(burst=2, every=1000, clock=FakeClock())
+        start_queue_logging([handler], level=logging.INFO, sampling=sampling)
+
+        log = logging.getLogger('test.sampling')
+        for i in range(10):
+            log.info("sinal %d", i)
+        stats = logging_stats()
+        stop_logging()
+
+        assert len(handler.records) == 2
+        assert stats['suppressed'] == 8
@@ -0,0 +1,99 @@
+"""
+Testes do MetaLearner - modelo online, treino em background e cache de predição
+"""
+import pytest
+import sys
+import os
+import random
+from datetime import datetime
+
+import numpy as np
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from learning.meta_learner import MetaLearner, MetaContext
+
+
+def _context(hour=20, game='Double', wr=0.6):
+    return MetaContext(datetime.now(), hour, 3, 5, game, wr, 1.0, 80)
+
+
+class TestOnlineModel:
+    def test_no_samples_returns_heuristics(self):
+        meta = MetaLearner()
+        ctx = _context()
+        assert meta.predict_strategy_weights(ctx) == meta._heuristic_weights(ctx)
+
+    def test_updates_shift_weights_towards_winner(self):
+        meta = MetaLearner()
+        ctx = _context(hour=14)
+        for _ in range(30):
+            meta.add_training_sample(ctx, [4])
+
+        weights = meta.predict_strategy_weights(ctx)
+        assert sum(weights) == pytest.approx(1.0)
+        assert max(range(6), key=lambda i: weights[i]) == 3
+        # Outro bucket (hora/jogo) continua nas heurísticas
+        other = _context(hour=3, game='Crash')
+        assert meta.predict_strategy_weights(other) == meta._heuristic_weights(other)
+
+    def test_online_model_can_be_disabled(self):
+        meta = MetaLearner(use_online_model=False)
+        ctx = _context()
+        meta.add_training_sample(ctx, [2])
+        assert meta.predict_strategy_weights(ctx) == meta._heuristic_weights(ctx)
+
+
+class TestForestModel:
+    def _trained(self):
+        pytest.importorskip('sklearn')
+        rng = random.Random(1)
+        meta = MetaLearner()
+        meta.min_samples = 40
+        for _ in range(60):
+            hour = rng.randrange(24)
+            meta.add_training_sample(_context(hour=hour), [5 if hour >= 12 else 1])
+        return meta
+
+    def test_weights_cover_all_strategies_and_are_cached(self):
+        meta = self._trained()
+        assert meta.train()
+
+        ctx = _context(hour=20)
+        weights = meta.predict_strategy_weights(ctx)
+        assert len(weights) == 6
+        assert sum(weights) == pytest.approx(1.0)
+        assert weights[1] == weights[2] == weights[3] == weights[5] == 0.0
+
+        # Contexto no mesmo bucket reaproveita a predição
+        assert meta.predict_strategy_weights(_context(hour=20, wr=0.601)) == weights
+        assert len(meta._state.get().predictions) == 1
+
+    def test_predicts_from_raw_features_without_mutating_snapshot(self):
+        meta = self._trained()
+        assert meta.train()
+        snapshot = meta._state.get()
+
+        ctx = _context(hour=13)
+        ctx.recent_drawdown = 0.03                  # bucket arredonda para 0.0
+        weights = meta.predict_strategy_weights(ctx)
+        expected = meta.model.predict_proba(np.array([ctx.to_features()]))[0]
+        assert [weights[int(cls)] for cls in meta.model.classes_] == pytest.approx(expected)
+
+        # Cache publicado num snapshot novo, mesmo modelo; o antigo não muda
+        assert snapshot.predictions == {}
+        assert meta._state.get().model is snapshot.model
+        assert ctx.bucket() in meta._state.get().predictions
+
+    def test_background_training_swaps_model(self):
+        meta = self._trained()
+        assert meta.should_retrain()
+        assert meta.train_async()
+        meta.wait_for_training(timeout=60)
+
+        assert meta.is_trained and not meta.is_training
+        assert not meta.should_retrain()
+        for _ in range(100):
+            meta.add_training_sample(_context(hour=8), [2])
+        assert meta.should_retrain()
@@ -0,0 +1,114 @@
+"""
+Testes do modo captura persistente (BlazeNetworkCapture) com FixtureDriver
+"""
+import pytest
+import sys
+import os
+import asyncio
+from datetime import timedelta
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_collection.blaze_realtime_scraper import (
+    BlazeRealtimeScraper, BlazeNetworkCapture, FixtureDriver
+)
+
+RECORDING = os.path.join(os.path.dirname(__file__), 'fixtures', 'blaze_ws_recording.jsonl')
+URLS = ['https://example/double', 'https://example/crash']
+
+
+def _drain(capture, polls=20):
+    rolls = []
+    for _ in range(polls):
+        rolls.extend(capture.poll())
+    return rolls
+
+
+class TestNetworkCapture:
+    def test_incremental_parsing(self):
+        drivers = []
+
+        def factory():
+            drivers.append(FixtureDriver(RECORDING))
+            return drivers[-1]
+
+        capture = BlazeNetworkCapture(URLS, factory)
+        assert capture.start()
+
+        first = capture.poll()
+        assert [r['game_id'] for r in first] == ['dbl000']
+
+        rolls = first + _drain(capture)
+        assert len(rolls) == 15
+        assert [r['game_id'] for r in capture.recent('double', 3)] == ['dbl007', 'dbl008', 'dbl009']
+        assert capture.stats['frames'] == 43
+        # Uma única sessão, páginas abertas uma vez
+        assert len(drivers) == 1
+        assert drivers[0].pages == URLS
+        capture.close()
+        assert drivers[0].closed
+
+    def test_recycles_when_heap_exceeds_budget(self):
+        drivers = []
+
+        def factory():
+            driver = FixtureDriver(RECORDING, heap_per_frame_mb=5.0)
+            if drivers:
+                # Página recarregada volta a receber os últimos frames
+                driver.position = max(0, drivers[-1].position - 5)
+                driver.heap_per_frame_mb = 0.0
+            drivers.append(driver)
+            return driver
+
+        capture = BlazeNetworkCapture(URLS, factory, memory_cap_mb=50, budget_check_every=2)
+        capture.start()
+        rolls = _drain(capture, polls=40)
+
+        assert capture.stats['recycles'] >= 1
+        assert len(drivers) == capture.stats['recycles'] + 1
+        assert all(d.closed for d in drivers[:-1])
+        # Frames reenviados após reciclar não duplicam rodadas
+        assert len(rolls) == len({(r['type'], r['game_id']) for r in rolls}) == 15
+
+    def test_recycles_when_page_expires(self):
+        capture = BlazeNetworkCapture(URLS, lambda: FixtureDriver(RECORDING),
+                                      page_max_age=timedelta(0), budget_check_every=1)
+        capture.start()
+        capture.poll()
+        assert capture.stats['recycles'] == 1
+
+    def test_async_iterator(self):
+        capture = BlazeNetworkCapture(URLS, lambda: FixtureDriver(RECORDING), poll_interval=0.01)
+        capture.start()
+
+        async def collect():
+            rolls = []
+            async for roll in capture.rolls():
+                rolls.append(roll)
+                if len(rolls) == 15:
+                    break
+            return rolls
+
+        rolls = asyncio.run(asyncio.wait_for(collect(), 5))
+        capture.close()
+        assert [r['crash_point'] for r in rolls if r['type'] == 'crash'] == [1.0, 2.35, 1.47, 12.8, 1.12]
+
+
+class TestScraperCaptureMode:
+    def test_fixture_mode_does_not_reload(self, tmp_path):
+        scraper = BlazeRealtimeScraper(fixture_path=RECORDING)
+        scraper.cache_dir = tmp_path
+        try:
+            for _ in range(10):
+                double = scraper.get_double_realtime(limit=100)
+                crash = scraper.get_crash_realtime(limit=100)
+
+            assert len(double) == 10
+            assert len(crash) == 5
+            assert double[-1]['color'] == 'BLACK'
+            assert scraper.driver is None
+            assert scraper.capture.driver.pages == [scraper.urls['double'], scraper.urls['crash']]
+            assert (tmp_path / 'double_realtime.json').exists()
+        finally:
+            scraper.close()
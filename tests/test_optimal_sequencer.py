@@ -0,0 +1,65 @@
+"""
+Testes do OptimalSequencer - tabela DP vetorizada
+"""
+import pytest
+import sys
+import os
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from learning.optimal_sequencer import (
+    OptimalSequencer, DPState, CONFIDENCE_BINS, BANKROLL_BINS
+)
+
+
+class TestVectorizedTable:
+    def test_table_matches_scalar_formula(self):
+        seq = OptimalSequencer()
+        assert len(seq.dp_table) == 1920
+
+        for ci, conf in enumerate(CONFIDENCE_BINS):
+            for bi, br in enumerate(BANKROLL_BINS):
+                for hour in range(24):
+                    expected = seq._compute_state_value(DPState(float(conf), int(br), hour))
+                    value = seq.dp_table.value_at(ci, bi, hour)
+                    assert value.optimal_bet_fraction == pytest.approx(expected.optimal_bet_fraction)
+                    assert value.expected_return == pytest.approx(expected.expected_return)
+
+    @pytest.mark.parametrize("confidence,bankroll,expected_conf,expected_br", [
+        (0.83, 77.0, 0.85, 70),
+        (0.50, 5, 0.60, 10),
+        (0.99, 250, 0.95, 100),
+        (0.724, 99.9, 0.70, 90),
+    ])
+    def test_lookup_uses_same_bins(self, confidence, bankroll, expected_conf, expected_br):
+        seq = OptimalSequencer()
+        expected = seq._compute_state_value(DPState(expected_conf, expected_br, 20))
+        assert seq.get_optimal_bet(confidence, bankroll, 20) == pytest.approx(
+            expected.optimal_bet_fraction)
+
+
+class TestRecompute:
+    def test_recomputes_only_when_win_rates_change(self):
+        seq = OptimalSequencer()
+        table = seq.dp_table
+        assert not seq.should_recompute()
+
+        seq.get_optimal_bet(0.80, 80, 12)
+        seq.set_win_rate(12, seq.win_rate_by_hour[12])
+        assert seq.dp_table is table
+
+        before = seq.get_optimal_bet(0.80, 80, 12)
+        seq.set_win_rate(12, 0.70)
+        assert seq.dp_table is not table
+        assert seq.get_optimal_bet(0.80, 80, 12) > before
+
+    def test_win_rates_are_read_only(self):
+        seq = OptimalSequencer()
+        with pytest.raises(TypeError):
+            seq.win_rate_by_hour[3] = 0.9
+
+        rates = dict(seq.win_rate_by_hour)
+        rates[3] = 0.70
+        seq.win_rate_by_hour = rates
+        assert seq.dp_table.win_rates[3] == 0.70
@@ -0,0 +1,107 @@
+"""
+Testes da varredura de parâmetros (PipelineConfig / ParameterSweep)
+"""
+import pytest
+import sys
+import os
+import numpy as np
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.strategy_pipeline import StrategyPipeline, PipelineConfig, BATCH_STAGES, RESULT_MEMBERS
+from analysis.parameter_sweep import (
+    ParameterSweep, build_windows, grid_space, random_space
+)
+
+
+def _records(n=400, seed=11):
+    rng = np.random.default_rng(seed)
+    colors = rng.choice([1, 2, 0], n, p=[0.47, 0.47, 0.06])
+    return [{'color': int(c), 'roll': int(rng.integers(0, 15))} for c in colors]
+
+
+CUSTOM = PipelineConfig(pattern_majority=6, pattern_minority=4, technical_pass=0.85,
+                        min_combined_confidence=0.65, confirmation_pass=0.80,
+                        pass_bonus=0.20, records_moderate=15, records_good=25)
+
+
+class TestPipelineConfig:
+    def test_config_applies_to_single_and_batch_paths(self):
+        colors, rolls, _ = build_windows(_records(150), window_size=20)
+        pipeline = StrategyPipeline(short_circuit=False, config=CUSTOM)
+        batch = pipeline.process_windows(colors, rolls)
+        assert pipeline.required_strategies_for(20) == 2
+
+        for i in range(0, len(batch), 7):
+            signal = pipeline.process_signal({
+                'all_colors': list(colors[i]),
+                'recent_colors': list(colors[i][-10:]),
+                'prices': list(rolls[i]),
+            })
+            assert batch.is_valid[i] == signal.is_valid
+            assert batch.final_confidence[i] == pytest.approx(signal.final_confidence)
+            for name, key in BATCH_STAGES:
+                assert RESULT_MEMBERS[batch.results[key + '_result'][i]] == signal.strategy_results[name][0]
+
+    def test_defaults_keep_historical_thresholds(self):
+        pipeline = StrategyPipeline()
+        assert pipeline.required_strategies_for(29) == 1
+        assert pipeline.required_strategies_for(100) == 3
+        assert pipeline.strategies[0].majority == 7
+        assert pipeline.strategies[3].pass_threshold == 0.72
+
+
+class TestSearchSpaces:
+    def test_grid(self):
+        configs = grid_space({'pattern_majority': [6, 7], 'technical_pass': [0.6, 0.7, 0.8]})
+        assert len(configs) == 6
+        assert {c.pattern_majority for c in configs} == {6, 7}
+        assert all(c.confirmation_pass == 0.72 for c in configs)
+
+    def test_random_bounds(self):
+        configs = random_space({'records_moderate': (10, 40), 'technical_pass': (0.6, 0.8),
+                                'pattern_minority': [2, 3]}, n_iter=50, seed=1)
+        assert len(configs) == 50
+        assert all(10 <= c.records_moderate <= 40 and isinstance(c.records_moderate, int) for c in configs)
+        assert all(0.6 <= c.technical_pass <= 0.8 for c in configs)
+        assert {c.pattern_minority for c in configs} <= {2, 3}
+
+    def test_unknown_parameter(self):
+        with pytest.raises(ValueError):
+            grid_space({'not_a_threshold': [1]})
+
+
+class TestParameterSweep:
+    def test_build_windows_outcomes(self):
+        records = _records(30)
+        colors, rolls, outcomes = build_windows(records, window_size=20)
+        assert colors.shape == rolls.shape == (10, 20)
+        assert colors[0, 0] == {0: 'white', 1: 'red', 2: 'black'}[records[0]['color']]
+        expected = {0: 0, 1: 1, 2: -1}[records[20]['color']]
+        assert outcomes[0] == expected
+
+    def test_metrics_and_ranking(self):
+        sweep = ParameterSweep.from_records(_records(), window_size=20, min_bets=5,
+                                            initial_confidence=0.45)
+        ranking = sweep.run_grid({'records_moderate': [10], 'records_good': [15, 100],
+                                  'technical_pass': [0.70, 0.99]}, workers=1)
+
+        assert len(ranking) == 4
+        assert ranking['rank'].tolist() == list(range(1, 5))
+        # Exigir 3 estratégias com a engrenagem 2 inalcançável reduz as apostas
+        bets = ranking.set_index(['records_good', 'technical_pass'])['bets']
+        assert bets[(15, 0.99)] < bets[(15, 0.70)] == bets[(100, 0.70)]
+        ranked = ranking[ranking['enough_bets']]
+        assert ranked['roi'].is_monotonic_decreasing
+        for _, row in ranking.iterrows():
+            assert row['wins'] <= row['bets'] <= row['windows']
+            assert row['profit'] == pytest.approx(2 * row['wins'] - row['bets'])
+            assert row['max_drawdown'] >= 0
+
+    def test_parallel_matches_sequential(self):
+        sweep = ParameterSweep.from_records(_records(), window_size=20)
+        configs = grid_space({'technical_pass': [0.7, 0.8], 'records_moderate': [10, 30]})
+        sequential = sweep.run(configs, workers=1)
+        parallel = sweep.run(configs, workers=2, chunksize=1)
+        assert sequential.drop(columns='rank').equals(parallel.drop(columns='rank'))
@@ -0,0 +1,175 @@
+"""
+Testes da camada de resiliência (core.resilience e retry)
+"""
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import retry, RetryableError, CircuitOpenError
+from core.resilience import (
+    CircuitBreaker, Deadline, guarded_get, remaining_timeout, reset_breakers, breaker_metrics
+)
+from data_collection.blaze_client_v2 import BlazeDataCollectorV2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeadSession:
+    """Sessão cujas requisições sempre falham"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, timeout=None, **kwargs):
+        self.calls.append((url, timeout))
+        raise ConnectionError("upstream fora do ar")
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def clean_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+class TestCircuitBreaker:
+    def test_open_half_open_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('x', failure_threshold=2, reset_timeout=10, clock=clock)
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == 'open'
+        assert not breaker.allow()
+
+        clock.now = 10
+        assert breaker.allow()               # teste half-open
+        assert not breaker.allow()           # só um teste por vez
+        breaker.record_failure()
+        assert breaker.state == 'open'
+
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == 'closed'
+        assert breaker.snapshot()['opened'] == 2
+
+    def test_call_raises_when_open(self):
+        breaker = CircuitBreaker('y', failure_threshold=1)
+        with pytest.raises(ZeroDivisionError):
+            breaker.call(lambda: 1 / 0)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: 1)
+
+    def test_guarded_get_skips_open_endpoints(self):
+        session = DeadSession()
+        for _ in range(10):
+            assert guarded_get(session, 'https://dead/games?limit=1', timeout=5) is None
+        # 3 falhas abrem o circuito; as demais chamadas nem tocam a rede
+        assert len(session.calls) == 3
+        assert breaker_metrics()['https://dead/games']['rejected'] == 7
+
+    def test_collector_cycle_is_cheap_when_upstream_down(self):
+        collector = BlazeDataCollectorV2()
+        collector.session = DeadSession()
+        for _ in range(3):                       # 3 falhas por endpoint abrem os circuitos
+            assert not collector.test_connectivity()
+        probes = len(collector.session.calls)
+
+        started = time.perf_counter()
+        for _ in range(10):
+            assert not collector.test_connectivity()
+            assert collector.get_double_history(10)       # fallback
+        assert time.perf_counter() - started < 0.5
+        assert len(collector.session.calls) == probes
+
+
+class TestDeadline:
+    def test_caps_timeouts_and_nests(self):
+        clock = FakeClock()
+        assert remaining_timeout(5) == 5
+        with Deadline(3, clock=clock):
+            assert remaining_timeout(5) == 3
+            with Deadline(10, clock=clock) as inner:
+                assert inner.remaining() == 3    # não estende o externo
+            clock.now = 4
+            assert remaining_timeout(5) == 0
+            assert guarded_get(DeadSession(), 'https://any', timeout=5) is None
+        assert remaining_timeout(5) == 5
+
+
+class TestRetry:
+    def test_backoff_with_jitter_and_stats(self, monkeypatch):
+        waits = []
+        monkeypatch.setattr(time, 'sleep', waits.append)
+        calls = []
+
+        @retry(max_attempts=4, delay=1.0, backoff=2.0, jitter=0.5, exceptions=(ConnectionError,))
+        def flaky():
+            calls.append(1)
+            if len(calls) < 4:
+                raise ConnectionError()
+            return 'ok'
+
+        assert flaky() == 'ok'
+        assert len(waits) == 3
+        for wait, base in zip(waits, (1.0, 2.0, 4.0)):
+            assert base <= wait <= base * 1.5
+        assert flaky.retry_stats == {'calls': 1, 'retries': 3, 'failures': 0}
+
+    def test_async_retry_does_not_block(self):
+        attempts = []
+
+        @retry(max_attempts=3, delay=0.01, jitter=0)
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RetryableError()
+            return 'ok'
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            task = asyncio.create_task(ticker())
+            result = await flaky()
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result == 'ok' and len(attempts) == 3
+        assert ticks > 1
+
+    def test_stops_at_deadline(self, monkeypatch):
+        monkeypatch.setattr(time, 'sleep', lambda s: pytest.fail("não deveria esperar"))
+
+        @retry(max_attempts=5, delay=2.0)
+        def always_fails():
+            raise RetryableError()
+
+        with Deadline(1.0):
+            with pytest.raises(RetryableError):
+                always_fails()
+        assert always_fails.retry_stats['failures'] == 1
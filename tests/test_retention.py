@@ -0,0 +1,190 @@
+"""
+Testes da retenção (database.retention)
+"""
+import gzip
+import sys
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import (
+    GameResultRepository, RetentionManager, RetentionPolicy,
+    init_db, log_file_lock
+)
+from database.models import EventModel, PerformanceMetricModel, SignalModel
+
+NOW = datetime(2024, 3, 1, 12, 30)
+LONG_AGO = int((datetime.now() - NOW).total_seconds() // 3600) + 24 * 60   # get_rollups usa o relógio real
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    return init_db(str(tmp_path / "test.db"), database_url='')
+
+
+def make_manager(session_factory, tmp_path, **policy):
+    policy = RetentionPolicy(archive_dir=str(tmp_path / 'archive'), log_files=(), **policy)
+    return RetentionManager(session_factory, policy, clock=lambda: NOW)
+
+
+def read_archive(directory):
+    frames = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            frames.append(pd.read_parquet(path) if name.endswith('.parquet')
+                          else pd.read_csv(path, compression='gzip'))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def crash_rounds(start, n, step=timedelta(minutes=20)):
+    return [{
+        'id': f"Crash_{start:%d%H%M}_{i}",
+        'game': 'Crash',
+        'timestamp': start + i * step,
+        'result': 'Suba' if i % 2 else 'Caia',
+        'price': 1.0 + i,
+        'odds': 1.0 + i,
+        'signal_id': 'sig' if i == 0 else None,
+        'signal_matched': i == 0,
+    } for i in range(n)]
+
+
+class TestRetentionManager:
+    def test_old_game_results_are_rolled_up_archived_and_deleted(self, session_factory, tmp_path):
+        repo = GameResultRepository(session_factory)
+        old_start = NOW - timedelta(days=40, hours=NOW.hour, minutes=NOW.minute)
+        repo.save_many(crash_rounds(old_start, 6))          # 2 horas antigas
+        repo.save_many(crash_rounds(NOW - timedelta(hours=1), 2))
+        manager = make_manager(session_factory, tmp_path)
+
+        report = manager.expire_table('game_results')
+
+        assert report['archived'] == 6
+        assert len(repo.get_all(limit=100)) == 2
+        archived = read_archive(tmp_path / 'archive' / 'game_results')
+        assert sorted(archived['price']) == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+        rollups = repo.get_rollups('Crash', hours=LONG_AGO)
+        assert [r['rounds'] for r in rollups] == [3, 3]
+        assert rollups[0]['wins'] == 1
+        assert rollups[0]['avg_price'] == pytest.approx(2.0)
+        assert (rollups[1]['min_price'], rollups[1]['max_price']) == (4.0, 6.0)
+        by_result = repo.get_rollups('Crash', hours=LONG_AGO, result='Suba')
+        assert sum(r['rounds'] for r in by_result) == 3
+        # Os agregados de rodadas não se misturam às métricas de sinais
+        session = session_factory()
+        try:
+            assert session.query(PerformanceMetricModel).count() == 0
+        finally:
+            session.close()
+
+    def test_late_rows_merge_into_existing_rollup(self, session_factory, tmp_path):
+        repo = GameResultRepository(session_factory)
+        hour = NOW - timedelta(days=40)
+        repo.save_many(crash_rounds(hour, 2, step=timedelta(minutes=1)))
+        manager = make_manager(session_factory, tmp_path)
+        manager.expire_table('game_results')
+
+        late = crash_rounds(hour, 3, step=timedelta(minutes=1))[2:]   # preço 3.0
+        late[0]['id'] = 'late'
+        repo.save_many(late)
+        manager.expire_table('game_results')
+
+        rollup = repo.get_rollups('Crash', hours=LONG_AGO)
+        assert len(rollup) == 1
+        assert rollup[0]['rounds'] == 3
+        assert rollup[0]['avg_price'] == pytest.approx(2.0)
+        assert rollup[0]['max_price'] == 3.0
+
+    def test_batches_and_pending_signals(self, session_factory, tmp_path):
+        session = session_factory()
+        old = NOW - timedelta(days=100)
+        for i in range(7):
+            session.add(SignalModel(id=f"s{i}", timestamp=old + timedelta(minutes=i),
+                                    game='Double', signal_type='Vermelho', confidence=0.7,
+                                    status='pending' if i == 0 else 'win', metadata_json={}))
+            session.add(EventModel(timestamp=old, level='ERROR', source='t', message=str(i)))
+        session.commit()
+        session.close()
+        manager = make_manager(session_factory, tmp_path, batch_size=2)
+
+        signals = manager.expire_table('signals')
+        events = manager.expire_table('events')
+
+        assert signals['archived'] == 6
+        assert signals['files'] == 3          # 3 lotes de 2, todos do mesmo dia
+        assert events['archived'] == 7
+        session = session_factory()
+        try:
+            assert [s.id for s in session.query(SignalModel).all()] == ['s0']
+            assert session.query(EventModel).count() == 0
+        finally:
+            session.close()
+
+    def test_table_without_policy_is_kept(self, session_factory, tmp_path):
+        GameResultRepository(session_factory).save_many(crash_rounds(NOW - timedelta(days=400), 2))
+        manager = make_manager(session_factory, tmp_path, hot_days={'raw_data': 7})
+
+        assert manager.expire_table('game_results')['archived'] == 0
+
+    def test_compact_log_file_keeps_header_and_tail(self, session_factory, tmp_path):
+        path = tmp_path / 'pipeline_metrics.csv'
+        path.write_text('timestamp,cycle\n' + ''.join(f"t{i},{i}\n" for i in range(100)))
+        manager = make_manager(session_factory, tmp_path, log_keep_lines=10, log_max_bytes=0)
+
+        assert manager.compact_log_file(str(path)) == 90
+        lines = path.read_text().splitlines()
+        assert lines[0] == 'timestamp,cycle'
+        assert lines[1:] == [f"t{i},{i}" for i in range(90, 100)]
+        archive_dir = tmp_path / 'archive' / 'logs'
+        archived = gzip.open(next(archive_dir.iterdir()), 'rt').read().splitlines()
+        assert archived[0] == 'timestamp,cycle' and len(archived) == 91
+
+    def test_compact_log_file_waits_for_writer_lock(self, session_factory, tmp_path):
+        path = tmp_path / 'pipeline_stats.json'
+        path.write_text(''.join(f'{{"i": {i}}}\n' for i in range(50)))
+        manager = make_manager(session_factory, tmp_path, log_keep_lines=10, log_max_bytes=0)
+        compacted = []
+
+        with log_file_lock(str(path)):
+            worker = threading.Thread(target=lambda: compacted.append(manager.compact_log_file(str(path))))
+            worker.start()
+            worker.join(0.2)
+            assert worker.is_alive()            # compactação espera quem está anexando
+            with open(path, 'a') as f:
+                f.write('{"i": 50}\n')
+        worker.join(5)
+
+        assert compacted == [41]
+        assert path.read_text().splitlines()[-1] == '{"i": 50}'
+
+    def test_vacuum_skipped_while_cycle_holds_lock(self, session_factory, tmp_path):
+        lock = threading.Lock()
+        manager = make_manager(session_factory, tmp_path)
+        manager.maintenance_lock = lock
+
+        with lock:
+            assert manager.vacuum() == 'skipped'
+        assert manager.vacuum() in ('optimize', 'vacuum')
+        assert not lock.locked()
+
+    def test_small_log_file_is_untouched(self, session_factory, tmp_path):
+        path = tmp_path / 'pipeline_stats.json'
+        path.write_text('{"a": 1}\n')
+        manager = make_manager(session_factory, tmp_path, log_keep_lines=0)
+
+        assert manager.compact_log_file(str(path)) == 0
+        assert path.read_text() == '{"a": 1}\n'
+
+    def test_run_reports_every_table_and_vacuum(self, session_factory, tmp_path):
+        report = make_manager(session_factory, tmp_path).run()
+
+        assert set(report['tables']) == {'game_results', 'raw_data', 'events', 'signals'}
+        assert report['vacuum'] in ('optimize', 'vacuum')
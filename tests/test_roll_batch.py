@@ -0,0 +1,154 @@
+"""
+Testes do RollBatch (rodadas em colunas)
+"""
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import RollBatch
+from core.rolls import HAS_PYARROW
+from data_collection.blaze_client_v2 import BlazeDataCollectorV2
+
+
+def double_records(n, start=0):
+    return [{
+        'type': 'double',
+        'color': ('RED', 'BLACK', 'WHITE')[i % 3],
+        'result': ('red', 'black', 'white')[i % 3],
+        'game_id': f"double_{i}",
+        'timestamp': f"2024-01-01T10:00:{i:02d}",
+        'created_at': f"2024-01-01T10:00:{i:02d}Z",
+        'roll': (4, 11, 0)[i % 3],
+    } for i in range(start, n)]
+
+
+def crash_records(n):
+    return [{
+        'type': 'crash',
+        'crash_point': 1.5 + i,
+        'game_id': f"crash_{i}",
+        'timestamp': f"2024-01-01T10:00:{i:02d}",
+    } for i in range(n)]
+
+
+class TestRollBatch:
+    def test_from_records_builds_typed_columns(self):
+        batch = RollBatch.from_records(double_records(3), 'double', source='stream')
+
+        assert len(batch) == 3
+        assert batch.colors.tolist() == [1, -1, 0]
+        assert batch.rolls.tolist() == [4, 11, 0]
+        assert batch.timestamps.dtype == np.int64
+        assert batch.datetimes()[1] == np.datetime64('2024-01-01T10:00:01')
+        assert batch.color_names() == ['red', 'black', 'white']
+        assert batch.source == 'stream' and batch.last_id == 'double_2'
+
+    def test_blaze_color_codes_and_missing_fields(self):
+        batch = RollBatch.from_records(
+            [{'id': 7, 'color': 2, 'created_at': '2024-01-01T10:00:00Z'}, {'color': 'Vermelho'}],
+            'double')
+
+        assert batch.ids.tolist() == ['7', '']
+        assert batch.color_names(lower=False) == ['BLACK', 'RED']
+        assert batch.rolls.tolist() == [-1, -1]
+        assert np.isnat(batch.datetimes()[1])
+        assert not batch.has_rolls
+
+    def test_columns_are_read_only_and_slices_are_views(self):
+        batch = RollBatch.from_records(double_records(10), 'double')
+        tail = batch.tail(4)
+
+        assert np.shares_memory(tail.timestamps, batch.timestamps)
+        assert tail.ids.tolist() == [f"double_{i}" for i in range(6, 10)]
+        with pytest.raises(ValueError):
+            batch.colors[0] = 0
+        assert batch[-1].last_id == 'double_9'
+
+    def test_since_returns_only_new_rounds(self):
+        batch = RollBatch.from_records(double_records(10), 'double')
+
+        assert len(batch.since('double_6')) == 3
+        assert len(batch.since('double_9')) == 0
+        assert len(batch.since('desconhecida')) == 10
+        assert len(batch.since(None)) == 10
+
+    def test_from_records_sorts_newest_first_api(self):
+        records = double_records(10)
+        batch = RollBatch.from_records(records[::-1], 'double')
+
+        assert batch.ids.tolist() == [r['game_id'] for r in records]
+        assert batch.last_id == 'double_9'
+        assert batch.color_names(lower=False) == [r['color'] for r in records]
+        # Próximo ciclo (de novo da mais nova para a mais antiga): só as rodadas novas
+        following = RollBatch.from_records(double_records(13, start=3)[::-1], 'double')
+        assert following.since(batch.last_id).ids.tolist() == ['double_10', 'double_11', 'double_12']
+
+    def test_to_frame_shares_numeric_columns(self):
+        double = RollBatch.from_records(double_records(6), 'double')
+        crash = RollBatch.from_records(crash_records(4), 'crash')
+
+        df_double = double.to_frame()
+        df_crash = crash.to_frame()
+
+        assert list(df_double.columns) == ['game_id', 'timestamp', 'color', 'roll']
+        assert df_double['color'].value_counts()['RED'] == 2
+        assert np.shares_memory(df_double['roll'].to_numpy(), double.rolls)
+        assert list(df_crash.columns) == ['game_id', 'timestamp', 'crash_point']
+        assert np.shares_memory(df_crash['crash_point'].to_numpy(), crash.crash_points)
+        assert pd.api.types.is_datetime64_any_dtype(df_crash['timestamp'])
+
+        # Colunas novas ou substituídas não tocam o lote; escrita in-place é recusada
+        df_crash['crash_point'] = df_crash['crash_point'] * 2
+        assert crash.crash_points[0] == 1.5
+        with pytest.raises(ValueError):
+            df_double.loc[0, 'roll'] = 3
+
+    def test_frame_without_rolls_omits_column(self):
+        records = double_records(3)
+        for record in records:
+            del record['roll']
+
+        assert 'roll' not in RollBatch.from_records(records, 'double').to_frame().columns
+
+    def test_to_records_for_persistence(self):
+        double = RollBatch.from_records(double_records(2), 'double').to_records()
+        crash = RollBatch.from_records(crash_records(1), 'crash').to_records()
+
+        assert double[1] == {'type': 'double', 'id': 'double_1', 'game_id': 'double_1',
+                             'timestamp': datetime(2024, 1, 1, 10, 0, 1), 'color': 'BLACK',
+                             'result': 'black', 'roll': 11}
+        assert crash[0]['price'] == crash[0]['crash_point'] == 1.5
+
+    def test_concat_and_length_check(self):
+        batch = RollBatch.concat([RollBatch.from_records(double_records(3), 'double'),
+                                  RollBatch.from_records(double_records(5, start=3), 'double')])
+
+        assert batch.ids.tolist() == [f"double_{i}" for i in range(5)]
+        with pytest.raises(ValueError):
+            RollBatch('double', ['a', 'b'], [0])
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow não instalado")
+    def test_to_arrow(self):
+        table = RollBatch.from_records(crash_records(3), 'crash').to_arrow()
+
+        assert table.column('crash_point').to_pylist() == [1.5, 2.5, 3.5]
+
+
+class TestCollectorBatches:
+    def test_get_all_batches_from_fallback(self, monkeypatch):
+        collector = BlazeDataCollectorV2()
+        monkeypatch.setattr(collector, 'save_cache', lambda *args: None)
+
+        data = collector.get_all_batches(limit=20)
+
+        assert isinstance(data['double'], RollBatch) and len(data['double']) == 20
+        assert data['crash'].game == 'crash' and not np.isnan(data['crash'].crash_points).any()
+        assert data['double'].source == data['source'] == 'fallback'
+        assert set(data['double'].color_names()) <= {'red', 'black'}
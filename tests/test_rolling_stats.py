@@ -0,0 +1,110 @@
+"""
+Testes de métricas de janela deslizante (learning.rolling_stats)
+
+Os acumuladores O(1) devem bater com o recálculo direto sobre a janela.
+"""
+import pytest
+import sys
+import os
+import random
+from datetime import datetime
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from learning.rolling_stats import RollingSum, RollingMaxStreak, DrawdownTracker
+from learning.feedback_loop import FeedbackLoop, SignalResult
+from learning.meta_learner import MetaLearner, MetaContext
+
+
+def _max_streak(flags):
+    best = current = 0
+    for flag in flags:
+        current = current + 1 if flag else 0
+        best = max(best, current)
+    return best
+
+
+class TestAccumulators:
+    @pytest.mark.parametrize("size", [1, 3, 50])
+    def test_rolling_sum_matches_window(self, size):
+        rng = random.Random(size)
+        acc = RollingSum(size)
+        values = []
+        for _ in range(500):
+            value = rng.uniform(-10, 20)
+            values.append(value)
+            acc.push(value)
+            window = values[-size:]
+            assert acc.count == len(window)
+            assert acc.sum == pytest.approx(sum(window))
+
+    @pytest.mark.parametrize("size,p", [(1, 0.5), (7, 0.3), (100, 0.5), (100, 0.9)])
+    def test_max_streak_matches_window(self, size, p):
+        rng = random.Random(size)
+        acc = RollingMaxStreak(size)
+        flags = []
+        for _ in range(1500):
+            flag = rng.random() < p
+            flags.append(flag)
+            acc.push(flag)
+            assert acc.max_streak == _max_streak(flags[-size:])
+
+    def test_drawdown_tracker(self):
+        tracker = DrawdownTracker()
+        for payout in [10, 5, -8, -4, 6, -12, 20]:
+            tracker.push(payout)
+        # Curva: 10, 15, 7, 3, 9, -3, 17
+        assert tracker.peak == 17
+        assert tracker.max_drawdown == 18
+        assert tracker.current_drawdown == 0
+
+
+class TestFeedbackLoopRolling:
+    def test_metrics_match_recomputation(self):
+        rng = random.Random(11)
+        feedback = FeedbackLoop(min_samples=20)
+        history = []
+        for i in range(300):
+            won = rng.random() < 0.5
+            result = SignalResult(
+                signal_id=f"sig_{i}", signal_type='Vermelho', game_type='Double',
+                confidence=0.7, bet_size=10.0, odds=1.9, timestamp=datetime.now(),
+                result='WIN' if won else 'LOSS', payout=rng.uniform(0, 19) if won else -10.0,
+                context_hour=12, context_day=2, strategy_used='Strategy1',
+                expected_wr=rng.uniform(0.55, 0.7), actual_wr_24h=0.6
+            )
+            history.append(result)
+            feedback.record_result(result)
+
+        recent = history[-50:]
+        gain = sum(r.payout for r in recent)
+        loss = abs(sum(r.payout for r in recent if r.payout < 0))
+        assert feedback.stats['current_wr'] == pytest.approx(
+            sum(r.result == 'WIN' for r in recent) / 50)
+        assert feedback.stats['current_roi'] == pytest.approx(1.0 + (gain - loss) / 100.0)
+        assert feedback.stats['equity'] == pytest.approx(sum(r.payout for r in history))
+
+        window = history[-100:]
+        adjustments = {a.parameter: a for a in feedback.analyze_and_adjust()}
+        expected = sum(r.expected_wr for r in window) / 100
+        desvio = sum(r.result == 'WIN' for r in window) / 100 - expected
+        assert ('min_confidence' in adjustments) == (abs(desvio) >= feedback.adjustment_threshold)
+        assert all(a.samples_used == 100 for a in adjustments.values())
+
+
+class TestMetaLearnerCounters:
+    def test_strategy_performance_after_eviction(self):
+        rng = random.Random(5)
+        meta = MetaLearner(max_training_samples=200)
+        context = MetaContext(datetime.now(), 12, 2, 3, 'Double', 0.6, 1.0, 80)
+
+        for _ in range(450):
+            meta.add_training_sample(context, [rng.randrange(1, 7)])
+
+        assert meta.samples_seen == 450
+        for strategy_id in range(1, 7):
+            perf = meta.get_strategy_performance(strategy_id)
+            wins = sum(1 for _, t, _ in meta.training_data if t == strategy_id - 1)
+            assert perf['samples'] == 200
+            assert perf['wins'] == wins
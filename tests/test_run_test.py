@@ -0,0 +1,116 @@
+"""
+Testes do Run Test (Strategy6): distribuição exata e contagem incremental
+"""
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.monte_carlo_strategy import (
+    EXACT_RUNS_MAX_N, RunsAccumulator, StrategyResult, Strategy6_RunTestValidation,
+    runs_critical_table, runs_distribution, runs_test
+)
+
+
+def _count_runs(sequence):
+    return 1 + sum(1 for a, b in zip(sequence, sequence[1:]) if a != b)
+
+
+def _brute_force(n1, n2):
+    """Frequência de cada nº de runs enumerando todos os arranjos"""
+    n = n1 + n2
+    freq = [0] * (n + 1)
+    for reds in itertools.combinations(range(n), n1):
+        sequence = ['B'] * n
+        for i in reds:
+            sequence[i] = 'R'
+        freq[_count_runs(sequence)] += 1
+    total = sum(freq)
+    return [f / total for f in freq]
+
+
+class TestExactDistribution:
+    @pytest.mark.parametrize('n1,n2', [(1, 1), (2, 3), (4, 4), (5, 7), (6, 2), (8, 6)])
+    def test_matches_enumeration(self, n1, n2):
+        below, above = runs_distribution(n1, n2)
+        probabilities = _brute_force(n1, n2)
+        assert below == pytest.approx(list(itertools.accumulate(probabilities)))
+        assert above[0] == pytest.approx(1.0)
+        assert above[-1] == pytest.approx(probabilities[-1])
+
+    def test_critical_values_from_enumeration(self):
+        table = runs_critical_table(0.05)
+        assert table.shape == (EXACT_RUNS_MAX_N + 1, EXACT_RUNS_MAX_N + 1, 2)
+        for n1, n2 in [(5, 7), (8, 6), (7, 7)]:
+            probabilities = _brute_force(n1, n2)
+            lower, upper = table[n1, n2]
+            assert sum(probabilities[:lower + 1]) <= 0.025 < sum(probabilities[:lower + 2])
+            assert sum(probabilities[upper:]) <= 0.025 < sum(probabilities[upper - 1:])
+
+    def test_published_critical_values(self):
+        # Tabela clássica (alpha = 0.05 bilateral)
+        table = runs_critical_table(0.05)
+        assert tuple(table[10, 10]) == (6, 16)
+        assert tuple(table[20, 20]) == (14, 28)
+
+    def test_exact_differs_from_normal_on_short_sequences(self):
+        # 10 cores, 5x5 e 3 runs: z ≈ -2.01 (normal rejeitaria), p exato ≈ 0.079
+        result = runs_test(3, 5, 5)
+        assert result.method == 'exact'
+        assert result.z_score < -1.96
+        assert not result.has_clusters
+        assert result.p_value == pytest.approx(2 * 10 / 252)
+
+    def test_normal_approximation_for_long_sequences(self):
+        result = runs_test(10, 25, 25)
+        assert result.method == 'normal'
+        assert result.has_clusters and not result.is_random
+
+
+class TestRunsAccumulator:
+    def test_streaming_window_matches_batch(self):
+        rng = random.Random(3)
+        colors = [rng.choice(['vermelho', 'preto', 'red', 'black']) for _ in range(300)]
+        stream = RunsAccumulator(window=20)
+        for i, color in enumerate(colors):
+            stream.push(color)
+            batch = RunsAccumulator.from_sequence(colors[max(0, i - 19):i + 1])
+            assert (stream.runs, stream.n_red, stream.n_black, stream.clusters) == \
+                   (batch.runs, batch.n_red, batch.n_black, batch.clusters)
+            assert stream.cluster_info() == batch.cluster_info()
+
+    def test_strategy_numeric_details(self):
+        strategy = Strategy6_RunTestValidation()
+        sequence = ['vermelho'] * 6 + ['preto'] * 6
+        result, confidence, details = strategy.analyze({'color_sequence': sequence})
+
+        assert result == StrategyResult.PASS and confidence == 0.85
+        assert details['actual_runs'] == 2
+        assert isinstance(details['z_score'], float)
+        assert details['expected_runs'] == pytest.approx(7.0)
+        assert details['method'] == 'exact'
+        assert details['run_analysis']['cluster_info']['max_cluster_length'] == 6
+
+        stream_result = strategy.analyze_stream(RunsAccumulator.from_sequence(sequence))
+        assert stream_result == (result, confidence, details)
+
+    def test_shared_instance_across_threads(self):
+        rng = random.Random(5)
+        colors = [rng.choice(['vermelho', 'preto']) for _ in range(400)]
+        windows = [colors[end - 10:end] for end in range(10, len(colors))]
+        expected = [Strategy6_RunTestValidation().analyze({'color_sequence': w}) for w in windows]
+        strategy = Strategy6_RunTestValidation()
+
+        def worker(offset):
+            return [strategy.analyze({'color_sequence': w}) for w in windows[offset:] + windows[:offset]]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(worker, range(0, 400, 100)))
+        for offset, result in zip(range(0, 400, 100), results):
+            assert result == expected[offset:] + expected[:offset]
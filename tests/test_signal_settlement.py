@@ -0,0 +1,85 @@
+"""
+Testes da liquidação dos sinais (analysis.signal_settlement)
+"""
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import RollBatch
+from core.rolls import RED, BLACK, WHITE
+from analysis.signal_settlement import SignalSettler
+from analysis.result_tracker import ResultTracker
+from analysis.strategy_pipeline import Signal, StrategyResult
+from learning.calibration import ConfidenceCalibrator
+
+
+def double_batch(colors, start=0):
+    ids = [f"r{start + i}" for i in range(len(colors))]
+    return RollBatch('Double', ids, list(range(start, start + len(colors))), colors)
+
+
+def pipeline_signal(signal_id, signal_type='Vermelho', confidence=0.8):
+    signal = Signal(signal_id, signal_type, 0.7, datetime(2024, 1, 1))
+    signal.add_strategy_result('Strategy1_Pattern', StrategyResult.PASS, confidence)
+    signal.add_strategy_result('Strategy4_Confirmation', StrategyResult.PASS, confidence)
+    signal.final_confidence = confidence
+    return signal
+
+
+class TestSignalSettler:
+    def test_settles_with_next_roll(self):
+        settler = SignalSettler()
+        first = double_batch([RED, BLACK])
+        assert settler.open('red', pipeline_signal('red'), first.last_id, bet_size=10.0, odds=2.0)
+        assert settler.open('black', pipeline_signal('black', 'Preto'), first.last_id)
+        assert not settler.open('crash', pipeline_signal('crash', 'Suba'), first.last_id)
+
+        assert settler.settle(first) == []          # próxima rodada ainda não saiu
+        assert len(settler) == 2
+
+        settled = settler.settle(double_batch([RED, BLACK, RED, WHITE]))
+        outcomes = {entry.signal_id: outcome for entry, outcome in settled}
+        assert (outcomes['red'].result, outcomes['red'].payout, outcomes['red'].roll_id) == ('WIN', 10.0, 'r2')
+        assert outcomes['black'].result == 'LOSS'
+        assert len(settler) == 0
+
+    def test_white_is_loss_and_gap_drops_signal(self):
+        settler = SignalSettler()
+        settler.open('a', pipeline_signal('a'), 'r1', bet_size=5.0)
+        settler.open('b', pipeline_signal('b'), 'r0')
+
+        settled = settler.settle(double_batch([BLACK, WHITE, BLACK], start=1))
+        assert [(entry.signal_id, outcome.result, outcome.payout)
+                for entry, outcome in settled] == [('a', 'LOSS', -5.0)]
+        assert len(settler) == 0                    # 'b': rodada r0 fora do lote
+
+
+class TestSettlementCalibration:
+    def test_settled_signal_publishes_curve(self, tmp_path):
+        """Caminho do main: sinal enviado → rodada seguinte → tracker + calibração → curva"""
+        calibrator = ConfidenceCalibrator(min_samples=1, refresh_every=1)
+        tracker = ResultTracker(str(tmp_path / 'history.json'))
+        settler = SignalSettler()
+        signal = pipeline_signal('sig_1')
+        assert calibrator.calibrate(signal.final_confidence, 'Double', signal.passed_strategies) is None
+
+        tracker.save_signal({'signal_id': 'sig_1', 'signal_type': signal.signal_type,
+                             'confidence': signal.final_confidence, 'timestamp': datetime(2024, 1, 1),
+                             'strategies': '+'.join(signal.passed_strategies)})
+        settler.open('sig_1', signal, 'r9')
+
+        for entry, outcome in settler.settle(double_batch([BLACK, RED], start=9)):
+            tracker.register_result(entry.signal_id, outcome.result == 'WIN')
+            assert calibrator.record_signal(entry.signal, outcome.result == 'WIN', 'Double')
+
+        assert tracker.get_stats()['wins'] == 1
+        assert calibrator.should_refresh()
+        assert calibrator.refresh(save=False) == 2      # curva do jogo e da combinação
+        calibrated = calibrator.calibrate(signal.final_confidence, 'Double', signal.passed_strategies)
+        assert calibrated is not None
+        assert calibrated > signal.final_confidence     # um acerto puxa a faixa para cima
@@ -0,0 +1,261 @@
+"""
+Testes do StrategyPipeline - avaliação com curto-circuito
+"""
+import pytest
+import sys
+import os
+import random
+import numpy as np
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.strategy_pipeline import (
+    StrategyPipeline, Signal, StrategyResult, BATCH_STAGES, RESULT_MEMBERS
+)
+
+
+def _random_signal_data(rng):
+    n = rng.choice([5, 15, 40, 120])
+    colors = [rng.choice(['vermelho', 'preto']) for _ in range(n)]
+    return {
+        'all_colors': colors,
+        'recent_colors': colors[-10:],
+        'initial_confidence': rng.choice([0.30, 0.45, 0.60, 0.72, 0.90]),
+        'prices': [rng.random() * 10 for _ in range(rng.choice([0, 8, 30]))],
+    }
+
+
+class TestShortCircuitEvaluation:
+    """Curto-circuito (decide) não pode alterar o resultado do finalize()"""
+
+    def test_decide_matches_full_evaluation(self):
+        rng = random.Random(42)
+        fast = StrategyPipeline(short_circuit=True)
+        full = StrategyPipeline(short_circuit=False)
+
+        for _ in range(150):
+            data = _random_signal_data(rng)
+            signal = full.process_signal(data)
+            assert fast.decide(data) == full.decide(data) == \
+                   (signal.is_valid, signal.final_confidence, signal.signal_type)
+
+    def test_signal_fields_independent_of_costs(self):
+        rng = random.Random(5)
+        reference = StrategyPipeline(short_circuit=True)
+        fast = StrategyPipeline(short_circuit=True)
+        # Custos medidos invertidos: process_signal usa a ordem fixa
+        for stage in fast.stages.values():
+            stage.cost = -stage.cost
+
+        for _ in range(60):
+            data = _random_signal_data(rng)
+            fast.decide(data)
+            a, b = fast.process_signal(data), reference.process_signal(data)
+            assert a.strategy_results == b.strategy_results
+            assert a.strategy_details == b.strategy_details
+            assert (a.is_valid, a.final_confidence, a.signal_type, a.strategies_passed) == \
+                   (b.is_valid, b.final_confidence, b.signal_type, b.strategies_passed)
+            assert a.passed_strategies == b.passed_strategies
+
+    def test_process_signal_short_circuit_matches_full(self):
+        rng = random.Random(11)
+        fast = StrategyPipeline(short_circuit=True)
+        full = StrategyPipeline(short_circuit=False)
+
+        for _ in range(100):
+            data = _random_signal_data(rng)
+            a, b = fast.process_signal(data), full.process_signal(data)
+            assert (a.is_valid, a.final_confidence, a.signal_type) == \
+                   (b.is_valid, b.final_confidence, b.signal_type)
+            # As engrenagens executadas têm o mesmo resultado da avaliação completa
+            assert all(b.strategy_results[name] == value for name, value in a.strategy_results.items())
+            assert a.strategies_passed == len(a.passed_strategies)
+            assert list(b.strategy_results) == list(StrategyPipeline.STAGE_ORDER)
+
+        stats = fast.get_evaluation_stats()
+        for name, counters in stats['strategies'].items():
+            assert counters['runs'] + counters['skips'] == 100, name
+        assert stats['strategies']['Strategy5_MonteCarlo']['skips'] > 0
+
+    def test_process_signal_skips_decided_signal(self):
+        pipeline = StrategyPipeline()
+        colors = ['vermelho'] * 2 + ['preto'] * 8
+        # Padrão forte + confiança alta: válido e saturado em 0.99 após a engrenagem 1
+        signal = pipeline.process_signal({'all_colors': colors * 5, 'recent_colors': colors,
+                                          'initial_confidence': 0.90})
+
+        assert signal.is_valid and signal.final_confidence == 0.99
+        assert list(signal.strategy_results) == ['Strategy1_Pattern']
+        stats = pipeline.get_evaluation_stats()['strategies']
+        assert stats['Strategy5_MonteCarlo'] == {**stats['Strategy5_MonteCarlo'], 'runs': 0, 'skips': 1}
+
+    def test_skip_counters(self):
+        pipeline = StrategyPipeline()
+        rng = random.Random(7)
+        for _ in range(20):
+            pipeline.decide(_random_signal_data(rng))
+
+        stats = pipeline.get_evaluation_stats()
+        assert stats['signals_evaluated'] == 20
+        for name, counters in stats['strategies'].items():
+            assert counters['runs'] + counters['skips'] == 20, name
+        # Monte Carlo (o mais caro) só roda depois de todas as outras etapas
+        monte_carlo = stats['strategies']['Strategy5_MonteCarlo']
+        assert monte_carlo['skips'] > 0
+        assert all(monte_carlo['runs'] <= counters['runs'] for counters in stats['strategies'].values())
+
+        # process_signal() também conta execuções e pulos
+        pipeline.process_signal(_random_signal_data(rng))
+        for counters in pipeline.get_evaluation_stats()['strategies'].values():
+            assert counters['runs'] + counters['skips'] == 21
+
+    def test_results_recorded_in_canonical_order(self):
+        pipeline = StrategyPipeline(short_circuit=False)
+        colors = ['vermelho'] * 2 + ['preto'] * 8
+        signal = pipeline.process_signal({
+            'all_colors': colors * 5,
+            'recent_colors': colors,
+            'initial_confidence': 0.60,
+            'prices': [1.0, 2.0, 1.5, 3.0, 2.5, 1.0, 4.0],
+        })
+        assert list(signal.strategy_results) == list(StrategyPipeline.STAGE_ORDER)
+
+    def test_outcome_determined(self):
+        # Nenhuma estratégia restante pode passar: sempre decidido
+        assert Signal.is_outcome_determined(0.72, 1, 0, 3)
+        # Confiança já saturada em 0.99 e sinal válido
+        assert Signal.is_outcome_determined(0.90, 2, 2, 3)
+        # Ainda pode virar válido
+        assert not Signal.is_outcome_determined(0.40, 0, 3, 3)
+        # Baixa confiança e sem chance de atingir o mínimo
+        assert Signal.is_outcome_determined(0.40, 0, 2, 3)
+
+
+class TestBatchWindows:
+    """process_windows deve reproduzir process_signal linha a linha"""
+
+    def _windows(self, n, total, points, seed=3):
+        rng = np.random.default_rng(seed)
+        colors = rng.choice(['vermelho', 'preto', 'branco', 'RED'], (n, total), p=[.45, .45, .05, .05])
+        prices = rng.integers(0, 15, (n, points)).astype(float) if points else None
+        initial = rng.choice([0.30, 0.45, 0.60, 0.72, 0.90], n)
+        return colors, prices, initial
+
+    @pytest.mark.parametrize("total,points", [(5, 0), (12, 8), (40, 30), (120, 4)])
+    def test_matches_process_signal(self, total, points):
+        pipeline = StrategyPipeline(short_circuit=False)
+        colors, prices, initial = self._windows(40, total, points)
+        batch = pipeline.process_windows(colors, prices, initial)
+
+        for i in range(len(batch)):
+            signal = pipeline.process_signal({
+                'all_colors': list(colors[i]),
+                'recent_colors': list(colors[i][-10:]),
+                'prices': list(prices[i]) if prices is not None else [],
+                'initial_confidence': initial[i],
+            })
+            assert batch.is_valid[i] == signal.is_valid
+            assert batch.final_confidence[i] == pytest.approx(signal.final_confidence)
+            for name, key in BATCH_STAGES:
+                result, confidence = signal.strategy_results[name]
+                assert RESULT_MEMBERS[batch.results[key + '_result'][i]] == result, name
+                assert batch.results[key + '_confidence'][i] == pytest.approx(confidence), name
+
+            lazy = batch.signal(i)
+            assert lazy.signal_type == signal.signal_type
+            assert lazy.passed_strategies == signal.passed_strategies
+            assert lazy.is_valid == signal.is_valid
+            assert lazy.final_confidence == pytest.approx(signal.final_confidence)
+
+    def test_integer_codes_and_lazy_signals(self):
+        pipeline = StrategyPipeline()
+        codes = np.array([[1] * 8 + [-1] * 2] * 3 + [[1, -1] * 5], dtype=np.int8)
+        batch = pipeline.process_windows(codes, initial_confidence=0.60)
+
+        assert len(batch) == 4
+        assert batch.results['signal_type'].tolist() == [2, 2, 2, 0]
+        valid = batch.valid_signals()
+        assert len(valid) == int(batch.is_valid.sum())
+        assert all(s.signal_type == 'Preto' for s in valid)
+
+    def test_rejects_mismatched_prices(self):
+        with pytest.raises(ValueError):
+            StrategyPipeline().process_windows(np.ones((3, 10)), np.ones((2, 10)))
+
+
+class TestCompactSignal:
+    """Signal com __slots__, códigos por engrenagem e detalhes legíveis sob demanda"""
+
+    DATA = {
+        'all_colors': (['vermelho'] * 2 + ['preto'] * 8) * 5,
+        'recent_colors': ['vermelho'] * 2 + ['preto'] * 8,
+        'initial_confidence': 0.40,
+        'prices': [1.0, 2.0, 1.5, 3.0, 2.5, 1.0, 4.0, 2.0, 3.5, 1.2, 2.2, 0.8, 3.1, 2.7, 1.9],
+    }
+
+    def test_signal_has_no_instance_dict(self):
+        signal = StrategyPipeline().process_signal(self.DATA)
+
+        assert not hasattr(signal, '__dict__')
+        with pytest.raises(AttributeError):
+            signal.extra = 1
+        # Anotações da FASE 2 feitas pelo main continuam permitidas
+        signal.optimal_bet_fraction = 0.25
+        assert signal.meta_context is None
+
+    def test_details_are_raw_until_rendered(self):
+        signal = StrategyPipeline(short_circuit=False).process_signal(self.DATA)
+
+        raw = signal.raw_details('Strategy2_Technical')
+        assert isinstance(raw['rsi'], float) and isinstance(raw['volatility_ratio'], float)
+        rendered = signal.strategy_details['Strategy2_Technical']
+        assert rendered['rsi'] == round(raw['rsi'], 2)
+        assert rendered['volatility'] == f"{raw['volatility']} ({raw['volatility_ratio']:.4f})"
+        assert 'volatility_ratio' not in rendered
+        confirmation = signal.strategy_details['Strategy4_Confirmation']
+        assert confirmation['streak_confirmation'] == f"SIM (streak={confirmation['max_streak']})"
+        # Renderizar não altera os brutos
+        assert 'volatility_ratio' in signal.raw_details('Strategy2_Technical')
+
+    def test_foreign_result_enums_round_trip(self):
+        from analysis.monte_carlo_strategy import StrategyResult as MCResult
+        signal = StrategyPipeline(short_circuit=False).process_signal(self.DATA)
+
+        result, _ = signal.strategy_results['Strategy6_RunTest']
+        assert isinstance(result, MCResult)
+        assert 'Z=' in signal.strategy_details['Strategy6_RunTest']['randomness_test']['interpretation']
+
+    def test_passed_strategies_include_foreign_pass(self):
+        from analysis.monte_carlo_strategy import StrategyResult as MCResult
+        signal = Signal('s', 'Vermelho', 0.6, None)
+        signal.add_strategy_result('Strategy1_Pattern', StrategyResult.PASS, 0.8)
+        signal.add_strategy_result('Strategy2_Technical', StrategyResult.WEAK, 0.6)
+        signal.add_strategy_result('Strategy5_MonteCarlo', MCResult.WEAK, 0.6)
+        signal.add_strategy_result('Strategy6_RunTest', MCResult.PASS, 0.85)
+
+        assert signal.passed_strategies == ('Strategy1_Pattern', 'Strategy6_RunTest')
+        # Uma só definição de PASS: contagem, chave da calibração e resumo
+        assert signal.strategies_passed == len(signal.passed_strategies) == 2
+        signal.finalize(required_strategies=2)
+        assert signal.summary().endswith('Strategy1_Pattern, Strategy6_RunTest')
+
+    def test_monte_carlo_is_deterministic(self):
+        a = StrategyPipeline(short_circuit=False).process_signal(self.DATA)
+        b = StrategyPipeline(short_circuit=False).process_signal(self.DATA)
+
+        assert a.strategy_results['Strategy5_MonteCarlo'] == b.strategy_results['Strategy5_MonteCarlo']
+        assert a.raw_details('Strategy5_MonteCarlo') == b.raw_details('Strategy5_MonteCarlo')
+
+    def test_keep_details_false_drops_details_only(self):
+        full = StrategyPipeline(short_circuit=False).process_signal(self.DATA)
+        lean = StrategyPipeline(short_circuit=False, keep_details=False).process_signal(self.DATA)
+
+        assert lean.strategy_details == {}
+        assert lean.strategy_results == full.strategy_results
+        assert (lean.is_valid, lean.final_confidence) == (full.is_valid, full.final_confidence)
+
+    def test_unknown_stage_is_rejected(self):
+        signal = Signal('s', 'Vermelho', 0.6, None)
+        with pytest.raises(KeyError):
+            signal.add_strategy_result('Strategy7', StrategyResult.PASS, 0.9)
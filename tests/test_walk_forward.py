@@ -0,0 +1,91 @@
+"""
+Testes do backtest walk-forward (resolução contra as rodadas reais)
+"""
+import pytest
+import sys
+import os
+import json
+import numpy as np
+from datetime import datetime, timedelta
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analysis.walk_forward import WalkForwardBacktester, SweepLearner, first_hit_offsets
+from analysis.backtester import Backtester
+
+COLOR_CODE = {'red': 1, 'black': -1, 'white': 0}
+
+
+def _records(n=600, seed=5):
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 3, 1, 12, 0, 0)
+    return [{
+        'color': str(rng.choice(['red', 'black', 'white'], p=[0.47, 0.47, 0.06])),
+        'roll': int(rng.integers(0, 15)),
+        'created_at': (start + timedelta(seconds=30 * i)).isoformat() + 'Z',
+    } for i in range(n)]
+
+
+def test_first_hit_offsets_brute_force():
+    rng = np.random.default_rng(0)
+    outcomes = rng.choice([1, -1, 0], 200).astype(np.int8)
+    for attempts in (1, 2, 3):
+        offsets = first_hit_offsets(outcomes, 1, attempts)
+        for i in range(len(outcomes)):
+            ahead = list(outcomes[i:i + attempts])
+            if 1 in ahead:
+                assert offsets[i] == ahead.index(1)
+            else:
+                assert offsets[i] == (-1 if len(ahead) == attempts else -2)
+
+
+@pytest.mark.parametrize("attempts", [1, 2])
+def test_trades_resolved_against_next_rolls(attempts):
+    records = _records()
+    wf = WalkForwardBacktester(records, window_size=20, stake=10.0, attempts=attempts)
+    report = wf.run(test_size=len(wf))
+    fold = wf.fold(0, len(wf))
+    trades = wf.resolve(fold, wf.decide(fold))
+
+    assert report['summary']['total_trades'] == len(trades) > 0
+    for trade in trades.itertuples():
+        bet = 1 if trade.signal_type == 'Vermelho' else -1
+        following = [COLOR_CODE[r['color']] for r in records[trade.window + 20:trade.window + 20 + attempts]]
+        hit = bet in following
+        assert trade.result == ('WIN' if hit else 'LOSS')
+        if hit:
+            # Gale: stakes 10, 20, ...; acerto sempre devolve o stake inicial
+            assert trade.profit_loss == pytest.approx(10.0)
+        else:
+            assert trade.profit_loss == pytest.approx(-10.0 * (2 ** attempts - 1))
+        # Horário do sinal = última rodada da janela (não datetime.now())
+        assert trade.signal_time == np.datetime64(records[trade.window + 19]['created_at'][:-1])
+
+
+def test_rolling_folds_stream_to_disk(tmp_path):
+    wf = WalkForwardBacktester(_records(), window_size=20)
+    output = tmp_path / 'wf.jsonl'
+    report = wf.run(train_size=200, test_size=100, learner=SweepLearner(
+        {'technical_pass': [0.70, 0.99], 'records_moderate': [10, 30]}, min_bets=5),
+        output_path=output)
+
+    assert report['summary']['folds'] == len(report['folds']) == 3
+    assert [f['test_start'] for f in report['folds']] == [200, 300, 400]
+    lines = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert len(lines) == report['summary']['total_trades']
+    assert {line['fold'] for line in lines} <= {0, 1, 2}
+    assert all(200 <= line['window'] < 500 for line in lines)
+
+
+def test_invalid_fold_sizes():
+    wf = WalkForwardBacktester(_records(100), window_size=20)
+    with pytest.raises(ValueError):
+        wf.run(train_size=50, test_size=50)
+    with pytest.raises(ValueError):
+        wf.run(test_size=10, learner=SweepLearner({'technical_pass': [0.7]}))
+
+
+def test_backtester_uses_record_time():
+    assert Backtester.record_time({'created_at': '2025-03-01T12:00:30Z'}) == datetime(2025, 3, 1, 12, 0, 30)
+    assert isinstance(Backtester.record_time({}), datetime)